@@ -1,92 +1,69 @@
+"""
+iShares-Indexzusammensetzung → <CODE>_clean.csv (Emittententicker, Name, Börse, ISIN)
+
+Modi:
+- direct:   lädt die Positionsdaten, die die Fondsseite selbst per Ajax nachlädt
+            (JSON der Bestände-Tabelle, sonst CSV-Download) und parst sie mit pandas
+- selenium: klickt sich wie bisher mit Headless-Chrome durch #allHoldingsTable
+- auto:     direct, Selenium nur als Fallback (Standard)
+
+Offline: --fixture DIR liest <CODE>.json / <CODE>.csv / <CODE>.html aus DIR statt
+aus dem Netz (ohne --etf nur die ETFs mit Fixture) und schreibt <CODE>_clean.csv
+nach DIR/out, damit die echten CSVs nicht überschrieben werden;
+--save-fixtures DIR speichert die geladenen Antworten dorthin.
+Eingecheckt sind synthetische Fixtures für DAX (JSON) und MDAX (CSV).
+
+Aufruf:
+    python 01_ishares_scrap_ubuntu.py
+    python 01_ishares_scrap_ubuntu.py --etf DAX MDAX
+    python 01_ishares_scrap_ubuntu.py --mode selenium
+    python 01_ishares_scrap_ubuntu.py --fixture
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 import os
 import time
 import traceback
-import requests
+
 import pandas as pd
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from ishares_holdings import (
+    ETF_CONFIG,
+    FIXTURE_DIR,
+    HTTP,
+    REQUEST_ERRORS,
+    fetch_holdings,
+    find_col_generic,
+    fixture_codes,
+    load_fixture,
+    normalize_holdings,
+    write_clean_csv,
+)
 
 # ==========================
 # KONFIGURATION
 # ==========================
 
+SCRIPT_DIR = Path(__file__).parent
+
 HEADLESS = True
 SELENIUM_TIMEOUT = 15
 PAGE_WAIT_SECONDS = 2
 
-ETF_CONFIG = [
-    {
-        "code": "STOXX600",
-        "index_name": "STOXX Europe 600",
-        "main_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/251931/"
-            "ishares-stoxx-europe-600-ucits-etf-de-fund",
-        "official_csv_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/251931/"
-            "ishares-stoxx-europe-600-ucits-etf-de-fund/"
-            "1478358465952.ajax?fileType=csv&fileName=EXSA_holdings&dataType=fund",
-    },
-    {
-        "code": "DAX",
-        "index_name": "DAX",
-        "main_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/251464/"
-            "ishares-dax-ucits-etf-de-fund",
-        "official_csv_url": None,
-    },
-    {
-        "code": "MDAX",
-        "index_name": "MDAX",
-        "main_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/251845/"
-            "ishares-mdax-ucits-etf-de-fund",
-        "official_csv_url": None,
-    },
-    {
-        "code": "SP500",
-        "index_name": "S&P 500",
-        "main_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/253743/"
-            "ishares-sp-500-b-ucits-etf-acc-fund",
-        "official_csv_url": None,
-    },
-    {
-        "code": "FTSE100",
-        "index_name": "FTSE 100",
-        "main_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/251795/"
-            "ishares-ftse-100-ucits-etf-inc-fund",
-        "official_csv_url": None,
-    },
-    {
-        "code": "NIKKEI225",
-        "index_name": "Nikkei 225",
-        "main_url":
-            "https://www.ishares.com/de/privatanleger/de/produkte/251898/"
-            "ishares-nikkei-225-ucits-etf-de-fund",
-        "official_csv_url": None,
-    },
-]
-
-# Helfer zum robusten Spaltensuchen
-def find_col_generic(df, candidates, label):
-    cols_lower = {c.lower(): c for c in df.columns}
-    for cand in candidates:
-        if cand.lower() in cols_lower:
-            return cols_lower[cand.lower()]
-    raise ValueError(f"Spalte für {label} nicht gefunden. Gefunden: {df.columns}")
-
 # ==========================
 # HILFSFUNKTIONEN
 # ==========================
 
 def create_driver(headless=True):
+    # Selenium nur laden, wenn wirklich ein Browser gebraucht wird
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -131,10 +108,14 @@ def safe_sleep(sec):
 
 
 # ==========================
-# 1) SCRAPING
+# 1) SCRAPING (SELENIUM-FALLBACK)
 # ==========================
 
 def scrape_ishares_holdings(url: str, out_csv: str) -> int:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     print(f"==> Scraping {url}")
 
     driver = create_driver(headless=HEADLESS)
@@ -219,13 +200,13 @@ def scrape_ishares_holdings(url: str, out_csv: str) -> int:
 def download_official_csv(url: str, out_file: str) -> bool:
     print("==> Lade offizielle CSV…")
     try:
-        r = requests.get(url, timeout=20)
+        r = HTTP.get(url)
         if r.status_code == 200:
             with open(out_file, "wb") as f:
                 f.write(r.content)
             print(f"Download OK → {out_file}")
             return True
-    except:
+    except REQUEST_ERRORS:
         pass
     print("❌ Download fehlgeschlagen")
     return False
@@ -284,25 +265,22 @@ def merge_official_and_scraped(official_file: str, scraped_file: str, out_file:
 # 4) PIPELINE PRO ETF
 # ==========================
 
-def process_etf(cfg):
+def scrape_with_selenium(cfg) -> pd.DataFrame:
+    """Bisheriger Weg: Tabelle per Browser scrapen, ggf. mit offizieller CSV mergen."""
     code = cfg["code"]
-    main_url = cfg["main_url"]
     official_csv_url = cfg.get("official_csv_url")
 
-    scraped = f"{code}_scraped.csv"
-    cleaned = f"{code}_clean.csv"
-    merged = f"{code}_merged.csv"
-
-    print(f"\n==== ETF {code} ({cfg['index_name']}) ====")
+    scraped = str(SCRIPT_DIR / f"{code}_scraped.csv")
+    official = str(SCRIPT_DIR / f"{code}_official.csv")
+    merged = str(SCRIPT_DIR / f"{code}_merged.csv")
 
-    # 1) Scrape
-    scrape_ishares_holdings(main_url, scraped)
+    scrape_ishares_holdings(cfg["main_url"], scraped)
 
-    # 2) Falls offizielle CSV existiert, downloaden und mergen
+    # Falls offizielle CSV existiert, downloaden und mergen
     if official_csv_url:
-        if download_official_csv(official_csv_url, f"{code}_official.csv"):
+        if download_official_csv(official_csv_url, official):
             try:
-                merge_official_and_scraped(f"{code}_official.csv", scraped, merged)
+                merge_official_and_scraped(official, scraped, merged)
             except Exception as e:
                 print(f"⚠ Merge fehlgeschlagen ({e}), verwende Scrape-Daten.")
                 merged = scraped
@@ -312,37 +290,76 @@ def process_etf(cfg):
     else:
         merged = scraped
 
-    # 3) Bereinigen (Trimmen, Deduplizieren)
-    df = pd.read_csv(merged)
-    if not {"ticker", "name", "isin"}.issubset(set(df.columns)):
-        rename_map = {
-            find_col_generic(df, ["ticker", "Emittententicker"], "Ticker (final)"): "ticker",
-            find_col_generic(df, ["name"], "Name (final)"): "name",
-            find_col_generic(df, ["isin"], "ISIN (final)"): "isin",
-        }
-        df = df.rename(columns=rename_map)
+    # Scrape enthält nur Aktien → Anlageklasse für normalize_holdings ergänzen
+    df = pd.read_csv(merged, dtype=str)
+    df["Anlageklasse"] = "Aktien"
+    return normalize_holdings(df)
 
-    df["ticker"] = df["ticker"].astype(str).str.strip()
-    df["name"] = df["name"].astype(str).str.strip()
-    df["isin"] = df["isin"].astype(str).str.strip()
 
-    df = df.drop_duplicates(subset=["isin"])
-    df.to_csv(cleaned, index=False)
-    print(f"Bereinigt & gespeichert: {len(df)} Zeilen → {cleaned}")
+def process_etf(cfg, mode="auto", fixture_dir: Path = None, save_dir: Path = None) -> int:
+    print(f"\n==== ETF {cfg['code']} ({cfg['index_name']}) ====")
+
+    df = None
+    if fixture_dir:
+        df = load_fixture(cfg, fixture_dir)
+    elif mode in ("auto", "direct"):
+        try:
+            df = fetch_holdings(cfg, save_dir=save_dir)
+        except ValueError as e:
+            if mode == "direct":
+                raise
+            print(f"⚠ Direkter Download fehlgeschlagen ({e}), Fallback auf Selenium…")
+
+    if df is None:
+        df = scrape_with_selenium(cfg)
+
+    out_dir = SCRIPT_DIR
+    if fixture_dir:
+        out_dir = fixture_dir / "out"
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    cleaned = write_clean_csv(cfg, df, out_dir)
+    print(f"Bereinigt & gespeichert: {len(df)} Zeilen → {cleaned.name}")
+    return len(df)
 
 
 # ==========================
 # 5) MAIN
 # ==========================
 
-def main():
-    try:
-        for cfg in ETF_CONFIG:
-            process_etf(cfg)
-    except Exception as e:
-        print("❌ Fehler:", e)
-        traceback.print_exc()
+def main(codes=None, mode="auto", fixture_dir: Path = None, save_dir: Path = None):
+    start = time.time()
+    failed = []
+    if fixture_dir and not codes:
+        codes = fixture_codes(fixture_dir)
+
+    for cfg in ETF_CONFIG:
+        if codes and cfg["code"] not in codes:
+            continue
+        try:
+            process_etf(cfg, mode=mode, fixture_dir=fixture_dir, save_dir=save_dir)
+        except Exception as e:
+            print(f"❌ Fehler bei {cfg['code']}:", e)
+            traceback.print_exc()
+            failed.append(cfg["code"])
+
+    print(f"\n✅ Fertig in {time.time() - start:.1f}s"
+          + (f" – fehlgeschlagen (alte CSV bleibt): {', '.join(failed)}" if failed else ""))
+    HTTP.print_stats()
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="iShares-Indexzusammensetzung laden")
+    parser.add_argument("--etf", nargs="+", choices=[c["code"] for c in ETF_CONFIG],
+                        help="Nur bestimmte ETFs")
+    parser.add_argument("--mode", choices=["auto", "direct", "selenium"], default="auto",
+                        help="auto: direkter Download, Selenium nur als Fallback")
+    parser.add_argument("--fixture", type=Path, nargs="?", const=FIXTURE_DIR,
+                        help=f"Offline aus Fixture-Dateien lesen (Standard: {FIXTURE_DIR})")
+    parser.add_argument("--save-fixtures", type=Path, nargs="?", const=FIXTURE_DIR,
+                        help="Geladene Antworten als Fixture speichern")
+    args = parser.parse_args()
+
+    main(codes=args.etf, mode=args.mode, fixture_dir=args.fixture, save_dir=args.save_fixtures)
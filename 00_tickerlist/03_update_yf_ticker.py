@@ -3,11 +3,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import os
+import re
 import json
 import time
-import requests
+import hashlib
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 from db import get_connection
+from http_client import HttpClient, REQUEST_ERRORS
 from mysql.connector import Error as MySQLError
 
 # ============================================================
@@ -18,10 +23,19 @@ DB_SCHEMA = "TICKER"
 TABLE_NAME = "tickerlist"
 SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
 
-OVERRIDE_FILE = "manual_overrides.json"
+OVERRIDE_FILE = Path(__file__).parent / "manual_overrides.json"
 with open(OVERRIDE_FILE, "r") as f:
     MANUAL_OVERRIDES = json.load(f)
 
+# Suchantworten auf Platte cachen (eine JSON-Datei pro Query)
+CACHE_DIR = Path(os.getenv(
+    "YAHOO_SEARCH_CACHE_DIR", Path(__file__).parent.parent / "data" / "yahoo_search_cache"
+))
+CACHE_TTL_DAYS = 30
+
+MAX_WORKERS = 8
+REQUEST_INTERVAL = 0.15   # Sekunden zwischen zwei Suchen (über alle Threads)
+
 ISIN_SUFFIX_MAP = {
     "DE": ".DE", "FR": ".PA", "NL": ".AS", "BE": ".BR", "AT": ".VI",
     "CH": ".SW", "IT": ".MI", "ES": ".MC", "SE": ".ST", "DK": ".CO",
@@ -36,36 +50,93 @@ EU_SUFFIXES = [
 
 BLACKLIST_SUFFIXES = {".MX", ".SG", ".KQ", ".KS", ".TW", ".TWO", ".XC"}
 
+# Rechtsformen/Füllwörter, die für den Namensvergleich nichts aussagen
+NAME_STOPWORDS = {
+    "ag", "se", "sa", "nv", "plc", "inc", "corp", "corporation", "co", "ltd",
+    "limited", "group", "holding", "holdings", "the", "and", "kgaa", "asa",
+    "ab", "oyj", "spa", "as", "class", "cl", "a", "b", "adr", "reg", "shs",
+}
+
 # ============================================================
 #   HELFER
 # ============================================================
 
+# Gemeinsamer Client: Keep-Alive-Pool, Retry bei 429/5xx, Mindestabstand über alle Threads
+HTTP = HttpClient(
+    pool_size=MAX_WORKERS,
+    max_retries=2,
+    timeout=10,
+    headers={"User-Agent": "Mozilla/5.0"},
+    rate=1 / REQUEST_INTERVAL,
+)
+STATS = {"cache_hits": 0, "requests": 0}
+STATS_LOCK = threading.Lock()
+
+
+def _cache_path(query):
+    key = hashlib.sha1(query.strip().lower().encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _count(key):
+    with STATS_LOCK:
+        STATS[key] += 1
+
+
 def yahoo_search(query):
+    """Yahoo-Suche mit Platten-Cache; Fehler werden nicht gecacht."""
     if not query:
         return []
+
+    path = _cache_path(query)
+    if path.exists() and time.time() - path.stat().st_mtime < CACHE_TTL_DAYS * 86400:
+        try:
+            quotes = json.loads(path.read_text(encoding="utf-8"))
+            _count("cache_hits")
+            return quotes
+        except ValueError:
+            pass
+
+    _count("requests")
     try:
-        r = requests.get(
-            SEARCH_URL,
-            params={"q": query, "quotesCount": 100},
-            headers={"User-Agent": "Mozilla/5.0"},
-            timeout=10,
-        )
+        r = HTTP.get(SEARCH_URL, params={"q": query, "quotesCount": 100})
         if r.status_code != 200:
             return []
-        return r.json().get("quotes", [])
-    except Exception:
+        quotes = r.json().get("quotes", [])
+    except REQUEST_ERRORS + (ValueError,):
         return []
 
+    # Atomar schreiben (mehrere Threads, evtl. gleiche Query)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(quotes), encoding="utf-8")
+    os.replace(tmp, path)
+    return quotes
+
 def similarity(a, b):
     if not a or not b:
         return 0.0
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
+def name_tokens(name):
+    """Normalisierte Namens-Tokens (ohne Akzente, Satzzeichen, Rechtsformen)."""
+    if not name:
+        return set()
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return {t for t in re.findall(r"[a-z0-9]+", text) if t not in NAME_STOPWORDS}
+
 # ============================================================
 #   BEST CANDIDATE
 # ============================================================
 
 def best_candidate(results, preferred_suffix, name):
+    """
+    Wählt das beste Symbol: bevorzugtes Börsen-Suffix, sonst EU-Börse, sonst ADR.
+
+    Innerhalb der gewählten Gruppe entscheidet die Namensähnlichkeit.
+    Vorfilter: nur Kandidaten mit den meisten gemeinsamen normalisierten
+    Namens-Tokens kommen in den (teuren) SequenceMatcher-Vergleich.
+    """
     candidates = []
 
     for r in results:
@@ -77,28 +148,29 @@ def best_candidate(results, preferred_suffix, name):
         if any(sym.endswith(bad) for bad in BLACKLIST_SUFFIXES):
             continue
 
-        score = similarity(name, yname)
-        candidates.append((score, sym, yname))
+        candidates.append((sym, yname))
 
     if not candidates:
         return None
 
-    candidates.sort(reverse=True, key=lambda x: x[0])
-
+    group = []
     if preferred_suffix:
-        filt = [c for c in candidates if c[1].endswith(preferred_suffix)]
-        if filt:
-            return filt[0][1]
+        group = [c for c in candidates if c[0].endswith(preferred_suffix)]
+    if not group:
+        group = [c for c in candidates if any(c[0].endswith(s) for s in EU_SUFFIXES)]
+    if not group:
+        group = [c for c in candidates if "." not in c[0]]
+    if not group:
+        return None
 
-    filt = [c for c in candidates if any(c[1].endswith(s) for s in EU_SUFFIXES)]
-    if filt:
-        return filt[0][1]
+    if len(group) > 1:
+        tokens = name_tokens(name)
+        overlap = [len(tokens & name_tokens(yname)) for _, yname in group]
+        best_overlap = max(overlap)
+        if best_overlap > 0:
+            group = [c for c, o in zip(group, overlap) if o == best_overlap]
 
-    adr = [c[1] for c in candidates if "." not in c[1]]
-    if adr:
-        return adr[0]
-
-    return None
+    return max(group, key=lambda c: similarity(name, c[1]))[0]
 
 # ============================================================
 #   TICKER FINDEN
@@ -123,7 +195,15 @@ def find_yahoo_ticker(name, isin, exchange):
 #   DB UPDATE
 # ============================================================
 
-def update_yf_tickers():
+def update_yf_tickers(resolve_all=False, workers=MAX_WORKERS):
+    """
+    Setzt yf_ticker für neue/ungelöste ISINs (resolve_all: für alle).
+
+    - Manuelle Overrides gelten immer
+    - Jede ISIN wird nur einmal gesucht (auch wenn sie in mehreren Indizes steht);
+      ist sie in einem anderen Index schon gelöst, wird der Ticker übernommen
+    - Suchen laufen parallel (HTTP-Client mit Rate Limit), Antworten kommen aus dem Platten-Cache
+    """
 
     print("🔗 Verbinde DB...")
     try:
@@ -132,63 +212,88 @@ def update_yf_tickers():
         print("❌ DB Fehler:", e)
         return
 
+    start = time.time()
     cur = con.cursor(dictionary=True)
-    cur.execute(f"SELECT id, name, exchange, isin FROM {TABLE_NAME}")
+    cur.execute(f"SELECT id, name, exchange, isin, yf_ticker FROM {TABLE_NAME}")
     rows = cur.fetchall()
 
-    update_sql = """
-        UPDATE tickerlist
-        SET yf_ticker = %s, updated_at = CURRENT_TIMESTAMP
-        WHERE id = %s
-    """
+    # Bereits gelöste ISINs (aus irgendeinem Index)
+    known = {}
+    for r in rows:
+        if r["yf_ticker"]:
+            known.setdefault(r["isin"], r["yf_ticker"])
 
+    updates = {}      # isin → ticker
+    todo = {}         # isin → (name, exchange)
     not_found = []
-    print(f"🔍 Verarbeite {len(rows)} Einträge...\n")
 
-    for i, r in enumerate(rows, start=1):
-        rid = r["id"]
-        name = r["name"]
-        exchange = r["exchange"] or ""
+    for r in rows:
         isin = r["isin"]
-
-        print(f"[{i}/{len(rows)}] {name} ({exchange}) – {isin}")
-
         if isin in MANUAL_OVERRIDES:
-            override = MANUAL_OVERRIDES[isin]
-            if override:
-                print(f"  ✔ Override → {override}")
-                cur.execute(update_sql, (override, rid))
-            else:
-                print("  → ❌ Override: kein Ticker")
-                not_found.append((rid, name, exchange, isin))
-            continue
-
-        ticker = find_yahoo_ticker(name, isin, exchange)
-
-        if not ticker:
-            print("  → ❌ Nicht gefunden")
-            not_found.append((rid, name, exchange, isin))
+            if MANUAL_OVERRIDES[isin]:
+                updates[isin] = MANUAL_OVERRIDES[isin]
             continue
+        if resolve_all:
+            todo.setdefault(isin, (r["name"], r["exchange"] or ""))
+        elif not r["yf_ticker"]:
+            if isin in known:
+                updates[isin] = known[isin]
+            else:
+                todo.setdefault(isin, (r["name"], r["exchange"] or ""))
+
+    print(f"🔍 {len(rows)} Einträge, {len(todo)} ISINs zu suchen"
+          f"{' (alle)' if resolve_all else ' (neu/ungelöst)'}...\n")
+
+    if todo:
+        items = list(todo.items())
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tickers = executor.map(lambda item: find_yahoo_ticker(item[1][0], item[0], item[1][1]), items)
+            for i, ((isin, (name, exchange)), ticker) in enumerate(zip(items, tickers), start=1):
+                if ticker:
+                    updates[isin] = ticker
+                else:
+                    not_found.append((name, exchange, isin))
+                if i % 100 == 0 or i == len(items):
+                    print(f"  [{i}/{len(items)}] {STATS['requests']} Requests, "
+                          f"{STATS['cache_hits']} aus Cache")
+
+    # Nur tatsächlich geänderte Zeilen schreiben
+    params = [
+        (updates[r["isin"]], r["id"]) for r in rows
+        if r["isin"] in updates and updates[r["isin"]] != r["yf_ticker"]
+    ]
 
-        print(f"  ✔ {ticker}")
-        cur.execute(update_sql, (ticker, rid))
-        time.sleep(0.15)
+    update_sql = """
+        UPDATE tickerlist
+        SET yf_ticker = %s, updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+    """
+    cur.executemany(update_sql, params)
 
     con.commit()
     cur.close()
     con.close()
 
-    print("\n🎉 Fertig.")
+    print(f"\n🎉 Fertig in {time.time() - start:.1f}s – {len(params)} Zeilen aktualisiert.")
+    HTTP.print_stats()
 
     print("\n--------------------------------------------------")
     print("❗ NICHT GEFUNDENE TICKER")
     print("--------------------------------------------------")
 
     for nf in not_found:
-        print(f"ID {nf[0]} – {nf[1]} – {nf[2]} – ISIN {nf[3]}")
+        print(f"{nf[0]} – {nf[1]} – ISIN {nf[2]}")
 
     print("--------------------------------------------------")
 
 
 if __name__ == "__main__":
-    update_yf_tickers()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Yahoo-Ticker für tickerlist ermitteln")
+    parser.add_argument("--all", action="store_true",
+                        help="Alle ISINs neu auflösen (nicht nur neue/ungelöste)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Parallele Suchen")
+    args = parser.parse_args()
+
+    update_yf_tickers(resolve_all=args.all, workers=args.workers)
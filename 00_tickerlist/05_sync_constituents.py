@@ -0,0 +1,292 @@
+"""
+Constituent-Sync: iShares-Indizes parallel laden und tickerlist per Delta abgleichen.
+
+Ersetzt im Pipeline-Lauf 01_ishares_scrap_ubuntu.py + 02_add_to_tickerlist_from_csv.py:
+- Alle ETFs aus ETF_CONFIG werden gleichzeitig per Direkt-Download geholt
+- Je Index wird die neue Zusammensetzung mit tickerdb.tickerlist verglichen:
+  added (neue ISIN im Index), removed (nicht mehr enthalten), changed (Name/Ticker/Börse)
+- Geschrieben wird nur das Delta (INSERT / UPDATE / DELETE), in einer Transaktion
+- ISINs, die bisher in keinem Index standen, landen in data/constituents/new_isins.txt
+  → Nachlader (Kurse, FMP-Fundamentaldaten, company_info) ziehen per --isins-file
+    nur diese nach (constituents.py, run_pipeline.sh 0)
+- Ein ETF, dessen Download fehlschlägt, bleibt unverändert (nichts wird gelöscht)
+
+Aufruf:
+    python 05_sync_constituents.py
+    python 05_sync_constituents.py --dry-run
+    python 05_sync_constituents.py --etf DAX MDAX
+    python 05_sync_constituents.py --fixture --dry-run
+
+--fixture liest die ETFs aus fixtures/ishares (ohne --etf nur die mit Fixture)
+und lässt die <CODE>_clean.csv-Snapshots unverändert.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from db import get_connection
+from mysql.connector import Error as MySQLError
+
+from constituents import CONSTITUENT_DELTA_DIR as DELTA_DIR, NEW_ISINS_FILE
+from ishares_holdings import (
+    ETF_CONFIG, FIXTURE_DIR, HTTP, fetch_holdings, fixture_codes, load_fixture, write_clean_csv,
+)
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+DB_SCHEMA = "TICKER"        # nutzt DB_NAME_TICKER aus .env
+TABLE_NAME = "tickerlist"
+SCRIPT_DIR = Path(__file__).parent
+
+MAX_WORKERS = 6
+
+# Schutz vor kaputten Downloads: fällt mehr als dieser Anteil eines Index weg,
+# werden die Löschungen für diesen Index ausgelassen (--force-remove erzwingt sie)
+MAX_REMOVED_SHARE = 0.25
+
+DELTA_FILE = DELTA_DIR / "last_delta.json"
+
+COMPARE_FIELDS = ("name", "ticker", "exchange")
+
+INSERT_SQL = f"""
+INSERT INTO `{TABLE_NAME}` (isin, stock_index, name, ticker, exchange)
+VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    name = VALUES(name),
+    ticker = VALUES(ticker),
+    exchange = VALUES(exchange),
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+UPDATE_SQL = f"""
+UPDATE `{TABLE_NAME}`
+SET name = %s, ticker = %s, exchange = %s, updated_at = CURRENT_TIMESTAMP
+WHERE id = %s
+"""
+
+DELETE_SQL = f"DELETE FROM `{TABLE_NAME}` WHERE id = %s"
+
+# ============================================================
+# LADEN
+# ============================================================
+
+def _load_one(cfg, fixture_dir: Path = None):
+    if fixture_dir:
+        return load_fixture(cfg, fixture_dir)
+    # Gemeinsamer, threadsicherer Client (Keep-Alive zu www.ishares.com)
+    return fetch_holdings(cfg, client=HTTP)
+
+
+def fetch_all(configs, workers=MAX_WORKERS, fixture_dir: Path = None) -> dict:
+    """
+    Lädt alle ETFs parallel. Returns {code: DataFrame | None};
+    None = Download fehlgeschlagen, Index wird nicht angefasst.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {cfg["code"]: executor.submit(_load_one, cfg, fixture_dir) for cfg in configs}
+        for code, future in futures.items():
+            try:
+                results[code] = future.result()
+            except Exception as e:
+                print(f"❌ {code}: {e}")
+                results[code] = None
+    return results
+
+
+def to_members(cfg, df) -> dict:
+    """DataFrame → {isin: {name, ticker, exchange}} im Format der tickerlist."""
+    members = {}
+    for isin, name, ticker, exchange in zip(df["ISIN"], df["Name"], df["Emittententicker"], df["Börse"]):
+        members[isin] = {
+            "name": name or None,
+            "ticker": ticker or None,
+            # Feste Börse je Index wie im CSV-Import, sonst aus den Positionsdaten
+            "exchange": cfg["exchange"] or exchange or None,
+        }
+    return members
+
+
+def load_current(cur) -> dict:
+    """Returns {stock_index: {isin: {id, name, ticker, exchange}}}."""
+    cur.execute(f"SELECT id, isin, stock_index, name, ticker, exchange FROM `{TABLE_NAME}`")
+    current = {}
+    for row in cur.fetchall():
+        current.setdefault(row["stock_index"], {})[row["isin"]] = row
+    return current
+
+# ============================================================
+# DIFF
+# ============================================================
+
+def _norm(value):
+    return (value or "").strip()
+
+
+def diff_index(current: dict, members: dict) -> dict:
+    """Vergleicht Ist (tickerlist) mit Soll (ETF). Returns {added, removed, changed}."""
+    added = [isin for isin in members if isin not in current]
+    removed = [isin for isin in current if isin not in members]
+    changed = [
+        isin for isin, new in members.items()
+        if isin in current
+        and any(_norm(current[isin][f]) != _norm(new[f]) for f in COMPARE_FIELDS)
+    ]
+    return {"added": sorted(added), "removed": sorted(removed), "changed": sorted(changed)}
+
+
+def build_delta(configs, holdings: dict, current: dict, force_remove=False) -> tuple[dict, dict]:
+    """
+    Returns (delta, params):
+        delta  = {code: {added, removed, changed}} für Report/Ausgabe
+        params = {"insert": [...], "update": [...], "delete": [...]} für executemany
+    """
+    delta = {}
+    params = {"insert": [], "update": [], "delete": []}
+
+    for cfg in configs:
+        code, stock_index = cfg["code"], cfg["stock_index"]
+        df = holdings.get(code)
+        if df is None:
+            continue
+
+        members = to_members(cfg, df)
+        existing = current.get(stock_index, {})
+        d = diff_index(existing, members)
+
+        if existing and len(d["removed"]) > MAX_REMOVED_SHARE * len(existing) and not force_remove:
+            print(f"⚠ {code}: {len(d['removed'])}/{len(existing)} würden entfernt "
+                  f"– Löschungen ausgelassen (--force-remove)")
+            d["removed"] = []
+
+        for isin in d["added"]:
+            m = members[isin]
+            params["insert"].append((isin, stock_index, m["name"], m["ticker"], m["exchange"]))
+        for isin in d["changed"]:
+            m = members[isin]
+            params["update"].append((m["name"], m["ticker"], m["exchange"], existing[isin]["id"]))
+        for isin in d["removed"]:
+            params["delete"].append((existing[isin]["id"],))
+
+        delta[code] = d
+
+    return delta, params
+
+
+def new_isins(delta: dict, current: dict) -> list[str]:
+    """Hinzugekommene ISINs, die bisher in keinem Index standen."""
+    known = {isin for rows in current.values() for isin in rows}
+    return sorted({isin for d in delta.values() for isin in d["added"]} - known)
+
+# ============================================================
+# SCHREIBEN
+# ============================================================
+
+def apply_delta(con, params: dict):
+    cur = con.cursor()
+    if params["insert"]:
+        cur.executemany(INSERT_SQL, params["insert"])
+    if params["update"]:
+        cur.executemany(UPDATE_SQL, params["update"])
+    if params["delete"]:
+        cur.executemany(DELETE_SQL, params["delete"])
+    con.commit()
+    cur.close()
+
+
+def write_report(delta: dict, isins: list[str]):
+    """new_isins.txt (eine ISIN pro Zeile) + last_delta.json für die Nachlader."""
+    DELTA_DIR.mkdir(parents=True, exist_ok=True)
+    NEW_ISINS_FILE.write_text("".join(f"{isin}\n" for isin in isins), encoding="utf-8")
+    DELTA_FILE.write_text(json.dumps({
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "indexes": delta,
+        "new_isins": isins,
+    }, indent=2), encoding="utf-8")
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def sync_constituents(codes=None, workers=MAX_WORKERS, fixture_dir: Path = None,
+                      dry_run=False, force_remove=False):
+    if fixture_dir and not codes:
+        codes = fixture_codes(fixture_dir)
+    configs = [cfg for cfg in ETF_CONFIG if not codes or cfg["code"] in codes]
+
+    start = time.time()
+    print(f"📥 Lade {len(configs)} ETFs parallel...")
+    holdings = fetch_all(configs, workers=workers, fixture_dir=fixture_dir)
+    print(f"   {sum(df is not None for df in holdings.values())}/{len(configs)} geladen "
+          f"in {time.time() - start:.1f}s")
+    HTTP.print_stats()
+
+    try:
+        con = get_connection(db_name=DB_SCHEMA, autocommit=False)
+    except MySQLError as e:
+        print("❌ DB-Verbindung fehlgeschlagen:", e)
+        return
+
+    cur = con.cursor(dictionary=True)
+    current = load_current(cur)
+    cur.close()
+
+    delta, params = build_delta(configs, holdings, current, force_remove=force_remove)
+    isins = new_isins(delta, current)
+
+    print("\n--------------------------------------------------")
+    print(f"{'Index':<12}{'neu':>6}{'entfernt':>10}{'geändert':>10}")
+    for code, d in delta.items():
+        print(f"{code:<12}{len(d['added']):>6}{len(d['removed']):>10}{len(d['changed']):>10}")
+    print("--------------------------------------------------")
+    print(f"Neue ISINs im Universum: {len(isins)}")
+
+    if dry_run:
+        print("\n(dry-run – keine Änderungen geschrieben)")
+        con.close()
+        return
+
+    try:
+        apply_delta(con, params)
+    except MySQLError as e:
+        con.rollback()
+        print("❌ Delta konnte nicht geschrieben werden:", e)
+        return
+    finally:
+        con.close()
+
+    write_report(delta, isins)
+
+    # CSV-Snapshots aktuell halten (manueller Import/Debugging), nicht aus Fixtures
+    for cfg in configs:
+        if holdings[cfg["code"]] is not None and not fixture_dir:
+            write_clean_csv(cfg, holdings[cfg["code"]], SCRIPT_DIR)
+    print(f"\n✅ {len(params['insert'])} eingefügt, {len(params['update'])} aktualisiert, "
+          f"{len(params['delete'])} entfernt in {time.time() - start:.1f}s")
+    print(f"   Neue ISINs → {NEW_ISINS_FILE}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="iShares-Indizes parallel laden und tickerlist abgleichen")
+    parser.add_argument("--etf", nargs="+", choices=[c["code"] for c in ETF_CONFIG],
+                        help="Nur bestimmte ETFs")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Parallele Downloads")
+    parser.add_argument("--fixture", type=Path, nargs="?", const=FIXTURE_DIR,
+                        help=f"Offline aus Fixture-Dateien lesen (Standard: {FIXTURE_DIR})")
+    parser.add_argument("--dry-run", action="store_true", help="Nur Delta anzeigen")
+    parser.add_argument("--force-remove", action="store_true",
+                        help=f"Löschungen auch bei mehr als {MAX_REMOVED_SHARE:.0%} Abgängen je Index")
+    args = parser.parse_args()
+
+    sync_constituents(codes=args.etf, workers=args.workers, fixture_dir=args.fixture,
+                      dry_run=args.dry_run, force_remove=args.force_remove)
@@ -0,0 +1,299 @@
+"""
+iShares-Positionsdaten ohne Browser laden und parsen.
+
+Die Fondsseite lädt ihre Bestände-Tabelle per Ajax nach (JSON, aaData) und
+bietet zusätzlich einen CSV-Download an. Beides wird hier direkt geholt und
+mit pandas auf CLEAN_COLUMNS normalisiert.
+
+Genutzt von 01_ishares_scrap_ubuntu.py (CSV-Export) und
+05_sync_constituents.py (Abgleich mit tickerlist).
+"""
+
+import io
+import re
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from http_client import HttpClient, REQUEST_ERRORS
+
+# ==========================
+# KONFIGURATION
+# ==========================
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "ishares"
+
+HTTP_TIMEOUT = 20
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
+}
+
+# Ein Client für alle ETFs (threadsicher, Keep-Alive zu www.ishares.com)
+HTTP = HttpClient(pool_size=6, max_retries=2, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS)
+
+# Ajax-Ressource der Fondsseite (Bestände-Tabelle + Download-Link)
+HOLDINGS_AJAX_ID = "1478358465952"
+AJAX_LINK_RE = re.compile(r"""["']([^"']*?\d{10,}\.ajax\?[^"']*?fileType=(?:json|csv)[^"']*)["']""")
+
+# Spaltenpositionen in den aaData-Zeilen (= Reihenfolge in #allHoldingsTable)
+JSON_COLUMNS = {"Emittententicker": 0, "Name": 1, "Anlageklasse": 3, "ISIN": 8, "Börse": 11}
+
+EQUITY_CLASSES = {"aktien", "equity"}
+CLEAN_COLUMNS = ["Emittententicker", "Name", "Börse", "ISIN"]
+
+ETF_CONFIG = [
+    {
+        "code": "STOXX600",
+        "stock_index": "STOXX600",
+        "exchange": None,
+        "index_name": "STOXX Europe 600",
+        "main_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/251931/"
+            "ishares-stoxx-europe-600-ucits-etf-de-fund",
+        "official_csv_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/251931/"
+            "ishares-stoxx-europe-600-ucits-etf-de-fund/"
+            "1478358465952.ajax?fileType=csv&fileName=EXSA_holdings&dataType=fund",
+    },
+    {
+        "code": "DAX",
+        "stock_index": "DAX",
+        "exchange": "Xetra",
+        "index_name": "DAX",
+        "main_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/251464/"
+            "ishares-dax-ucits-etf-de-fund",
+        "official_csv_url": None,
+    },
+    {
+        "code": "MDAX",
+        "stock_index": "MDAX",
+        "exchange": "Xetra",
+        "index_name": "MDAX",
+        "main_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/251845/"
+            "ishares-mdax-ucits-etf-de-fund",
+        "official_csv_url": None,
+    },
+    {
+        "code": "SP500",
+        "stock_index": "S&P 500",
+        "exchange": "New York Stock Exchange",
+        "index_name": "S&P 500",
+        "main_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/253743/"
+            "ishares-sp-500-b-ucits-etf-acc-fund",
+        "official_csv_url": None,
+    },
+    {
+        "code": "FTSE100",
+        "stock_index": "FTSE 100",
+        "exchange": "London Stock Exchange",
+        "index_name": "FTSE 100",
+        "main_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/251795/"
+            "ishares-ftse-100-ucits-etf-inc-fund",
+        "official_csv_url": None,
+    },
+    {
+        "code": "NIKKEI225",
+        "stock_index": "Nikkei 225",
+        "exchange": "Tokyo Stock Exchange",
+        "index_name": "Nikkei 225",
+        "main_url":
+            "https://www.ishares.com/de/privatanleger/de/produkte/251898/"
+            "ishares-nikkei-225-ucits-etf-de-fund",
+        "official_csv_url": None,
+    },
+]
+
+
+def find_col_generic(df, candidates, label):
+    """Spalte robust (case-insensitiv) suchen."""
+    cols_lower = {c.lower(): c for c in df.columns}
+    for cand in candidates:
+        if cand.lower() in cols_lower:
+            return cols_lower[cand.lower()]
+    raise ValueError(f"Spalte für {label} nicht gefunden. Gefunden: {df.columns}")
+
+
+# ==========================
+# PARSER
+# ==========================
+
+def _cell(value):
+    """aaData-Zellen sind entweder Text oder {"display": ..., "raw": ...}."""
+    if isinstance(value, dict):
+        value = value.get("display", value.get("raw"))
+    return "" if value is None else str(value).strip()
+
+
+def parse_holdings_json(text: str) -> pd.DataFrame:
+    """Bestände-JSON der Fondsseite (aaData) → DataFrame mit JSON_COLUMNS."""
+    rows = json.loads(text.lstrip("\ufeff"))["aaData"]
+    width = max(JSON_COLUMNS.values()) + 1
+    df = pd.DataFrame(
+        [[_cell(r[i]) for i in JSON_COLUMNS.values()] for r in rows if len(r) >= width],
+        columns=list(JSON_COLUMNS),
+    )
+    return df
+
+
+def parse_holdings_csv(text: str) -> pd.DataFrame:
+    """
+    Offizieller Positions-CSV-Download: Kopfzeilen (Fondsposition per …)
+    überspringen, Fußzeilen ohne Namen verwerfen.
+    """
+    lines = text.lstrip("\ufeff").splitlines()
+    header = next(
+        (i for i, line in enumerate(lines)
+         if line.startswith(("Emittententicker", "Ticker", '"Emittententicker"', '"Ticker"'))),
+        None,
+    )
+    if header is None:
+        raise ValueError("Kopfzeile im Positions-CSV nicht gefunden")
+
+    df = pd.read_csv(io.StringIO("\n".join(lines[header:])), dtype=str)
+    col_name = find_col_generic(df, ["Name"], "Name (CSV)")
+    return df[df[col_name].notna()]
+
+
+def parse_holdings_html(text: str) -> pd.DataFrame:
+    """Gespeicherte Fondsseite mit gerenderter #allHoldingsTable (Fixture)."""
+    df = pd.read_html(io.StringIO(text), attrs={"id": "allHoldingsTable"})[0]
+    return df.astype(str)
+
+
+PARSERS = {
+    "json": parse_holdings_json,
+    "csv": parse_holdings_csv,
+    "html": parse_holdings_html,
+}
+
+
+def normalize_holdings(df: pd.DataFrame) -> pd.DataFrame:
+    """Nur Aktien, Spalten auf CLEAN_COLUMNS bringen, leere/doppelte ISINs raus."""
+    col_isin = find_col_generic(df, ["ISIN"], "ISIN")
+    col_class = find_col_generic(df, ["Anlageklasse", "Asset Class"], "Anlageklasse")
+
+    out = pd.DataFrame({
+        "Emittententicker": df[find_col_generic(df, ["Emittententicker", "Ticker"], "Ticker")],
+        "Name": df[find_col_generic(df, ["Name"], "Name")],
+        "Börse": df[find_col_generic(df, ["Börse", "Exchange"], "Börse")]
+                 if {"börse", "exchange"} & {c.lower() for c in df.columns} else "",
+        "ISIN": df[col_isin],
+    })
+    out = out[df[col_class].astype(str).str.strip().str.lower().isin(EQUITY_CLASSES)]
+
+    for col in CLEAN_COLUMNS:
+        out[col] = out[col].fillna("").astype(str).str.strip()
+
+    out = out[(out["ISIN"] != "") & (out["ISIN"].str.lower() != "nan")]
+    return out.drop_duplicates(subset=["ISIN"]).reset_index(drop=True)
+
+
+# ==========================
+# DOWNLOAD
+# ==========================
+
+def holdings_urls(client, cfg) -> list[tuple[str, str]]:
+    """
+    Kandidaten (Format, URL) in Reihenfolge: Ajax-Links aus der Fondsseite,
+    dann die bekannte Ajax-Ressource, zuletzt der offizielle CSV-Download.
+    JSON zuerst, weil nur die Tabelle die ISIN enthält.
+    """
+    main_url = cfg["main_url"].rstrip("/")
+    urls = []
+
+    try:
+        r = client.get(main_url)
+        if r.status_code == 200:
+            for link in AJAX_LINK_RE.findall(r.text):
+                link = link.replace("&amp;", "&")
+                if link.startswith("/"):
+                    link = "https://www.ishares.com" + link
+                elif not link.startswith("http"):
+                    link = f"{main_url}/{link}"
+                urls.append(link)
+    except REQUEST_ERRORS as e:
+        print(f"⚠ Fondsseite nicht erreichbar ({e}), nutze bekannte Ajax-URL")
+
+    urls.append(f"{main_url}/{HOLDINGS_AJAX_ID}.ajax?tab=all&fileType=json")
+    if cfg.get("official_csv_url"):
+        urls.append(cfg["official_csv_url"])
+    urls.append(f"{main_url}/{HOLDINGS_AJAX_ID}.ajax?fileType=csv&fileName={cfg['code']}_holdings&dataType=fund")
+
+    seen = set()
+    candidates = []
+    for fmt in ("json", "csv"):
+        for url in urls:
+            if f"fileType={fmt}" in url and url not in seen:
+                seen.add(url)
+                candidates.append((fmt, url))
+    return candidates
+
+
+def fetch_holdings(cfg, client: HttpClient = None, save_dir: Path = None) -> pd.DataFrame:
+    """
+    Lädt die Positionen ohne Browser. Returns normalisiertes DataFrame;
+    ValueError, wenn keine Quelle verwertbare Aktien mit ISIN liefert.
+    """
+    client = client or HTTP
+    errors = []
+
+    for fmt, url in holdings_urls(client, cfg):
+        try:
+            r = client.get(url)
+            if r.status_code != 200:
+                errors.append(f"{fmt}: HTTP {r.status_code}")
+                continue
+            text = r.content.decode("utf-8-sig", errors="replace")
+            df = normalize_holdings(PARSERS[fmt](text))
+        except REQUEST_ERRORS + (ValueError, KeyError) as e:
+            errors.append(f"{fmt}: {e}")
+            continue
+
+        if df.empty:
+            errors.append(f"{fmt}: keine Aktien")
+            continue
+
+        if save_dir:
+            save_dir.mkdir(parents=True, exist_ok=True)
+            (save_dir / f"{cfg['code']}.{fmt}").write_text(text, encoding="utf-8")
+
+        print(f"Download OK ({fmt}): {len(df)} Aktien ← {url}")
+        return df
+
+    raise ValueError("; ".join(errors) or "keine Download-URL gefunden")
+
+
+def fixture_codes(fixture_dir: Path) -> list[str]:
+    """ETF-Codes, für die fixture_dir eine <CODE>.json / .csv / .html enthält."""
+    return [cfg["code"] for cfg in ETF_CONFIG
+            if any((fixture_dir / f"{cfg['code']}.{fmt}").exists() for fmt in PARSERS)]
+
+
+def load_fixture(cfg, fixture_dir: Path) -> pd.DataFrame:
+    """Liest <CODE>.json / .csv / .html aus fixture_dir (erste vorhandene Datei)."""
+    for fmt in PARSERS:
+        path = fixture_dir / f"{cfg['code']}.{fmt}"
+        if path.exists():
+            df = normalize_holdings(PARSERS[fmt](path.read_text(encoding="utf-8-sig")))
+            print(f"Fixture ({fmt}): {len(df)} Aktien ← {path}")
+            return df
+    raise FileNotFoundError(f"Keine Fixture für {cfg['code']} in {fixture_dir}")
+
+
+def write_clean_csv(cfg, df: pd.DataFrame, out_dir: Path) -> Path:
+    """Schreibt <CODE>_clean.csv im Format von 02_add_to_tickerlist_from_csv."""
+    path = Path(out_dir) / f"{cfg['code']}_clean.csv"
+
+    # Leere Börsen-Spalte weglassen → Import nimmt die Börse aus FILE_CONFIG
+    if (df["Börse"] == "").all():
+        df = df.drop(columns=["Börse"])
+
+    df.to_csv(path, index=False)
+    return path
@@ -7,7 +7,7 @@ Lädt Balance Sheet, Income Statement und Cash Flow von FMP API
 und kombiniert sie zu einer Zeile pro Datum.
 
 Workflow:
-1. Ticker aus tickerlist laden (yf_ticker + isin)
+1. Ticker aus tickerlist laden (yf_ticker + isin); mit --isins-file nur diese ISINs
 2. Primär: yf_ticker → FMP-Ticker konvertieren und Heimatbörse abfragen
 3. Fallback: Falls zu wenig Daten, ISIN-Suche nach Alternativen
 4. 3 Statements laden und by date mergen
@@ -16,7 +16,6 @@ Workflow:
 
 import sys
 import os
-import time
 import logging
 import threading
 from pathlib import Path
@@ -26,11 +25,12 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from mysql.connector import Error as MySQLError
 from db import get_connection
+from http_client import HttpClient
+from constituents import add_isins_argument, isins_from_args
 
 # .env laden
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -38,6 +38,9 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 FMP_BASE_URL = "https://financialmodelingprep.com"
 
+# Rate Limit für FMP (Requests/Sekunde über alle Threads, None = unbegrenzt)
+FMP_REQUESTS_PER_SECOND = 20
+
 # Threading Konfiguration
 MAX_WORKERS = 5  # Anzahl paralleler Threads
 
@@ -249,29 +252,17 @@ CREATE TABLE IF NOT EXISTS raw_data.fmp_financial_statements (
 # API Functions
 # =============================================================================
 
-def api_request(endpoint, params=None, max_retries=3):
-    """API Request mit Retry und Rate Limiting."""
+# Keep-Alive-Pool mit einer Verbindung je Thread, Retry bei 429/5xx
+HTTP = HttpClient(pool_size=MAX_WORKERS, max_retries=2, rate=FMP_REQUESTS_PER_SECOND)
+
+
+def api_request(endpoint, params=None):
+    """API Request über den gemeinsamen HTTP-Client (Retry, Backoff, Rate Limiting)."""
     if params is None:
         params = {}
     params["apikey"] = FMP_API_KEY
 
-    url = f"{FMP_BASE_URL}{endpoint}"
-
-    for attempt in range(max_retries):
-        try:
-            time.sleep(0.25)  # Rate limiting
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait = 2 ** attempt
-                logger.warning(f"API Fehler (Versuch {attempt+1}): {e}. Warte {wait}s...")
-                time.sleep(wait)
-            else:
-                logger.error(f"API Fehler nach {max_retries} Versuchen: {e}")
-                return None
-    return None
+    return HTTP.get_json(f"{FMP_BASE_URL}{endpoint}", params=params)
 
 
 def search_isin(isin):
@@ -876,7 +867,7 @@ def process_worker(isin, stock_index, period_type, ticker_cache, cache_lock, yf_
             conn.close()
 
 
-def main():
+def main(only_isins=None):
     print("=" * 60)
     print("FMP FINANCIAL STATEMENTS LOADER (THREADED)")
     print(f"Max Workers: {MAX_WORKERS}")
@@ -911,6 +902,8 @@ def main():
             WHERE isin IS NOT NULL AND isin != ''
         """)
         tickers = cur.fetchall()
+        if only_isins is not None:
+            tickers = [t for t in tickers if t[0] in only_isins]
         print(f"{len(tickers)} Ticker geladen!")
 
         # Statistik: Wie viele haben yf_ticker?
@@ -922,6 +915,10 @@ def main():
         cur.close()
         conn.close()
 
+        if not tickers:
+            print("\n✅ Nichts zu tun.")
+            return
+
         # Thread-safe Strukturen
         failed_isins = []
         ticker_cache = {}
@@ -1060,4 +1057,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FMP Financial Statements laden")
+    add_isins_argument(parser)
+    args = parser.parse_args()
+
+    main(only_isins=isins_from_args(args))
+    HTTP.print_stats()
@@ -7,7 +7,7 @@ Lädt historische Marktkapitalisierung von FMP API für alle ISINs in tickerlist
 Verwendet Threading für parallele API-Requests.
 
 Workflow:
-1. ISINs aus tickerlist laden
+1. ISINs aus tickerlist laden (mit --isins-file nur diese ISINs)
 2. ISIN → Ticker mappen via FMP API (nutzt bestehendes Mapping falls vorhanden)
 3. Historical Market Cap laden (parallel)
 4. In fmp_historical_market_cap speichern
@@ -15,23 +15,19 @@ Workflow:
 
 import sys
 import os
-import time
 import logging
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from mysql.connector import Error as MySQLError
 from db import get_connection
-
-# Thread-lokaler Storage für DB-Connections
-thread_local = threading.local()
+from http_client import HttpClient
+from constituents import add_isins_argument, isins_from_args
 
 # .env laden
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -39,6 +35,9 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 FMP_BASE_URL = "https://financialmodelingprep.com"
 
+# Rate Limit für FMP (Requests/Sekunde über alle Threads, None = unbegrenzt)
+FMP_REQUESTS_PER_SECOND = None
+
 # Anzahl paralleler Threads (FMP erlaubt typischerweise 10-30 parallele Requests)
 MAX_WORKERS = 10
 
@@ -90,36 +89,17 @@ CREATE TABLE IF NOT EXISTS raw_data.fmp_historical_market_cap (
 # API Functions
 # =============================================================================
 
-def get_session():
-    """Thread-lokale requests Session für Connection Pooling."""
-    if not hasattr(thread_local, "session"):
-        thread_local.session = requests.Session()
-    return thread_local.session
+# Keep-Alive-Pool mit einer Verbindung je Thread, Retry bei 429/5xx
+HTTP = HttpClient(pool_size=MAX_WORKERS, max_retries=2, rate=FMP_REQUESTS_PER_SECOND)
 
 
-def api_request(endpoint, params=None, max_retries=3):
-    """API Request mit Retry (ohne künstliches Rate Limiting bei Threading)."""
+def api_request(endpoint, params=None):
+    """API Request über den gemeinsamen HTTP-Client (Retry, Backoff, Rate Limiting)."""
     if params is None:
         params = {}
     params["apikey"] = FMP_API_KEY
 
-    url = f"{FMP_BASE_URL}{endpoint}"
-    session = get_session()
-
-    for attempt in range(max_retries):
-        try:
-            response = session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait = 2 ** attempt
-                logger.warning(f"API Fehler (Versuch {attempt+1}): {e}. Warte {wait}s...")
-                time.sleep(wait)
-            else:
-                logger.error(f"API Fehler nach {max_retries} Versuchen: {e}")
-                return None
-    return None
+    return HTTP.get_json(f"{FMP_BASE_URL}{endpoint}", params=params)
 
 
 def search_isin(isin):
@@ -234,7 +214,7 @@ def fetch_market_cap_for_ticker(isin, stock_index, existing_mappings):
     return (isin, stock_index, ticker, company_name, market_cap_data, None)
 
 
-def main():
+def main(only_isins=None):
     print("=" * 60)
     print("FMP HISTORICAL MARKET CAP LOADER")
     print(f"(mit {MAX_WORKERS} parallelen Threads)")
@@ -268,8 +248,14 @@ def main():
             WHERE isin IS NOT NULL AND isin != ''
         """)
         isins = cur.fetchall()
+        if only_isins is not None:
+            isins = [row for row in isins if row[0] in only_isins]
         print(f"{len(isins)} ISINs geladen!")
 
+        if not isins:
+            print("\n✅ Nichts zu tun.")
+            return
+
         # Bestehende Mappings vorladen (spart API-Calls)
         print("\nLade bestehende Ticker-Mappings...")
         cur.execute("""
@@ -397,4 +383,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FMP Historical Market Cap laden")
+    add_isins_argument(parser)
+    args = parser.parse_args()
+
+    main(only_isins=isins_from_args(args))
+    HTTP.print_stats()
@@ -8,7 +8,7 @@ von FMP API für alle ISINs in tickerlist.
 Verwendet Threading für parallele API-Requests.
 
 Workflow:
-1. ISINs aus tickerlist laden
+1. ISINs aus tickerlist laden (mit --isins-file nur diese ISINs)
 2. ISIN → Ticker mappen (nutzt bestehendes Mapping)
 3. Product & Geographic Segments laden (parallel) - Annual + Quarterly
 4. In separate Tabellen speichern
@@ -16,20 +16,19 @@ Workflow:
 
 import sys
 import os
-import time
 import logging
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from mysql.connector import Error as MySQLError
 from db import get_connection
+from http_client import HttpClient
+from constituents import add_isins_argument, isins_from_args
 
 # .env laden
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -37,12 +36,12 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 FMP_BASE_URL = "https://financialmodelingprep.com"
 
+# Rate Limit für FMP (Requests/Sekunde über alle Threads, None = unbegrenzt)
+FMP_REQUESTS_PER_SECOND = 50
+
 # Anzahl paralleler Threads
 MAX_WORKERS = 10
 
-# Thread-lokaler Storage für Sessions
-thread_local = threading.local()
-
 # Logging Setup
 logging.basicConfig(
     level=logging.INFO,
@@ -134,37 +133,17 @@ CREATE TABLE IF NOT EXISTS raw_data.fmp_revenue_geographic_segments (
 # API Functions
 # =============================================================================
 
-def get_session():
-    """Thread-lokale requests Session für Connection Pooling."""
-    if not hasattr(thread_local, "session"):
-        thread_local.session = requests.Session()
-    return thread_local.session
+# Keep-Alive-Pool mit einer Verbindung je Thread, Retry bei 429/5xx
+HTTP = HttpClient(pool_size=MAX_WORKERS, max_retries=2, rate=FMP_REQUESTS_PER_SECOND)
 
 
-def api_request(endpoint, params=None, max_retries=3):
-    """API Request mit Retry und Rate Limiting."""
+def api_request(endpoint, params=None):
+    """API Request über den gemeinsamen HTTP-Client (Retry, Backoff, Rate Limiting)."""
     if params is None:
         params = {}
     params["apikey"] = FMP_API_KEY
 
-    url = f"{FMP_BASE_URL}{endpoint}"
-    session = get_session()
-
-    for attempt in range(max_retries):
-        try:
-            time.sleep(0.1)  # Rate Limiting: 100ms Pause pro Request
-            response = session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait = 2 ** attempt
-                logger.warning(f"API Fehler (Versuch {attempt+1}): {e}. Warte {wait}s...")
-                time.sleep(wait)
-            else:
-                logger.error(f"API Fehler nach {max_retries} Versuchen: {e}")
-                return None
-    return None
+    return HTTP.get_json(f"{FMP_BASE_URL}{endpoint}", params=params)
 
 
 def search_isin(isin):
@@ -314,7 +293,7 @@ def fetch_segments_for_ticker(isin, stock_index, existing_mappings):
     return (isin, stock_index, ticker, company_name, product_data, geo_data, None)
 
 
-def main():
+def main(only_isins=None):
     print("=" * 60)
     print("FMP REVENUE SEGMENTS LOADER")
     print(f"(mit {MAX_WORKERS} parallelen Threads)")
@@ -349,8 +328,14 @@ def main():
             WHERE isin IS NOT NULL AND isin != ''
         """)
         isins = cur.fetchall()
+        if only_isins is not None:
+            isins = [row for row in isins if row[0] in only_isins]
         print(f"{len(isins)} ISINs geladen!")
 
+        if not isins:
+            print("\n✅ Nichts zu tun.")
+            return
+
         # Bestehende Mappings vorladen
         print("\nLade bestehende Ticker-Mappings...")
         cur.execute("""
@@ -517,4 +502,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FMP Revenue Segments laden")
+    add_isins_argument(parser)
+    args = parser.parse_args()
+
+    main(only_isins=isins_from_args(args))
+    HTTP.print_stats()
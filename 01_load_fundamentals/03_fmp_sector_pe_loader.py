@@ -21,18 +21,17 @@ GICS Sektoren:
 
 import sys
 import os
-import time
 import logging
 from pathlib import Path
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from mysql.connector import Error as MySQLError
 from db import get_connection
+from http_client import HttpClient
 
 # .env laden
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -40,6 +39,9 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 FMP_BASE_URL = "https://financialmodelingprep.com"
 
+# Rate Limit für FMP (Requests/Sekunde über alle Threads, None = unbegrenzt)
+FMP_REQUESTS_PER_SECOND = 10
+
 # Die 11 Sektoren (FMP-Bezeichnungen)
 FMP_SECTORS = [
     "Energy",
@@ -104,29 +106,17 @@ CREATE TABLE IF NOT EXISTS raw_data.fmp_historical_sector_pe (
 # API Functions
 # =============================================================================
 
-def api_request(endpoint, params=None, max_retries=3):
-    """API Request mit Retry und Rate Limiting."""
+# Keep-Alive-Pool mit einer Verbindung je Thread, Retry bei 429/5xx
+HTTP = HttpClient(pool_size=1, max_retries=2, rate=FMP_REQUESTS_PER_SECOND)
+
+
+def api_request(endpoint, params=None):
+    """API Request über den gemeinsamen HTTP-Client (Retry, Backoff, Rate Limiting)."""
     if params is None:
         params = {}
     params["apikey"] = FMP_API_KEY
 
-    url = f"{FMP_BASE_URL}{endpoint}"
-
-    for attempt in range(max_retries):
-        try:
-            time.sleep(0.1)  # Rate Limiting
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait = 2 ** attempt
-                logger.warning(f"API Fehler (Versuch {attempt+1}): {e}. Warte {wait}s...")
-                time.sleep(wait)
-            else:
-                logger.error(f"API Fehler nach {max_retries} Versuchen: {e}")
-                return None
-    return None
+    return HTTP.get_json(f"{FMP_BASE_URL}{endpoint}", params=params)
 
 
 def get_historical_sector_pe(sector, exchange):
@@ -298,3 +288,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    HTTP.print_stats()
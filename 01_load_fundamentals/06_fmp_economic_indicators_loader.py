@@ -9,20 +9,18 @@ Enthält GDP, CPI, Unemployment Rate, Fed Funds, etc.
 
 import sys
 import os
-import time
 import logging
 from pathlib import Path
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from mysql.connector import Error as MySQLError
 from db import get_connection
+from http_client import HttpClient
 
 # .env laden
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -30,8 +28,8 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 FMP_BASE_URL = "https://financialmodelingprep.com"
 
-# Thread-lokaler Storage für Sessions
-thread_local = threading.local()
+# Rate Limit für FMP (Requests/Sekunde über alle Threads, None = unbegrenzt)
+FMP_REQUESTS_PER_SECOND = 50
 
 # Anzahl paralleler Threads
 MAX_WORKERS = 5
@@ -106,37 +104,17 @@ CREATE TABLE IF NOT EXISTS raw_data.fmp_economic_indicators (
 # API Functions
 # =============================================================================
 
-def get_session():
-    """Thread-lokale requests Session für Connection Pooling."""
-    if not hasattr(thread_local, "session"):
-        thread_local.session = requests.Session()
-    return thread_local.session
+# Keep-Alive-Pool mit einer Verbindung je Thread, Retry bei 429/5xx
+HTTP = HttpClient(pool_size=MAX_WORKERS, max_retries=2, rate=FMP_REQUESTS_PER_SECOND)
 
 
-def api_request(endpoint, params=None, max_retries=3):
-    """API Request mit Retry und Rate Limiting."""
+def api_request(endpoint, params=None):
+    """API Request über den gemeinsamen HTTP-Client (Retry, Backoff, Rate Limiting)."""
     if params is None:
         params = {}
     params["apikey"] = FMP_API_KEY
 
-    url = f"{FMP_BASE_URL}{endpoint}"
-    session = get_session()
-
-    for attempt in range(max_retries):
-        try:
-            time.sleep(0.1)  # Rate Limiting
-            response = session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait = 2 ** attempt
-                logger.warning(f"API Fehler (Versuch {attempt+1}): {e}. Warte {wait}s...")
-                time.sleep(wait)
-            else:
-                logger.error(f"API Fehler nach {max_retries} Versuchen: {e}")
-                return None
-    return None
+    return HTTP.get_json(f"{FMP_BASE_URL}{endpoint}", params=params)
 
 
 def get_economic_indicator(indicator_name):
@@ -332,3 +310,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    HTTP.print_stats()
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 """
 create_historie_table.py
-Erstellt die SQL-Tabelle `yf_prices` im Schema `raw_data`.
+Erstellt die SQL-Tabellen `yf_prices` und `yf_prices_yearly` im Schema `raw_data`.
 """
 
 import sys
@@ -35,12 +35,31 @@ CREATE TABLE IF NOT EXISTS `yf_prices` (
 """
 
 
+# Jahresaggregate pro ISIN (gepflegt von 01_yf_history_all.py),
+# ersetzt die GROUP BY isin, YEAR(date)-Scans in 03_analytics
+CREATE_YEARLY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS `yf_prices_yearly` (
+  `isin` varchar(20) NOT NULL,
+  `year` smallint NOT NULL,
+  `avg_close` double DEFAULT NULL COMMENT 'Durchschnittlicher Schlusskurs im Jahr',
+  `last_close` double DEFAULT NULL COMMENT 'Letzter Schlusskurs im Jahr',
+  `last_date` date DEFAULT NULL COMMENT 'Datum des letzten Schlusskurses',
+  `trading_days` int DEFAULT NULL COMMENT 'Anzahl Handelstage mit Schlusskurs',
+  `updated_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`isin`, `year`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+"""
+
+
 def create_table():
     try:
         con = get_connection(db_name="raw_data")
         cur = con.cursor()
         cur.execute(CREATE_TABLE_SQL)
         print("✔ Tabelle `yf_prices` erfolgreich erstellt.")
+        cur.execute(CREATE_YEARLY_TABLE_SQL)
+        print("✔ Tabelle `yf_prices_yearly` erfolgreich erstellt.")
+        print("  (Erstbefüllung: python 01_yf_history_all.py --rebuild-yearly)")
         cur.close()
         con.close()
     except MySQLError as e:
@@ -3,8 +3,15 @@
 """
 Lädt historische Kursdaten über yfinance in raw_data.yf_prices
 - ISIN wird übernommen
-- Yahoo-Ticker kommen aus tickerdb.tickerlist
+- Yahoo-Ticker kommen aus tickerdb.tickerlist (mit --isins-file nur diese ISINs)
 - Struktur passt exakt zur Tabelle yf_prices
+- Hält zusätzlich das Spaltenarchiv (price_store.py) synchron
+- Aktualisiert raw_data.yf_prices_yearly nur für die geänderten ISIN-Jahre (yearly_prices.py)
+
+Aufruf:
+    python 01_yf_history_all.py                   # Kurse laden
+    python 01_yf_history_all.py --rebuild-yearly  # yf_prices_yearly komplett neu aufbauen
+    python 01_yf_history_all.py --isins-file      # nur neu aufgenommene ISINs
 """
 
 import sys
@@ -16,6 +23,9 @@ import pandas as pd
 import yfinance as yf
 from mysql.connector import Error as MySQLError
 from db import get_connection
+import price_store
+from constituents import add_isins_argument, isins_from_args
+from yearly_prices import changed_years, find_touched_years, refresh_yearly_prices, rebuild_yearly_prices
 
 BATCH_SIZE = 50
 START_DATE = "1970-01-01"
@@ -32,7 +42,7 @@ def execute_in_chunks(cursor, sql, data, chunk_size=5000):
 # -----------------------------------------------------------
 # Main
 # -----------------------------------------------------------
-def load_history():
+def load_history(only_isins=None):
     try:
         conn = get_connection(db_name="raw_data", autocommit=False)
         cur = conn.cursor(dictionary=True)
@@ -48,6 +58,8 @@ def load_history():
     """)
 
     records = cur.fetchall()
+    if only_isins is not None:
+        records = [r for r in records if r["isin"] in only_isins]
     print(f"📈 {len(records)} gültige Ticker gefunden.")
 
     ticker_map = {r["yf_ticker"]: r for r in records}
@@ -152,10 +164,24 @@ def load_history():
                 for _, row in merged.iterrows()
             ]
 
+            # Vor dem Upsert: ab welchem Jahr ändern sich Schlusskurse je ISIN?
+            changed = changed_years(cur, merged)
+
             execute_in_chunks(cur, insert_sql, rows)
             conn.commit()
 
-            print(f"✅ Batch {i // BATCH_SIZE + 1}: {len(rows)} Zeilen gespeichert.")
+            # Jahresaggregate nur ab den geänderten Jahren prüfen und neu berechnen
+            touched = find_touched_years(cur, changed)
+            refresh_yearly_prices(cur, touched)
+            conn.commit()
+
+            try:
+                price_store.merge_frame(merged)
+            except Exception as e:
+                print(f"⚠️ Kursarchiv nicht aktualisiert: {e}")
+
+            print(f"✅ Batch {i // BATCH_SIZE + 1}: {len(rows)} Zeilen gespeichert, "
+                  f"{len(touched)} ISINs mit geänderten Jahresaggregaten.")
             time.sleep(2)
 
         except Exception as e:
@@ -169,4 +195,15 @@ def load_history():
 
 
 if __name__ == "__main__":
-    load_history()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="yfinance Kurshistorie laden")
+    parser.add_argument("--rebuild-yearly", action="store_true",
+                        help="Nur yf_prices_yearly komplett neu aufbauen")
+    add_isins_argument(parser)
+    args = parser.parse_args()
+
+    if args.rebuild_yearly:
+        rebuild_yearly_prices()
+    else:
+        load_history(only_isins=isins_from_args(args))
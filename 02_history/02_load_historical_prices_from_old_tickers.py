@@ -12,6 +12,10 @@ Beispiel:
 - Über ticker_history finden wir DSM.AS als alten Ticker
 - Wir laden DSM.AS Daten für 1989-2023 nach
 - Diese werden mit ISIN CH1216478797 in yf_prices gespeichert
+- yf_prices_yearly wird für die betroffenen ISINs ab dem ältesten
+  nachgeladenen Jahr neu berechnet (yearly_prices.py)
+- Das Spaltenarchiv (price_store.py) bekommt die fehlenden Tage ebenfalls;
+  vorhandene Tage des aktuellen Tickers bleiben unverändert
 """
 
 import sys
@@ -23,7 +27,14 @@ import pandas as pd
 import yfinance as yf
 from mysql.connector import Error as MySQLError
 from db import get_connection
+import price_store
 from datetime import datetime, timedelta
+from yearly_prices import refresh_yearly_prices
+
+
+# Spaltenreihenfolge von rows_to_insert (= INSERT INTO yf_prices)
+PRICE_ROW_COLUMNS = ["isin", "ticker_yf", "date", "open", "high", "low", "close",
+                     "adj_close", "volume", "stock_index"]
 
 
 def execute_in_chunks(cursor, sql, data, chunk_size=5000):
@@ -88,6 +99,7 @@ def load_historical_prices_for_old_tickers():
 
     total_inserted = 0
     total_skipped = 0
+    refreshed_isins = set()
 
     # Verarbeite jede Ticker-Änderung
     for change in ticker_changes:
@@ -180,9 +192,21 @@ def load_historical_prices_for_old_tickers():
             if rows_to_insert:
                 print(f"   💾 Speichere {len(rows_to_insert)} Datensätze...")
                 execute_in_chunks(cur, insert_sql, rows_to_insert)
+                # Jahresaggregate ab dem ältesten nachgeladenen Jahr, in derselben Transaktion
+                from_year = min(row[2] for row in rows_to_insert)[:4]
+                refresh_yearly_prices(cur, {change['isin']: int(from_year)})
                 conn.commit()
                 total_inserted += len(rows_to_insert)
-                print(f"   ✅ {len(rows_to_insert)} Einträge gespeichert")
+                refreshed_isins.add(change['isin'])
+                print(f"   ✅ {len(rows_to_insert)} Einträge gespeichert, "
+                      f"Jahresaggregate ab {from_year} aktualisiert")
+
+                try:
+                    price_store.merge_frame(
+                        pd.DataFrame(rows_to_insert, columns=PRICE_ROW_COLUMNS), keep_existing=True
+                    )
+                except Exception as e:
+                    print(f"   ⚠️  Kursarchiv nicht aktualisiert: {e}")
             else:
                 print(f"   ⚠️  Keine Daten zum Speichern")
 
@@ -203,6 +227,7 @@ def load_historical_prices_for_old_tickers():
     print(f"Verarbeitet: {len(ticker_changes)} Ticker-Änderungen")
     print(f"Eingefügt:   {total_inserted:,} neue Datensätze")
     print(f"Übersprungen: {total_skipped} (Daten bereits vorhanden)")
+    print(f"Jahresaggregate: {len(refreshed_isins)} ISINs neu berechnet")
     print("\n✅ Historische Preise erfolgreich nachgeladen!")
 
 
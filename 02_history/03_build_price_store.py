@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Baut das spaltenbasierte Kursarchiv (price_store.py) aus raw_data.yf_prices auf.
+
+- Initialer Aufbau bzw. vollständige Neusynchronisation
+- Danach hält 01_yf_history_all.py das Archiv automatisch aktuell
+- Liest pro ISIN über den Index (isin, ticker_yf, date) → kein Full Scan am Stück
+
+Aufruf:
+    python 03_build_price_store.py              # alle ISINs
+    python 03_build_price_store.py --isin DE0007164600 US0378331005
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import time
+from mysql.connector import Error as MySQLError
+from db import get_connection
+import price_store
+
+
+def build_price_store(isins=None):
+    try:
+        conn = get_connection(db_name="raw_data")
+        cur = conn.cursor()
+    except MySQLError as e:
+        print("❌ DB-Verbindung fehlgeschlagen:", e)
+        return
+
+    if not isins:
+        cur.execute("SELECT DISTINCT isin FROM yf_prices")
+        isins = [row[0] for row in cur.fetchall()]
+
+    print(f"📦 Exportiere {len(isins)} ISINs nach {price_store.PRICE_STORE_DIR}...")
+    start = time.time()
+    total_rows = 0
+
+    for n, isin in enumerate(isins, 1):
+        cur.execute("""
+            SELECT date, open, high, low, close, adj_close, volume
+            FROM yf_prices
+            WHERE isin = %s AND close IS NOT NULL
+            ORDER BY date
+        """, (isin,))
+        rows = cur.fetchall()
+
+        if not rows:
+            continue
+
+        dates, opens, highs, lows, closes, adj_closes, volumes = zip(*rows)
+        total_rows += price_store.write_series(isin, {
+            "date": dates,
+            "open": [float("nan") if v is None else v for v in opens],
+            "high": [float("nan") if v is None else v for v in highs],
+            "low": [float("nan") if v is None else v for v in lows],
+            "close": closes,
+            "adj_close": [float("nan") if v is None else v for v in adj_closes],
+            "volume": [float("nan") if v is None else v for v in volumes],
+        })
+
+        if n % 250 == 0:
+            print(f"   {n}/{len(isins)} ISINs ({total_rows:,} Zeilen)")
+
+    cur.close()
+    conn.close()
+
+    print(f"✅ {total_rows:,} Zeilen in {time.time() - start:.1f}s exportiert.")
+
+    # Kurzer Check: universumweite Auswertungen direkt aus dem Archiv
+    start = time.time()
+    yearly = sum(1 for _ in price_store.iter_yearly_aggregates())
+    print(f"📊 Jahresaggregate: {yearly:,} ISIN-Jahre in {time.time() - start:.1f}s")
+
+    start = time.time()
+    latest = price_store.latest_prices()
+    print(f"📊 Letzte Kurse:    {len(latest):,} ISINs in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kursarchiv aus yf_prices aufbauen")
+    parser.add_argument("--isin", nargs="*", help="Nur bestimmte ISINs exportieren")
+    args = parser.parse_args()
+
+    build_price_store(args.isin)
@@ -0,0 +1,157 @@
+"""
+Jahresaggregate der Kurshistorie (raw_data.yf_prices_yearly)
+
+Gemeinsam genutzt von 01_yf_history_all.py (laufende Kurs-Loads) und
+02_load_historical_prices_from_old_tickers.py (Nachladen alter Ticker).
+
+Aggregiert wird je ISIN über alle ticker_yf (aktueller und alte Ticker);
+find_touched_years vergleicht deshalb das gespeicherte Aggregat mit derselben
+Aggregation über yf_prices – nicht mit den Zeilen eines einzelnen Tickers.
+
+Inkrementell: changed_years ermittelt vor dem Upsert, ab welchem Jahr sich
+Schlusskurse je ISIN tatsächlich ändern; aggregiert und verglichen werden
+danach nur diese und spätere Jahre.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from db import get_connection
+
+# Ø-Kurs, letzter Kurs, letztes Datum, Handelstage pro ISIN/Jahr
+YEARLY_SELECT_SQL = """
+    SELECT
+        isin,
+        year,
+        AVG(close) AS avg_close,
+        MAX(CASE WHEN rn = 1 THEN close END) AS last_close,
+        MAX(date) AS last_date,
+        COUNT(DISTINCT date) AS trading_days
+    FROM (
+        SELECT
+            isin,
+            YEAR(date) AS year,
+            date,
+            close,
+            ROW_NUMBER() OVER (PARTITION BY isin, YEAR(date) ORDER BY date DESC) AS rn
+        FROM yf_prices
+        WHERE close IS NOT NULL {where}
+    ) ranked
+    GROUP BY isin, year
+"""
+
+YEARLY_AGGREGATE_SQL = """
+    INSERT INTO yf_prices_yearly
+        (isin, year, avg_close, last_close, last_date, trading_days)
+""" + YEARLY_SELECT_SQL + """
+    ON DUPLICATE KEY UPDATE
+        avg_close = VALUES(avg_close),
+        last_close = VALUES(last_close),
+        last_date = VALUES(last_date),
+        trading_days = VALUES(trading_days);
+"""
+
+
+def _same_float(a, b) -> bool:
+    if a is None or b is None:
+        return a is b
+    return abs(a - b) <= 1e-9 * max(abs(b), 1)
+
+
+def changed_years(cur, merged) -> dict:
+    """
+    Vor dem Upsert aufrufen: vergleicht die geladenen Kurse (isin, ticker_yf,
+    date, close) mit den gespeicherten Zeilen derselben ISIN/Ticker-Paare.
+
+    Returns {isin: ältestes Jahr mit neuen oder geänderten Schlusskursen};
+    ISINs ohne Änderung fehlen.
+    """
+    new = merged[["isin", "ticker_yf", "date", "close"]].copy()
+    new["date"] = pd.to_datetime(new["date"].dt.date)
+
+    pairs = list(new[["isin", "ticker_yf"]].drop_duplicates().itertuples(index=False, name=None))
+    if not pairs:
+        return {}
+    placeholders = ",".join(["(%s, %s)"] * len(pairs))
+    cur.execute(f"""
+        SELECT isin, ticker_yf, date, close
+        FROM yf_prices
+        WHERE (isin, ticker_yf) IN ({placeholders})
+    """, [v for pair in pairs for v in pair])
+    stored = pd.DataFrame.from_records(cur.fetchall(), columns=["isin", "ticker_yf", "date", "close"])
+    stored["date"] = pd.to_datetime(stored["date"])
+    stored["close"] = pd.to_numeric(stored["close"])
+
+    both = new.merge(stored, on=["isin", "ticker_yf", "date"], how="left", suffixes=("", "_old"))
+    changed = both["close_old"].isna() | ~np.isclose(both["close"], both["close_old"], rtol=1e-9, atol=0)
+    first = both.loc[changed].groupby("isin")["date"].min()
+    return {isin: int(date.year) for isin, date in first.items()}
+
+
+def find_touched_years(cur, changed) -> dict:
+    """
+    Vergleicht yf_prices_yearly mit dem aktuellen Stand von yf_prices
+    (nach dem Insert, alle Ticker der ISIN) – nur für die Jahre ab
+    changed[isin] (siehe changed_years), nicht für die ganze Historie.
+
+    Returns {isin: ältestes geändertes Jahr} – nur ISIN-Jahre, deren Handelstage,
+    letztes Datum, letzter oder Ø-Kurs sich gegenüber dem gespeicherten Aggregat ändern.
+    cur muss ein dictionary-Cursor sein.
+    """
+    if not changed:
+        return {}
+
+    current = []
+    sql = YEARLY_SELECT_SQL.format(where="AND isin = %s AND date >= %s")
+    for isin, from_year in changed.items():
+        cur.execute(sql, (isin, f"{from_year}-01-01"))
+        current.extend(cur.fetchall())
+
+    isins = list(changed)
+    placeholders = ",".join(["%s"] * len(isins))
+    cur.execute(f"""
+        SELECT isin, year, avg_close, last_close, last_date, trading_days
+        FROM yf_prices_yearly
+        WHERE isin IN ({placeholders})
+    """, isins)
+    stored = {(r["isin"], int(r["year"])): r for r in cur.fetchall()}
+
+    touched = {}
+    for row in current:
+        isin, year = row["isin"], int(row["year"])
+        old = stored.get((isin, year))
+        changed_row = (
+            old is None
+            or old["trading_days"] != row["trading_days"]
+            or old["last_date"] != row["last_date"]
+            or not _same_float(old["last_close"], row["last_close"])
+            or not _same_float(old["avg_close"], row["avg_close"])
+        )
+        if changed_row:
+            touched[isin] = min(year, touched.get(isin, year))
+    return touched
+
+
+def refresh_yearly_prices(cur, touched):
+    """Berechnet yf_prices_yearly für {isin: ab_jahr} neu (nutzt Index auf isin/date)."""
+    sql = YEARLY_AGGREGATE_SQL.format(where="AND isin = %s AND date >= %s")
+    for isin, from_year in touched.items():
+        cur.execute(sql, (isin, f"{from_year}-01-01"))
+
+
+def rebuild_yearly_prices():
+    """Baut yf_prices_yearly einmalig komplett aus yf_prices auf (Full Scan)."""
+    conn = get_connection(db_name="raw_data", autocommit=False)
+    cur = conn.cursor()
+
+    print("🔄 Baue yf_prices_yearly komplett neu auf...")
+    start = time.time()
+    cur.execute("TRUNCATE TABLE yf_prices_yearly")
+    cur.execute(YEARLY_AGGREGATE_SQL.format(where=""))
+    conn.commit()
+    print(f"✅ {cur.rowcount} ISIN-Jahre in {time.time() - start:.1f}s geschrieben.")
+
+    cur.close()
+    conn.close()
@@ -8,7 +8,8 @@ Logik:
 - Startet von tickerdb.tickerlist (nur Einträge mit eodhd_ticker)
 - Für jeden Match in raw_data.eodhd_financial_statements wird pivotiert
 - UNIQUE KEY ist (isin, stock_index, year)
-- Kursdaten (price, avg_price) werden separat per UPDATE hinzugefügt (Performance)
+- Kursdaten (price, avg_price) werden separat per UPDATE aus raw_data.yf_prices_yearly
+  hinzugefügt (Performance)
 """
 
 import sys
@@ -128,29 +129,15 @@ ON DUPLICATE KEY UPDATE
 # Schritt 2: avg_price hinzufügen
 UPDATE_AVG_PRICE_SQL = """
 UPDATE analytics.eodhd_filtered_numbers efn
-JOIN (
-    SELECT isin, YEAR(date) AS year, AVG(close) AS avg_price
-    FROM raw_data.yf_prices
-    GROUP BY isin, YEAR(date)
-) yp ON yp.isin = efn.isin AND yp.year = efn.year
-SET efn.avg_price = yp.avg_price;
+JOIN raw_data.yf_prices_yearly yp ON yp.isin = efn.isin AND yp.year = efn.year
+SET efn.avg_price = yp.avg_close;
 """
 
 # Schritt 3: price (letzter Kurs des Jahres) hinzufügen
 UPDATE_LAST_PRICE_SQL = """
 UPDATE analytics.eodhd_filtered_numbers efn
-JOIN (
-    SELECT yp1.isin, YEAR(yp1.date) AS year, yp1.close AS price
-    FROM raw_data.yf_prices yp1
-    INNER JOIN (
-        SELECT isin, YEAR(date) AS year, MAX(date) AS max_date
-        FROM raw_data.yf_prices
-        GROUP BY isin, YEAR(date)
-    ) yp_max ON yp1.isin = yp_max.isin
-            AND YEAR(yp1.date) = yp_max.year
-            AND yp1.date = yp_max.max_date
-) yp ON yp.isin = efn.isin AND yp.year = efn.year
-SET efn.price = yp.price;
+JOIN raw_data.yf_prices_yearly yp ON yp.isin = efn.isin AND yp.year = efn.year
+SET efn.price = yp.last_close;
 """
 
 
@@ -185,7 +172,7 @@ def main():
         print("\n" + "-" * 60)
         print("[2/3] DURCHSCHNITTSPREISE BERECHNEN")
         print("-" * 60)
-        print("      Berechne AVG(close) pro ISIN/Jahr aus yf_prices...")
+        print("      Übernehme AVG(close) pro ISIN/Jahr aus yf_prices_yearly...")
         start = time.time()
         cur.execute(UPDATE_AVG_PRICE_SQL)
         rows2 = cur.rowcount
@@ -197,7 +184,7 @@ def main():
         print("\n" + "-" * 60)
         print("[3/3] JAHRESENDKURSE BERECHNEN")
         print("-" * 60)
-        print("      Ermittle letzten Schlusskurs pro ISIN/Jahr...")
+        print("      Übernehme letzten Schlusskurs pro ISIN/Jahr aus yf_prices_yearly...")
         start = time.time()
         cur.execute(UPDATE_LAST_PRICE_SQL)
         rows3 = cur.rowcount
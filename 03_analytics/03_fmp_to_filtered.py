@@ -7,6 +7,7 @@ Befuellt analytics.fmp_filtered_numbers aus raw_data.fmp_financial_statements.
 Logik:
 - Kopiert ausgewaehlte Spalten von fmp_financial_statements
 - Ergaenzt price (letzter Kurs des Jahres), avg_price (Durchschnittskurs)
+  aus raw_data.yf_prices_yearly (gepflegt von 02_history/01_yf_history_all.py)
 - Berechnet market_cap aus price * weighted_average_shs_out
 - UNIQUE KEY ist (isin, stock_index, date, period)
 """
@@ -17,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from mysql.connector import Error
 from db import get_connection
+from data_generation import bump_generation
 
 
 # Schritt 1: Fundamentaldaten kopieren
@@ -145,34 +147,19 @@ ON DUPLICATE KEY UPDATE
     updated_at = NOW();
 """
 
-# Schritt 2: avg_price hinzufuegen (Durchschnitt pro ISIN und Jahr)
+# Schritt 2: avg_price hinzufuegen (Durchschnitt pro ISIN und Jahr, aus yf_prices_yearly)
 UPDATE_AVG_PRICE_SQL = """
 UPDATE analytics.fmp_filtered_numbers ffn
-JOIN (
-    SELECT isin, YEAR(date) AS year, AVG(close) AS avg_price
-    FROM raw_data.yf_prices
-    GROUP BY isin, YEAR(date)
-) yp ON yp.isin = ffn.isin AND yp.year = YEAR(ffn.date)
-SET ffn.avg_price = yp.avg_price;
+JOIN raw_data.yf_prices_yearly yp ON yp.isin = ffn.isin AND yp.year = YEAR(ffn.date)
+SET ffn.avg_price = yp.avg_close;
 """
 
 # Schritt 3: price (letzter Kurs des Jahres) hinzufuegen
-# Optimiert mit ROW_NUMBER() Window Function (MySQL 8+)
+# Aus dem gepflegten Aggregat raw_data.yf_prices_yearly (statt Full Scan über yf_prices)
 UPDATE_LAST_PRICE_SQL = """
 UPDATE analytics.fmp_filtered_numbers ffn
-JOIN (
-    SELECT isin, year, close AS price
-    FROM (
-        SELECT
-            isin,
-            YEAR(date) AS year,
-            close,
-            ROW_NUMBER() OVER (PARTITION BY isin, YEAR(date) ORDER BY date DESC) AS rn
-        FROM raw_data.yf_prices
-    ) ranked
-    WHERE rn = 1
-) yp ON yp.isin = ffn.isin AND yp.year = YEAR(ffn.date)
-SET ffn.price = yp.price;
+JOIN raw_data.yf_prices_yearly yp ON yp.isin = ffn.isin AND yp.year = YEAR(ffn.date)
+SET ffn.price = yp.last_close;
 """
 
 # Schritt 4: market_cap berechnen (price * weighted_average_shs_out)
@@ -214,7 +201,7 @@ def main():
         print("\n" + "-" * 60)
         print("[2/4] DURCHSCHNITTSPREISE BERECHNEN")
         print("-" * 60)
-        print("      Berechne AVG(close) pro ISIN/Jahr aus yf_prices...")
+        print("      Uebernehme AVG(close) pro ISIN/Jahr aus yf_prices_yearly...")
         start = time.time()
         cur.execute(UPDATE_AVG_PRICE_SQL)
         rows2 = cur.rowcount
@@ -226,7 +213,7 @@ def main():
         print("\n" + "-" * 60)
         print("[3/4] JAHRESENDKURSE BERECHNEN")
         print("-" * 60)
-        print("      Ermittle letzten Schlusskurs pro ISIN/Jahr...")
+        print("      Uebernehme letzten Schlusskurs pro ISIN/Jahr aus yf_prices_yearly...")
         start = time.time()
         cur.execute(UPDATE_LAST_PRICE_SQL)
         rows3 = cur.rowcount
@@ -246,6 +233,9 @@ def main():
         elapsed = time.time() - start
         print(f"      --> {rows4} Zeilen aktualisiert in {elapsed:.1f}s")
 
+        # Income Statement/TTM im Detail-Modal lesen aus fmp_filtered_numbers
+        print(f"🔄 Daten-Generation {bump_generation()}")
+
         # Statistik
         print("\n" + "=" * 60)
         print("FERTIG - STATISTIK")
@@ -22,6 +22,7 @@ import numpy as np
 from collections import defaultdict
 from mysql.connector import Error
 from db import get_connection
+from data_generation import bump_generation
 
 
 def calculate_cagr(end_value, start_value, years):
@@ -533,6 +534,9 @@ def main():
         conn.commit()
         print(f"\nErfolgreich {len(all_results):,} Datensätze in calcu_numbers eingefügt!")
 
+        # Neue KGV-/EV-EBIT-Verläufe für das Detail-Modal
+        print(f"🔄 Daten-Generation {bump_generation()}")
+
         # Statistik ausgeben
         cur.execute("""
             SELECT
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migration: Composite-Indizes für die heißen Website- und Pipeline-Queries.
+
+NICHT GEMESSEN: von Hand angelegter Vorschlag (Indizes passend zu den
+isin/period/date-Filtern der Detail- und DCF-Queries), bisher ohne Lauf von
+index_advisor.py gegen eine Datenbank. Deshalb nicht Teil von run_pipeline.sh.
+Die CREATE-TABLE-DDLs (02_/04_create_table_*) legen diese Indizes ebenfalls
+nicht an; sie kommen erst über eine gemessene Migration in die Datenbank.
+
+Vor dem Einsatz gegen eine lokale DB-Kopie messen; der Advisor überschreibt
+diese Datei dann mit den tatsächlich messbar schnelleren Indizes:
+    python index_advisor.py --evaluate --write-migration 03_analytics/06_add_query_indexes.py
+
+Idempotent: vorhandene Indizes werden übersprungen.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mysql.connector import Error
+from db import get_connection
+
+# (schema, tabelle, index_name, spalten)
+INDEXES = [
+    ('analytics', 'fmp_filtered_numbers', 'idx_isin_period_date', ('isin', 'period', 'date')),
+    ('analytics', 'calcu_numbers', 'idx_isin_period_date', ('isin', 'period', 'date')),
+]
+
+
+def main():
+    conn = None
+    cur = None
+
+    try:
+        print("Verbinde mit Datenbank...")
+        conn = get_connection(autocommit=False)
+        cur = conn.cursor()
+
+        print("Lege Indizes an...")
+
+        for schema, table, name, columns in INDEXES:
+            try:
+                cur.execute(f"ALTER TABLE {schema}.{table} ADD INDEX {name} ({', '.join(columns)})")
+                print(f"  + {table}.{name} ({', '.join(columns)}) angelegt")
+            except Error as e:
+                if e.errno == 1061:  # Duplicate key name
+                    print(f"  - {table}.{name} existiert bereits")
+                else:
+                    raise
+
+        conn.commit()
+        print("Migration erfolgreich!")
+
+    except Error as e:
+        print(f"Datenbankfehler: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
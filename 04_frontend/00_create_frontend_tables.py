@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from mysql.connector import Error
 from db import get_connection
+from translation_cache import CREATE_TRANSLATION_CACHE
 
 
 # =============================================================================
@@ -28,6 +29,7 @@ CREATE TABLE IF NOT EXISTS analytics.company_info (
     country VARCHAR(100) COMMENT 'Land des Hauptsitzes',
     currency VARCHAR(10) COMMENT 'Berichtswährung',
     description TEXT COMMENT 'Unternehmensbeschreibung',
+    description_hash CHAR(64) COMMENT 'SHA-256 der englischen Quelle der Beschreibung',
     fiscal_year_end VARCHAR(20) COMMENT 'Fiskaljahr-Ende (z.B. December)',
     stock_index VARCHAR(50) COMMENT 'Index-Zugehörigkeit',
 
@@ -240,6 +242,11 @@ def main():
         cur.execute(INSERT_DEFAULT_FILTER)
         print("   ✓ user_favorite_filter erstellt mit Default-Werten")
 
+        # Tabelle 6: translation_cache
+        print("\n6. Erstelle analytics.translation_cache...")
+        cur.execute(CREATE_TRANSLATION_CACHE)
+        print("   ✓ translation_cache erstellt (Übersetzungen)")
+
         conn.commit()
 
         # Übersicht
@@ -255,6 +262,7 @@ def main():
 │ user_watchlist            │ Favoriten & Notizen (manuell)        │
 │ user_favorite_labels      │ Namen für Favoriten 1-9              │
 │ user_favorite_filter      │ Filter: Welche Favoriten anzeigen    │
+│ translation_cache         │ Übersetzungen (Hash des Quelltexts)  │
 └───────────────────────────┴──────────────────────────────────────┘
 
 Nächste Schritte:
@@ -7,11 +7,32 @@ Quellen:
 - tickerlist: isin, ticker, company_name, stock_index
 - yfinance API: sector, industry, country, currency, description, fiscal_year_end
 
+Ablauf (eine Engine für alle Refresh-Varianten):
+1. yf.Ticker(...).info je Ticker genau einmal holen → lokaler Snapshot
+   (data/yf_info_snapshots/<ticker>.json, wiederverwendet solange jünger als
+   SNAPSHOT_MAX_AGE_DAYS); parallel unter einem gemeinsamen Rate-Limit
+2. Alle Felder aus dem Snapshot ableiten
+3. Mit company_info vergleichen: nur geänderte Felder, nur geänderte Zeilen,
+   per Bulk-Upsert schreiben
+4. Beschreibungen nur übersetzen, wenn sich der englische Text geändert hat
+   (description_hash); Übersetzungen kommen aus analytics.translation_cache
+
+Modi:
+    python 01_load_company_info.py                     # alle ISINs (monatlich)
+    python 01_load_company_info.py --mode missing      # nur ohne Sektor (Retry)
+    python 01_load_company_info.py --mode fiscal-year  # nur ohne fiscal_year_end
+    python 01_load_company_info.py --refresh           # Snapshots ignorieren
+    python 01_load_company_info.py --isins-file        # nur neu aufgenommene ISINs
+
 Update-Frequenz: Jährlich oder bei Bedarf
 """
 
+import os
 import sys
+import json
 import time
+import datetime
+import threading
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -21,264 +42,450 @@ import yfinance as yf
 from tqdm import tqdm
 from mysql.connector import Error
 from db import get_connection
+from data_generation import bump_generation
+from constituents import add_isins_argument, isins_from_args
 
-try:
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-except ImportError:
-    TRANSLATOR_AVAILABLE = False
-    print("WARNUNG: deep-translator nicht installiert. Beschreibungen werden nicht übersetzt.")
-    print("Installiere mit: pip install deep-translator")
+from translation_cache import get_backend, text_hash, translate_texts
 
 
 # Threading Konfiguration
 MAX_WORKERS = 10
+REQUEST_INTERVAL = 0.1   # Sekunden zwischen zwei yfinance-Abfragen (über alle Threads)
 
+# Lokaler Snapshot-Speicher der yfinance-Info-Payloads
+SNAPSHOT_DIR = Path(os.getenv(
+    "YF_INFO_SNAPSHOT_DIR", Path(__file__).parent.parent / "data" / "yf_info_snapshots"
+))
+SNAPSHOT_MAX_AGE_DAYS = 25
 
-def translate_to_german(text):
-    """Übersetze Text von Englisch nach Deutsch."""
-    if not text or not TRANSLATOR_AVAILABLE:
-        return text
+UPSERT_BATCH = 500
 
-    try:
-        # Google Translate ist kostenlos über deep-translator
-        translator = GoogleTranslator(source='en', target='de')
-
-        # Teile lange Texte in kleinere Chunks (Google Translate Limit: 5000 Zeichen)
-        if len(text) > 4500:
-            chunks = []
-            sentences = text.split('. ')
-            current_chunk = ''
-
-            for sentence in sentences:
-                if len(current_chunk) + len(sentence) + 2 < 4500:
-                    current_chunk += sentence + '. '
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk)
-                    current_chunk = sentence + '. '
-
-            if current_chunk:
-                chunks.append(current_chunk)
-
-            translated_chunks = [translator.translate(chunk) for chunk in chunks]
-            return ' '.join(translated_chunks)
-        else:
-            return translator.translate(text)
+# Felder, die aus dem Snapshot abgeleitet und verglichen werden
+INFO_FIELDS = ["sector", "industry", "country", "currency", "fiscal_year_end"]
 
-    except Exception as e:
-        # Bei Fehler Original-Text zurückgeben
-        print(f"Übersetzungsfehler: {e}")
-        return text
+MODES = {
+    "full": "alle ISINs aus tickerlist",
+    "missing": "nur Einträge ohne Sektor",
+    "fiscal-year": "nur Einträge ohne fiscal_year_end",
+}
 
+MONTHS_DE = {
+    1: "Januar", 2: "Februar", 3: "März", 4: "April",
+    5: "Mai", 6: "Juni", 7: "Juli", 8: "August",
+    9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
+}
 
-def get_yf_info(ticker_yf):
-    """Hole Stammdaten von yfinance API."""
-    if not ticker_yf:
-        return None
 
+# =============================================================================
+# Snapshot-Speicher + Rate-Limit
+# =============================================================================
+
+class RateLimiter:
+    """Mindestabstand zwischen Requests, gemeinsam für alle Threads."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _snapshot_path(ticker_yf):
+    return SNAPSHOT_DIR / f"{ticker_yf.replace('/', '_')}.json"
+
+
+def load_snapshot(ticker_yf, max_age_days=SNAPSHOT_MAX_AGE_DAYS):
+    """Returns den gespeicherten Info-Payload oder None (fehlt/zu alt/kaputt)."""
+    path = _snapshot_path(ticker_yf)
+    if not path.exists() or time.time() - path.stat().st_mtime > max_age_days * 86400:
+        return None
     try:
-        stock = yf.Ticker(ticker_yf)
-        info = stock.info
-
-        # Prüfe ob gültige Daten zurückkamen
-        if not info or info.get("trailingPegRatio") is None and info.get("sector") is None:
-            # Manchmal gibt yfinance leere Dicts zurück
-            if not info.get("shortName") and not info.get("longName"):
-                return None
-
-        # Beschreibung holen und übersetzen
-        description = info.get("longBusinessSummary")
-        if description:
-            description_de = translate_to_german(description)
-        else:
-            description_de = None
-
-        # Fiskaljahr-Ende behandeln
-        # yfinance gibt manchmal einen Unix-Timestamp zurück, manchmal einen Monatsnamen
-        fiscal_year_end = info.get("fiscalYearEnd") or info.get("lastFiscalYearEnd")
-        if fiscal_year_end and isinstance(fiscal_year_end, int):
-            # Unix-Timestamp -> Monat extrahieren
-            import datetime
-            dt = datetime.datetime.fromtimestamp(fiscal_year_end)
-            months = {
-                1: "Januar", 2: "Februar", 3: "März", 4: "April",
-                5: "Mai", 6: "Juni", 7: "Juli", 8: "August",
-                9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
-            }
-            fiscal_year_end = months.get(dt.month)
-
-        return {
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "country": info.get("country"),
-            "currency": info.get("currency"),
-            "description": description_de,
-            "fiscal_year_end": fiscal_year_end,
-        }
-
-    except Exception as e:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
         return None
 
 
-def process_ticker(isin, ticker_yf, name, stock_index):
-    """Verarbeite einen Ticker - hole yfinance Daten."""
-    yf_data = get_yf_info(ticker_yf)
+def save_snapshot(ticker_yf, info):
+    """Atomar schreiben (mehrere Threads)."""
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = _snapshot_path(ticker_yf)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(info, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def is_valid_info(info):
+    """yfinance gibt manchmal leere Dicts bzw. Dicts ohne Namen zurück."""
+    return bool(info) and bool(info.get("shortName") or info.get("longName") or info.get("sector"))
+
+
+def fetch_info(ticker_yf, limiter, refresh=False, required=None):
+    """
+    Info-Payload eines Tickers – aus dem Snapshot oder (einmal) von yfinance.
+
+    required: abgeleitetes Feld, das der Snapshot liefern muss (z. B. "sector"
+    im Modus missing), sonst wird neu geladen.
+    Returns (info | None, "snapshot" | "api" | "error").
+    """
+    if not refresh:
+        info = load_snapshot(ticker_yf)
+        if info is not None and (not required or derive_fields(info)[required]):
+            return info, "snapshot"
+
+    limiter.wait()
+    try:
+        info = yf.Ticker(ticker_yf).info
+    except Exception:
+        return None, "error"
+
+    if not is_valid_info(info):
+        return None, "error"
+
+    save_snapshot(ticker_yf, info)
+    return info, "api"
+
+
+def derive_fields(info):
+    """Leitet alle company_info-Felder aus einem Info-Payload ab."""
+    if not info:
+        return {f: None for f in INFO_FIELDS + ["description_en"]}
+
+    # Fiskaljahr-Ende: yfinance liefert manchmal einen Unix-Timestamp, manchmal einen Monatsnamen
+    fiscal_year_end = info.get("fiscalYearEnd") or info.get("lastFiscalYearEnd")
+    if fiscal_year_end and isinstance(fiscal_year_end, int):
+        fiscal_year_end = MONTHS_DE.get(datetime.datetime.fromtimestamp(fiscal_year_end).month)
 
     return {
-        "isin": isin,
-        "ticker": ticker_yf,
-        "company_name": name,
-        "stock_index": stock_index,
-        "sector": yf_data.get("sector") if yf_data else None,
-        "industry": yf_data.get("industry") if yf_data else None,
-        "country": yf_data.get("country") if yf_data else None,
-        "currency": yf_data.get("currency") if yf_data else None,
-        "description": yf_data.get("description") if yf_data else None,
-        "fiscal_year_end": yf_data.get("fiscal_year_end") if yf_data else None,
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "country": info.get("country"),
+        "currency": info.get("currency"),
+        "fiscal_year_end": fiscal_year_end,
+        "description_en": info.get("longBusinessSummary"),
     }
 
 
-def save_company_info(cur, data):
-    """Speichere Stammdaten in company_info."""
-    sql = """
-    INSERT INTO analytics.company_info (
-        isin, ticker, company_name, sector, industry,
-        country, currency, description, fiscal_year_end, stock_index
-    ) VALUES (
-        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-    )
-    ON DUPLICATE KEY UPDATE
-        ticker = VALUES(ticker),
-        company_name = VALUES(company_name),
-        sector = COALESCE(VALUES(sector), sector),
-        industry = COALESCE(VALUES(industry), industry),
-        country = COALESCE(VALUES(country), country),
-        currency = COALESCE(VALUES(currency), currency),
-        description = COALESCE(VALUES(description), description),
-        fiscal_year_end = COALESCE(VALUES(fiscal_year_end), fiscal_year_end),
-        stock_index = VALUES(stock_index),
-        updated_at = NOW()
+# =============================================================================
+# Laden / Vergleichen
+# =============================================================================
+
+def load_targets(cur, mode):
+    """Returns [{isin, yf_ticker, company_name, stock_index}] je nach Modus (eine Zeile je ISIN)."""
+    if mode == "full":
+        cur.execute("""
+            SELECT isin, yf_ticker, name, stock_index
+            FROM tickerdb.tickerlist
+            WHERE isin IS NOT NULL AND isin != ''
+            ORDER BY id
+        """)
+    else:
+        condition = (
+            "ci.sector IS NULL" if mode == "missing"
+            else "(ci.fiscal_year_end IS NULL OR ci.fiscal_year_end = '')"
+        )
+        cur.execute(f"""
+            SELECT ci.isin, t.yf_ticker, ci.company_name, ci.stock_index
+            FROM analytics.company_info ci
+            JOIN tickerdb.tickerlist t ON ci.isin = t.isin
+            WHERE {condition}
+              AND t.yf_ticker IS NOT NULL AND t.yf_ticker != ''
+        """)
+
+    targets = {}
+    for isin, yf_ticker, name, stock_index in cur.fetchall():
+        # ISIN in mehreren Indizes: Eintrag mit yf_ticker bevorzugen
+        if isin not in targets or (yf_ticker and not targets[isin]["yf_ticker"]):
+            targets[isin] = {
+                "isin": isin, "yf_ticker": yf_ticker,
+                "company_name": name, "stock_index": stock_index,
+            }
+    return list(targets.values())
+
+
+def load_existing(cur):
+    """Returns {isin: aktuelle company_info-Zeile}."""
+    cur.execute("""
+        SELECT isin, ticker, company_name, stock_index, description_hash,
+               sector, industry, country, currency, fiscal_year_end
+        FROM analytics.company_info
+    """)
+    columns = [d[0] for d in cur.description]
+    return {row[0]: dict(zip(columns, row)) for row in cur.fetchall()}
+
+
+def diff_row(target, fields, old):
+    """
+    Baut die Upsert-Zeile: nur geänderte Felder, unveränderte als None
+    (COALESCE im Upsert behält dann den alten Wert).
+    Returns (row, changed_fields); row None = nichts zu schreiben.
     """
+    row = {
+        "isin": target["isin"],
+        "ticker": target["yf_ticker"],
+        "company_name": target["company_name"],
+        "stock_index": target["stock_index"],
+        "description": fields.get("description"),
+        "description_hash": fields.get("description_hash"),
+    }
+    changed = []
+
+    for f in INFO_FIELDS:
+        new = fields[f]
+        if new is not None and (old is None or new != old[f]):
+            row[f] = new
+            changed.append(f)
+        else:
+            row[f] = None
+
+    if row["description"] is not None:
+        changed.append("description")
+
+    if old is None:
+        return row, changed or ["neu"]
+
+    for f in ("ticker", "company_name", "stock_index"):
+        # Basisdaten kommen aus tickerlist und werden direkt überschrieben
+        if row[f] is not None and row[f] != old[f]:
+            changed.append(f)
+        else:
+            row[f] = old[f]
 
-    cur.execute(sql, (
-        data["isin"],
-        data["ticker"],
-        data["company_name"],
-        data["sector"],
-        data["industry"],
-        data["country"],
-        data["currency"],
-        data["description"],
-        data["fiscal_year_end"],
-        data["stock_index"],
-    ))
-
-
-def main():
+    return (row, changed) if changed else (None, [])
+
+
+def translate_descriptions(conn, cur, results, translator=None):
+    """
+    Setzt description/description_hash in results.
+
+    Unveränderte englische Texte (Hash wie in company_info) werden übersprungen –
+    description bleibt dann None, das Upsert behält die bestehende Übersetzung.
+    Neue/geänderte Texte laufen über den Übersetzungs-Cache.
+    """
+    cur.execute("SELECT isin, description_hash FROM analytics.company_info")
+    known_hashes = dict(cur.fetchall())
+
+    pending = [
+        r for r in results
+        if r["description_en"] and known_hashes.get(r["isin"]) != text_hash(r["description_en"])
+    ]
+    with_desc = sum(1 for r in results if r["description_en"])
+    print(f"  → {with_desc} Beschreibungen, {with_desc - len(pending)} unverändert (übersprungen), "
+          f"{len(pending)} neu/geändert")
+
+    backend = get_backend(translator)
+    if backend is None:
+        print("WARNUNG: deep-translator nicht installiert. Beschreibungen werden nicht übersetzt.")
+        print("Installiere mit: pip install deep-translator")
+
+    with tqdm(total=len(pending), desc="Übersetzung") as pbar:
+        translations, stats = translate_texts(
+            conn, [r["description_en"] for r in pending], backend=backend, progress=pbar.update
+        )
+    print(f"  → {stats['cached']} aus Cache, {stats['translated']} übersetzt, {stats['failed']} fehlgeschlagen")
+
+    if backend is not None and not backend.persistent:
+        # Testlauf: bestehende Beschreibungen/Hashes nicht überschreiben
+        print(f"  → Backend '{backend.name}': Übersetzungen werden nicht gespeichert")
+        return
+
+    for r in pending:
+        h = text_hash(r["description_en"])
+        if h in translations:
+            r["description"] = translations[h]
+            r["description_hash"] = h
+        else:
+            # Wie bisher: bei Fehler Original-Text speichern, Hash offen lassen
+            r["description"] = r["description_en"]
+
+
+# =============================================================================
+# Speichern
+# =============================================================================
+
+UPSERT_SQL = """
+INSERT INTO analytics.company_info (
+    isin, ticker, company_name, sector, industry,
+    country, currency, description, description_hash, fiscal_year_end, stock_index
+) VALUES (
+    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+)
+ON DUPLICATE KEY UPDATE
+    ticker = VALUES(ticker),
+    company_name = VALUES(company_name),
+    sector = COALESCE(VALUES(sector), sector),
+    industry = COALESCE(VALUES(industry), industry),
+    country = COALESCE(VALUES(country), country),
+    currency = COALESCE(VALUES(currency), currency),
+    description = COALESCE(VALUES(description), description),
+    description_hash = COALESCE(VALUES(description_hash), description_hash),
+    fiscal_year_end = COALESCE(VALUES(fiscal_year_end), fiscal_year_end),
+    stock_index = VALUES(stock_index),
+    updated_at = NOW()
+"""
+
+
+def save_company_info(cur, rows):
+    """Bulk-Upsert geänderter Zeilen (executemany in Blöcken)."""
+    params = [(
+        r["isin"], r["ticker"], r["company_name"], r["sector"], r["industry"],
+        r["country"], r["currency"], r["description"], r["description_hash"],
+        r["fiscal_year_end"], r["stock_index"],
+    ) for r in rows]
+
+    for i in range(0, len(params), UPSERT_BATCH):
+        cur.executemany(UPSERT_SQL, params[i:i + UPSERT_BATCH])
+
+
+def print_statistics(cur):
+    cur.execute("SELECT COUNT(*) FROM analytics.company_info")
+    total = cur.fetchone()[0]
+
+    cur.execute("SELECT COUNT(*) FROM analytics.company_info WHERE sector IS NOT NULL")
+    with_sector = cur.fetchone()[0]
+
+    cur.execute("SELECT COUNT(*) FROM analytics.company_info WHERE description IS NOT NULL")
+    with_desc = cur.fetchone()[0]
+
+    cur.execute("""
+        SELECT COUNT(*) FROM analytics.company_info
+        WHERE fiscal_year_end IS NOT NULL AND fiscal_year_end != ''
+    """)
+    with_fiscal = cur.fetchone()[0]
+
+    cur.execute("""
+        SELECT stock_index, COUNT(*) as cnt
+        FROM analytics.company_info
+        GROUP BY stock_index
+        ORDER BY cnt DESC
+    """)
+    index_stats = cur.fetchall()
+
+    cur.execute("""
+        SELECT sector, COUNT(*) as cnt
+        FROM analytics.company_info
+        WHERE sector IS NOT NULL
+        GROUP BY sector
+        ORDER BY cnt DESC
+        LIMIT 10
+    """)
+    sector_stats = cur.fetchall()
+
+    if not total:
+        return
+
+    print(f"\n📊 Gesamt Einträge:        {total:,}")
+    print(f"✅ Mit Sektor:             {with_sector:,} ({with_sector*100/total:.1f}%)")
+    print(f"📝 Mit Beschreibung:       {with_desc:,} ({with_desc*100/total:.1f}%)")
+    print(f"📅 Mit Fiskaljahr-Ende:    {with_fiscal:,} ({with_fiscal*100/total:.1f}%)")
+
+    print("\n📈 Nach Index:")
+    for idx, cnt in index_stats:
+        print(f"   {str(idx):20} {cnt:>6,}")
+
+    print("\n🏭 Top 10 Sektoren:")
+    for sector, cnt in sector_stats:
+        print(f"   {sector:30} {cnt:>6,}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main(mode="full", workers=MAX_WORKERS, interval=REQUEST_INTERVAL, refresh=False, translator=None,
+         only_isins=None):
     print("=" * 60)
-    print("COMPANY INFO LADEN (Stammdaten)")
+    print(f"COMPANY INFO LADEN (Stammdaten) – Modus {mode}: {MODES[mode]}")
     print("=" * 60)
 
     conn = None
     cur = None
+    start = time.time()
 
     try:
         print("\nVerbinde mit Datenbank...")
         conn = get_connection(autocommit=False)
         cur = conn.cursor()
 
-        # Ticker aus tickerlist laden
-        print("Lade Ticker aus tickerlist...")
-        cur.execute("""
-            SELECT DISTINCT isin, yf_ticker, name, stock_index
-            FROM tickerdb.tickerlist
-            WHERE isin IS NOT NULL AND isin != ''
-        """)
-        tickers = cur.fetchall()
-        print(f"  → {len(tickers)} Ticker geladen")
+        print("Lade Ticker...")
+        targets = load_targets(cur, mode)
+        if only_isins is not None:
+            targets = [t for t in targets if t["isin"] in only_isins]
+        print(f"  → {len(targets)} ISINs")
+
+        if not targets:
+            print("\n✅ Nichts zu tun.")
+            return
 
-        # Statistik: Wie viele haben yf_ticker?
-        with_yf = sum(1 for t in tickers if t[1])
+        with_yf = sum(1 for t in targets if t["yf_ticker"])
         print(f"  → {with_yf} mit yf_ticker (werden bei yfinance abgefragt)")
-        print(f"  → {len(tickers) - with_yf} ohne yf_ticker (nur Basisdaten)")
+        print(f"  → {len(targets) - with_yf} ohne yf_ticker (nur Basisdaten)")
 
-        # Parallel verarbeiten
-        print(f"\nLade Stammdaten von yfinance (max {MAX_WORKERS} parallel)...")
-        results = []
-        success_count = 0
-        yf_success_count = 0
+        # Info-Payloads holen (Snapshot oder API, je Ticker genau einmal)
+        required = {"missing": "sector", "fiscal-year": "fiscal_year_end"}.get(mode)
+        limiter = RateLimiter(interval)
+        sources = {"snapshot": 0, "api": 0, "error": 0}
+        infos = {}
 
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        tickers = sorted({t["yf_ticker"] for t in targets if t["yf_ticker"]})
+        print(f"\nLade Stammdaten (max {workers} parallel, Snapshots: {SNAPSHOT_DIR})...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = {
-                executor.submit(process_ticker, isin, yf_ticker, name, stock_index): isin
-                for isin, yf_ticker, name, stock_index in tickers
+                executor.submit(fetch_info, ticker, limiter, refresh, required): ticker
+                for ticker in tickers
             }
-
-            with tqdm(total=len(futures), desc="yfinance API") as pbar:
+            with tqdm(total=len(futures), desc="yfinance") as pbar:
                 for future in as_completed(futures):
-                    result = future.result()
-                    results.append(result)
-
-                    if result["sector"]:
-                        yf_success_count += 1
-
+                    info, source = future.result()
+                    infos[futures[future]] = info
+                    sources[source] += 1
                     pbar.update(1)
 
-        # In DB speichern
-        print("\nSpeichere in analytics.company_info...")
-        for data in tqdm(results, desc="Speichern"):
-            try:
-                save_company_info(cur, data)
-                success_count += 1
-            except Error as e:
-                print(f"  Fehler bei {data['isin']}: {e}")
+        print(f"  → {sources['snapshot']} aus Snapshot, {sources['api']} von yfinance, "
+              f"{sources['error']} ohne Daten")
 
+        # Felder ableiten
+        results = []
+        for t in targets:
+            fields = derive_fields(infos.get(t["yf_ticker"]))
+            results.append({"isin": t["isin"], "target": t, **fields})
+
+        # Beschreibungen übersetzen (nur neue/geänderte englische Texte)
+        print("\nÜbersetze Beschreibungen (Cache: analytics.translation_cache)...")
+        translate_descriptions(conn, cur, results, translator=translator)
+
+        # Nur geänderte Zeilen/Felder schreiben
+        existing = load_existing(cur)
+        rows = []
+        field_changes = {}
+        for r in results:
+            row, changed = diff_row(r["target"], r, existing.get(r["isin"]))
+            if row:
+                rows.append(row)
+                for f in changed:
+                    field_changes[f] = field_changes.get(f, 0) + 1
+
+        print(f"\nSpeichere {len(rows)} geänderte Einträge in analytics.company_info "
+              f"({len(results) - len(rows)} unverändert)...")
+        if field_changes:
+            print("  → " + ", ".join(f"{f}: {n}" for f, n in sorted(field_changes.items())))
+        save_company_info(cur, rows)
         conn.commit()
 
+        # Stammdaten/Beschreibungen für Info-Modal und Screener-Filter
+        print(f"🔄 Daten-Generation {bump_generation()}")
+
         # Statistik
         print("\n" + "=" * 60)
-        print("FERTIG - STATISTIK")
+        print(f"FERTIG in {time.time() - start:.1f}s - STATISTIK")
         print("=" * 60)
-
-        cur.execute("SELECT COUNT(*) FROM analytics.company_info")
-        total = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM analytics.company_info WHERE sector IS NOT NULL")
-        with_sector = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM analytics.company_info WHERE description IS NOT NULL")
-        with_desc = cur.fetchone()[0]
-
-        cur.execute("""
-            SELECT stock_index, COUNT(*) as cnt
-            FROM analytics.company_info
-            GROUP BY stock_index
-            ORDER BY cnt DESC
-        """)
-        index_stats = cur.fetchall()
-
-        cur.execute("""
-            SELECT sector, COUNT(*) as cnt
-            FROM analytics.company_info
-            WHERE sector IS NOT NULL
-            GROUP BY sector
-            ORDER BY cnt DESC
-            LIMIT 10
-        """)
-        sector_stats = cur.fetchall()
-
-        print(f"\n📊 Gesamt Einträge:        {total:,}")
-        print(f"✅ Mit Sektor:             {with_sector:,} ({with_sector*100/total:.1f}%)")
-        print(f"📝 Mit Beschreibung:       {with_desc:,} ({with_desc*100/total:.1f}%)")
-
-        print("\n📈 Nach Index:")
-        for idx, cnt in index_stats:
-            print(f"   {idx:20} {cnt:>6,}")
-
-        print("\n🏭 Top 10 Sektoren:")
-        for sector, cnt in sector_stats:
-            print(f"   {sector:30} {cnt:>6,}")
+        print_statistics(cur)
 
     except Error as e:
         print(f"\nDatenbankfehler: {e}")
@@ -294,4 +501,19 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Company-Info (Stammdaten) laden")
+    parser.add_argument("--mode", choices=list(MODES), default="full",
+                        help="full: alle, missing: ohne Sektor, fiscal-year: ohne Fiskaljahr-Ende")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Parallele yfinance-Abfragen")
+    parser.add_argument("--interval", type=float, default=REQUEST_INTERVAL,
+                        help="Mindestabstand zwischen Abfragen in Sekunden (über alle Threads)")
+    parser.add_argument("--refresh", action="store_true", help="Snapshots ignorieren und neu laden")
+    parser.add_argument("--translator", choices=["google", "stub"],
+                        help="Übersetzungs-Backend (Default: TRANSLATOR_BACKEND oder google)")
+    add_isins_argument(parser)
+    args = parser.parse_args()
+
+    main(mode=args.mode, workers=args.workers, interval=args.interval,
+         refresh=args.refresh, translator=args.translator, only_isins=isins_from_args(args))
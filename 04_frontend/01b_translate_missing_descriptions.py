@@ -4,6 +4,7 @@
 Übersetzt fehlende Beschreibungen (z.B. Nikkei 225) nachträglich.
 
 Dieses Script findet alle englischen Beschreibungen und übersetzt sie ins Deutsche.
+Übersetzungen laufen gebündelt über analytics.translation_cache.
 """
 
 import sys
@@ -15,49 +16,7 @@ from tqdm import tqdm
 from mysql.connector import Error
 from db import get_connection
 
-try:
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-except ImportError:
-    TRANSLATOR_AVAILABLE = False
-    print("FEHLER: deep-translator nicht installiert!")
-    print("Installiere mit: pip install deep-translator")
-    sys.exit(1)
-
-
-def translate_to_german(text):
-    """Übersetze Text von Englisch nach Deutsch."""
-    if not text:
-        return text
-
-    try:
-        translator = GoogleTranslator(source='en', target='de')
-
-        # Teile lange Texte in kleinere Chunks (Google Translate Limit: 5000 Zeichen)
-        if len(text) > 4500:
-            chunks = []
-            sentences = text.split('. ')
-            current_chunk = ''
-
-            for sentence in sentences:
-                if len(current_chunk) + len(sentence) + 2 < 4500:
-                    current_chunk += sentence + '. '
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk)
-                    current_chunk = sentence + '. '
-
-            if current_chunk:
-                chunks.append(current_chunk)
-
-            translated_chunks = [translator.translate(chunk) for chunk in chunks]
-            return ' '.join(translated_chunks)
-        else:
-            return translator.translate(text)
-
-    except Exception as e:
-        print(f"Übersetzungsfehler: {e}")
-        return text
+from translation_cache import get_backend, text_hash, translate_texts
 
 
 def is_english(text):
@@ -80,11 +39,17 @@ def is_english(text):
     return matches >= 3
 
 
-def main():
+def main(translator=None):
     print("=" * 60)
     print("FEHLENDE BESCHREIBUNGEN ÜBERSETZEN")
     print("=" * 60)
 
+    backend = get_backend(translator)
+    if backend is None:
+        print("FEHLER: deep-translator nicht installiert!")
+        print("Installiere mit: pip install deep-translator")
+        return
+
     conn = None
     cur = None
 
@@ -130,32 +95,36 @@ def main():
         for idx, rows in sorted(by_index.items(), key=lambda x: len(x[1]), reverse=True):
             print(f"  {idx:20} {len(rows):>4} Beschreibungen")
 
-        # Übersetzen
+        # Übersetzen (Cache + Batches)
         print(f"\nÜbersetze {len(english_descriptions)} Beschreibungen...")
-        translated_count = 0
-
-        for row in tqdm(english_descriptions, desc="Übersetzung"):
-            try:
-                description_de = translate_to_german(row['description'])
-
-                # In Datenbank aktualisieren
-                cur.execute("""
-                    UPDATE analytics.company_info
-                    SET description = %s
-                    WHERE isin = %s
-                """, (description_de, row['isin']))
-
-                translated_count += 1
-
-                # Alle 10 Einträge committen
-                if translated_count % 10 == 0:
-                    conn.commit()
-
-            except Exception as e:
-                print(f"\nFehler bei {row['company_name']} ({row['isin']}): {e}")
+        with tqdm(total=len(english_descriptions), desc="Übersetzung") as pbar:
+            translations, stats = translate_texts(
+                conn, [row['description'] for row in english_descriptions],
+                backend=backend, progress=pbar.update
+            )
+        print(f"  → {stats['cached']} aus Cache, {stats['translated']} übersetzt, "
+              f"{stats['failed']} fehlgeschlagen")
+
+        if not backend.persistent:
+            print(f"\nBackend '{backend.name}': Testlauf, company_info bleibt unverändert")
+            for row in english_descriptions[:3]:
+                print(f"  {row['isin']}: {translations.get(text_hash(row['description']), '')[:80]}")
+            return
 
-        # Finaler Commit
+        # In Datenbank aktualisieren
+        updates = []
+        for row in english_descriptions:
+            h = text_hash(row['description'])
+            if h in translations:
+                updates.append((translations[h], h, row['isin']))
+
+        cur.executemany("""
+            UPDATE analytics.company_info
+            SET description = %s, description_hash = %s
+            WHERE isin = %s
+        """, updates)
         conn.commit()
+        translated_count = len(updates)
 
         print("\n" + "=" * 60)
         print("FERTIG")
@@ -190,4 +159,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Englische Beschreibungen nachträglich übersetzen")
+    parser.add_argument("--translator", choices=["google", "stub"],
+                        help="Übersetzungs-Backend (Default: TRANSLATOR_BACKEND oder google)")
+    args = parser.parse_args()
+
+    main(translator=args.translator)
@@ -14,17 +14,16 @@ Nutzung: python 04_frontend/01d_load_fmp_sector_nikkei.py
 
 import sys
 import os
-import time
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from mysql.connector import Error
 from db import get_connection
+from http_client import HttpClient, REQUEST_ERRORS
 
 load_dotenv()
 
@@ -34,6 +33,9 @@ FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
 # Threading Konfiguration
 MAX_WORKERS = 5
 
+# Rate Limiting: 5 Requests/Sekunde (Free Plan), gilt über alle Threads
+HTTP = HttpClient(pool_size=MAX_WORKERS, max_retries=2, timeout=10, rate=5)
+
 
 def get_fmp_company_profile(ticker_fmp):
     """
@@ -49,7 +51,7 @@ def get_fmp_company_profile(ticker_fmp):
         url = f"{FMP_BASE_URL}/profile/{ticker_fmp}"
         params = {"apikey": FMP_API_KEY}
 
-        response = requests.get(url, params=params, timeout=10)
+        response = HTTP.get(url, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -67,7 +69,7 @@ def get_fmp_company_profile(ticker_fmp):
             "currency": profile.get("currency"),
         }
 
-    except requests.exceptions.RequestException as e:
+    except REQUEST_ERRORS as e:
         print(f"  API-Fehler für {ticker_fmp}: {e}")
         return None
     except Exception as e:
@@ -179,10 +181,8 @@ def main():
 
                     pbar.update(1)
 
-                    # Rate Limiting: 5 Requests/Sekunde (Free Plan)
-                    time.sleep(0.2)
-
         print(f"\n  → {success_count}/{len(results)} Ticker mit Sektor von FMP")
+        HTTP.print_stats()
 
         # In DB speichern
         print("\nSpeichere in analytics.company_info...")
@@ -15,16 +15,21 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 from mysql.connector import Error
 from db import get_connection
+from http_client import HttpClient, REQUEST_ERRORS
 
 
 # Wikipedia-URL für NIKKEI 225 Komponenten
 WIKIPEDIA_URL = "https://en.wikipedia.org/wiki/Nikkei_225"
 
+# User-Agent Header setzen, damit Wikipedia nicht blockt
+HTTP = HttpClient(pool_size=1, max_retries=2, headers={
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
 # Sektor-Mapping: Wikipedia/Japanisch -> Yahoo Finance Standard
 # Basierend auf: https://en.wikipedia.org/wiki/Nikkei_225
 SECTOR_MAPPING = {
@@ -102,11 +107,7 @@ def scrape_nikkei_225_from_wikipedia():
     print(f"Lade Wikipedia-Seite: {WIKIPEDIA_URL}")
 
     try:
-        # User-Agent Header setzen, damit Wikipedia nicht blockt
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(WIKIPEDIA_URL, headers=headers, timeout=30)
+        response = HTTP.get(WIKIPEDIA_URL)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -163,7 +164,7 @@ def scrape_nikkei_225_from_wikipedia():
 
         return companies
 
-    except requests.exceptions.RequestException as e:
+    except REQUEST_ERRORS as e:
         print(f"FEHLER beim Laden der Wikipedia-Seite: {e}")
         return []
     except Exception as e:
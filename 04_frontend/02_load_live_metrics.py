@@ -26,6 +26,7 @@ import yfinance as yf
 from tqdm import tqdm
 from mysql.connector import Error
 from db import get_connection
+from data_generation import bump_generation
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Threading Konfiguration
@@ -678,6 +679,9 @@ def main():
         conn.commit()
         cur_insert.close()
 
+        # live_metrics veröffentlicht → ETags der Website (data_generation.py) ungültig
+        print(f"🔄 Daten-Generation {bump_generation()}")
+
         # Statistik
         print("\n" + "=" * 60)
         print("FERTIG - STATISTIK")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migration: Fügt DCF-Screening-Spalten hinzu.
+
+Diese Migration:
+1. Fügt dcf_fair_value, dcf_upside und dcf_updated_at zu live_metrics hinzu
+2. Fügt die Spalten-Konfiguration für Watchlist und Screener hinzu
+   (dadurch im Screener filterbar)
+
+Befüllt werden die Spalten von 12_dcf_screening.py.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mysql.connector import Error
+from db import get_connection
+
+
+ALTER_STATEMENTS = [
+    ("dcf_fair_value", """ALTER TABLE analytics.live_metrics
+       ADD COLUMN dcf_fair_value DOUBLE
+       COMMENT 'DCF Fair Value je Aktie (Default-Annahmen)' AFTER next_earnings_date"""),
+
+    ("dcf_upside", """ALTER TABLE analytics.live_metrics
+       ADD COLUMN dcf_upside DOUBLE
+       COMMENT 'DCF Upside/Downside zum aktuellen Kurs in %' AFTER dcf_fair_value"""),
+
+    ("dcf_updated_at", """ALTER TABLE analytics.live_metrics
+       ADD COLUMN dcf_updated_at DATETIME
+       COMMENT 'Zeitpunkt der letzten DCF-Berechnung' AFTER dcf_upside"""),
+]
+
+# column_key, display_name, sort_order, column_group, format_type
+NEW_COLUMNS = [
+    ('dcf_fair_value', 'DCF<br>Fair Value', 160, 'DCF', 'number'),
+    ('dcf_upside', 'DCF<br>Upside', 161, 'DCF', 'percent'),
+]
+
+
+def main():
+    conn = None
+    cur = None
+
+    try:
+        print("=" * 60)
+        print("MIGRATION: DCF-Screening-Spalten hinzufügen")
+        print("=" * 60)
+
+        print("\nVerbinde mit Datenbank...")
+        conn = get_connection(autocommit=False)
+        cur = conn.cursor()
+
+        # Schritt 1: Spalten zu live_metrics hinzufügen (falls nicht vorhanden)
+        print("\n1. Prüfe/Erstelle Spalten in live_metrics...")
+        for col_name, sql in ALTER_STATEMENTS:
+            try:
+                cur.execute(sql)
+                print(f"   ✓ Spalte {col_name} hinzugefügt")
+            except Error as e:
+                if "Duplicate column name" in str(e):
+                    print(f"   ℹ Spalte {col_name} existiert bereits")
+                else:
+                    raise e
+
+        # Schritt 2: Spalten-Konfiguration hinzufügen
+        print("\n2. Füge Spalten-Konfiguration hinzu...")
+
+        cur.execute("SELECT DISTINCT user_id FROM analytics.user_column_settings")
+        user_ids = [row[0] for row in cur.fetchall()]
+        print(f"   Gefundene User-IDs: {user_ids}")
+
+        insert_sql = """
+        INSERT INTO analytics.user_column_settings
+            (user_id, view_name, source_table, column_key, display_name, sort_order, is_visible, column_group, format_type)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            display_name = VALUES(display_name),
+            column_group = VALUES(column_group),
+            format_type = VALUES(format_type)
+        """
+
+        for user_id in user_ids:
+            for view in ['watchlist', 'screener']:
+                for column_key, display_name, sort_order, group, format_type in NEW_COLUMNS:
+                    cur.execute(insert_sql, (
+                        user_id,
+                        view,
+                        'live_metrics',
+                        column_key,
+                        display_name,
+                        sort_order,
+                        False,  # is_visible (muss manuell aktiviert werden)
+                        group,
+                        format_type
+                    ))
+                print(f"   ✓ Spalten-Konfiguration für User {user_id}, {view} hinzugefügt")
+
+        conn.commit()
+
+        print("\n" + "=" * 60)
+        print("MIGRATION ERFOLGREICH")
+        print("=" * 60)
+        print("""
+Die Spalten 'DCF Fair Value' und 'DCF Upside' sind jetzt verfügbar
+(Spalten-Dialog, Gruppe 'DCF') und im Screener filterbar, z. B.:
+  DCF Upside > 20  -> Aktien mind. 20% unter DCF Fair Value
+
+Befüllt werden sie von 12_dcf_screening.py.
+""")
+
+    except Error as e:
+        print(f"\nDatenbankfehler: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DCF-Screening: Bewertet das gesamte Universum mit den Default-DCF-Annahmen.
+
+Nutzt dieselbe Engine (dcf_engine.py) und dieselbe Herleitung der Defaults wie
+das interaktive DCF-Modal (/api/stock/<isin>/dcf-data + dcf-calculate):
+- Basis: letztes FY aus fmp_filtered_numbers (Revenue, Net Debt, Shares dil.)
+- Wachstum: Revenue-CAGR (3J aus den letzten 5 FY, Fallback live_metrics),
+  abklingend über 10 Jahre
+- EBIT-Marge: Ø der letzten 5 FY, Fallback operating_margin aus live_metrics
+
+Alle Aktien werden in EINEM vektorisierten Engine-Aufruf gerechnet.
+
+Ergebnis:
+- live_metrics.dcf_fair_value, dcf_upside, dcf_updated_at (Screener-Filter)
+- Optional (--scenarios): gespeicherte User-Szenarien neu bewerten und
+  fair_value_per_share / enterprise_value in user_dcf_scenarios aktualisieren
+
+Voraussetzung: 11_add_dcf_columns.py wurde ausgeführt.
+Update-Frequenz: Täglich nach 02_load_live_metrics.py
+"""
+
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from mysql.connector import Error
+from db import get_connection
+from data_generation import bump_generation
+import dcf_engine
+
+# Anzahl FY-Jahre für Margen-Durchschnitt und CAGR (wie im DCF-Modal)
+HISTORY_YEARS = 5
+
+BATCH_SIZE = 1000
+
+
+def load_base_data(cur):
+    """
+    Lädt Basisdaten für alle ISINs in live_metrics.
+
+    Returns:
+        Dict mit ISIN-Liste und Arrays: revenue, net_debt, shares, price,
+        revenue_history (N, HISTORY_YEARS, neuestes zuerst), ebit_history,
+        live_cagr_3y, live_cagr_5y, live_operating_margin
+    """
+    cur.execute("""
+        SELECT isin, price, revenue_cagr_3y, revenue_cagr_5y, operating_margin
+        FROM analytics.live_metrics
+    """)
+    live = {row['isin']: row for row in cur.fetchall()}
+
+    cur.execute("""
+        SELECT isin, date, revenue, operating_income, net_debt,
+               weighted_average_shs_out_dil as shares_outstanding
+        FROM analytics.fmp_filtered_numbers
+        WHERE period = 'FY'
+        ORDER BY isin, date DESC
+    """)
+
+    # Letzte HISTORY_YEARS FY-Zeilen pro ISIN (neueste zuerst, ohne Index-Duplikate)
+    history = defaultdict(list)
+    for row in cur.fetchall():
+        rows = history[row['isin']]
+        if len(rows) < HISTORY_YEARS and (not rows or rows[-1]['date'] != row['date']):
+            rows.append(row)
+
+    isins = [isin for isin in live if history.get(isin)]
+    n = len(isins)
+
+    revenue_history = np.full((n, HISTORY_YEARS), np.nan)
+    ebit_history = np.full((n, HISTORY_YEARS), np.nan)
+    for i, isin in enumerate(isins):
+        for j, row in enumerate(history[isin]):
+            if row['revenue'] is not None:
+                revenue_history[i, j] = row['revenue']
+            if row['operating_income'] is not None:
+                ebit_history[i, j] = row['operating_income']
+
+    def live_column(key):
+        return np.array([
+            np.nan if live[isin][key] is None else live[isin][key] for isin in isins
+        ], dtype=float)
+
+    def latest_column(key):
+        return np.array([
+            np.nan if history[isin][0][key] is None else history[isin][0][key] for isin in isins
+        ], dtype=float)
+
+    return {
+        "isins": isins,
+        "revenue": revenue_history[:, 0],
+        "net_debt": latest_column('net_debt'),
+        "shares": latest_column('shares_outstanding'),
+        "price": live_column('price'),
+        "revenue_history": revenue_history,
+        "ebit_history": ebit_history,
+        "live_cagr_3y": live_column('revenue_cagr_3y'),
+        "live_cagr_5y": live_column('revenue_cagr_5y'),
+        "live_operating_margin": live_column('operating_margin'),
+    }
+
+
+def derive_default_inputs(base):
+    """
+    Vektorisierte Herleitung der Default-Inputs (entspricht get_dcf_data()).
+
+    Returns:
+        Tuple (revenue_cagr_5y, revenue_cagr_3y, ebit_margin) als (N,)-Arrays in Prozent
+    """
+    revenue = base["revenue_history"]
+    ebit = base["ebit_history"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # EBIT-Marge je Jahr (nur wenn Revenue und EBIT vorhanden und != 0)
+        margins = np.where((revenue != 0) & (ebit != 0), ebit / revenue * 100, np.nan)
+        margins = np.round(margins, 1)
+        margins[margins == 0] = np.nan
+        margin_count = np.sum(~np.isnan(margins), axis=1)
+        avg_margin = np.where(margin_count > 0, np.nansum(margins, axis=1) / margin_count, np.nan)
+
+        # CAGR 3J: neuestes Jahr vs. 3 Jahre davor
+        start, end = revenue[:, 3], revenue[:, 0]
+        cagr_3y = np.where(
+            (start > 0) & (end != 0), ((end / start) ** (1 / 3) - 1) * 100, np.nan
+        )
+
+    # Fallbacks auf live_metrics (0 zählt wie im Modal als "nicht vorhanden")
+    cagr_3y = np.where(np.isnan(cagr_3y) | (cagr_3y == 0), base["live_cagr_3y"], cagr_3y)
+    # CAGR 5J braucht 6 FY-Jahre → bei 5 Jahren Historie immer aus live_metrics
+    cagr_5y = base["live_cagr_5y"]
+
+    live_margin = base["live_operating_margin"]
+    live_margin = np.where(live_margin == 0, np.nan, live_margin)
+    ebit_margin = np.where(np.isnan(avg_margin), live_margin, avg_margin)
+
+    return cagr_5y, cagr_3y, ebit_margin
+
+
+def screen_universe(cur):
+    """Rechnet den Default-DCF für alle ISINs. Returns (base, dcf, upside)."""
+    base = load_base_data(cur)
+    print(f"  -> {len(base['isins'])} ISINs mit FY-Daten und live_metrics")
+
+    start = time.perf_counter()
+
+    cagr_5y, cagr_3y, ebit_margin = derive_default_inputs(base)
+    assumptions = dcf_engine.batch_to_arrays(
+        dcf_engine.default_assumptions_batch(cagr_5y, cagr_3y, ebit_margin)
+    )
+
+    # Ohne Revenue keine Prognose (fair_value wird dann NaN)
+    revenue = np.where(base["revenue"] != 0, base["revenue"], np.nan)
+    dcf = dcf_engine.evaluate(revenue, base["net_debt"], base["shares"], assumptions)
+    upside = dcf_engine.upside(dcf["fair_value"], base["price"])
+
+    elapsed = time.perf_counter() - start
+    valid = np.isfinite(dcf["fair_value"]).sum()
+    print(f"  -> {valid} Fair Values berechnet in {elapsed * 1000:.1f} ms")
+
+    return base, dcf, upside
+
+
+def save_screening(conn, isins, fair_values, upsides):
+    """Schreibt Fair Value und Upside gebündelt nach live_metrics."""
+    cur = conn.cursor()
+
+    cur.execute("SELECT NOW()")
+    run_started = cur.fetchone()[0]
+
+    # ISINs existieren bereits in live_metrics → Upsert aktualisiert nur die DCF-Spalten
+    upsert_sql = """
+        INSERT INTO analytics.live_metrics (isin, dcf_fair_value, dcf_upside, dcf_updated_at)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            dcf_fair_value = VALUES(dcf_fair_value),
+            dcf_upside = VALUES(dcf_upside),
+            dcf_updated_at = VALUES(dcf_updated_at)
+    """
+
+    rows = [
+        (isin, dcf_engine.to_python(fv), dcf_engine.to_python(up), run_started)
+        for isin, fv, up in zip(isins, fair_values, upsides)
+    ]
+
+    for i in range(0, len(rows), BATCH_SIZE):
+        cur.executemany(upsert_sql, rows[i:i + BATCH_SIZE])
+
+    # Veraltete Werte (ISIN ohne FY-Daten) zurücksetzen
+    cur.execute("""
+        UPDATE analytics.live_metrics
+        SET dcf_fair_value = NULL, dcf_upside = NULL
+        WHERE dcf_updated_at IS NULL OR dcf_updated_at < %s
+    """, (run_started,))
+
+    conn.commit()
+    cur.close()
+    return len(rows)
+
+
+def revalue_scenarios(conn, base):
+    """Bewertet alle gespeicherten User-Szenarien in einem Engine-Aufruf neu."""
+    cur = conn.cursor(dictionary=True)
+    cur.execute(f"""
+        SELECT id, isin, {', '.join(dcf_engine.ASSUMPTION_KEYS)}
+        FROM analytics.user_dcf_scenarios
+    """)
+    scenarios = cur.fetchall()
+
+    index = {isin: i for i, isin in enumerate(base["isins"])}
+    scenarios = [s for s in scenarios if s['isin'] in index]
+    print(f"  -> {len(scenarios)} Szenarien mit Basisdaten")
+
+    if not scenarios:
+        cur.close()
+        return 0
+
+    rows = np.array([index[s['isin']] for s in scenarios])
+    dcf = dcf_engine.evaluate(
+        base["revenue"][rows],
+        base["net_debt"][rows],
+        base["shares"][rows],
+        dcf_engine.assumptions_to_arrays(scenarios)
+    )
+
+    # updated_at explizit beibehalten (sonst ON UPDATE CURRENT_TIMESTAMP)
+    update_sql = """
+        UPDATE analytics.user_dcf_scenarios
+        SET fair_value_per_share = %s, enterprise_value = %s, updated_at = updated_at
+        WHERE id = %s
+    """
+    params = [
+        (dcf_engine.to_python(dcf["fair_value"][i]),
+         dcf_engine.to_python(dcf["enterprise_value"][i]),
+         s['id'])
+        for i, s in enumerate(scenarios)
+    ]
+    cur.executemany(update_sql, params)
+    conn.commit()
+    cur.close()
+    return len(params)
+
+
+def main(include_scenarios=False):
+    print("=" * 60)
+    print("DCF-SCREENING (Default-Annahmen, gesamtes Universum)")
+    print("=" * 60)
+
+    conn = None
+    cur = None
+
+    try:
+        print("\nVerbinde mit Datenbank...")
+        conn = get_connection(autocommit=False)
+        cur = conn.cursor(dictionary=True)
+
+        print("\nLade Basisdaten und rechne DCF...")
+        base, dcf, upside = screen_universe(cur)
+
+        print("\nSpeichere in live_metrics...")
+        saved = save_screening(conn, base["isins"], dcf["fair_value"], upside)
+        print(f"  -> {saved} Zeilen aktualisiert")
+
+        if include_scenarios:
+            print("\nBewerte gespeicherte User-Szenarien...")
+            updated = revalue_scenarios(conn, base)
+            print(f"  -> {updated} Szenarien aktualisiert")
+
+        # DCF-Spalten und ggf. Szenario-Fair-Values geändert
+        print(f"🔄 Daten-Generation {bump_generation()}")
+
+        # Statistik
+        print("\n" + "=" * 60)
+        print("FERTIG - STATISTIK")
+        print("=" * 60)
+
+        cur.execute("""
+            SELECT COUNT(*) as total,
+                   SUM(dcf_fair_value IS NOT NULL) as with_fv,
+                   SUM(dcf_upside > 0) as undervalued
+            FROM analytics.live_metrics
+        """)
+        stats = cur.fetchone()
+        print(f"\nGesamt Eintraege:        {stats['total']:,}")
+        print(f"Mit DCF Fair Value:      {int(stats['with_fv'] or 0):,}")
+        print(f"Mit positivem Upside:    {int(stats['undervalued'] or 0):,}")
+
+    except Error as e:
+        print(f"\nDatenbankfehler: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+    print("\nFertig.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DCF-Screening über das gesamte Universum")
+    parser.add_argument("--scenarios", action="store_true",
+                        help="Zusätzlich gespeicherte User-Szenarien neu bewerten")
+    args = parser.parse_args()
+
+    main(include_scenarios=args.scenarios)
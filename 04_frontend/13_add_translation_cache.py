@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migration: Übersetzungs-Cache für Unternehmensbeschreibungen.
+
+Diese Migration:
+1. Erstellt analytics.translation_cache (Übersetzung je SHA-256 des Quelltexts)
+2. Fügt company_info.description_hash hinzu (Hash der englischen Quelle)
+   → 01_load_company_info.py überspringt unveränderte Beschreibungen
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mysql.connector import Error
+from db import get_connection
+from translation_cache import CREATE_TRANSLATION_CACHE
+
+
+ALTER_STATEMENTS = [
+    ("description_hash", """ALTER TABLE analytics.company_info
+       ADD COLUMN description_hash CHAR(64)
+       COMMENT 'SHA-256 der englischen Quelle der Beschreibung' AFTER description"""),
+]
+
+
+def main():
+    conn = None
+    cur = None
+
+    try:
+        print("=" * 60)
+        print("MIGRATION: Übersetzungs-Cache")
+        print("=" * 60)
+
+        print("\nVerbinde mit Datenbank...")
+        conn = get_connection(autocommit=False)
+        cur = conn.cursor()
+
+        print("\n1. Erstelle analytics.translation_cache...")
+        cur.execute(CREATE_TRANSLATION_CACHE)
+        print("   ✓ translation_cache vorhanden")
+
+        print("\n2. Prüfe/Erstelle Spalten in company_info...")
+        for col_name, sql in ALTER_STATEMENTS:
+            try:
+                cur.execute(sql)
+                print(f"   ✓ Spalte {col_name} hinzugefügt")
+            except Error as e:
+                if "Duplicate column name" in str(e):
+                    print(f"   ℹ Spalte {col_name} existiert bereits")
+                else:
+                    raise e
+
+        conn.commit()
+
+        print("\n" + "=" * 60)
+        print("MIGRATION ERFOLGREICH")
+        print("=" * 60)
+
+    except Error as e:
+        print(f"\nDatenbankfehler: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Übersetzungs-Cache für Unternehmensbeschreibungen.
+
+- Cache in analytics.translation_cache, Schlüssel = SHA-256 des Quelltexts
+  → identische englische Texte werden nur einmal übersetzt
+- Nicht gecachte Texte werden in Batches mit begrenzter Parallelität übersetzt,
+  jeder Batch wird sofort in den Cache geschrieben (Abbruch verliert nichts)
+- Backends: "google" (deep-translator, ein GoogleTranslator pro Thread)
+  und "stub" (offline, für Tests: "[de] <Text>")
+  Auswahl per Argument oder Umgebungsvariable TRANSLATOR_BACKEND
+- Nur Backends mit persistent = True lesen und schreiben den Cache; die
+  Aufrufer speichern Ergebnisse anderer Backends auch nicht in company_info
+
+Genutzt von 01_load_company_info.py und 01b_translate_missing_descriptions.py.
+"""
+
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from deep_translator import GoogleTranslator
+    TRANSLATOR_AVAILABLE = True
+except ImportError:
+    TRANSLATOR_AVAILABLE = False
+
+
+SOURCE_LANG = "en"
+TARGET_LANG = "de"
+
+# Google Translate Limit: 5000 Zeichen pro Request
+CHUNK_SIZE = 4500
+
+TRANSLATE_WORKERS = 4
+BATCH_SIZE = 40
+
+CREATE_TRANSLATION_CACHE = """
+CREATE TABLE IF NOT EXISTS analytics.translation_cache (
+    source_hash CHAR(64) NOT NULL COMMENT 'SHA-256 des Quelltexts',
+    source_lang VARCHAR(8) NOT NULL,
+    target_lang VARCHAR(8) NOT NULL,
+    translated MEDIUMTEXT NOT NULL,
+    backend VARCHAR(20) NOT NULL,
+    source_chars INT COMMENT 'Länge des Quelltexts',
+
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (source_hash, source_lang, target_lang)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+COMMENT='Übersetzungen nach Hash des Quelltexts';
+"""
+
+
+def text_hash(text):
+    """SHA-256 des (getrimmten) Quelltexts – Schlüssel für Cache und company_info."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def split_chunks(text, size=CHUNK_SIZE):
+    """Teilt lange Texte an Satzgrenzen in Stücke < size Zeichen."""
+    if len(text) <= size:
+        return [text]
+
+    chunks = []
+    current_chunk = ''
+    for sentence in text.split('. '):
+        if len(current_chunk) + len(sentence) + 2 < size:
+            current_chunk += sentence + '. '
+        else:
+            if current_chunk:
+                chunks.append(current_chunk)
+            current_chunk = sentence + '. '
+
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+class GoogleBackend:
+    """deep-translator; der Translator wird pro Thread einmal erzeugt."""
+
+    name = "google"
+    persistent = True
+
+    def __init__(self, source=SOURCE_LANG, target=TARGET_LANG):
+        self.source = source
+        self.target = target
+        self._local = threading.local()
+
+    def translate(self, text):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = GoogleTranslator(source=self.source, target=self.target)
+            self._local.translator = translator
+        return ' '.join(translator.translate(chunk) for chunk in split_chunks(text))
+
+
+class StubBackend:
+    """Offline-Backend: markiert den Text nur mit der Zielsprache."""
+
+    name = "stub"
+    persistent = False      # Testausgabe, nie in Cache oder company_info
+
+    def __init__(self, source=SOURCE_LANG, target=TARGET_LANG):
+        self.target = target
+
+    def translate(self, text):
+        return f"[{self.target}] {text}"
+
+
+BACKENDS = {"google": GoogleBackend, "stub": StubBackend}
+PERSISTENT_BACKENDS = tuple(name for name, cls in BACKENDS.items() if cls.persistent)
+
+
+def get_backend(name=None):
+    """
+    Backend nach Name (Default: TRANSLATOR_BACKEND oder "google").
+    Returns None, wenn Google gewünscht, aber deep-translator fehlt.
+    """
+    name = name or os.getenv("TRANSLATOR_BACKEND", "google")
+    if name not in BACKENDS:
+        raise ValueError(f"Unbekanntes Übersetzungs-Backend: {name}")
+    if name == "google" and not TRANSLATOR_AVAILABLE:
+        return None
+    return BACKENDS[name]()
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+def load_cached(cur, hashes, backends=PERSISTENT_BACKENDS, source=SOURCE_LANG, target=TARGET_LANG):
+    """
+    Returns {source_hash: translated} für alle bereits gecachten Hashes.
+    Nur Einträge der angegebenen Backends (Altbestände anderer werden ignoriert).
+    """
+    cached = {}
+    hashes = list(hashes)
+    backend_placeholders = ", ".join(["%s"] * len(backends))
+    for i in range(0, len(hashes), 1000):
+        part = hashes[i:i + 1000]
+        placeholders = ", ".join(["%s"] * len(part))
+        cur.execute(f"""
+            SELECT source_hash, translated
+            FROM analytics.translation_cache
+            WHERE source_lang = %s AND target_lang = %s
+              AND backend IN ({backend_placeholders})
+              AND source_hash IN ({placeholders})
+        """, (source, target, *backends, *part))
+        cached.update({row[0]: row[1] for row in cur.fetchall()})
+    return cached
+
+
+def save_cached(cur, rows, backend_name, source=SOURCE_LANG, target=TARGET_LANG):
+    """rows: [(source_hash, source_text, translated)]"""
+    cur.executemany("""
+        INSERT INTO analytics.translation_cache
+            (source_hash, source_lang, target_lang, translated, backend, source_chars)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE translated = VALUES(translated), backend = VALUES(backend)
+    """, [(h, source, target, translated, backend_name, len(text)) for h, text, translated in rows])
+
+
+def _translate_one(backend, text):
+    try:
+        return backend.translate(text)
+    except Exception as e:
+        print(f"Übersetzungsfehler: {e}")
+        return None
+
+
+def translate_texts(conn, texts, backend=None, workers=TRANSLATE_WORKERS,
+                    batch_size=BATCH_SIZE, progress=None):
+    """
+    Übersetzt eine Menge Texte über den Cache.
+
+    Returns ({source_hash: translated}, stats). Fehlgeschlagene Übersetzungen
+    fehlen im Ergebnis und werden nicht gecacht (nächster Lauf versucht es erneut).
+    Nicht-persistente Backends (stub) umgehen den Cache komplett.
+    conn muss eine Verbindung mit autocommit=False sein; jeder Batch wird committet.
+    progress(n) wird mit der Anzahl erledigter Eingabetexte aufgerufen.
+    """
+    by_hash = {}
+    counts = {}     # Vorkommen je Hash (für den Fortschritt über alle Eingaben)
+    for text in texts:
+        if text and text.strip():
+            h = text_hash(text)
+            by_hash.setdefault(h, text.strip())
+            counts[h] = counts.get(h, 0) + 1
+
+    stats = {"texts": len(by_hash), "cached": 0, "translated": 0, "failed": 0}
+    if not by_hash:
+        return {}, stats
+
+    persistent = backend is None or backend.persistent
+    cur = conn.cursor()
+    result = load_cached(cur, by_hash.keys()) if persistent else {}
+    stats["cached"] = len(result)
+    if progress:
+        progress(len(texts) - sum(counts[h] for h in by_hash if h not in result))
+
+    missing = [(h, text) for h, text in by_hash.items() if h not in result]
+    if missing and backend is None:
+        stats["failed"] = len(missing)
+        cur.close()
+        return result, stats
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            translations = executor.map(lambda item: _translate_one(backend, item[1]), batch)
+
+            rows = []
+            for (h, text), translated in zip(batch, translations):
+                if translated:
+                    rows.append((h, text, translated))
+                    result[h] = translated
+                else:
+                    stats["failed"] += 1
+
+            if rows and persistent:
+                save_cached(cur, rows, backend.name)
+                conn.commit()
+            stats["translated"] += len(rows)
+
+            if progress:
+                progress(sum(counts[h] for h, _ in batch))
+
+    cur.close()
+    return result, stats
@@ -3,23 +3,41 @@
 """
 Flask Webserver für Aktien-Watchlist und Screener.
 
-Starten mit: python app.py
-Öffnen: http://localhost:5000
+Entwicklung: python app.py (Flask-Dev-Server, ein Prozess)
+Produktiv:   gunicorn -c gunicorn.conf.py (siehe wsgi.py)
+Öffnen: http://localhost:5001
 """
 
 import sys
 import os
 import re
+import json
+import gzip
+import base64
+import hashlib
+import math
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 # Parent-Ordner für db.py Import
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, flash, abort, make_response
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from functools import wraps
-from db import get_connection
-from auth import User
+from metrics import get_connection
+from auth import User, invalidate_user, user_cache_stats
+from assets import AssetRegistry, IMMUTABLE_CACHE
+from data_generation import DATA, read_generation, bump_generation, user_key
+import dcf_engine
+import metrics
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -32,7 +50,104 @@ login_manager.login_message = 'Bitte melden Sie sich an, um diese Seite zu sehen
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.get_by_id(int(user_id))
+    return User.get_cached(user_id)
+
+
+# =============================================================================
+# Response-Kompression (brotli, sonst gzip)
+# =============================================================================
+
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_MIMETYPES = {'application/json', 'text/html', 'text/css', 'application/javascript', 'text/javascript'}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5     # guter Kompromiss aus Größe und CPU für dynamische Antworten
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Accept-Encoding → Menge der erlaubten Codings (q=0 wird ignoriert)."""
+    encodings = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        if name:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+@app.after_request
+def compress_response(response):
+    """Komprimiert JSON/HTML-Antworten ab COMPRESS_MIN_SIZE Bytes."""
+    if (response.direct_passthrough
+            or response.status_code < 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or (response.content_length or 0) < COMPRESS_MIN_SIZE):
+        return response
+
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    if BROTLI_AVAILABLE and 'br' in accepted:
+        body, encoding = brotli.compress(response.get_data(), quality=BROTLI_QUALITY), 'br'
+    elif 'gzip' in accepted:
+        body, encoding = gzip.compress(response.get_data(), compresslevel=GZIP_LEVEL), 'gzip'
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+# =============================================================================
+# Request-Timing (Latenz je Route, DB-Queries je Request, siehe metrics.py)
+# =============================================================================
+
+@app.before_request
+def start_request_timing():
+    rule = request.url_rule
+    metrics.start_request(f"{request.method} {rule.rule if rule else '<unbekannt>'}")
+
+
+@app.after_request
+def note_response_status(response):
+    # läuft vor compress_response, die Kompression zählt trotzdem mit (teardown)
+    timing = metrics.current_request()
+    if timing is not None:
+        timing.status = response.status_code
+    return response
+
+
+@app.teardown_request
+def finish_request_timing(error):
+    metrics.finish_request(error=error is not None)
+
+
+# =============================================================================
+# Statische Assets (Content-Hash im Dateinamen, siehe assets.py)
+# =============================================================================
+
+ASSETS = AssetRegistry(app.static_folder)
+app.add_template_global(ASSETS.url, 'asset_url')
+
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    """CSS/JS mit Hash im Namen: ein Jahr cachebar, vorkomprimiert (br/gzip)."""
+    entry, current = ASSETS.resolve(filename)
+    if entry is None:
+        abort(404)
+
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    encoding = next((e for e in ('br', 'gzip') if e in accepted and e in entry.variants), None)
+
+    response = Response(entry.variants[encoding] if encoding else entry.body, mimetype=entry.mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE if current else 'no-cache'
+    response.set_etag(entry.hash)
+    return response.make_conditional(request)
 
 
 def admin_required(f):
@@ -46,6 +161,61 @@ def admin_required(f):
     return decorated_function
 
 
+# =============================================================================
+# HTTP-Caching der Daten-Routen (ETag aus Daten-Generation, siehe data_generation.py)
+# =============================================================================
+
+# Neue Antwortformate nach einem Deploy → neue ETags
+APP_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+# Routen ohne User-Daten darf der Browser so lange ohne Nachfrage wiederverwenden
+DATA_MAX_AGE = 300
+
+
+def data_etag(user_state: bool = False) -> str:
+    """ETag aus App-Version, URL, Daten-Generation und ggf. Generation des Users."""
+    parts = [APP_VERSION, request.full_path, read_generation(DATA)]
+    if user_state:
+        parts += [current_user.id, read_generation(user_key(current_user.id))]
+    return hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()[:20]
+
+
+def conditional_data(user_state: bool = False):
+    """
+    Decorator: ETag + Cache-Control für lesende JSON-Routen.
+
+    Passt If-None-Match, gibt es sofort 304 – ohne Datenbankzugriff.
+    user_state=True: Antwort enthält eigene Daten des Users (Szenarien,
+    Spalten) → immer revalidieren, ETag ändert sich mit touch_user_state().
+    """
+    cache_control = 'private, no-cache' if user_state else f'private, max-age={DATA_MAX_AGE}'
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = data_etag(user_state)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            # schwach: gzip/br-Varianten tragen denselben ETag
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return decorated_function
+    return decorator
+
+
+def touch_user_state(user_id: int):
+    """Eigene Daten des Users geändert → ETags seiner user_state-Routen ungültig."""
+    try:
+        bump_generation(user_key(user_id))
+    except OSError as e:
+        app.logger.warning(f"User-Generation {user_id} nicht geschrieben: {e}")
+
+
 # =============================================================================
 # Custom Jinja2 Filter: Deutsche Zahlenformatierung
 # =============================================================================
@@ -141,23 +311,40 @@ def get_visible_columns(view_name: str, user_id: int) -> list[dict]:
     return [c for c in get_column_config(view_name, user_id) if c['is_visible']]
 
 
-def build_dynamic_query(view_name: str, user_id: int, where_clause: str = "", order_by: str = "ci.company_name"):
-    """Baut dynamisch eine SQL-Query basierend auf konfigurierten Spalten."""
+def build_dynamic_query(view_name: str, user_id: int, where_clause: str = "", order_by: str = "ci.company_name",
+                        extra_select: list[str] = None, join_live_metrics: bool = False,
+                        json_types: bool = False):
+    """
+    Baut dynamisch eine SQL-Query basierend auf konfigurierten Spalten.
+
+    extra_select: zusätzliche SELECT-Ausdrücke (z. B. Sortierwert für Keyset-Cursor)
+    join_live_metrics: live_metrics auch joinen, wenn keine sichtbare Spalte daraus kommt
+                       (Filter/Sortierung auf nicht angezeigte Kennzahlen)
+    json_types: Kennzahlen als DOUBLE, Datumswerte als ISO-String liefern lassen
+                → Ergebnis ist ohne Umwandlung pro Zelle JSON-serialisierbar
+    """
     columns = get_visible_columns(view_name, user_id)
 
     # Immer ISIN dabei
     select_parts = ['ci.isin']
-    needs_live_metrics = False
+    needs_live_metrics = join_live_metrics
 
     for col in columns:
         if col['source_table'] == 'company_info':
-            select_parts.append(f"ci.{col['column_key']}")
+            expr = f"ci.{col['column_key']}"
         else:
-            select_parts.append(f"lm.{col['column_key']}")
+            expr = f"lm.{col['column_key']}"
             needs_live_metrics = True
 
+        if json_types and col['format_type'] == 'date':
+            expr = f"DATE_FORMAT({expr}, '%%Y-%%m-%%d') AS {col['column_key']}"
+        elif json_types and col['format_type'] != 'text':
+            expr = f"CAST({expr} AS DOUBLE) AS {col['column_key']}"
+        select_parts.append(expr)
+
     # Watchlist-Felder immer dabei
     select_parts.extend(['uw.favorite', 'uw.notes'])
+    select_parts.extend(extra_select or [])
 
     select_clause = ", ".join(select_parts)
 
@@ -178,6 +365,241 @@ def build_dynamic_query(view_name: str, user_id: int, where_clause: str = "", or
     return query, columns
 
 
+# =============================================================================
+# Helper: Screener (Filter, Sortierung, Keyset-Pagination)
+# =============================================================================
+
+SCREENER_PAGE_SIZE = 100
+SCREENER_MAX_PAGE_SIZE = 500
+SCREENER_DEFAULT_SORT = 'company_name'
+
+SCREENER_CATEGORICAL = ['stock_index', 'sector', 'industry', 'country']
+SCREENER_OPERATORS = {"<": "<", ">": ">", "<=": "<=", ">=": ">=", "=": "="}
+
+
+def get_screener_sort_columns(user_id: int) -> dict:
+    """
+    Erlaubte Sortierspalten → SQL-Ausdruck, aus user_column_settings des Users
+    (auch ausgeblendete Spalten) plus Favorit.
+    """
+    allowed = {'favorite': 'uw.favorite'}
+    for col in get_column_config('screener', user_id):
+        prefix = 'ci' if col['source_table'] == 'company_info' else 'lm'
+        allowed[col['column_key']] = f"{prefix}.{col['column_key']}"
+    allowed.setdefault(SCREENER_DEFAULT_SORT, f"ci.{SCREENER_DEFAULT_SORT}")
+    return allowed
+
+
+def build_screener_where(filters: dict, allowed: dict) -> tuple[list[str], list, bool]:
+    """
+    WHERE-Teile + Parameter aus den Screener-Filtern (Spalten nur aus allowed).
+    Returns (where_parts, params, needs_live_metrics).
+    """
+    where_parts = []
+    params = []
+    needs_live_metrics = False
+
+    # Suchfeld (ticker, isin, company_name)
+    search = (filters.get("search") or "").strip()
+    if search:
+        where_parts.append("(ci.ticker LIKE %s OR ci.isin LIKE %s OR ci.company_name LIKE %s)")
+        search_pattern = f"%{search}%"
+        params.extend([search_pattern, search_pattern, search_pattern])
+
+    # Kategorische Filter (company_info)
+    for field in SCREENER_CATEGORICAL:
+        if filters.get(field):
+            where_parts.append(f"ci.{field} = %s")
+            params.append(filters[field])
+
+    # Numerische Filter (live_metrics)
+    for nf in filters.get("numeric", []):
+        col = nf.get("column")
+        op = nf.get("operator")
+        val = nf.get("value")
+
+        if not col or op not in SCREENER_OPERATORS or val is None:
+            continue
+        expr = allowed.get(col)
+        if not expr or not expr.startswith('lm.'):
+            continue
+        try:
+            val = float(val)
+        except (TypeError, ValueError):
+            continue
+
+        where_parts.append(f"{expr} {SCREENER_OPERATORS[op]} %s")
+        params.append(val)
+        needs_live_metrics = True
+
+    return where_parts, params, needs_live_metrics
+
+
+def json_value(value):
+    """DB-Wert → JSON-tauglicher Wert (Zahlen bleiben Zahlen, Rest als String)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return str(value)
+
+
+def to_columnar(fields: list[str], rows: list) -> list[list]:
+    """Zeilen → eine Werteliste je Feld (Antwortformat "columnar")."""
+    return [list(values) for values in zip(*rows)] if rows else [[] for _ in fields]
+
+
+def encode_cursor(data: dict) -> str:
+    raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """Returns dict oder None bei ungültigem Cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return data if isinstance(data, dict) else None
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_condition(expr: str, direction: str, cursor: dict) -> tuple[str, list]:
+    """
+    WHERE-Bedingung "nach der letzten Zeile" für
+    ORDER BY (expr IS NULL), expr <dir>, ci.isin <dir>  (NULL-Werte immer am Ende).
+    """
+    op = '>' if direction == 'asc' else '<'
+    if cursor.get('n'):
+        # Letzte Zeile war schon im NULL-Block
+        return f"({expr} IS NULL AND ci.isin {op} %s)", [cursor['i']]
+    return (
+        f"({expr} IS NULL OR {expr} {op} %s OR ({expr} = %s AND ci.isin {op} %s))",
+        [cursor['v'], cursor['v'], cursor['i']],
+    )
+
+
+def query_screener_page(user_id: int, filters: dict = None, sort: str = None, direction: str = 'asc',
+                        page_size: int = SCREENER_PAGE_SIZE, cursor: str = None, fmt: str = 'rows') -> dict:
+    """
+    Eine Seite Screener-Daten, serverseitig sortiert und per Keyset-Cursor paginiert.
+
+    Returns {"columns", "count", "total", "next_cursor", "sort", "direction"} plus
+      fmt="rows":     "stocks" = [{spalte: wert}, ...]
+      fmt="columnar": "fields" = [spalte, ...], "data" = [[werte spalte 1], [werte spalte 2], ...]
+    Kennzahlen kommen als float, Datumswerte als ISO-String (json_types), daher
+    ist das Ergebnis ohne Umwandlung pro Zelle JSON-serialisierbar.
+    total wird nur für die erste Seite (ohne Cursor) gezählt, sonst None.
+    """
+    filters = filters or {}
+    allowed = get_screener_sort_columns(user_id)
+    sort = sort if sort in allowed else SCREENER_DEFAULT_SORT
+    direction = 'desc' if str(direction).lower() == 'desc' else 'asc'
+    try:
+        page_size = max(1, min(int(page_size), SCREENER_MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page_size = SCREENER_PAGE_SIZE
+    expr = allowed[sort]
+
+    where_parts, where_params, filter_lm = build_screener_where(filters, allowed)
+    join_lm = filter_lm or expr.startswith('lm.')
+
+    conn = get_connection()
+    cur = conn.cursor()
+
+    total = None
+    if not cursor:
+        count_query = "SELECT COUNT(*) AS total FROM analytics.company_info ci\n"
+        if filter_lm:
+            count_query += "LEFT JOIN analytics.live_metrics lm ON ci.isin = lm.isin\n"
+        if where_parts:
+            count_query += "WHERE " + " AND ".join(where_parts)
+        cur.execute(count_query, where_params)
+        total = cur.fetchone()[0]
+
+    page_parts = list(where_parts)
+    page_params = list(where_params)
+    state = decode_cursor(cursor) if cursor else None
+    if state and state.get('s') == sort and state.get('d') == direction:
+        condition, condition_params = keyset_condition(expr, direction, state)
+        page_parts.append(condition)
+        page_params.extend(condition_params)
+
+    order = direction.upper()
+    query, columns = build_dynamic_query(
+        view_name='screener',
+        user_id=user_id,
+        where_clause=" AND ".join(page_parts),
+        order_by=f"({expr} IS NULL), {expr} {order}, ci.isin {order}",
+        extra_select=[f"{expr} AS _sort_value"],
+        join_live_metrics=join_lm,
+        json_types=True,
+    )
+    # Eine Zeile mehr holen → wissen, ob es eine nächste Seite gibt
+    query += f" LIMIT {page_size + 1}"
+
+    cur.execute(query, [user_id] + page_params)
+    rows = cur.fetchall()
+    # Letztes Feld ist _sort_value (nur für den Cursor)
+    fields = [d[0] for d in cur.description][:-1]
+
+    cur.close()
+    conn.close()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor({
+            's': sort,
+            'd': direction,
+            'v': json_value(last[-1]),
+            'n': last[-1] is None,
+            'i': last[0],
+        })
+
+    page = {
+        "columns": columns,
+        "count": len(rows),
+        "total": total,
+        "next_cursor": next_cursor,
+        "sort": sort,
+        "direction": direction,
+    }
+    if fmt == 'columnar':
+        page["format"] = "columnar"
+        page["fields"] = fields
+        page["data"] = to_columnar(fields, rows)[:len(fields)]
+    else:
+        page["stocks"] = [dict(zip(fields, row)) for row in rows]
+    return page
+
+
+# Jüngste Request-Nummer je (user_id, Tab) – ältere Requests sind überholt
+SCREENER_REQUEST_TRACK_SIZE = 5000
+_screener_latest = OrderedDict()
+_screener_latest_lock = threading.Lock()
+
+
+def is_stale_screener_request(user_id: int, request_id) -> bool:
+    """
+    request_id = "<tab>:<laufende Nummer>" (vom Frontend je Tab hochgezählt).
+    Returns True, wenn derselbe Tab bereits einen neueren Request geschickt hat.
+    Ohne bzw. mit ungültiger request_id wird nichts geprüft.
+    """
+    tab, _, seq = str(request_id or '').rpartition(':')
+    if not tab or not seq.isdigit():
+        return False
+    key, seq = (user_id, tab), int(seq)
+    with _screener_latest_lock:
+        latest = _screener_latest.get(key, 0)
+        if seq < latest:
+            return True
+        _screener_latest[key] = seq
+        _screener_latest.move_to_end(key)
+        while len(_screener_latest) > SCREENER_REQUEST_TRACK_SIZE:
+            _screener_latest.popitem(last=False)
+    return False
+
+
 # =============================================================================
 # Routen
 # =============================================================================
@@ -228,9 +650,9 @@ def get_favorite_labels(user_id: int) -> dict:
 @app.route("/watchlist")
 @login_required
 def watchlist():
-    """Watchlist-Seite mit Favoriten."""
+    """Watchlist-Seite mit Favoriten (Zeilen als JSON, gerendert von static/js/table.js)."""
     conn = get_connection()
-    cur = conn.cursor(dictionary=True)
+    cur = conn.cursor()
 
     user_id = current_user.id
 
@@ -244,12 +666,14 @@ def watchlist():
         view_name='watchlist',
         user_id=user_id,
         where_clause=where_clause,
-        order_by='uw.favorite ASC, ci.company_name ASC'
+        order_by='uw.favorite ASC, ci.company_name ASC',
+        json_types=True
     )
 
     # user_id ist bereits im JOIN eingebaut, daher als erstes Param übergeben
     cur.execute(query, [user_id] + visible_favorites)
-    stocks = cur.fetchall()
+    rows = cur.fetchall()
+    fields = [d[0] for d in cur.description]
 
     cur.close()
     conn.close()
@@ -257,9 +681,16 @@ def watchlist():
     # Labels für die Legende
     favorite_labels = get_favorite_labels(user_id)
 
+    page = {
+        "columns": columns,
+        "count": len(rows),
+        "format": "columnar",
+        "fields": fields,
+        "data": to_columnar(fields, rows),
+    }
+
     return render_template("watchlist.html",
-                           stocks=stocks,
-                           columns=columns,
+                           page=page,
                            favorite_labels=favorite_labels,
                            visible_favorites=visible_favorites)
 
@@ -267,27 +698,10 @@ def watchlist():
 @app.route("/screener")
 @login_required
 def screener():
-    """Aktien-Screener mit allen Aktien."""
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
+    """Aktien-Screener: erste Seite serverseitig, weitere per Cursor über die Filter-API."""
+    page = query_screener_page(current_user.id, fmt='columnar')
 
-    user_id = current_user.id
-
-    # Dynamische Query basierend auf Spalten-Konfiguration
-    query, columns = build_dynamic_query(
-        view_name='screener',
-        user_id=user_id,
-        order_by='ci.company_name ASC'
-    )
-    query += " LIMIT 100"
-
-    cur.execute(query, [user_id])
-    stocks = cur.fetchall()
-
-    cur.close()
-    conn.close()
-
-    return render_template("screener.html", stocks=stocks, columns=columns)
+    return render_template("screener.html", page=page)
 
 
 @app.route("/api/note", methods=["POST"])
@@ -426,6 +840,7 @@ def update_favorite_settings():
 
 @app.route("/api/filter-options")
 @login_required
+@conditional_data(user_state=True)
 def get_filter_options():
     """API: Filter-Optionen für den Screener."""
     user_id = current_user.id
@@ -467,88 +882,36 @@ def get_filter_options():
 @app.route("/api/screener/filter", methods=["POST"])
 @login_required
 def filter_screener():
-    """API: Gefilterte Screener-Daten."""
-    user_id = current_user.id
-    data = request.json or {}
-    filters = data.get("filters", {})
-
-    conn = get_connection()
-    cur = conn.cursor(dictionary=True)
-
-    # WHERE-Klauseln aufbauen
-    where_parts = []
-    params = [user_id]  # Erstes Param ist user_id für JOIN
-
-    # Suchfeld (ticker, isin, company_name)
-    search = filters.get("search", "").strip()
-    if search:
-        where_parts.append("(ci.ticker LIKE %s OR ci.isin LIKE %s OR ci.company_name LIKE %s)")
-        search_pattern = f"%{search}%"
-        params.extend([search_pattern, search_pattern, search_pattern])
-
-    # Kategorische Filter (company_info)
-    for field in ['stock_index', 'sector', 'industry', 'country']:
-        if field in filters and filters[field]:
-            where_parts.append(f"ci.{field} = %s")
-            params.append(filters[field])
-
-    # Numerische Filter (live_metrics)
-    numeric_filters = filters.get("numeric", [])
-    for nf in numeric_filters:
-        col = nf.get("column")
-        op = nf.get("operator")
-        val = nf.get("value")
-
-        if not col or not op or val is None:
-            continue
-
-        # Operator validieren
-        valid_ops = {"<": "<", ">": ">", "<=": "<=", ">=": ">=", "=": "="}
-        if op not in valid_ops:
-            continue
-
-        # Spaltenname validieren (nur alphanumerisch und Unterstriche)
-        if not col.replace('_', '').isalnum():
-            continue
-
-        where_parts.append(f"lm.{col} {valid_ops[op]} %s")
-        params.append(float(val))
+    """
+    API: Gefilterte Screener-Daten, serverseitig sortiert und seitenweise.
 
-    where_clause = " AND ".join(where_parts) if where_parts else ""
+    Body: {"filters": {...}, "sort": "<column_key>", "direction": "asc"|"desc",
+           "page_size": 100, "cursor": "<next_cursor der Vorseite>",
+           "format": "rows"|"columnar", "request_id": "<tab>:<nummer>"}
 
-    # Query aufbauen
-    query, columns = build_dynamic_query(
-        view_name='screener',
-        user_id=user_id,
-        where_clause=where_clause,
-        order_by='ci.company_name ASC'
+    request_id wird unverändert zurückgegeben. Das Frontend schickt sie nur für
+    ersetzende Requests (erste Seite neuer Filter/Sortierung); ist bereits ein
+    neuerer davon desselben Tabs eingegangen, wird nicht mehr abgefragt (409,
+    "stale"). Nachlade-Requests (mit cursor) werden nie als veraltet verworfen.
+    """
+    user_id = current_user.id
+    data = request.json or {}
+    request_id = data.get("request_id")
+
+    if not data.get("cursor") and is_stale_screener_request(user_id, request_id):
+        return jsonify({"stale": True, "request_id": request_id}), 409
+
+    page = query_screener_page(
+        user_id,
+        filters=data.get("filters", {}),
+        sort=data.get("sort"),
+        direction=data.get("direction", "asc"),
+        page_size=data.get("page_size", SCREENER_PAGE_SIZE),
+        cursor=data.get("cursor"),
+        fmt='columnar' if data.get("format") == 'columnar' else 'rows',
     )
-    query += " LIMIT 500"
-
-    cur.execute(query, params)
-    stocks = cur.fetchall()
-
-    cur.close()
-    conn.close()
-
-    # Daten formatieren für JSON
-    result = []
-    for stock in stocks:
-        row = {}
-        for key, value in stock.items():
-            if value is None:
-                row[key] = None
-            elif isinstance(value, (int, float)):
-                row[key] = value
-            else:
-                row[key] = str(value)
-        result.append(row)
-
-    return jsonify({
-        "stocks": result,
-        "count": len(result),
-        "columns": columns
-    })
+    page["request_id"] = request_id
+    return jsonify(page)
 
 
 @app.route("/api/columns/<view_name>")
@@ -575,8 +938,565 @@ def get_columns(view_name):
     })
 
 
+# Modal-Daten (Details, Unternehmensinfo, DCF) werden set-basiert geladen:
+# je Tabelle eine Query mit WHERE isin IN (...), egal ob für eine ISIN
+# (Einzel-Routen) oder viele (/api/stocks, Prefetch der Watchlist)
+STOCK_SECTIONS = ('details', 'info', 'dcf')
+STOCK_BATCH_MAX_ISINS = 50
+
+DETAIL_HISTORY_YEARS = 20     # KGV- und EV/EBIT-Verlauf
+DETAIL_INCOME_YEARS = 10      # Income Statement
+DCF_HISTORY_YEARS = 5         # DCF: historische Jahre
+
+# Spalten aus live_metrics für Details, DCF (Teilmenge) und Info (market_cap)
+STOCK_LIVE_COLUMNS = """
+    market_cap, price, price_date,
+    ttm_pe, fy_pe,
+    pe_avg_5y, pe_avg_10y, pe_avg_15y, pe_avg_20y, pe_avg_10y_2019,
+    pe_avg_5y_count, pe_avg_10y_count, pe_avg_15y_count, pe_avg_20y_count,
+    yf_ttm_pe, yf_forward_pe,
+    ttm_ev_ebit, fy_ev_ebit,
+    ev_ebit_avg_5y, ev_ebit_avg_10y, ev_ebit_avg_15y, ev_ebit_avg_20y, ev_ebit_avg_10y_2019,
+    ev_ebit_avg_5y_count, ev_ebit_avg_10y_count, ev_ebit_avg_15y_count, ev_ebit_avg_20y_count,
+    revenue_cagr_3y, revenue_cagr_5y, revenue_cagr_10y,
+    ebit_cagr_3y, ebit_cagr_5y, ebit_cagr_10y,
+    net_income_cagr_3y, net_income_cagr_5y, net_income_cagr_10y,
+    profit_margin, operating_margin,
+    profit_margin_avg_3y, profit_margin_avg_5y, profit_margin_avg_10y, profit_margin_avg_5y_2019,
+    operating_margin_avg_3y, operating_margin_avg_5y, operating_margin_avg_10y, operating_margin_avg_5y_2019,
+    yf_ttm_pe_vs_avg_5y, yf_ttm_pe_vs_avg_10y, yf_ttm_pe_vs_avg_15y, yf_ttm_pe_vs_avg_20y, yf_ttm_pe_vs_avg_10y_2019,
+    yf_fwd_pe_vs_avg_5y, yf_fwd_pe_vs_avg_10y, yf_fwd_pe_vs_avg_15y, yf_fwd_pe_vs_avg_20y, yf_fwd_pe_vs_avg_10y_2019,
+    ev_ebit_vs_avg_5y, ev_ebit_vs_avg_10y, ev_ebit_vs_avg_15y, ev_ebit_vs_avg_20y, ev_ebit_vs_avg_10y_2019
+"""
+
+
+def _group_by_isin(rows) -> dict:
+    """Zeilen → {isin: [Zeilen]} (Reihenfolge der Query bleibt erhalten)."""
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.pop('isin'), []).append(row)
+    return grouped
+
+
+def _load_stock_rows(cur, user_id: int, isins: list[str], sections) -> dict:
+    """
+    Lädt alle Zeilen, die die angefragten Sections brauchen, mit je einer
+    Query pro Tabelle. company_info und live_metrics werden von allen
+    Sections geteilt. Returns {name: {isin: Zeile bzw. [Zeilen]}}.
+    """
+    placeholders = ','.join(['%s'] * len(isins))
+    rows = {}
+
+    # Beschreibung nur für die Unternehmensinfo (lange Texte)
+    description = ", description" if 'info' in sections else ""
+    cur.execute(f"""
+        SELECT isin, ticker, company_name, sector, industry, country,
+               currency, fiscal_year_end, stock_index{description}
+        FROM analytics.company_info
+        WHERE isin IN ({placeholders})
+    """, isins)
+    rows['company'] = {}
+    for row in cur.fetchall():
+        # Doppelte Zeilen (mehrere Indizes) → erste gewinnt
+        rows['company'].setdefault(row['isin'], row)
+
+    isins = [isin for isin in isins if isin in rows['company']]
+    if not isins:
+        return rows
+    placeholders = ','.join(['%s'] * len(isins))
+
+    cur.execute(f"""
+        SELECT isin, {STOCK_LIVE_COLUMNS}
+        FROM analytics.live_metrics
+        WHERE isin IN ({placeholders})
+    """, isins)
+    rows['live'] = {row['isin']: row for row in cur.fetchall()}
+
+    if 'details' in sections or 'dcf' in sections:
+        # Letzte FY-Einträge: EV-Komponenten, Income Statement, DCF-Historie
+        cur.execute(f"""
+            SELECT isin, year, revenue, gross_profit, operating_income, net_income,
+                   free_cash_flow, net_debt, minority_interest, shares_outstanding
+            FROM (
+                SELECT isin, date, YEAR(date) as year, revenue, gross_profit,
+                       operating_income, net_income, free_cash_flow, net_debt,
+                       minority_interest, weighted_average_shs_out_dil as shares_outstanding,
+                       ROW_NUMBER() OVER (PARTITION BY isin ORDER BY date DESC) AS rn
+                FROM analytics.fmp_filtered_numbers
+                WHERE isin IN ({placeholders}) AND period = 'FY'
+            ) fy
+            WHERE rn <= %s
+            ORDER BY isin, date DESC
+        """, isins + [max(DETAIL_INCOME_YEARS, DCF_HISTORY_YEARS)])
+        rows['fy'] = _group_by_isin(cur.fetchall())
+
+    if 'details' in sections:
+        # TTM-Berechnung: Quartale ODER Halbjahre
+        cur.execute(f"""
+            SELECT isin, period, date, net_income, revenue, gross_profit, operating_income
+            FROM analytics.fmp_filtered_numbers
+            WHERE isin IN ({placeholders}) AND period != 'FY'
+              AND date >= DATE_SUB(CURDATE(), INTERVAL 18 MONTH)
+            ORDER BY isin, date DESC
+        """, isins)
+        rows['periods'] = _group_by_isin(cur.fetchall())
+
+        # KGV- und EV/EBIT-Verlauf: je Kennzahl die letzten Jahre mit Wert
+        cur.execute(f"""
+            SELECT isin, year, fy_pe, fy_ev_ebit
+            FROM (
+                SELECT isin, date, YEAR(date) as year, fy_pe, fy_ev_ebit,
+                       ROW_NUMBER() OVER (PARTITION BY isin, fy_pe IS NULL ORDER BY date DESC) AS pe_rn,
+                       ROW_NUMBER() OVER (PARTITION BY isin, fy_ev_ebit IS NULL ORDER BY date DESC) AS ev_rn
+                FROM analytics.calcu_numbers
+                WHERE isin IN ({placeholders}) AND period = 'FY'
+                  AND (fy_pe IS NOT NULL OR fy_ev_ebit IS NOT NULL)
+            ) h
+            WHERE (fy_pe IS NOT NULL AND pe_rn <= %s) OR (fy_ev_ebit IS NOT NULL AND ev_rn <= %s)
+            ORDER BY isin, date DESC
+        """, isins + [DETAIL_HISTORY_YEARS, DETAIL_HISTORY_YEARS])
+        rows['history'] = _group_by_isin(cur.fetchall())
+
+    if 'dcf' in sections:
+        # Analyst Estimates aus finanzen.net (Revenue, EBIT, FCF)
+        cur.execute(f"""
+            SELECT isin, period, metric, estimate_value, currency, unit
+            FROM analytics.analyst_estimates
+            WHERE isin IN ({placeholders})
+              AND metric IN ('revenue', 'ebit', 'free_cashflow')
+              AND period_type = 'fiscal_year'
+            ORDER BY isin, period ASC
+        """, isins)
+        rows['estimates'] = _group_by_isin(cur.fetchall())
+
+        # Gespeicherte Szenarien des Users
+        cur.execute(f"""
+            SELECT isin, id, scenario_name, revenue_growth_y1, revenue_growth_y2,
+                   revenue_growth_y3, revenue_growth_y4, revenue_growth_y5,
+                   revenue_growth_y6, revenue_growth_y7, revenue_growth_y8,
+                   revenue_growth_y9, revenue_growth_y10,
+                   ebit_margin, tax_rate, capex_percent, wc_change_percent,
+                   depreciation_percent, terminal_growth, wacc,
+                   fair_value_per_share, created_at, updated_at
+            FROM analytics.user_dcf_scenarios
+            WHERE user_id = %s AND isin IN ({placeholders})
+            ORDER BY isin, updated_at DESC
+        """, [user_id] + isins)
+        rows['scenarios'] = _group_by_isin(cur.fetchall())
+
+    return rows
+
+
+def _build_stock_details(company: dict, live: dict, fy_rows: list, all_periods: list,
+                         history: list) -> dict:
+    """Detaildaten einer Aktie (Modal) aus den Zeilen von _load_stock_rows."""
+    # EV-Komponenten aus dem letzten FY-Eintrag
+    ev_components = fy_rows[0] if fy_rows else {}
+
+    # Prüfe ob Quartals- oder Halbjahresberichterstatter
+    period_types = set(p['period'] for p in all_periods)
+    is_semiannual = period_types.issubset({'Q2', 'Q4', 'H1', 'H2'})
+
+    # TTM-Werte berechnen
+    ttm_net_income = None
+    ttm_revenue = None
+    ttm_gross_profit = None
+    ttm_operating_income = None
+    periods_for_display = []
+
+    if is_semiannual and len(all_periods) >= 2:
+        # Halbjahresberichterstatter: 2 Halbjahre
+        periods_for_display = all_periods[:2]
+    elif len(all_periods) >= 4:
+        # Quartalsberichterstatter: 4 Quartale
+        periods_for_display = all_periods[:4]
+
+    if periods_for_display:
+        # Net Income
+        ni_values = [p['net_income'] for p in periods_for_display if p['net_income'] is not None]
+        if len(ni_values) == len(periods_for_display):
+            ttm_net_income = sum(ni_values)
+
+        # Revenue
+        rev_values = [p['revenue'] for p in periods_for_display if p['revenue'] is not None]
+        if len(rev_values) == len(periods_for_display):
+            ttm_revenue = sum(rev_values)
+
+        # Gross Profit
+        gp_values = [p['gross_profit'] for p in periods_for_display if p['gross_profit'] is not None]
+        if len(gp_values) == len(periods_for_display):
+            ttm_gross_profit = sum(gp_values)
+
+        # Operating Income
+        oi_values = [p['operating_income'] for p in periods_for_display if p['operating_income'] is not None]
+        if len(oi_values) == len(periods_for_display):
+            ttm_operating_income = sum(oi_values)
+
+    # Perioden für Anzeige formatieren (ältestes zuerst)
+    quarters_display = []
+    quarters_ebit_display = []
+    for q in reversed(periods_for_display):
+        quarters_display.append({
+            "period": q['period'],
+            "date": q['date'].strftime('%Y-%m-%d') if q['date'] else None,
+            "net_income": q['net_income']
+        })
+        quarters_ebit_display.append({
+            "period": q['period'],
+            "date": q['date'].strftime('%Y-%m-%d') if q['date'] else None,
+            "operating_income": q['operating_income']
+        })
+
+    # KGV-Verlauf: Letzte 20 FY-Jahre aus calcu_numbers
+    pe_history_raw = [row for row in history if row['fy_pe'] is not None][:DETAIL_HISTORY_YEARS]
+
+    # In chronologischer Reihenfolge (ältestes zuerst)
+    pe_history = []
+    for row in reversed(pe_history_raw):
+        pe_history.append({
+            "year": row['year'],
+            "pe": round(row['fy_pe'], 2) if row['fy_pe'] else None
+        })
+
+    # Aktuelles TTM PE ans Ende anhängen (falls vorhanden)
+    current_ttm_pe = live.get('ttm_pe')
+
+    # EV/EBIT-Verlauf: Letzte 20 FY-Jahre aus calcu_numbers
+    ev_ebit_history_raw = [row for row in history if row['fy_ev_ebit'] is not None][:DETAIL_HISTORY_YEARS]
+
+    # In chronologischer Reihenfolge (ältestes zuerst)
+    ev_ebit_history = []
+    for row in reversed(ev_ebit_history_raw):
+        ev_ebit_history.append({
+            "year": row['year'],
+            "ev_ebit": round(row['fy_ev_ebit'], 2) if row['fy_ev_ebit'] else None
+        })
+
+    current_ttm_ev_ebit = live.get('ttm_ev_ebit')
+
+    # Income Statement: Letzte 10 FY-Jahre aus fmp_filtered_numbers
+    income_raw = fy_rows[:DETAIL_INCOME_YEARS]
+
+    # In chronologischer Reihenfolge (ältestes zuerst)
+    income_statement = []
+    for row in reversed(income_raw):
+        income_statement.append({
+            "year": row['year'],
+            "revenue": row['revenue'],
+            "gross_profit": row['gross_profit'],
+            "operating_income": row['operating_income'],
+            "net_income": row['net_income']
+        })
+
+    # Response zusammenbauen
+    result = {
+        "company": {
+            "isin": company['isin'],
+            "ticker": company['ticker'],
+            "name": company['company_name'],
+            "sector": company['sector'],
+            "industry": company['industry'],
+            "country": company['country'],
+            "currency": company['currency'],
+            "fiscal_year_end": company['fiscal_year_end']
+        },
+        "current": {
+            "market_cap": live.get('market_cap'),
+            "price": live.get('price'),
+            "price_date": live.get('price_date').strftime('%Y-%m-%d') if live.get('price_date') else None,
+            "ttm_pe": round(current_ttm_pe, 2) if current_ttm_pe else None
+        },
+        "pe_overview": {
+            "ttm_pe": round(live.get('ttm_pe'), 2) if live.get('ttm_pe') else None,
+            "fy_pe": round(live.get('fy_pe'), 2) if live.get('fy_pe') else None,
+            "pe_avg_5y": round(live.get('pe_avg_5y'), 2) if live.get('pe_avg_5y') else None,
+            "pe_avg_10y": round(live.get('pe_avg_10y'), 2) if live.get('pe_avg_10y') else None,
+            "pe_avg_15y": round(live.get('pe_avg_15y'), 2) if live.get('pe_avg_15y') else None,
+            "pe_avg_20y": round(live.get('pe_avg_20y'), 2) if live.get('pe_avg_20y') else None,
+            "pe_avg_10y_2019": round(live.get('pe_avg_10y_2019'), 2) if live.get('pe_avg_10y_2019') else None,
+            "pe_avg_5y_count": live.get('pe_avg_5y_count'),
+            "pe_avg_10y_count": live.get('pe_avg_10y_count'),
+            "pe_avg_15y_count": live.get('pe_avg_15y_count'),
+            "pe_avg_20y_count": live.get('pe_avg_20y_count'),
+            "yf_ttm_pe": round(live.get('yf_ttm_pe'), 2) if live.get('yf_ttm_pe') else None,
+            "yf_forward_pe": round(live.get('yf_forward_pe'), 2) if live.get('yf_forward_pe') else None,
+            # Abweichungen TTM-KGV vs. Durchschnitte
+            "yf_ttm_pe_vs_avg_5y": round(live.get('yf_ttm_pe_vs_avg_5y'), 1) if live.get('yf_ttm_pe_vs_avg_5y') else None,
+            "yf_ttm_pe_vs_avg_10y": round(live.get('yf_ttm_pe_vs_avg_10y'), 1) if live.get('yf_ttm_pe_vs_avg_10y') else None,
+            "yf_ttm_pe_vs_avg_15y": round(live.get('yf_ttm_pe_vs_avg_15y'), 1) if live.get('yf_ttm_pe_vs_avg_15y') else None,
+            "yf_ttm_pe_vs_avg_20y": round(live.get('yf_ttm_pe_vs_avg_20y'), 1) if live.get('yf_ttm_pe_vs_avg_20y') else None,
+            "yf_ttm_pe_vs_avg_10y_2019": round(live.get('yf_ttm_pe_vs_avg_10y_2019'), 1) if live.get('yf_ttm_pe_vs_avg_10y_2019') else None,
+            # Abweichungen Forward-KGV vs. Durchschnitte
+            "yf_fwd_pe_vs_avg_5y": round(live.get('yf_fwd_pe_vs_avg_5y'), 1) if live.get('yf_fwd_pe_vs_avg_5y') else None,
+            "yf_fwd_pe_vs_avg_10y": round(live.get('yf_fwd_pe_vs_avg_10y'), 1) if live.get('yf_fwd_pe_vs_avg_10y') else None,
+            "yf_fwd_pe_vs_avg_15y": round(live.get('yf_fwd_pe_vs_avg_15y'), 1) if live.get('yf_fwd_pe_vs_avg_15y') else None,
+            "yf_fwd_pe_vs_avg_20y": round(live.get('yf_fwd_pe_vs_avg_20y'), 1) if live.get('yf_fwd_pe_vs_avg_20y') else None,
+            "yf_fwd_pe_vs_avg_10y_2019": round(live.get('yf_fwd_pe_vs_avg_10y_2019'), 1) if live.get('yf_fwd_pe_vs_avg_10y_2019') else None
+        },
+        "ev_ebit_overview": {
+            "ttm_ev_ebit": round(live.get('ttm_ev_ebit'), 2) if live.get('ttm_ev_ebit') else None,
+            "fy_ev_ebit": round(live.get('fy_ev_ebit'), 2) if live.get('fy_ev_ebit') else None,
+            "ev_ebit_avg_5y": round(live.get('ev_ebit_avg_5y'), 2) if live.get('ev_ebit_avg_5y') else None,
+            "ev_ebit_avg_10y": round(live.get('ev_ebit_avg_10y'), 2) if live.get('ev_ebit_avg_10y') else None,
+            "ev_ebit_avg_15y": round(live.get('ev_ebit_avg_15y'), 2) if live.get('ev_ebit_avg_15y') else None,
+            "ev_ebit_avg_20y": round(live.get('ev_ebit_avg_20y'), 2) if live.get('ev_ebit_avg_20y') else None,
+            "ev_ebit_avg_10y_2019": round(live.get('ev_ebit_avg_10y_2019'), 2) if live.get('ev_ebit_avg_10y_2019') else None,
+            "ev_ebit_avg_5y_count": live.get('ev_ebit_avg_5y_count'),
+            "ev_ebit_avg_10y_count": live.get('ev_ebit_avg_10y_count'),
+            "ev_ebit_avg_15y_count": live.get('ev_ebit_avg_15y_count'),
+            "ev_ebit_avg_20y_count": live.get('ev_ebit_avg_20y_count'),
+            # Abweichungen EV/EBIT vs. Durchschnitte
+            "ev_ebit_vs_avg_5y": round(live.get('ev_ebit_vs_avg_5y'), 1) if live.get('ev_ebit_vs_avg_5y') else None,
+            "ev_ebit_vs_avg_10y": round(live.get('ev_ebit_vs_avg_10y'), 1) if live.get('ev_ebit_vs_avg_10y') else None,
+            "ev_ebit_vs_avg_15y": round(live.get('ev_ebit_vs_avg_15y'), 1) if live.get('ev_ebit_vs_avg_15y') else None,
+            "ev_ebit_vs_avg_20y": round(live.get('ev_ebit_vs_avg_20y'), 1) if live.get('ev_ebit_vs_avg_20y') else None,
+            "ev_ebit_vs_avg_10y_2019": round(live.get('ev_ebit_vs_avg_10y_2019'), 1) if live.get('ev_ebit_vs_avg_10y_2019') else None
+        },
+        "growth_overview": {
+            "revenue_cagr_3y": round(live.get('revenue_cagr_3y'), 1) if live.get('revenue_cagr_3y') else None,
+            "revenue_cagr_5y": round(live.get('revenue_cagr_5y'), 1) if live.get('revenue_cagr_5y') else None,
+            "revenue_cagr_10y": round(live.get('revenue_cagr_10y'), 1) if live.get('revenue_cagr_10y') else None,
+            "ebit_cagr_3y": round(live.get('ebit_cagr_3y'), 1) if live.get('ebit_cagr_3y') else None,
+            "ebit_cagr_5y": round(live.get('ebit_cagr_5y'), 1) if live.get('ebit_cagr_5y') else None,
+            "ebit_cagr_10y": round(live.get('ebit_cagr_10y'), 1) if live.get('ebit_cagr_10y') else None,
+            "net_income_cagr_3y": round(live.get('net_income_cagr_3y'), 1) if live.get('net_income_cagr_3y') else None,
+            "net_income_cagr_5y": round(live.get('net_income_cagr_5y'), 1) if live.get('net_income_cagr_5y') else None,
+            "net_income_cagr_10y": round(live.get('net_income_cagr_10y'), 1) if live.get('net_income_cagr_10y') else None
+        },
+        "margins_overview": {
+            "profit_margin": round(live.get('profit_margin'), 1) if live.get('profit_margin') else None,
+            "operating_margin": round(live.get('operating_margin'), 1) if live.get('operating_margin') else None,
+            "profit_margin_avg_3y": round(live.get('profit_margin_avg_3y'), 1) if live.get('profit_margin_avg_3y') else None,
+            "profit_margin_avg_5y": round(live.get('profit_margin_avg_5y'), 1) if live.get('profit_margin_avg_5y') else None,
+            "profit_margin_avg_10y": round(live.get('profit_margin_avg_10y'), 1) if live.get('profit_margin_avg_10y') else None,
+            "profit_margin_avg_5y_2019": round(live.get('profit_margin_avg_5y_2019'), 1) if live.get('profit_margin_avg_5y_2019') else None,
+            "operating_margin_avg_3y": round(live.get('operating_margin_avg_3y'), 1) if live.get('operating_margin_avg_3y') else None,
+            "operating_margin_avg_5y": round(live.get('operating_margin_avg_5y'), 1) if live.get('operating_margin_avg_5y') else None,
+            "operating_margin_avg_10y": round(live.get('operating_margin_avg_10y'), 1) if live.get('operating_margin_avg_10y') else None,
+            "operating_margin_avg_5y_2019": round(live.get('operating_margin_avg_5y_2019'), 1) if live.get('operating_margin_avg_5y_2019') else None
+        },
+        "ttm_calculation": {
+            "market_cap": live.get('market_cap'),
+            "ttm_net_income": ttm_net_income,
+            "quarters": quarters_display
+        },
+        "ev_calculation": {
+            "market_cap": live.get('market_cap'),
+            "net_debt": ev_components.get('net_debt'),
+            "minority_interest": ev_components.get('minority_interest'),
+            "ttm_ebit": ttm_operating_income,
+            "quarters": quarters_ebit_display
+        },
+        "ttm_income_statement": {
+            "revenue": ttm_revenue,
+            "gross_profit": ttm_gross_profit,
+            "operating_income": ttm_operating_income,
+            "net_income": ttm_net_income
+        },
+        "pe_history": pe_history,
+        "current_ttm_pe": round(current_ttm_pe, 2) if current_ttm_pe else None,
+        "ev_ebit_history": ev_ebit_history,
+        "current_ttm_ev_ebit": round(current_ttm_ev_ebit, 2) if current_ttm_ev_ebit else None,
+        "income_statement": income_statement
+    }
+
+    return result
+
+
+def _build_stock_info(company: dict, live: dict) -> dict:
+    """Unternehmensinformationen (Modal) aus den Zeilen von _load_stock_rows."""
+    info = dict(company)
+    if live:
+        info['market_cap'] = live['market_cap']
+    return info
+
+
+def _build_dcf_data(company: dict, live: dict, fy_rows: list, estimates_raw: list,
+                    scenarios: list) -> dict:
+    """DCF-Daten einer Aktie aus den Zeilen von _load_stock_rows."""
+    # Net Debt und Shares Outstanding aus dem letzten FY-Eintrag
+    balance = fy_rows[0] if fy_rows else {}
+    historical_raw = fy_rows[:DCF_HISTORY_YEARS]
+
+    # In chronologischer Reihenfolge (ältestes zuerst)
+    historical = []
+    for row in reversed(historical_raw):
+        revenue = row['revenue']
+        ebit = row['operating_income']
+        fcf = row['free_cash_flow']
+
+        # Margen berechnen
+        ebit_margin = (ebit / revenue * 100) if revenue and ebit else None
+        fcf_margin = (fcf / revenue * 100) if revenue and fcf else None
+
+        historical.append({
+            "year": row['year'],
+            "revenue": revenue,
+            "ebit": ebit,
+            "fcf": fcf,
+            "ebit_margin": round(ebit_margin, 1) if ebit_margin else None,
+            "fcf_margin": round(fcf_margin, 1) if fcf_margin else None
+        })
+
+    # Analyst Estimates nach Jahr gruppieren
+    last_hist_year = historical[-1]['year'] if historical else 0
+    estimates_by_year = {}
+
+    for row in estimates_raw:
+        period = row['period']
+        year_match = re.search(r'(\d{4})', period)
+        if year_match:
+            year = int(year_match.group(1))
+            # Nur zukünftige Jahre (nach letztem historischen Jahr)
+            if year > last_hist_year:
+                if year not in estimates_by_year:
+                    estimates_by_year[year] = {
+                        "year": year,
+                        "revenue": None,
+                        "ebit": None,
+                        "fcf": None,
+                        "ebit_margin": None,
+                        "is_estimate": True
+                    }
+
+                # Wert konvertieren (Mio zu absolut)
+                value = row['estimate_value']
+                if row['unit'] == 'millions' and value:
+                    value = float(value) * 1_000_000
+
+                metric = row['metric']
+                if metric == 'revenue':
+                    estimates_by_year[year]['revenue'] = value
+                elif metric == 'ebit':
+                    estimates_by_year[year]['ebit'] = value
+                elif metric == 'free_cashflow':
+                    estimates_by_year[year]['fcf'] = value
+
+    # EBIT-Marge berechnen wo möglich
+    for year_data in estimates_by_year.values():
+        if year_data['revenue'] and year_data['ebit']:
+            year_data['ebit_margin'] = round(
+                (year_data['ebit'] / year_data['revenue']) * 100, 1
+            )
+
+    # In sortierte Liste umwandeln
+    estimates = [estimates_by_year[y] for y in sorted(estimates_by_year.keys())]
+
+    # CAGR berechnen aus historischen Daten
+    revenue_cagr_3y = None
+    revenue_cagr_5y = None
+    revenue_cagr_10y = None
+
+    if len(historical) >= 4:
+        start_rev = historical[-4]['revenue']
+        end_rev = historical[-1]['revenue']
+        if start_rev and end_rev and start_rev > 0:
+            revenue_cagr_3y = ((end_rev / start_rev) ** (1/3) - 1) * 100
+
+    if len(historical) >= 6:
+        start_rev = historical[-6]['revenue']
+        end_rev = historical[-1]['revenue']
+        if start_rev and end_rev and start_rev > 0:
+            revenue_cagr_5y = ((end_rev / start_rev) ** (1/5) - 1) * 100
+
+    if len(historical) >= 10:
+        start_rev = historical[0]['revenue']
+        end_rev = historical[-1]['revenue']
+        if start_rev and end_rev and start_rev > 0:
+            revenue_cagr_10y = ((end_rev / start_rev) ** (1/10) - 1) * 100
+
+    # Fallback auf live_metrics CAGRs
+    revenue_cagr_3y = revenue_cagr_3y or live.get('revenue_cagr_3y')
+    revenue_cagr_5y = revenue_cagr_5y or live.get('revenue_cagr_5y')
+    revenue_cagr_10y = revenue_cagr_10y or live.get('revenue_cagr_10y')
+
+    # Default-Annahmen berechnen
+    # Letzter Revenue für Berechnungen
+    last_revenue = historical[-1]['revenue'] if historical else None
+
+    # Durchschnittliche EBIT-Marge der letzten 5 Jahre
+    ebit_margins = [h['ebit_margin'] for h in historical[-5:] if h['ebit_margin'] is not None]
+    avg_ebit_margin = sum(ebit_margins) / len(ebit_margins) if ebit_margins else (live.get('operating_margin') or 15.0)
+
+    # Default Wachstum basierend auf historischem CAGR (abklingend über 10 Jahre)
+    defaults = dcf_engine.default_assumptions(
+        revenue_cagr_5y=revenue_cagr_5y,
+        revenue_cagr_3y=revenue_cagr_3y,
+        ebit_margin=avg_ebit_margin
+    )
+
+    # Datetime zu String konvertieren
+    for s in scenarios:
+        if s['created_at']:
+            s['created_at'] = s['created_at'].strftime('%Y-%m-%d %H:%M')
+        if s['updated_at']:
+            s['updated_at'] = s['updated_at'].strftime('%Y-%m-%d %H:%M')
+
+    result = {
+        "company": {
+            "isin": company['isin'],
+            "ticker": company['ticker'],
+            "name": company['company_name'],
+            "currency": company['currency']
+        },
+        "current": {
+            "market_cap": live.get('market_cap'),
+            "price": live.get('price'),
+            "price_date": live.get('price_date').strftime('%Y-%m-%d') if live.get('price_date') else None,
+            "net_debt": balance.get('net_debt'),
+            "shares_outstanding": balance.get('shares_outstanding')
+        },
+        "cagr": {
+            "cagr_3y": round(revenue_cagr_3y, 1) if revenue_cagr_3y else None,
+            "cagr_5y": round(revenue_cagr_5y, 1) if revenue_cagr_5y else None,
+            "cagr_10y": round(revenue_cagr_10y, 1) if revenue_cagr_10y else None
+        },
+        "historical": historical,
+        "estimates": estimates,
+        "defaults": defaults,
+        "scenarios": scenarios
+    }
+
+    return result
+
+
+def load_stock_sections(cur, user_id: int, isins: list[str], sections) -> dict:
+    """
+    Modal-Daten für mehrere ISINs und Sections ('details', 'info', 'dcf').
+    Returns {isin: {section: daten}}; unbekannte ISINs fehlen im Ergebnis.
+    """
+    if not isins:
+        return {}
+
+    rows = _load_stock_rows(cur, user_id, isins, sections)
+
+    stocks = {}
+    for isin in isins:
+        company = rows['company'].get(isin)
+        if not company:
+            continue
+        live = rows['live'].get(isin) or {}
+        stock = {}
+        if 'details' in sections:
+            stock['details'] = _build_stock_details(
+                company, live, rows['fy'].get(isin, []),
+                rows['periods'].get(isin, []), rows['history'].get(isin, [])
+            )
+        if 'info' in sections:
+            stock['info'] = _build_stock_info(company, rows['live'].get(isin))
+        if 'dcf' in sections:
+            stock['dcf'] = _build_dcf_data(
+                company, live, rows['fy'].get(isin, []),
+                rows['estimates'].get(isin, []), rows['scenarios'].get(isin, [])
+            )
+        stocks[isin] = stock
+
+    return stocks
+
+
 @app.route("/api/stock/<isin>/details")
 @login_required
+@conditional_data()
 def get_stock_details(isin):
     """
     API: Detaildaten für eine Aktie (Modal-Ansicht).
@@ -591,289 +1511,11 @@ def get_stock_details(isin):
     cur = conn.cursor(dictionary=True)
 
     try:
-        # 1. Stammdaten aus company_info
-        cur.execute("""
-            SELECT isin, ticker, company_name, sector, industry, country, currency, fiscal_year_end
-            FROM analytics.company_info
-            WHERE isin = %s
-        """, (isin,))
-        company = cur.fetchone()
-
-        if not company:
+        stock = load_stock_sections(cur, current_user.id, [isin], ['details']).get(isin)
+        if not stock:
             return jsonify({"error": "Aktie nicht gefunden"}), 404
 
-        # 2. Aktuelle Kennzahlen aus live_metrics (inkl. alle PE-, EV/EBIT-, CAGR- und Margen-Werte)
-        cur.execute("""
-            SELECT market_cap, price, price_date,
-                   ttm_pe, fy_pe,
-                   pe_avg_5y, pe_avg_10y, pe_avg_15y, pe_avg_20y, pe_avg_10y_2019,
-                   pe_avg_5y_count, pe_avg_10y_count, pe_avg_15y_count, pe_avg_20y_count,
-                   yf_ttm_pe, yf_forward_pe,
-                   ttm_ev_ebit, fy_ev_ebit,
-                   ev_ebit_avg_5y, ev_ebit_avg_10y, ev_ebit_avg_15y, ev_ebit_avg_20y, ev_ebit_avg_10y_2019,
-                   ev_ebit_avg_5y_count, ev_ebit_avg_10y_count, ev_ebit_avg_15y_count, ev_ebit_avg_20y_count,
-                   revenue_cagr_3y, revenue_cagr_5y, revenue_cagr_10y,
-                   ebit_cagr_3y, ebit_cagr_5y, ebit_cagr_10y,
-                   net_income_cagr_3y, net_income_cagr_5y, net_income_cagr_10y,
-                   profit_margin, operating_margin,
-                   profit_margin_avg_3y, profit_margin_avg_5y, profit_margin_avg_10y, profit_margin_avg_5y_2019,
-                   operating_margin_avg_3y, operating_margin_avg_5y, operating_margin_avg_10y, operating_margin_avg_5y_2019,
-                   yf_ttm_pe_vs_avg_5y, yf_ttm_pe_vs_avg_10y, yf_ttm_pe_vs_avg_15y, yf_ttm_pe_vs_avg_20y, yf_ttm_pe_vs_avg_10y_2019,
-                   yf_fwd_pe_vs_avg_5y, yf_fwd_pe_vs_avg_10y, yf_fwd_pe_vs_avg_15y, yf_fwd_pe_vs_avg_20y, yf_fwd_pe_vs_avg_10y_2019,
-                   ev_ebit_vs_avg_5y, ev_ebit_vs_avg_10y, ev_ebit_vs_avg_15y, ev_ebit_vs_avg_20y, ev_ebit_vs_avg_10y_2019
-            FROM analytics.live_metrics
-            WHERE isin = %s
-        """, (isin,))
-        live = cur.fetchone() or {}
-
-        # 3. EV-Komponenten aus dem letzten FY-Eintrag holen
-        cur.execute("""
-            SELECT market_cap, net_debt, minority_interest
-            FROM analytics.fmp_filtered_numbers
-            WHERE isin = %s AND period = 'FY'
-            ORDER BY date DESC
-            LIMIT 1
-        """, (isin,))
-        ev_components = cur.fetchone() or {}
-
-        # 4. TTM-Berechnung: Quartale ODER Halbjahre aus fmp_filtered_numbers
-        cur.execute("""
-            SELECT period, date, net_income, revenue, gross_profit, operating_income
-            FROM analytics.fmp_filtered_numbers
-            WHERE isin = %s AND period != 'FY'
-              AND date >= DATE_SUB(CURDATE(), INTERVAL 18 MONTH)
-            ORDER BY date DESC
-        """, (isin,))
-        all_periods = cur.fetchall()
-
-        # Prüfe ob Quartals- oder Halbjahresberichterstatter
-        period_types = set(p['period'] for p in all_periods)
-        is_semiannual = period_types.issubset({'Q2', 'Q4', 'H1', 'H2'})
-
-        # TTM-Werte berechnen
-        ttm_net_income = None
-        ttm_revenue = None
-        ttm_gross_profit = None
-        ttm_operating_income = None
-        periods_for_display = []
-
-        if is_semiannual and len(all_periods) >= 2:
-            # Halbjahresberichterstatter: 2 Halbjahre
-            periods_for_display = all_periods[:2]
-        elif len(all_periods) >= 4:
-            # Quartalsberichterstatter: 4 Quartale
-            periods_for_display = all_periods[:4]
-
-        if periods_for_display:
-            # Net Income
-            ni_values = [p['net_income'] for p in periods_for_display if p['net_income'] is not None]
-            if len(ni_values) == len(periods_for_display):
-                ttm_net_income = sum(ni_values)
-
-            # Revenue
-            rev_values = [p['revenue'] for p in periods_for_display if p['revenue'] is not None]
-            if len(rev_values) == len(periods_for_display):
-                ttm_revenue = sum(rev_values)
-
-            # Gross Profit
-            gp_values = [p['gross_profit'] for p in periods_for_display if p['gross_profit'] is not None]
-            if len(gp_values) == len(periods_for_display):
-                ttm_gross_profit = sum(gp_values)
-
-            # Operating Income
-            oi_values = [p['operating_income'] for p in periods_for_display if p['operating_income'] is not None]
-            if len(oi_values) == len(periods_for_display):
-                ttm_operating_income = sum(oi_values)
-
-        # Perioden für Anzeige formatieren (ältestes zuerst)
-        quarters_display = []
-        quarters_ebit_display = []
-        for q in reversed(periods_for_display):
-            quarters_display.append({
-                "period": q['period'],
-                "date": q['date'].strftime('%Y-%m-%d') if q['date'] else None,
-                "net_income": q['net_income']
-            })
-            quarters_ebit_display.append({
-                "period": q['period'],
-                "date": q['date'].strftime('%Y-%m-%d') if q['date'] else None,
-                "operating_income": q['operating_income']
-            })
-
-        # 5. KGV-Verlauf: Letzte 20 FY-Jahre aus calcu_numbers
-        cur.execute("""
-            SELECT YEAR(date) as year, fy_pe
-            FROM analytics.calcu_numbers
-            WHERE isin = %s AND period = 'FY' AND fy_pe IS NOT NULL
-            ORDER BY date DESC
-            LIMIT 20
-        """, (isin,))
-        pe_history_raw = cur.fetchall()
-
-        # In chronologischer Reihenfolge (ältestes zuerst)
-        pe_history = []
-        for row in reversed(pe_history_raw):
-            pe_history.append({
-                "year": row['year'],
-                "pe": round(row['fy_pe'], 2) if row['fy_pe'] else None
-            })
-
-        # Aktuelles TTM PE ans Ende anhängen (falls vorhanden)
-        current_ttm_pe = live.get('ttm_pe')
-
-        # 6. EV/EBIT-Verlauf: Letzte 20 FY-Jahre aus calcu_numbers
-        cur.execute("""
-            SELECT YEAR(date) as year, fy_ev_ebit
-            FROM analytics.calcu_numbers
-            WHERE isin = %s AND period = 'FY' AND fy_ev_ebit IS NOT NULL
-            ORDER BY date DESC
-            LIMIT 20
-        """, (isin,))
-        ev_ebit_history_raw = cur.fetchall()
-
-        # In chronologischer Reihenfolge (ältestes zuerst)
-        ev_ebit_history = []
-        for row in reversed(ev_ebit_history_raw):
-            ev_ebit_history.append({
-                "year": row['year'],
-                "ev_ebit": round(row['fy_ev_ebit'], 2) if row['fy_ev_ebit'] else None
-            })
-
-        current_ttm_ev_ebit = live.get('ttm_ev_ebit')
-
-        # 7. Income Statement: Letzte 10 FY-Jahre aus fmp_filtered_numbers
-        cur.execute("""
-            SELECT YEAR(date) as year, revenue, gross_profit, operating_income, net_income
-            FROM analytics.fmp_filtered_numbers
-            WHERE isin = %s AND period = 'FY'
-            ORDER BY date DESC
-            LIMIT 10
-        """, (isin,))
-        income_raw = cur.fetchall()
-
-        # In chronologischer Reihenfolge (ältestes zuerst)
-        income_statement = []
-        for row in reversed(income_raw):
-            income_statement.append({
-                "year": row['year'],
-                "revenue": row['revenue'],
-                "gross_profit": row['gross_profit'],
-                "operating_income": row['operating_income'],
-                "net_income": row['net_income']
-            })
-
-        # Response zusammenbauen
-        result = {
-            "company": {
-                "isin": company['isin'],
-                "ticker": company['ticker'],
-                "name": company['company_name'],
-                "sector": company['sector'],
-                "industry": company['industry'],
-                "country": company['country'],
-                "currency": company['currency']
-            },
-            "current": {
-                "market_cap": live.get('market_cap'),
-                "price": live.get('price'),
-                "price_date": live.get('price_date').strftime('%Y-%m-%d') if live.get('price_date') else None,
-                "ttm_pe": round(current_ttm_pe, 2) if current_ttm_pe else None
-            },
-            "pe_overview": {
-                "ttm_pe": round(live.get('ttm_pe'), 2) if live.get('ttm_pe') else None,
-                "fy_pe": round(live.get('fy_pe'), 2) if live.get('fy_pe') else None,
-                "pe_avg_5y": round(live.get('pe_avg_5y'), 2) if live.get('pe_avg_5y') else None,
-                "pe_avg_10y": round(live.get('pe_avg_10y'), 2) if live.get('pe_avg_10y') else None,
-                "pe_avg_15y": round(live.get('pe_avg_15y'), 2) if live.get('pe_avg_15y') else None,
-                "pe_avg_20y": round(live.get('pe_avg_20y'), 2) if live.get('pe_avg_20y') else None,
-                "pe_avg_10y_2019": round(live.get('pe_avg_10y_2019'), 2) if live.get('pe_avg_10y_2019') else None,
-                "pe_avg_5y_count": live.get('pe_avg_5y_count'),
-                "pe_avg_10y_count": live.get('pe_avg_10y_count'),
-                "pe_avg_15y_count": live.get('pe_avg_15y_count'),
-                "pe_avg_20y_count": live.get('pe_avg_20y_count'),
-                "yf_ttm_pe": round(live.get('yf_ttm_pe'), 2) if live.get('yf_ttm_pe') else None,
-                "yf_forward_pe": round(live.get('yf_forward_pe'), 2) if live.get('yf_forward_pe') else None,
-                # Abweichungen TTM-KGV vs. Durchschnitte
-                "yf_ttm_pe_vs_avg_5y": round(live.get('yf_ttm_pe_vs_avg_5y'), 1) if live.get('yf_ttm_pe_vs_avg_5y') else None,
-                "yf_ttm_pe_vs_avg_10y": round(live.get('yf_ttm_pe_vs_avg_10y'), 1) if live.get('yf_ttm_pe_vs_avg_10y') else None,
-                "yf_ttm_pe_vs_avg_15y": round(live.get('yf_ttm_pe_vs_avg_15y'), 1) if live.get('yf_ttm_pe_vs_avg_15y') else None,
-                "yf_ttm_pe_vs_avg_20y": round(live.get('yf_ttm_pe_vs_avg_20y'), 1) if live.get('yf_ttm_pe_vs_avg_20y') else None,
-                "yf_ttm_pe_vs_avg_10y_2019": round(live.get('yf_ttm_pe_vs_avg_10y_2019'), 1) if live.get('yf_ttm_pe_vs_avg_10y_2019') else None,
-                # Abweichungen Forward-KGV vs. Durchschnitte
-                "yf_fwd_pe_vs_avg_5y": round(live.get('yf_fwd_pe_vs_avg_5y'), 1) if live.get('yf_fwd_pe_vs_avg_5y') else None,
-                "yf_fwd_pe_vs_avg_10y": round(live.get('yf_fwd_pe_vs_avg_10y'), 1) if live.get('yf_fwd_pe_vs_avg_10y') else None,
-                "yf_fwd_pe_vs_avg_15y": round(live.get('yf_fwd_pe_vs_avg_15y'), 1) if live.get('yf_fwd_pe_vs_avg_15y') else None,
-                "yf_fwd_pe_vs_avg_20y": round(live.get('yf_fwd_pe_vs_avg_20y'), 1) if live.get('yf_fwd_pe_vs_avg_20y') else None,
-                "yf_fwd_pe_vs_avg_10y_2019": round(live.get('yf_fwd_pe_vs_avg_10y_2019'), 1) if live.get('yf_fwd_pe_vs_avg_10y_2019') else None
-            },
-            "ev_ebit_overview": {
-                "ttm_ev_ebit": round(live.get('ttm_ev_ebit'), 2) if live.get('ttm_ev_ebit') else None,
-                "fy_ev_ebit": round(live.get('fy_ev_ebit'), 2) if live.get('fy_ev_ebit') else None,
-                "ev_ebit_avg_5y": round(live.get('ev_ebit_avg_5y'), 2) if live.get('ev_ebit_avg_5y') else None,
-                "ev_ebit_avg_10y": round(live.get('ev_ebit_avg_10y'), 2) if live.get('ev_ebit_avg_10y') else None,
-                "ev_ebit_avg_15y": round(live.get('ev_ebit_avg_15y'), 2) if live.get('ev_ebit_avg_15y') else None,
-                "ev_ebit_avg_20y": round(live.get('ev_ebit_avg_20y'), 2) if live.get('ev_ebit_avg_20y') else None,
-                "ev_ebit_avg_10y_2019": round(live.get('ev_ebit_avg_10y_2019'), 2) if live.get('ev_ebit_avg_10y_2019') else None,
-                "ev_ebit_avg_5y_count": live.get('ev_ebit_avg_5y_count'),
-                "ev_ebit_avg_10y_count": live.get('ev_ebit_avg_10y_count'),
-                "ev_ebit_avg_15y_count": live.get('ev_ebit_avg_15y_count'),
-                "ev_ebit_avg_20y_count": live.get('ev_ebit_avg_20y_count'),
-                # Abweichungen EV/EBIT vs. Durchschnitte
-                "ev_ebit_vs_avg_5y": round(live.get('ev_ebit_vs_avg_5y'), 1) if live.get('ev_ebit_vs_avg_5y') else None,
-                "ev_ebit_vs_avg_10y": round(live.get('ev_ebit_vs_avg_10y'), 1) if live.get('ev_ebit_vs_avg_10y') else None,
-                "ev_ebit_vs_avg_15y": round(live.get('ev_ebit_vs_avg_15y'), 1) if live.get('ev_ebit_vs_avg_15y') else None,
-                "ev_ebit_vs_avg_20y": round(live.get('ev_ebit_vs_avg_20y'), 1) if live.get('ev_ebit_vs_avg_20y') else None,
-                "ev_ebit_vs_avg_10y_2019": round(live.get('ev_ebit_vs_avg_10y_2019'), 1) if live.get('ev_ebit_vs_avg_10y_2019') else None
-            },
-            "growth_overview": {
-                "revenue_cagr_3y": round(live.get('revenue_cagr_3y'), 1) if live.get('revenue_cagr_3y') else None,
-                "revenue_cagr_5y": round(live.get('revenue_cagr_5y'), 1) if live.get('revenue_cagr_5y') else None,
-                "revenue_cagr_10y": round(live.get('revenue_cagr_10y'), 1) if live.get('revenue_cagr_10y') else None,
-                "ebit_cagr_3y": round(live.get('ebit_cagr_3y'), 1) if live.get('ebit_cagr_3y') else None,
-                "ebit_cagr_5y": round(live.get('ebit_cagr_5y'), 1) if live.get('ebit_cagr_5y') else None,
-                "ebit_cagr_10y": round(live.get('ebit_cagr_10y'), 1) if live.get('ebit_cagr_10y') else None,
-                "net_income_cagr_3y": round(live.get('net_income_cagr_3y'), 1) if live.get('net_income_cagr_3y') else None,
-                "net_income_cagr_5y": round(live.get('net_income_cagr_5y'), 1) if live.get('net_income_cagr_5y') else None,
-                "net_income_cagr_10y": round(live.get('net_income_cagr_10y'), 1) if live.get('net_income_cagr_10y') else None
-            },
-            "margins_overview": {
-                "profit_margin": round(live.get('profit_margin'), 1) if live.get('profit_margin') else None,
-                "operating_margin": round(live.get('operating_margin'), 1) if live.get('operating_margin') else None,
-                "profit_margin_avg_3y": round(live.get('profit_margin_avg_3y'), 1) if live.get('profit_margin_avg_3y') else None,
-                "profit_margin_avg_5y": round(live.get('profit_margin_avg_5y'), 1) if live.get('profit_margin_avg_5y') else None,
-                "profit_margin_avg_10y": round(live.get('profit_margin_avg_10y'), 1) if live.get('profit_margin_avg_10y') else None,
-                "profit_margin_avg_5y_2019": round(live.get('profit_margin_avg_5y_2019'), 1) if live.get('profit_margin_avg_5y_2019') else None,
-                "operating_margin_avg_3y": round(live.get('operating_margin_avg_3y'), 1) if live.get('operating_margin_avg_3y') else None,
-                "operating_margin_avg_5y": round(live.get('operating_margin_avg_5y'), 1) if live.get('operating_margin_avg_5y') else None,
-                "operating_margin_avg_10y": round(live.get('operating_margin_avg_10y'), 1) if live.get('operating_margin_avg_10y') else None,
-                "operating_margin_avg_5y_2019": round(live.get('operating_margin_avg_5y_2019'), 1) if live.get('operating_margin_avg_5y_2019') else None
-            },
-            "ttm_calculation": {
-                "market_cap": live.get('market_cap'),
-                "ttm_net_income": ttm_net_income,
-                "quarters": quarters_display
-            },
-            "ev_calculation": {
-                "market_cap": live.get('market_cap'),
-                "net_debt": ev_components.get('net_debt'),
-                "minority_interest": ev_components.get('minority_interest'),
-                "ttm_ebit": ttm_operating_income,
-                "quarters": quarters_ebit_display
-            },
-            "ttm_income_statement": {
-                "revenue": ttm_revenue,
-                "gross_profit": ttm_gross_profit,
-                "operating_income": ttm_operating_income,
-                "net_income": ttm_net_income
-            },
-            "pe_history": pe_history,
-            "current_ttm_pe": round(current_ttm_pe, 2) if current_ttm_pe else None,
-            "ev_ebit_history": ev_ebit_history,
-            "current_ttm_ev_ebit": round(current_ttm_ev_ebit, 2) if current_ttm_ev_ebit else None,
-            "income_statement": income_statement
-        }
-
-        return jsonify(result)
+        return jsonify(stock['details'])
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -909,6 +1551,7 @@ def update_columns(view_name):
             """, (col['is_visible'], col['sort_order'], user_id, view_name, col['column_key']))
 
         conn.commit()
+        touch_user_state(user_id)
         return jsonify({"success": True})
 
     except Exception as e:
@@ -922,6 +1565,7 @@ def update_columns(view_name):
 
 @app.route("/api/stock/<isin>/info")
 @login_required
+@conditional_data()
 def get_stock_info(isin):
     """
     API: Unternehmensinformationen für Modal.
@@ -936,32 +1580,59 @@ def get_stock_info(isin):
     cur = conn.cursor(dictionary=True)
 
     try:
-        cur.execute("""
-            SELECT isin, ticker, company_name, sector, industry, country,
-                   currency, description, fiscal_year_end, stock_index
-            FROM analytics.company_info
-            WHERE isin = %s
-        """, (isin,))
-        info = cur.fetchone()
-
-        if not info:
+        stock = load_stock_sections(cur, current_user.id, [isin], ['info']).get(isin)
+        if not stock:
             return jsonify({"error": "Aktie nicht gefunden"}), 404
 
-        # Marktkapitalisierung aus live_metrics abrufen
-        cur.execute("""
-            SELECT market_cap
-            FROM analytics.live_metrics
-            WHERE isin = %s
-        """, (isin,))
-        metrics = cur.fetchone()
+        return jsonify(stock['info'])
 
-        if metrics:
-            info['market_cap'] = metrics['market_cap']
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
 
-        return jsonify(info)
+
+@app.route("/api/stocks")
+@login_required
+@conditional_data(user_state=True)
+def get_stocks_batch():
+    """
+    API: Modal-Daten mehrerer Aktien in einem Request (z. B. Prefetch der Watchlist).
+
+    Query-Parameter:
+    - isins: kommagetrennt, höchstens STOCK_BATCH_MAX_ISINS
+    - sections: kommagetrennt aus details, info, dcf (Standard: details)
+
+    Liefert {"stocks": {isin: {section: ...}}, "missing": [...]}; die Sections
+    entsprechen den Antworten der Einzel-Routen.
+    """
+    isins = list(dict.fromkeys(
+        isin.strip() for isin in request.args.get('isins', '').split(',') if isin.strip()
+    ))
+    sections = [s.strip() for s in request.args.get('sections', 'details').split(',') if s.strip()]
+
+    if not isins:
+        return jsonify({"error": "Keine ISINs angegeben"}), 400
+    if len(isins) > STOCK_BATCH_MAX_ISINS:
+        return jsonify({"error": f"Maximal {STOCK_BATCH_MAX_ISINS} ISINs pro Request"}), 400
+    invalid = [s for s in sections if s not in STOCK_SECTIONS]
+    if invalid or not sections:
+        return jsonify({"error": f"Ungültige Sections: {', '.join(invalid)}"}), 400
+
+    conn = get_connection()
+    cur = conn.cursor(dictionary=True)
+
+    try:
+        stocks = load_stock_sections(cur, current_user.id, isins, sections)
+        return jsonify({
+            "stocks": stocks,
+            "missing": [isin for isin in isins if isin not in stocks]
+        })
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
     finally:
         cur.close()
         conn.close()
@@ -1077,7 +1748,7 @@ def admin_users():
     cur.close()
     conn.close()
 
-    return render_template("admin_users.html", users=users)
+    return render_template("admin_users.html", users=users, cache_stats=user_cache_stats())
 
 
 @app.route("/admin/users/<int:user_id>/approve", methods=["POST"])
@@ -1093,6 +1764,7 @@ def admin_approve_user(user_id):
 
     cur.close()
     conn.close()
+    invalidate_user(user_id)
 
     flash('Benutzer wurde freigeschaltet.', 'success')
     return redirect(url_for('admin_users'))
@@ -1111,6 +1783,7 @@ def admin_toggle_active(user_id):
 
     cur.close()
     conn.close()
+    invalidate_user(user_id)
 
     flash('Benutzer-Status wurde geändert.', 'success')
     return redirect(url_for('admin_users'))
@@ -1129,256 +1802,214 @@ def admin_make_admin(user_id):
 
     cur.close()
     conn.close()
+    invalidate_user(user_id)
 
     flash('Benutzer wurde zum Administrator gemacht.', 'success')
     return redirect(url_for('admin_users'))
 
 
+@app.route("/admin/metrics")
+@login_required
+@admin_required
+def admin_metrics():
+    """Latenzen (p50/p95/p99) und DB-Anteil je Route, langsame Queries."""
+    return render_template("admin_metrics.html", routes=metrics.route_stats(),
+                           slow_queries=metrics.slow_queries(), info=metrics.metrics_info(),
+                           flush_s=metrics.METRICS_FLUSH_S)
+
+
+@app.route("/admin/metrics/reset", methods=["POST"])
+@login_required
+@admin_required
+def admin_metrics_reset():
+    """Messwerte aller Worker zurücksetzen."""
+    metrics.reset()
+    flash('Messwerte wurden zurückgesetzt.', 'success')
+    return redirect(url_for('admin_metrics'))
+
+
+@app.route("/admin/user-cache")
+@login_required
+@admin_required
+def admin_user_cache():
+    """Trefferzähler des User-Caches (load_user)."""
+    return jsonify(user_cache_stats())
+
+
 # =============================================================================
 # DCF Modal API Endpoints
 # =============================================================================
 
+# Standard-Raster der Sensitivitätsmatrix (WACC x Terminal Growth)
+SENSITIVITY_WACC_STEPS = 5
+SENSITIVITY_TGR_STEPS = 3
+SENSITIVITY_MAX_STEPS = 51
+# Abstand zweier Rasterpunkte in Prozentpunkten (Default und Obergrenze)
+SENSITIVITY_STEP_PCT = 0.5
+SENSITIVITY_MAX_STEP_PCT = 5.0
+
+
+def _clamp_grid_steps(value, default):
+    """Rasterschritte aus dem Request validieren (ungerade, 1..SENSITIVITY_MAX_STEPS)."""
+    try:
+        steps = int(value)
+    except (TypeError, ValueError):
+        return default
+    steps = max(1, min(steps, SENSITIVITY_MAX_STEPS))
+    # Ungerade Anzahl, damit der gewählte Wert in der Mitte liegt
+    return steps if steps % 2 == 1 else steps + 1
+
+
+def _clamp_step_size(value, default=SENSITIVITY_STEP_PCT):
+    """Rasterabstand (Prozentpunkte) validieren: > 0, höchstens SENSITIVITY_MAX_STEP_PCT."""
+    try:
+        step = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(step) or step <= 0:
+        return default
+    return min(step, SENSITIVITY_MAX_STEP_PCT)
+
+
+def _load_dcf_base(cur, isins: list[str]) -> dict:
+    """
+    Holt die DCF-Basisdaten (letztes FY: Revenue, Net Debt, Shares; aktueller Kurs)
+    für mehrere ISINs mit je einer set-basierten Query.
+    """
+    if not isins:
+        return {}
+
+    placeholders = ','.join(['%s'] * len(isins))
+
+    cur.execute(f"""
+        SELECT f.isin, f.revenue, f.net_debt,
+               f.weighted_average_shs_out_dil as shares_outstanding
+        FROM analytics.fmp_filtered_numbers f
+        INNER JOIN (
+            SELECT isin, MAX(date) as max_date
+            FROM analytics.fmp_filtered_numbers
+            WHERE period = 'FY' AND isin IN ({placeholders})
+            GROUP BY isin
+        ) latest ON f.isin = latest.isin AND f.date = latest.max_date
+        WHERE f.period = 'FY'
+    """, isins)
+
+    base = {}
+    for row in cur.fetchall():
+        # Doppelte Zeilen (mehrere Indizes) → erste gewinnt
+        base.setdefault(row['isin'], row)
+
+    cur.execute(f"""
+        SELECT ci.isin, ci.company_name, ci.currency, lm.price
+        FROM analytics.company_info ci
+        LEFT JOIN analytics.live_metrics lm ON ci.isin = lm.isin
+        WHERE ci.isin IN ({placeholders})
+    """, isins)
+
+    for row in cur.fetchall():
+        entry = base.setdefault(row['isin'], {'isin': row['isin']})
+        entry['company_name'] = row['company_name']
+        entry['currency'] = row['currency']
+        entry['price'] = row['price']
+
+    return base
+
+
+def _value_saved_scenarios(cur, user_id: int, isins: list[str]) -> dict:
+    """
+    Bewertet alle gespeicherten DCF-Szenarien des Users für die ISINs
+    in einem einzigen vektorisierten Engine-Aufruf.
+    """
+    if not isins:
+        return {}
+
+    placeholders = ','.join(['%s'] * len(isins))
+    cur.execute(f"""
+        SELECT id, isin, scenario_name,
+               {', '.join(dcf_engine.ASSUMPTION_KEYS)},
+               fair_value_per_share, updated_at
+        FROM analytics.user_dcf_scenarios
+        WHERE user_id = %s AND isin IN ({placeholders})
+        ORDER BY isin, updated_at DESC
+    """, [user_id] + isins)
+    scenarios = cur.fetchall()
+
+    base = _load_dcf_base(cur, sorted({s['isin'] for s in scenarios}))
+
+    results = {}
+    for isin in isins:
+        if any(s['isin'] == isin for s in scenarios):
+            info = base.get(isin, {})
+            results[isin] = {
+                "isin": isin,
+                "name": info.get('company_name'),
+                "currency": info.get('currency'),
+                "current_price": info.get('price'),
+                "scenarios": []
+            }
+
+    # Nur Szenarien mit vollständigen Basisdaten rechnen
+    valid = [
+        s for s in scenarios
+        if base.get(s['isin'], {}).get('revenue')
+        and (base[s['isin']].get('shares_outstanding') or 0) > 0
+    ]
+
+    if valid:
+        rows = [base[s['isin']] for s in valid]
+        dcf = dcf_engine.evaluate(
+            [r['revenue'] for r in rows],
+            [r.get('net_debt') for r in rows],
+            [r['shares_outstanding'] for r in rows],
+            dcf_engine.assumptions_to_arrays(valid)
+        )
+        upsides = dcf_engine.upside(dcf['fair_value'], [r.get('price') for r in rows])
+
+        for i, s in enumerate(valid):
+            results[s['isin']]['scenarios'].append({
+                "id": s['id'],
+                "scenario_name": s['scenario_name'],
+                "fair_value": dcf_engine.to_python(dcf['fair_value'][i], 2),
+                "enterprise_value": dcf_engine.to_python(dcf['enterprise_value'][i]),
+                "equity_value": dcf_engine.to_python(dcf['equity_value'][i]),
+                "upside": dcf_engine.to_python(upsides[i], 1),
+                "stored_fair_value": s['fair_value_per_share'],
+                "updated_at": s['updated_at'].strftime('%Y-%m-%d %H:%M') if s['updated_at'] else None
+            })
+
+    valid_ids = {s['id'] for s in valid}
+    for s in scenarios:
+        if s['id'] not in valid_ids:
+            results[s['isin']]['scenarios'].append({
+                "id": s['id'],
+                "scenario_name": s['scenario_name'],
+                "error": "Keine Revenue-Daten oder Aktienanzahl verfügbar"
+            })
+
+    return results
+
 @app.route("/api/stock/<isin>/dcf-data")
 @login_required
+@conditional_data(user_state=True)
 def get_dcf_data(isin):
     """
     API: DCF-Daten für eine Aktie.
 
     Liefert:
-    - Historische Daten (10 Jahre): Revenue, EBIT, FCF, Margen
+    - Historische Daten (5 Jahre): Revenue, EBIT, FCF, Margen
     - Aktuelle Kennzahlen: Preis, Market Cap, Net Debt, Shares Outstanding
     - Default-Annahmen basierend auf historischen Werten
     - Gespeicherte Szenarien des Users
     """
-    user_id = current_user.id
     conn = get_connection()
     cur = conn.cursor(dictionary=True)
 
     try:
-        # 1. Stammdaten
-        cur.execute("""
-            SELECT isin, ticker, company_name, currency
-            FROM analytics.company_info
-            WHERE isin = %s
-        """, (isin,))
-        company = cur.fetchone()
-
-        if not company:
+        stock = load_stock_sections(cur, current_user.id, [isin], ['dcf']).get(isin)
+        if not stock:
             return jsonify({"error": "Aktie nicht gefunden"}), 404
 
-        # 2. Aktuelle Kennzahlen aus live_metrics
-        cur.execute("""
-            SELECT market_cap, price, price_date,
-                   revenue_cagr_3y, revenue_cagr_5y, revenue_cagr_10y,
-                   operating_margin, operating_margin_avg_5y
-            FROM analytics.live_metrics
-            WHERE isin = %s
-        """, (isin,))
-        live = cur.fetchone() or {}
-
-        # 3. Net Debt und Shares Outstanding aus fmp_filtered_numbers
-        cur.execute("""
-            SELECT net_debt, weighted_average_shs_out_dil as shares_outstanding
-            FROM analytics.fmp_filtered_numbers
-            WHERE isin = %s AND period = 'FY'
-            ORDER BY date DESC
-            LIMIT 1
-        """, (isin,))
-        balance = cur.fetchone() or {}
-
-        # 4. Historische Daten (5 Jahre) für Revenue, EBIT, FCF
-        cur.execute("""
-            SELECT YEAR(date) as year, revenue, operating_income,
-                   free_cash_flow, net_income
-            FROM analytics.fmp_filtered_numbers
-            WHERE isin = %s AND period = 'FY'
-            ORDER BY date DESC
-            LIMIT 5
-        """, (isin,))
-        historical_raw = cur.fetchall()
-
-        # In chronologischer Reihenfolge (ältestes zuerst)
-        historical = []
-        for row in reversed(historical_raw):
-            revenue = row['revenue']
-            ebit = row['operating_income']
-            fcf = row['free_cash_flow']
-
-            # Margen berechnen
-            ebit_margin = (ebit / revenue * 100) if revenue and ebit else None
-            fcf_margin = (fcf / revenue * 100) if revenue and fcf else None
-
-            historical.append({
-                "year": row['year'],
-                "revenue": revenue,
-                "ebit": ebit,
-                "fcf": fcf,
-                "ebit_margin": round(ebit_margin, 1) if ebit_margin else None,
-                "fcf_margin": round(fcf_margin, 1) if fcf_margin else None
-            })
-
-        # 4b. Analyst Estimates aus finanzen.net (Revenue, EBIT, FCF)
-        cur.execute("""
-            SELECT period, metric, estimate_value, currency, unit
-            FROM analytics.analyst_estimates
-            WHERE isin = %s
-              AND metric IN ('revenue', 'ebit', 'free_cashflow')
-              AND period_type = 'fiscal_year'
-            ORDER BY period ASC
-        """, (isin,))
-        estimates_raw = cur.fetchall()
-
-        # Estimates nach Jahr gruppieren
-        last_hist_year = historical[-1]['year'] if historical else 0
-        estimates_by_year = {}
-
-        for row in estimates_raw:
-            period = row['period']
-            year_match = re.search(r'(\d{4})', period)
-            if year_match:
-                year = int(year_match.group(1))
-                # Nur zukünftige Jahre (nach letztem historischen Jahr)
-                if year > last_hist_year:
-                    if year not in estimates_by_year:
-                        estimates_by_year[year] = {
-                            "year": year,
-                            "revenue": None,
-                            "ebit": None,
-                            "fcf": None,
-                            "ebit_margin": None,
-                            "is_estimate": True
-                        }
-
-                    # Wert konvertieren (Mio zu absolut)
-                    value = row['estimate_value']
-                    if row['unit'] == 'millions' and value:
-                        value = float(value) * 1_000_000
-
-                    metric = row['metric']
-                    if metric == 'revenue':
-                        estimates_by_year[year]['revenue'] = value
-                    elif metric == 'ebit':
-                        estimates_by_year[year]['ebit'] = value
-                    elif metric == 'free_cashflow':
-                        estimates_by_year[year]['fcf'] = value
-
-        # EBIT-Marge berechnen wo möglich
-        for year_data in estimates_by_year.values():
-            if year_data['revenue'] and year_data['ebit']:
-                year_data['ebit_margin'] = round(
-                    (year_data['ebit'] / year_data['revenue']) * 100, 1
-                )
-
-        # In sortierte Liste umwandeln
-        estimates = [estimates_by_year[y] for y in sorted(estimates_by_year.keys())]
-
-        # 5. CAGR berechnen aus historischen Daten
-        revenue_cagr_3y = None
-        revenue_cagr_5y = None
-        revenue_cagr_10y = None
-
-        if len(historical) >= 4:
-            start_rev = historical[-4]['revenue']
-            end_rev = historical[-1]['revenue']
-            if start_rev and end_rev and start_rev > 0:
-                revenue_cagr_3y = ((end_rev / start_rev) ** (1/3) - 1) * 100
-
-        if len(historical) >= 6:
-            start_rev = historical[-6]['revenue']
-            end_rev = historical[-1]['revenue']
-            if start_rev and end_rev and start_rev > 0:
-                revenue_cagr_5y = ((end_rev / start_rev) ** (1/5) - 1) * 100
-
-        if len(historical) >= 10:
-            start_rev = historical[0]['revenue']
-            end_rev = historical[-1]['revenue']
-            if start_rev and end_rev and start_rev > 0:
-                revenue_cagr_10y = ((end_rev / start_rev) ** (1/10) - 1) * 100
-
-        # Fallback auf live_metrics CAGRs
-        revenue_cagr_3y = revenue_cagr_3y or live.get('revenue_cagr_3y')
-        revenue_cagr_5y = revenue_cagr_5y or live.get('revenue_cagr_5y')
-        revenue_cagr_10y = revenue_cagr_10y or live.get('revenue_cagr_10y')
-
-        # 6. Default-Annahmen berechnen
-        # Letzter Revenue für Berechnungen
-        last_revenue = historical[-1]['revenue'] if historical else None
-
-        # Durchschnittliche EBIT-Marge der letzten 5 Jahre
-        ebit_margins = [h['ebit_margin'] for h in historical[-5:] if h['ebit_margin'] is not None]
-        avg_ebit_margin = sum(ebit_margins) / len(ebit_margins) if ebit_margins else (live.get('operating_margin') or 15.0)
-
-        # Default Wachstum basierend auf historischem CAGR
-        default_growth = revenue_cagr_5y or revenue_cagr_3y or 5.0
-
-        defaults = {
-            "revenue_growth_y1": round(default_growth, 1) if default_growth else 8.0,
-            "revenue_growth_y2": round(default_growth * 0.9, 1) if default_growth else 7.0,
-            "revenue_growth_y3": round(default_growth * 0.8, 1) if default_growth else 6.0,
-            "revenue_growth_y4": round(default_growth * 0.7, 1) if default_growth else 5.0,
-            "revenue_growth_y5": round(default_growth * 0.6, 1) if default_growth else 4.0,
-            "revenue_growth_y6": round(default_growth * 0.5, 1) if default_growth else 3.5,
-            "revenue_growth_y7": round(default_growth * 0.4, 1) if default_growth else 3.0,
-            "revenue_growth_y8": round(default_growth * 0.35, 1) if default_growth else 2.5,
-            "revenue_growth_y9": round(default_growth * 0.3, 1) if default_growth else 2.0,
-            "revenue_growth_y10": round(default_growth * 0.25, 1) if default_growth else 2.0,
-            "ebit_margin": round(avg_ebit_margin, 1),
-            "tax_rate": 25.0,
-            "capex_percent": 3.0,
-            "wc_change_percent": 0.0,
-            "depreciation_percent": 3.0,
-            "terminal_growth": 2.0,
-            "wacc": 9.0
-        }
-
-        # 7. Gespeicherte Szenarien des Users laden
-        cur.execute("""
-            SELECT id, scenario_name, revenue_growth_y1, revenue_growth_y2,
-                   revenue_growth_y3, revenue_growth_y4, revenue_growth_y5,
-                   revenue_growth_y6, revenue_growth_y7, revenue_growth_y8,
-                   revenue_growth_y9, revenue_growth_y10,
-                   ebit_margin, tax_rate, capex_percent, wc_change_percent,
-                   depreciation_percent, terminal_growth, wacc,
-                   fair_value_per_share, created_at, updated_at
-            FROM analytics.user_dcf_scenarios
-            WHERE user_id = %s AND isin = %s
-            ORDER BY updated_at DESC
-        """, (user_id, isin))
-        scenarios = cur.fetchall()
-
-        # Datetime zu String konvertieren
-        for s in scenarios:
-            if s['created_at']:
-                s['created_at'] = s['created_at'].strftime('%Y-%m-%d %H:%M')
-            if s['updated_at']:
-                s['updated_at'] = s['updated_at'].strftime('%Y-%m-%d %H:%M')
-
-        result = {
-            "company": {
-                "isin": company['isin'],
-                "ticker": company['ticker'],
-                "name": company['company_name'],
-                "currency": company['currency']
-            },
-            "current": {
-                "market_cap": live.get('market_cap'),
-                "price": live.get('price'),
-                "price_date": live.get('price_date').strftime('%Y-%m-%d') if live.get('price_date') else None,
-                "net_debt": balance.get('net_debt'),
-                "shares_outstanding": balance.get('shares_outstanding')
-            },
-            "cagr": {
-                "cagr_3y": round(revenue_cagr_3y, 1) if revenue_cagr_3y else None,
-                "cagr_5y": round(revenue_cagr_5y, 1) if revenue_cagr_5y else None,
-                "cagr_10y": round(revenue_cagr_10y, 1) if revenue_cagr_10y else None
-            },
-            "historical": historical,
-            "estimates": estimates,
-            "defaults": defaults,
-            "scenarios": scenarios
-        }
-
-        return jsonify(result)
+        return jsonify(stock['dcf'])
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1394,13 +2025,14 @@ def calculate_dcf(isin):
     """
     API: DCF-Berechnung durchführen.
 
-    Nimmt Annahmen als JSON und berechnet:
-    - 5-Jahres-Prognose (Revenue, EBIT, NOPAT, FCF, Barwert)
+    Nimmt Annahmen als JSON und berechnet (über dcf_engine):
+    - 10-Jahres-Prognose (Revenue, EBIT, NOPAT, FCF, Barwert)
     - Terminal Value
     - Enterprise Value
     - Equity Value
     - Fair Value per Share
-    - Sensitivitätsmatrix (WACC x Terminal Growth)
+    - Sensitivitätsmatrix (WACC x Terminal Growth), Raster optional über
+      {"sensitivity": {"wacc_steps": 25, "tgr_steps": 25, "wacc_step": 0.5, "tgr_step": 0.5}}
     """
     data = request.json
     conn = get_connection()
@@ -1434,126 +2066,59 @@ def calculate_dcf(isin):
         if not shares_outstanding or shares_outstanding <= 0:
             return jsonify({"error": "Keine Aktienanzahl verfügbar"}), 400
 
-        # Annahmen aus Request
-        growth_rates = [
-            data.get('revenue_growth_y1', 8) / 100,
-            data.get('revenue_growth_y2', 7) / 100,
-            data.get('revenue_growth_y3', 6) / 100,
-            data.get('revenue_growth_y4', 5) / 100,
-            data.get('revenue_growth_y5', 4) / 100,
-            data.get('revenue_growth_y6', 3.5) / 100,
-            data.get('revenue_growth_y7', 3) / 100,
-            data.get('revenue_growth_y8', 2.5) / 100,
-            data.get('revenue_growth_y9', 2) / 100,
-            data.get('revenue_growth_y10', 2) / 100
-        ]
-        ebit_margin = data.get('ebit_margin', 15) / 100
-        tax_rate = data.get('tax_rate', 25) / 100
-        capex_percent = data.get('capex_percent', 3) / 100
-        wc_change_percent = data.get('wc_change_percent', 0) / 100
-        depreciation_percent = data.get('depreciation_percent', 3) / 100
-        terminal_growth = data.get('terminal_growth', 2) / 100
-        wacc = data.get('wacc', 9) / 100
-
-        # Prognose berechnen (10 Jahre)
-        projections = []
-        current_revenue = base_revenue
-
-        for year in range(1, 11):
-            growth = growth_rates[year - 1]
-            projected_revenue = current_revenue * (1 + growth)
-            ebit = projected_revenue * ebit_margin
-            depreciation = projected_revenue * depreciation_percent
-            nopat = ebit * (1 - tax_rate)
-            capex = projected_revenue * capex_percent
-            wc_change = (projected_revenue - current_revenue) * wc_change_percent
-            fcf = nopat + depreciation - capex - wc_change
-            discount_factor = 1 / ((1 + wacc) ** year)
-            pv_fcf = fcf * discount_factor
-
-            projections.append({
-                "year": year,
-                "revenue": projected_revenue,
-                "ebit": ebit,
-                "depreciation": depreciation,
-                "nopat": nopat,
-                "capex": capex,
-                "wc_change": wc_change,
-                "fcf": fcf,
-                "discount_factor": discount_factor,
-                "pv_fcf": pv_fcf
-            })
-
-            current_revenue = projected_revenue
-
-        # Terminal Value (nach Jahr 10)
-        final_fcf = projections[-1]['fcf']
+        # Annahmen aus Request (fehlende Werte → Defaults der Engine)
+        assumptions = dcf_engine.assumptions_to_arrays([data])
+        wacc = assumptions['wacc'][0]
+        terminal_growth = assumptions['terminal_growth'][0]
 
         if wacc <= terminal_growth:
             return jsonify({"error": "WACC muss größer als Terminal Growth sein"}), 400
 
-        terminal_value = final_fcf * (1 + terminal_growth) / (wacc - terminal_growth)
-        terminal_pv = terminal_value / ((1 + wacc) ** 10)
-
-        # Summe der Barwerte
-        sum_pv_fcf = sum(p['pv_fcf'] for p in projections)
-        enterprise_value = sum_pv_fcf + terminal_pv
-
-        # Equity Value
-        equity_value = enterprise_value - net_debt
-
-        # Fair Value per Share
-        fair_value = equity_value / shares_outstanding
+        # Prognose (10 Jahre), Terminal Value und Fair Value
+        dcf = dcf_engine.evaluate(base_revenue, net_debt, shares_outstanding, assumptions)
+        fair_value = float(dcf['fair_value'][0])
 
         # Upside/Downside
         current_price = live.get('price') or 0
-        upside = ((fair_value / current_price) - 1) * 100 if current_price > 0 else None
-
-        # Sensitivitätsmatrix berechnen
-        wacc_values = [wacc - 0.01, wacc - 0.005, wacc, wacc + 0.005, wacc + 0.01]
-        tgr_values = [terminal_growth - 0.005, terminal_growth, terminal_growth + 0.005]
-
-        sensitivity_matrix = []
-        for w in wacc_values:
-            row = []
-            for tg in tgr_values:
-                if w <= tg:
-                    row.append(None)
-                    continue
-
-                # Neu berechnen mit anderem WACC/TGR
-                pv_sum = 0
-                for i, p in enumerate(projections):
-                    df = 1 / ((1 + w) ** (i + 1))
-                    pv_sum += p['fcf'] * df
-
-                tv = final_fcf * (1 + tg) / (w - tg)
-                tv_pv = tv / ((1 + w) ** 10)
-                ev = pv_sum + tv_pv
-                eq = ev - net_debt
-                fv = eq / shares_outstanding
-
-                row.append(round(fv, 2))
-
-            sensitivity_matrix.append({
-                "wacc": round(w * 100, 1),
-                "values": row
-            })
+        upside = dcf_engine.to_python(dcf_engine.upside(fair_value, current_price)[0])
+
+        # Sensitivitätsmatrix (WACC x Terminal Growth), Rastergröße optional per Request
+        sensitivity = data.get('sensitivity')
+        if not isinstance(sensitivity, dict):
+            sensitivity = {}
+        wacc_steps = _clamp_grid_steps(sensitivity.get('wacc_steps'), SENSITIVITY_WACC_STEPS)
+        tgr_steps = _clamp_grid_steps(sensitivity.get('tgr_steps'), SENSITIVITY_TGR_STEPS)
+        wacc_step = _clamp_step_size(sensitivity.get('wacc_step')) / 100
+        tgr_step = _clamp_step_size(sensitivity.get('tgr_step')) / 100
+
+        wacc_values = dcf_engine.sensitivity_axis(wacc, wacc_step, wacc_steps)
+        tgr_values = dcf_engine.sensitivity_axis(terminal_growth, tgr_step, tgr_steps)
+        grid = dcf_engine.sensitivity_grid(
+            dcf['fcf'][0], net_debt, shares_outstanding, wacc_values, tgr_values
+        )
+
+        sensitivity_matrix = [
+            {
+                "wacc": round(float(w) * 100, 1),
+                "values": dcf_engine.to_python(row, 2)
+            }
+            for w, row in zip(wacc_values, grid)
+        ]
 
         result = {
-            "projections": projections,
-            "terminal_value": terminal_value,
-            "terminal_pv": terminal_pv,
-            "sum_pv_fcf": sum_pv_fcf,
-            "enterprise_value": enterprise_value,
+            "projections": dcf_engine.projection_rows(dcf),
+            "terminal_value": float(dcf['terminal_value'][0]),
+            "terminal_pv": float(dcf['terminal_pv'][0]),
+            "sum_pv_fcf": float(dcf['sum_pv_fcf'][0]),
+            "enterprise_value": float(dcf['enterprise_value'][0]),
             "net_debt": net_debt,
-            "equity_value": equity_value,
+            "equity_value": float(dcf['equity_value'][0]),
             "shares_outstanding": shares_outstanding,
             "fair_value": fair_value,
             "current_price": current_price,
             "upside": round(upside, 1) if upside else None,
             "sensitivity": {
-                "terminal_growth_values": [round(tg * 100, 1) for tg in tgr_values],
+                "terminal_growth_values": [round(float(tg) * 100, 1) for tg in tgr_values],
                 "matrix": sensitivity_matrix
             }
         }
@@ -1650,6 +2215,7 @@ def save_dcf_scenario(isin):
             scenario_id = cur.lastrowid
 
         conn.commit()
+        touch_user_state(user_id)
 
         return jsonify({
             "success": True,
@@ -1683,6 +2249,7 @@ def delete_dcf_scenario(isin, scenario_id):
             return jsonify({"error": "Szenario nicht gefunden"}), 404
 
         conn.commit()
+        touch_user_state(user_id)
         return jsonify({"success": True})
 
     except Exception as e:
@@ -1694,6 +2261,94 @@ def delete_dcf_scenario(isin, scenario_id):
         conn.close()
 
 
+@app.route("/api/stock/<isin>/dcf-scenarios")
+@login_required
+def value_dcf_scenarios(isin):
+    """API: Alle gespeicherten DCF-Szenarien einer Aktie in einem Aufruf bewerten."""
+    user_id = current_user.id
+    conn = get_connection()
+    cur = conn.cursor(dictionary=True)
+
+    try:
+        results = _value_saved_scenarios(cur, user_id, [isin])
+        return jsonify(results.get(isin) or {"isin": isin, "scenarios": []})
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    finally:
+        cur.close()
+        conn.close()
+
+
+@app.route("/api/watchlist/dcf-scenarios")
+@login_required
+def value_watchlist_dcf_scenarios():
+    """
+    API: Gespeicherte DCF-Szenarien aller Watchlist-Aktien bewerten.
+
+    Optional: ?favorite=<id> beschränkt auf eine Favoriten-Kategorie.
+    """
+    user_id = current_user.id
+    favorite = request.args.get('favorite', type=int)
+    conn = get_connection()
+    cur = conn.cursor(dictionary=True)
+
+    try:
+        if favorite:
+            cur.execute("""
+                SELECT isin FROM analytics.user_watchlist
+                WHERE user_id = %s AND favorite = %s
+            """, (user_id, favorite))
+        else:
+            cur.execute("""
+                SELECT isin FROM analytics.user_watchlist
+                WHERE user_id = %s AND favorite > 0
+            """, (user_id,))
+        isins = [row['isin'] for row in cur.fetchall()]
+
+        results = _value_saved_scenarios(cur, user_id, isins)
+
+        return jsonify({
+            "stocks": list(results.values()),
+            "count": sum(len(r['scenarios']) for r in results.values())
+        })
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    finally:
+        cur.close()
+        conn.close()
+
+
+# =============================================================================
+# Warm-up (Produktivbetrieb, siehe wsgi.py)
+# =============================================================================
+
+def warm_up() -> dict:
+    """
+    Füllt die prozesslokalen Caches vor dem ersten Request: Asset-Registry
+    (Hashes, minifiziertes CSS, br/gzip-Varianten) und kompilierte Templates.
+    Mit preload_app läuft das einmal im gunicorn-Master, die Worker erben die
+    Caches beim fork(). Der User-Cache (auth.py) bleibt leer – er hält nur
+    USER_CACHE_TTL Sekunden und füllt sich mit den ersten Requests.
+    """
+    assets = ASSETS.assets()
+    templates = app.jinja_env.list_templates()
+    for name in templates:
+        app.jinja_env.get_template(name)
+
+    stats = {
+        'assets': len(assets),
+        'templates': len(templates),
+        'data_generation': read_generation(DATA),
+    }
+    print(f"🔥 Warm-up: {stats['assets']} Assets, {stats['templates']} Templates, "
+          f"Daten-Generation {stats['data_generation']}")
+    return stats
+
+
 # =============================================================================
 # Main
 # =============================================================================
@@ -1704,4 +2359,5 @@ if __name__ == "__main__":
     print("Öffne: http://localhost:5001")
     print("Beenden mit: Ctrl+C")
     print("=" * 50)
+    ASSETS.watch = True     # Dev-Server: geänderte CSS/JS ohne Neustart ausliefern
     app.run(debug=True, host="0.0.0.0", port=5001)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Statische Assets (CSS/JS) mit Content-Hash im Dateinamen.
+
+- asset_url('style.css') → /assets/style.<hash>.css, der Hash läuft über den
+  ausgelieferten Inhalt → neue Version = neue URL, Browser dürfen ein Jahr cachen
+- CSS wird minifiziert
+- JS-Module: relative Imports ('./x.js', auch import('./x.js')) werden auf die
+  gehashten URLs umgeschrieben → ändert sich ein Modul, ändern sich auch die
+  Hashes aller Module, die es importieren
+- gzip-/brotli-Varianten werden einmal beim Aufbau berechnet
+- watch=True (Dev-Server): Registry wird bei geänderten Dateien neu aufgebaut
+"""
+
+import re
+import gzip
+import hashlib
+import posixpath
+import threading
+from pathlib import Path
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+ASSET_PREFIX = '/assets/'
+ASSET_TYPES = {'.css': 'text/css', '.js': 'text/javascript'}
+HASH_LENGTH = 10
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+# from './x.js' | import './x.js' | import('./x.js')
+JS_IMPORT = re.compile(r"""(\b(?:from|import)\s*\(?\s*)(['"])(\.{1,2}/[\w./-]+\.js)\2""")
+CSS_STRING = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+
+
+def minify_css(text: str) -> str:
+    """Entfernt Kommentare und überflüssigen Whitespace (Strings bleiben unverändert)."""
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    parts = CSS_STRING.split(text)
+    for i in range(0, len(parts), 2):       # ungerade Indizes = String-Literale
+        part = re.sub(r'\s+', ' ', parts[i])
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        # nur nach ':' kürzen – davor kann ein Leerzeichen Teil des Selektors sein
+        parts[i] = re.sub(r':\s+', ':', part)
+    return ''.join(parts).replace(';}', '}').strip()
+
+
+class Asset:
+    """Eine ausgelieferte Datei: Inhalt, Hash-URL und vorkomprimierte Varianten."""
+
+    def __init__(self, name: str, body: bytes):
+        self.name = name
+        self.mimetype = ASSET_TYPES[Path(name).suffix]
+        self.body = body
+        self.hash = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        stem, ext = posixpath.splitext(name)
+        self.url = f"{ASSET_PREFIX}{stem}.{self.hash}{ext}"
+
+        self.variants = {'gzip': gzip.compress(body, compresslevel=9)}
+        if BROTLI_AVAILABLE:
+            self.variants['br'] = brotli.compress(body, quality=11)
+
+
+class AssetRegistry:
+    """Alle CSS/JS-Dateien unter static_dir, aufgebaut beim ersten Zugriff."""
+
+    def __init__(self, static_dir, watch: bool = False):
+        self.static_dir = Path(static_dir)
+        self.watch = watch
+        self._assets = None
+        self._mtimes = None
+        self._lock = threading.Lock()
+
+    def _files(self) -> dict:
+        return {
+            path.relative_to(self.static_dir).as_posix(): path
+            for path in sorted(self.static_dir.rglob('*'))
+            if path.suffix in ASSET_TYPES and path.is_file()
+        }
+
+    def _build(self, files: dict) -> dict:
+        texts = {name: path.read_text(encoding='utf-8') for name, path in files.items()}
+        assets = {}
+
+        def build(name, stack=()):
+            if name in assets:
+                return assets[name]
+            if name in stack:
+                raise ValueError(f"Zyklischer Import: {' → '.join(stack + (name,))}")
+
+            text = texts[name]
+            if name.endswith('.css'):
+                text = minify_css(text)
+            else:
+                base = posixpath.dirname(name)
+
+                def hashed_import(m):
+                    target = posixpath.normpath(posixpath.join(base, m.group(3)))
+                    if target not in texts:
+                        return m.group(0)
+                    url = build(target, stack + (name,)).url
+                    return f"{m.group(1)}{m.group(2)}{url}{m.group(2)}"
+
+                text = JS_IMPORT.sub(hashed_import, text)
+
+            assets[name] = Asset(name, text.encode('utf-8'))
+            return assets[name]
+
+        for name in texts:
+            build(name)
+        return assets
+
+    def assets(self) -> dict:
+        """Returns {name: Asset}; baut die Registry beim ersten Aufruf (bzw. nach Änderungen) auf."""
+        with self._lock:
+            if self._assets is None or self.watch:
+                files = self._files()
+                mtimes = {name: path.stat().st_mtime_ns for name, path in files.items()}
+                if self._assets is None or mtimes != self._mtimes:
+                    self._assets = self._build(files)
+                    self._mtimes = mtimes
+            return self._assets
+
+    def url(self, name: str) -> str:
+        """Gehashte URL für eine Datei relativ zu static/ (Template-Global asset_url)."""
+        return self.assets()[name].url
+
+    def resolve(self, path: str):
+        """
+        URL-Pfad unter /assets/ → (Asset, aktuell?) oder (None, False).
+        Veraltete Hashes (Seite von vor einem Deploy) liefern den aktuellen Inhalt,
+        aktuell=False → nicht langfristig cachen.
+        """
+        assets = self.assets()
+        if path in assets:
+            return assets[path], False
+        stem, ext = posixpath.splitext(path)
+        name, _, digest = stem.rpartition('.')
+        asset = assets.get(name + ext)
+        if asset is None:
+            return None, False
+        return asset, digest == asset.hash
@@ -6,12 +6,51 @@ Implementiert User-Model für Flask-Login und Datenbank-Interaktionen.
 """
 
 import sys
+import os
+import time
+import threading
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import bcrypt
 from flask_login import UserMixin
-from db import get_connection
+from metrics import get_connection
+
+
+# =============================================================================
+# User-Cache für load_user
+# =============================================================================
+# Flask-Login lädt den User bei jedem Request (auch jedem XHR). Der Cache hält
+# User-Objekte pro Prozess für USER_CACHE_TTL Sekunden; Admin-Änderungen an
+# is_approved/is_active/role invalidieren sofort (im eigenen Prozess, andere
+# Worker-Prozesse sehen die Änderung spätestens nach Ablauf der TTL).
+
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+
+_user_cache = {}            # user_id → (expires_at, User)
+_user_cache_lock = threading.Lock()
+_user_cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def invalidate_user(user_id=None):
+    """Entfernt einen User (oder alle bei None) aus dem Cache."""
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(int(user_id), None)
+        _user_cache_stats['invalidations'] += 1
+
+
+def user_cache_stats():
+    """Zähler des User-Caches (hits, misses, invalidations, size, hit_rate, ttl)."""
+    with _user_cache_lock:
+        stats = dict(_user_cache_stats)
+        stats['size'] = len(_user_cache)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+    stats['ttl'] = USER_CACHE_TTL
+    return stats
 
 
 class User(UserMixin):
@@ -63,6 +102,28 @@ class User(UserMixin):
             )
         return None
 
+    @staticmethod
+    def get_cached(user_id):
+        """
+        Wie get_by_id, aber aus dem prozesslokalen Cache (für load_user).
+        Nicht vorhandene User werden nicht gecacht.
+        """
+        user_id = int(user_id)
+        now = time.monotonic()
+
+        with _user_cache_lock:
+            entry = _user_cache.get(user_id)
+            if entry and entry[0] > now:
+                _user_cache_stats['hits'] += 1
+                return entry[1]
+            _user_cache_stats['misses'] += 1
+
+        user = User.get_by_id(user_id)
+        if user and USER_CACHE_TTL > 0:
+            with _user_cache_lock:
+                _user_cache[user_id] = (now + USER_CACHE_TTL, user)
+        return user
+
     @staticmethod
     def get_by_email(email):
         """Lädt User aus Datenbank anhand E-Mail (für Login)."""
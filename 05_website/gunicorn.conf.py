@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+gunicorn-Konfiguration für die Website (Produktivbetrieb).
+
+Starten mit: gunicorn -c gunicorn.conf.py   (aus 05_website/)
+
+Umgebungsvariablen:
+    WEB_BIND        Adresse, Default 0.0.0.0:5001
+    WEB_WORKERS     Worker-Prozesse, Default 2 × CPU-Kerne + 1 (max. 8)
+    WEB_THREADS     Threads je Worker, Default 4
+    WEB_TIMEOUT     Sekunden bis ein hängender Worker neu gestartet wird, Default 60
+    WEB_PIDFILE     PID des Masters, Default <projekt>/logs/website.pid
+
+Prozesslokal (je Worker eigener Stand): User-Cache in auth.py, Tracker für
+veraltete Screener-Requests (_screener_latest) und Asset-Registry. Die
+Latenz-Messwerte (metrics.py) schreibt jeder Worker nach logs/metrics/,
+/admin/metrics führt sie zusammen. Admin-
+Änderungen an Usern sehen andere Worker daher erst nach USER_CACHE_TTL.
+Zustand über Worker hinweg liegt in der DB bzw. in data/generation/.
+"""
+
+import os
+import multiprocessing
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+wsgi_app = "wsgi:application"
+bind = os.getenv("WEB_BIND", "0.0.0.0:5001")
+
+# Requests warten überwiegend auf MySQL → Threads statt nur Prozesse
+worker_class = "gthread"
+workers = int(os.getenv("WEB_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.getenv("WEB_THREADS", 4))
+
+# App (und Warm-up) einmal im Master laden, Worker erben die Caches per fork()
+preload_app = True
+
+timeout = int(os.getenv("WEB_TIMEOUT", 60))     # DCF-Sensitivitäten können dauern
+graceful_timeout = 30
+keepalive = 5
+
+pidfile = os.getenv("WEB_PIDFILE", str(PROJECT_DIR / "logs" / "website.pid"))
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    server.log.info(f"✅ Website bereit auf {bind} ({workers} Worker × {threads} Threads)")
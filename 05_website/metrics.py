@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Request-Timing und Slow-Query-Log der Website.
+
+- Latenz-Histogramm je Route (feste Buckets, p50/p95/p99 aus dem Histogramm),
+  dazu Anzahl und Dauer der DB-Queries je Request
+- get_connection(): wie db.get_connection, die Cursor messen execute() und
+  fetch*() und rechnen die Zeit dem laufenden Request zu
+- Queries ab SLOW_QUERY_MS landen mit SQL und Parametern in SLOW_QUERY_LOG
+  und (die letzten SLOW_QUERY_KEEP) auf der Admin-Seite /admin/metrics
+
+Gemessen wird je Prozess; jeder gunicorn-Worker schreibt seinen Stand
+spätestens alle METRICS_FLUSH_S Sekunden als Snapshot nach METRICS_DIR
+(<pid>-<start>.json, atomar per os.replace). Die Admin-Seite führt alle
+Snapshots zusammen (Histogramme addieren sich), "Zurücksetzen" gilt über eine
+Reset-Markierung für alle Worker.
+
+Umgebungsvariablen:
+    SLOW_QUERY_MS   Schwelle in ms, Default 200
+    SLOW_QUERY_LOG  Logdatei, Default <projekt>/logs/slow_queries.log
+    METRICS_DIR     Snapshots der Worker, Default <projekt>/logs/metrics
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import bisect
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import db
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+SLOW_QUERY_LOG = Path(os.getenv(
+    "SLOW_QUERY_LOG", Path(__file__).parent.parent / "logs" / "slow_queries.log"
+))
+SLOW_QUERY_KEEP = 50
+SLOW_QUERY_PARAM_CHARS = 200
+
+METRICS_DIR = Path(os.getenv(
+    "METRICS_DIR", Path(__file__).parent.parent / "logs" / "metrics"
+))
+METRICS_FLUSH_S = 5
+METRICS_RESET_FILE = "reset"
+
+# Obergrenzen der Buckets in ms, darüber ein Überlauf-Bucket
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500,
+                      750, 1000, 1500, 2000, 3000, 5000, 10000, 30000)
+
+
+# =============================================================================
+# Histogramm / Statistik je Route
+# =============================================================================
+
+class Histogram:
+    """Latenzen in festen Buckets: konstanter Speicher, Perzentile auf Bucket-Genauigkeit."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        return {'counts': self.counts, 'count': self.count, 'total': self.total,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        hist = cls()
+        if len(data['counts']) == len(hist.counts):     # Buckets seit dem Snapshot unverändert
+            hist.counts = list(data['counts'])
+            hist.count, hist.total = data['count'], data['total']
+            hist.min, hist.max = data['min'], data['max']
+        return hist
+
+    def percentile(self, q: float) -> float:
+        """Perzentil (q zwischen 0 und 1), linear interpoliert innerhalb des Buckets."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                # Bucket-Grenzen auf die tatsächlich gemessenen Extremwerte einengen
+                lower = max(self.bounds[i - 1] if i else 0.0, self.min)
+                upper = min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.errors = 0
+
+    def merge(self, other: "RouteStats"):
+        self.latency.merge(other.latency)
+        self.queries += other.queries
+        self.db_ms += other.db_ms
+        self.errors += other.errors
+
+    def to_dict(self) -> dict:
+        return {'latency': self.latency.to_dict(), 'queries': self.queries,
+                'db_ms': self.db_ms, 'errors': self.errors}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RouteStats":
+        stats = cls()
+        stats.latency = Histogram.from_dict(data['latency'])
+        stats.queries, stats.db_ms, stats.errors = data['queries'], data['db_ms'], data['errors']
+        return stats
+
+    def as_dict(self, route: str) -> dict:
+        count = self.latency.count
+        return {
+            'route': route,
+            'count': count,
+            'total_ms': self.latency.total,
+            'mean_ms': self.latency.total / count,
+            'p50_ms': self.latency.percentile(0.50),
+            'p95_ms': self.latency.percentile(0.95),
+            'p99_ms': self.latency.percentile(0.99),
+            'max_ms': self.latency.max,
+            'queries': self.queries / count,
+            'db_ms': self.db_ms / count,
+            'db_share': self.db_ms / self.latency.total if self.latency.total else 0.0,
+            'errors': self.errors,
+        }
+
+
+class RequestTiming:
+    """Messwerte des laufenden Requests (ein Objekt je Thread, siehe start_request)."""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.status = 500       # bis after_request einen Status meldet
+
+
+_routes = {}            # "GET /api/stock/<isin>/details" → RouteStats
+_slow_queries = deque(maxlen=SLOW_QUERY_KEEP)
+_lock = threading.Lock()
+_local = threading.local()
+_pid = None             # Prozess, dem _routes gehört (preload_app: Worker entstehen per fork)
+_started_at = None
+_last_flush = 0.0
+
+
+def _ensure_process():
+    """
+    Mit leerem Stand beginnen nach fork() bzw. nach einem Zurücksetzen, auch
+    wenn ein anderer Worker es ausgelöst hat (Aufruf unter _lock).
+    """
+    global _pid, _started_at
+    if _pid != os.getpid() or _reset_at() > _started_at.timestamp():
+        _pid = os.getpid()
+        _started_at = datetime.now()
+        _routes.clear()
+        _slow_queries.clear()
+
+
+def start_request(route: str):
+    _local.request = RequestTiming(route)
+
+
+def current_request():
+    """RequestTiming des laufenden Requests oder None (z. B. Warm-up, CLI)."""
+    return getattr(_local, 'request', None)
+
+
+def finish_request(error: bool = False):
+    """Schließt die Messung des laufenden Requests ab und verbucht sie bei seiner Route."""
+    timing = current_request()
+    if timing is None:
+        return
+    _local.request = None
+    elapsed_ms = (time.perf_counter() - timing.start) * 1000
+
+    with _lock:
+        _ensure_process()
+        stats = _routes.get(timing.route)
+        if stats is None:
+            stats = _routes[timing.route] = RouteStats()
+        stats.latency.add(elapsed_ms)
+        stats.queries += timing.queries
+        stats.db_ms += timing.db_ms
+        if error or timing.status >= 500:
+            stats.errors += 1
+
+    if time.monotonic() - _last_flush >= METRICS_FLUSH_S:
+        flush()
+
+
+# =============================================================================
+# Snapshots je Worker (Zusammenführung über alle Prozesse)
+# =============================================================================
+
+def _reset_at() -> float:
+    """Zeitpunkt des letzten Zurücksetzens (mtime der Markierung), 0 wenn nie."""
+    try:
+        return (METRICS_DIR / METRICS_RESET_FILE).stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+def flush():
+    """Schreibt den Stand dieses Prozesses als Snapshot nach METRICS_DIR."""
+    global _last_flush
+    _last_flush = time.monotonic()
+
+    with _lock:
+        _ensure_process()
+        if not _routes and not _slow_queries:
+            return      # z. B. gunicorn-Master ohne Requests
+        snapshot = {
+            'pid': _pid,
+            'started_at': _started_at.timestamp(),
+            'written_at': time.time(),
+            'routes': {route: stats.to_dict() for route, stats in _routes.items()},
+            'slow_queries': [{**q, 'time': q['time'].timestamp()} for q in _slow_queries],
+        }
+        name = f"{_pid}-{int(_started_at.timestamp())}.json"
+
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = METRICS_DIR / f".{name}.tmp"
+        tmp.write_text(json.dumps(snapshot), encoding="utf-8")
+        os.replace(tmp, METRICS_DIR / name)
+    except OSError as e:
+        print(f"⚠️ Metrik-Snapshot nicht schreibbar ({METRICS_DIR}): {e}")
+
+
+atexit.register(flush)
+
+
+def _load_snapshots() -> list[dict]:
+    """Snapshots aller Worker seit dem letzten Zurücksetzen (inkl. beendeter Prozesse)."""
+    reset_at = _reset_at()
+    snapshots = []
+    for path in sorted(METRICS_DIR.glob("*.json")):
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if snapshot['started_at'] >= reset_at:
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def route_stats() -> list[dict]:
+    """
+    Statistik je Route über alle Worker, nach Gesamtzeit absteigend
+    (= wo sich Optimierung lohnt).
+    """
+    flush()
+    merged = {}
+    for snapshot in _load_snapshots():
+        for route, data in snapshot['routes'].items():
+            stats = RouteStats.from_dict(data)
+            if route in merged:
+                merged[route].merge(stats)
+            else:
+                merged[route] = stats
+    rows = [stats.as_dict(route) for route, stats in merged.items() if stats.latency.count]
+    return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+
+def slow_queries() -> list[dict]:
+    """Die letzten SLOW_QUERY_KEEP langsamen Queries aller Worker, neueste zuerst."""
+    entries = [
+        {**q, 'time': datetime.fromtimestamp(q['time'])}
+        for snapshot in _load_snapshots() for q in snapshot['slow_queries']
+    ]
+    return sorted(entries, key=lambda q: q['time'], reverse=True)[:SLOW_QUERY_KEEP]
+
+
+def metrics_info() -> dict:
+    snapshots = _load_snapshots()
+    return {
+        'pid': os.getpid(),
+        'workers': sorted({s['pid'] for s in snapshots}),
+        'started_at': datetime.fromtimestamp(min((s['started_at'] for s in snapshots),
+                                                 default=time.time())),
+        'slow_query_ms': SLOW_QUERY_MS,
+        'slow_query_log': str(SLOW_QUERY_LOG),
+    }
+
+
+def reset():
+    """Setzt die Messwerte aller Worker zurück (Markierung + Snapshots löschen)."""
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    (METRICS_DIR / METRICS_RESET_FILE).write_text(datetime.now().isoformat(), encoding="utf-8")
+    for path in METRICS_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
+    # eigener Stand und der der anderen Worker: über die Markierung (_ensure_process)
+
+
+# =============================================================================
+# Slow-Query-Log
+# =============================================================================
+
+_slow_log = logging.getLogger("aktien.slow_queries")
+_slow_log.propagate = False
+
+
+def _slow_log_handler():
+    # Datei erst bei der ersten langsamen Query anlegen
+    with _lock:
+        if not _slow_log.handlers:
+            SLOW_QUERY_LOG.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(SLOW_QUERY_LOG, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s [pid %(process)d] %(message)s"))
+            _slow_log.addHandler(handler)
+            _slow_log.setLevel(logging.INFO)
+    return _slow_log
+
+
+def _format_params(params) -> str:
+    text = repr(params)
+    if len(text) > SLOW_QUERY_PARAM_CHARS:
+        text = text[:SLOW_QUERY_PARAM_CHARS] + f"… ({len(text)} Zeichen)"
+    return text
+
+
+def record_query(sql: str, params, elapsed_ms: float):
+    """Verbucht eine Query beim laufenden Request, ab SLOW_QUERY_MS zusätzlich im Slow-Query-Log."""
+    timing = current_request()
+    if timing is not None:
+        timing.queries += 1
+        timing.db_ms += elapsed_ms
+
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+
+    entry = {
+        'time': datetime.now(),
+        'ms': elapsed_ms,
+        'route': timing.route if timing else '-',
+        'sql': ' '.join(str(sql).split()),
+        'params': _format_params(params) if params is not None else '',
+    }
+    with _lock:
+        _ensure_process()
+        _slow_queries.append(entry)
+    try:
+        _slow_log_handler().info(f"{elapsed_ms:.1f} ms | {entry['route']} | {entry['sql']} | {entry['params']}")
+    except OSError as e:
+        print(f"⚠️ Slow-Query-Log nicht schreibbar ({SLOW_QUERY_LOG}): {e}")
+
+
+# =============================================================================
+# Gemessene DB-Verbindung
+# =============================================================================
+
+class TimedCursor:
+    """
+    Cursor-Hülle: Zeit für execute() plus die folgenden fetch*() zählt als eine
+    Query, abgeschlossen beim nächsten execute() bzw. close().
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._query = None          # (sql, params) der laufenden Query
+        self._elapsed = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._elapsed += (time.perf_counter() - start) * 1000
+
+    def _finish(self):
+        if self._query is not None:
+            record_query(*self._query, self._elapsed)
+        self._query = None
+        self._elapsed = 0.0
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._finish()
+        self._query = (operation, params)
+        return self._timed(self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._finish()
+        self._query = (operation, f"<{len(seq_params)} Parametersätze>")
+        return self._timed(self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._timed(self._cursor.fetchmany, *args, **kwargs)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall)
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+
+class TimedConnection:
+    """Verbindungs-Hülle, deren cursor() gemessene Cursor liefert."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._cursors = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = TimedCursor(self._conn.cursor(*args, **kwargs))
+        self._cursors.append(cursor)
+        return cursor
+
+    def close(self):
+        # nicht geschlossene Cursor: letzte Query trotzdem verbuchen
+        for cursor in self._cursors:
+            cursor._finish()
+        self._cursors.clear()
+        return self._conn.close()
+
+
+def get_connection(*args, **kwargs) -> TimedConnection:
+    """db.get_connection mit Query-Timing (gleiche Argumente)."""
+    start = time.perf_counter()
+    conn = db.get_connection(*args, **kwargs)
+    timing = current_request()
+    if timing is not None:
+        timing.db_ms += (time.perf_counter() - start) * 1000    # Verbindungsaufbau
+    return TimedConnection(conn)
@@ -0,0 +1,1799 @@
+import { loadChartJs } from './util.js';
+import { getStockData } from './stocks.js';
+
+// =============================================================================
+// Stock Detail Modal: KGV, EV/EBIT, Wachstum, Margen (Charts), Unternehmensinfo
+// =============================================================================
+// Wird von main.js beim ersten Öffnen eines Modals nachgeladen, Chart.js erst
+// zusammen mit den ersten Detaildaten. Der DCF-Tab lädt dcf.js nach.
+let currentDetailData = null;
+let currentTab = 'pe';
+let peChart = null;
+let incomeChart = null;
+let evEbitChart = null;
+let ebitChart = null;
+let growthRevenueChart = null;
+let growthEbitChart = null;
+let growthNetIncomeChart = null;
+let marginsChart = null;
+let fullscreenChart = null;
+
+// Daten für Chart-Vollbild-Ansicht
+let chartData = {
+    pe: null,
+    evEbit: null
+};
+
+// =========================================================================
+// Stock Detail Modal (KGV + EV/EBIT mit Tabs)
+// =========================================================================
+const stockDetailModal = document.getElementById('stock-detail-modal');
+const detailCompanyName = document.getElementById('detail-company-name');
+const detailMeta = document.getElementById('detail-meta');
+const detailBody = document.getElementById('detail-body');
+// Tab-Klicks mit Event Delegation am Modal-Container
+if (stockDetailModal) {
+    stockDetailModal.addEventListener('click', function(e) {
+        // Prüfe ob ein Tab-Button geklickt wurde
+        const tab = e.target.closest('.detail-tab');
+        if (!tab) return;
+
+        e.preventDefault();
+        e.stopPropagation();
+
+        const tabType = tab.dataset.tab;
+
+        // Wenn keine Daten vorhanden, nichts tun
+        if (!currentDetailData) return;
+
+        // Aktiven Tab wechseln
+        stockDetailModal.querySelectorAll('.detail-tab').forEach(t => t.classList.remove('active'));
+        tab.classList.add('active');
+        currentTab = tabType;
+
+        // Content rendern
+        if (tabType === 'ev_ebit') {
+            renderEvEbitDetail(currentDetailData);
+        } else if (tabType === 'growth') {
+            renderGrowthDetail(currentDetailData);
+        } else if (tabType === 'margins') {
+            renderMarginsDetail(currentDetailData);
+        } else if (tabType === 'dcf') {
+            showDcfTab(currentDetailData.company.isin);
+        } else {
+            renderStockDetail(currentDetailData);
+        }
+    });
+}
+
+export async function openStockDetail(isin, type = 'pe') {
+    if (!stockDetailModal) return;
+
+    // Zustand des zuletzt geöffneten Modals verwerfen
+    currentDetailData = null;
+
+    // Modal öffnen mit Ladeindikator
+    stockDetailModal.classList.remove('hidden');
+    detailCompanyName.textContent = 'Lade...';
+    detailMeta.textContent = '';
+    detailBody.innerHTML = '<div class="detail-loading">Lade Daten...</div>';
+
+    // Aktiven Tab setzen
+    currentTab = type;
+    stockDetailModal.querySelectorAll('.detail-tab').forEach(tab => {
+        tab.classList.toggle('active', tab.dataset.tab === type);
+    });
+
+    try {
+        // Chart.js parallel zu den Daten laden (nur beim ersten Öffnen);
+        // für sichtbare Watchlist-Zeilen liegen die Daten meist schon im Cache
+        const [data] = await Promise.all([getStockData(isin, 'details'), loadChartJs()]);
+        currentDetailData = data; // Daten cachen für Tab-Wechsel
+
+        // Je nach Typ unterschiedliches Modal rendern
+        if (type === 'ev_ebit') {
+            renderEvEbitDetail(data);
+        } else if (type === 'growth') {
+            renderGrowthDetail(data);
+        } else if (type === 'margins') {
+            renderMarginsDetail(data);
+        } else if (type === 'dcf') {
+            showDcfTab(isin);
+        } else {
+            renderStockDetail(data);
+        }
+
+    } catch (error) {
+        console.error('Fehler:', error);
+        detailBody.innerHTML = '<div class="detail-loading">Fehler beim Laden der Daten.</div>';
+    }
+}
+
+function renderStockDetail(data) {
+    // Header
+    detailCompanyName.textContent = data.company.name || '-';
+    const fiscalYear = data.company.fiscal_year_end ? ` | FJ: ${data.company.fiscal_year_end}` : '';
+    detailMeta.textContent = `${data.company.ticker} | ${data.company.sector || '-'} | ${data.company.country || '-'}${fiscalYear}`;
+
+    // Formatierungsfunktionen
+    const formatBillions = (val) => {
+        if (val === null || val === undefined) return '-';
+        return (val / 1e9).toLocaleString('de-DE', { minimumFractionDigits: 2, maximumFractionDigits: 2 }) + ' Mrd';
+    };
+
+    const formatNumber = (val, decimals = 1) => {
+        if (val === null || val === undefined) return '-';
+        return val.toLocaleString('de-DE', { minimumFractionDigits: decimals, maximumFractionDigits: decimals });
+    };
+
+    const formatPEAverage = (val, years, count) => {
+        if (val === null || val === undefined) {
+            return `<span class="pe-unavailable" title="Zu wenig Datenjahre für ${years}-Jahres-Durchschnitt verfügbar">n.v.</span>`;
+        }
+        const countText = count ? `${count} von ${years} Jahren` : `${years} Jahre`;
+        const tooltip = `Durchschnitt über ${countText} (nach Filterung: Negativwerte und Ausreißer >2σ ausgeschlossen)`;
+        return `<span class="pe-value-with-tooltip" title="${tooltip}">${val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 })}</span>`;
+    };
+
+    const formatEVEBITAverage = (val, years, count) => {
+        if (val === null || val === undefined) {
+            return `<span class="pe-unavailable" title="Zu wenig Datenjahre für ${years}-Jahres-Durchschnitt verfügbar">n.v.</span>`;
+        }
+        const countText = count ? `${count} von ${years} Jahren` : `${years} Jahre`;
+        const tooltip = `Durchschnitt über ${countText} (nach Filterung: Negativwerte und Ausreißer >2σ ausgeschlossen)`;
+        return `<span class="pe-value-with-tooltip" title="${tooltip}">${val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 })}</span>`;
+    };
+
+    // TTM Berechnung HTML
+    const ttm = data.ttm_calculation;
+    let quartersHtml = '';
+    if (ttm.quarters && ttm.quarters.length > 0) {
+        ttm.quarters.forEach(q => {
+            // Jahr aus Datum extrahieren (z.B. "2025-06-30" -> "2025")
+            const year = q.date ? q.date.substring(0, 4) : '';
+            const periodLabel = year ? `${q.period} ${year}` : q.period;
+            quartersHtml += `
+                <div class="ttm-quarter">
+                    <span class="ttm-quarter-period">${periodLabel}</span>
+                    <span class="ttm-quarter-value">${formatBillions(q.net_income)}</span>
+                </div>
+            `;
+        });
+        quartersHtml += `
+            <div class="ttm-quarter ttm-quarter-sum">
+                <span class="ttm-quarter-period">Summe</span>
+                <span class="ttm-quarter-value">${formatBillions(ttm.ttm_net_income)}</span>
+            </div>
+        `;
+    }
+
+    // PE Übersicht mit Abweichungen
+    const pe = data.pe_overview || {};
+
+    // Hilfsfunktion für Abweichungs-Formatierung
+    const formatDiff = (val) => {
+        if (val === null || val === undefined) return '-';
+        const sign = val >= 0 ? '+' : '';
+        return sign + val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 }) + '%';
+    };
+
+    const getDiffClass = (val) => {
+        if (val === null || val === undefined) return '';
+        return val < 0 ? 'diff-positive' : 'diff-negative';
+    };
+
+    // Tabelle mit Werten und Abweichungen
+    let peOverviewHtml = `
+        <table class="pe-comparison-table">
+            <thead>
+                <tr>
+                    <th></th>
+                    <th>Wert</th>
+                    <th>TTM vs Ø</th>
+                    <th>Fwd vs Ø</th>
+                </tr>
+            </thead>
+            <tbody>
+                <tr>
+                    <td class="pe-label">YF TTM-KGV</td>
+                    <td class="pe-value">${formatNumber(pe.yf_ttm_pe)}</td>
+                    <td class="pe-diff"></td>
+                    <td class="pe-diff"></td>
+                </tr>
+                <tr>
+                    <td class="pe-label">YF Forward-KGV</td>
+                    <td class="pe-value">${formatNumber(pe.yf_forward_pe)}</td>
+                    <td class="pe-diff"></td>
+                    <td class="pe-diff"></td>
+                </tr>
+                <tr class="pe-separator">
+                    <td colspan="4"></td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 5J</td>
+                    <td class="pe-value">${formatPEAverage(pe.pe_avg_5y, 5, pe.pe_avg_5y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_ttm_pe_vs_avg_5y)}">${formatDiff(pe.yf_ttm_pe_vs_avg_5y)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_fwd_pe_vs_avg_5y)}">${formatDiff(pe.yf_fwd_pe_vs_avg_5y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 10J</td>
+                    <td class="pe-value">${formatPEAverage(pe.pe_avg_10y, 10, pe.pe_avg_10y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_ttm_pe_vs_avg_10y)}">${formatDiff(pe.yf_ttm_pe_vs_avg_10y)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_fwd_pe_vs_avg_10y)}">${formatDiff(pe.yf_fwd_pe_vs_avg_10y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 15J</td>
+                    <td class="pe-value">${formatPEAverage(pe.pe_avg_15y, 15, pe.pe_avg_15y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_ttm_pe_vs_avg_15y)}">${formatDiff(pe.yf_ttm_pe_vs_avg_15y)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_fwd_pe_vs_avg_15y)}">${formatDiff(pe.yf_fwd_pe_vs_avg_15y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 20J</td>
+                    <td class="pe-value">${formatPEAverage(pe.pe_avg_20y, 20, pe.pe_avg_20y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_ttm_pe_vs_avg_20y)}">${formatDiff(pe.yf_ttm_pe_vs_avg_20y)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_fwd_pe_vs_avg_20y)}">${formatDiff(pe.yf_fwd_pe_vs_avg_20y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 10-19</td>
+                    <td class="pe-value">${formatNumber(pe.pe_avg_10y_2019)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_ttm_pe_vs_avg_10y_2019)}">${formatDiff(pe.yf_ttm_pe_vs_avg_10y_2019)}</td>
+                    <td class="pe-diff ${getDiffClass(pe.yf_fwd_pe_vs_avg_10y_2019)}">${formatDiff(pe.yf_fwd_pe_vs_avg_10y_2019)}</td>
+                </tr>
+            </tbody>
+        </table>
+    `;
+
+    // Body HTML aufbauen
+    let html = `
+        <!-- TTM PE Berechnung + PE Übersicht -->
+        <div class="detail-section">
+            <div class="detail-section-title">KGV Übersicht</div>
+            <div class="pe-section-grid">
+                <div class="ttm-calc-box">
+                    <div class="ttm-formula">
+                        <div class="ttm-fraction">
+                            <div class="ttm-numerator">
+                                <span class="ttm-label">Market Cap</span>
+                                <span class="ttm-value">${formatBillions(ttm.market_cap)}</span>
+                            </div>
+                            <div class="ttm-denominator">
+                                <span class="ttm-label">TTM Net Income</span>
+                                <span class="ttm-value">${formatBillions(ttm.ttm_net_income)}</span>
+                            </div>
+                        </div>
+                        <span class="ttm-equals">=</span>
+                        <span class="ttm-result">${formatNumber(data.current.ttm_pe)}</span>
+                    </div>
+                    <div class="ttm-quarters">
+                        ${quartersHtml}
+                    </div>
+                </div>
+                <div class="pe-overview-box">
+                    ${peOverviewHtml}
+                </div>
+            </div>
+        </div>
+
+        <!-- Charts -->
+        <div class="detail-charts">
+            <div class="chart-container">
+                <div class="chart-title">KGV Verlauf (20 Jahre)</div>
+                <div class="chart-wrapper">
+                    <canvas id="pe-chart"></canvas>
+                </div>
+            </div>
+            <div class="chart-container">
+                <div class="chart-title">Net Income Verlauf</div>
+                <div class="chart-wrapper">
+                    <canvas id="income-chart"></canvas>
+                </div>
+            </div>
+        </div>
+
+        <!-- Income Statement Tabelle -->
+        <div class="detail-section">
+            <div class="detail-section-title">Income Statement (${data.company.currency || 'EUR'})</div>
+            <div class="income-table-container">
+                <table class="income-table">
+                    <thead>
+                        <tr>
+                            <th></th>
+                            ${data.income_statement.map(y => `<th>'${String(y.year).slice(-2)}</th>`).join('')}
+                            <th class="ttm-col">TTM</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr class="row-revenue">
+                            <td>Revenue</td>
+                            ${data.income_statement.map(y => `<td>${formatBillions(y.revenue)}</td>`).join('')}
+                            <td class="ttm-col">${formatBillions(data.ttm_income_statement?.revenue)}</td>
+                        </tr>
+                        <tr>
+                            <td>Gross Profit</td>
+                            ${data.income_statement.map(y => `<td>${formatBillions(y.gross_profit)}</td>`).join('')}
+                            <td class="ttm-col">${formatBillions(data.ttm_income_statement?.gross_profit)}</td>
+                        </tr>
+                        <tr>
+                            <td>Operating Inc</td>
+                            ${data.income_statement.map(y => `<td>${formatBillions(y.operating_income)}</td>`).join('')}
+                            <td class="ttm-col">${formatBillions(data.ttm_income_statement?.operating_income)}</td>
+                        </tr>
+                        <tr class="row-net-income">
+                            <td>Net Income</td>
+                            ${data.income_statement.map(y => `<td>${formatBillions(y.net_income)}</td>`).join('')}
+                            <td class="ttm-col">${formatBillions(data.ttm_income_statement?.net_income)}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    `;
+
+    detailBody.innerHTML = html;
+
+    // Charts rendern (nur wenn Chart.js geladen ist)
+    if (typeof Chart !== 'undefined') {
+        renderPEChart(data.pe_history, data.current_ttm_pe);
+        renderIncomeChart(data.income_statement, data.ttm_income_statement);
+
+        // Click-Handler für Chart-Zoom hinzufügen
+        setupChartZoomHandlers();
+    }
+}
+
+// Hilfsfunktion: Berechnet das n-te Perzentil eines Arrays
+function calculatePercentile(arr, percentile) {
+    const validValues = arr.filter(v => v != null && !isNaN(v) && isFinite(v));
+    if (validValues.length === 0) return null;
+
+    const sorted = [...validValues].sort((a, b) => a - b);
+    const index = (percentile / 100) * (sorted.length - 1);
+    const lower = Math.floor(index);
+    const upper = Math.ceil(index);
+    const weight = index % 1;
+
+    if (lower === upper) return sorted[lower];
+    return sorted[lower] * (1 - weight) + sorted[upper] * weight;
+}
+
+function calculateIQR(arr) {
+    const validValues = arr.filter(v => v != null && !isNaN(v) && isFinite(v));
+    if (validValues.length === 0) return null;
+
+    const sorted = [...validValues].sort((a, b) => a - b);
+    const q1 = calculatePercentile(sorted, 25);
+    const q3 = calculatePercentile(sorted, 75);
+
+    if (q1 === null || q3 === null) return null;
+
+    return {
+        q1: q1,
+        q3: q3,
+        iqr: q3 - q1
+    };
+}
+
+function calculateRobustYMax(arr) {
+    const validValues = arr.filter(v => v != null && !isNaN(v) && isFinite(v));
+    if (validValues.length === 0) return undefined;
+
+    // Berechne verschiedene statistische Metriken
+    const median = calculatePercentile(validValues, 50);
+    const p85 = calculatePercentile(validValues, 85);
+    const iqrData = calculateIQR(validValues);
+
+    if (!median || !p85 || !iqrData) return undefined;
+
+    // Hybridansatz: Minimum von drei Methoden
+    const medianLimit = median * 4;              // Nicht mehr als 4x Median
+    const percentileLimit = p85 * 1.2;          // Nicht mehr als 85. Perzentil + 20%
+    const iqrLimit = iqrData.q3 + 1.5 * iqrData.iqr;  // IQR-Ausreißergrenze
+
+    // Nimm das Minimum der drei Grenzen (konservativster Ansatz)
+    const yMax = Math.min(medianLimit, percentileLimit, iqrLimit);
+
+    // Füge 10% Puffer hinzu für bessere Darstellung
+    return yMax * 1.1;
+}
+
+function renderPEChart(peHistory, currentTtmPe) {
+    const ctx = document.getElementById('pe-chart');
+    if (!ctx) return;
+
+    // Bestehenden Chart zerstören
+    if (peChart) {
+        peChart.destroy();
+    }
+
+    // Labels und Daten vorbereiten
+    const labels = peHistory.map(p => p.year);
+    const peData = peHistory.map(p => p.pe);
+
+    // TTM als letzten Punkt hinzufügen
+    if (currentTtmPe) {
+        labels.push('TTM');
+        peData.push(currentTtmPe);
+    }
+
+    // Daten für Vollbild-Ansicht speichern
+    chartData.pe = { labels, peData, currentTtmPe };
+
+    // Robuste Y-Achsen-Begrenzung mit Hybridansatz berechnen
+    const yMax = calculateRobustYMax(peData);
+
+    // Ausreißer identifizieren und unterschiedlich darstellen
+    const pointStyles = peData.map(val => (yMax && val > yMax) ? 'triangle' : 'circle');
+    const pointRadii = peData.map(val => (yMax && val > yMax) ? 5 : 3);
+
+    // Werte für Anzeige begrenzen, aber echte Werte für Tooltip behalten
+    const displayData = peData.map(val => (yMax && val > yMax) ? yMax : val);
+
+    peChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'KGV',
+                data: displayData,
+                borderColor: '#1a1a2e',
+                backgroundColor: 'rgba(26, 26, 46, 0.1)',
+                borderWidth: 2,
+                pointRadius: pointRadii,
+                pointStyle: pointStyles,
+                pointBackgroundColor: '#1a1a2e',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const actualValue = peData[context.dataIndex];
+                            const isOutlier = yMax && actualValue > yMax;
+                            const valueStr = actualValue != null ? actualValue.toFixed(2) : '-';
+                            return `KGV: ${valueStr}${isOutlier ? ' (Ausreißer)' : ''}`;
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    beginAtZero: true,
+                    max: yMax,
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+function renderIncomeChart(incomeStatement, ttmIncomeStatement) {
+    const ctx = document.getElementById('income-chart');
+    if (!ctx) return;
+
+    // Bestehenden Chart zerstören
+    if (incomeChart) {
+        incomeChart.destroy();
+    }
+
+    const labels = incomeStatement.map(y => y.year);
+    const netIncomeData = incomeStatement.map(y => y.net_income ? y.net_income / 1e9 : 0);
+
+    // TTM hinzufügen
+    if (ttmIncomeStatement?.net_income) {
+        labels.push('TTM');
+        netIncomeData.push(ttmIncomeStatement.net_income / 1e9);
+    }
+
+    // Farben basierend auf positiv/negativ, TTM in anderer Farbe
+    const colors = netIncomeData.map((val, idx) => {
+        if (labels[idx] === 'TTM') {
+            return val >= 0 ? '#1a1a2e' : '#dc3545';
+        }
+        return val >= 0 ? '#2d5aa3' : '#dc3545';
+    });
+
+    incomeChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Net Income (Mrd)',
+                data: netIncomeData,
+                backgroundColor: colors,
+                borderRadius: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+// =========================================================================
+// EV/EBIT Detail Modal
+// =========================================================================
+
+function renderEvEbitDetail(data) {
+    // Header
+    detailCompanyName.textContent = data.company.name || '-';
+    const fiscalYear = data.company.fiscal_year_end ? ` | FJ: ${data.company.fiscal_year_end}` : '';
+    detailMeta.textContent = `${data.company.ticker} | ${data.company.sector || '-'} | ${data.company.country || '-'}${fiscalYear}`;
+
+    // Formatierungsfunktionen
+    const formatBillions = (val) => {
+        if (val === null || val === undefined) return '-';
+        return (val / 1e9).toLocaleString('de-DE', { minimumFractionDigits: 2, maximumFractionDigits: 2 }) + ' Mrd';
+    };
+
+    const formatNumber = (val, decimals = 1) => {
+        if (val === null || val === undefined) return '-';
+        return val.toLocaleString('de-DE', { minimumFractionDigits: decimals, maximumFractionDigits: decimals });
+    };
+
+    const formatEVEBITAverage = (val, years, count) => {
+        if (val === null || val === undefined) {
+            return `<span class="pe-unavailable" title="Zu wenig Datenjahre für ${years}-Jahres-Durchschnitt verfügbar">n.v.</span>`;
+        }
+        const countText = count ? `${count} von ${years} Jahren` : `${years} Jahre`;
+        const tooltip = `Durchschnitt über ${countText} (nach Filterung: Negativwerte und Ausreißer >2σ ausgeschlossen)`;
+        return `<span class="pe-value-with-tooltip" title="${tooltip}">${val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 })}</span>`;
+    };
+
+    // EV Berechnung HTML
+    const ev = data.ev_calculation || {};
+    const marketCap = ev.market_cap || 0;
+    const netDebt = ev.net_debt || 0;
+    const minorityInterest = ev.minority_interest || 0;
+    const enterpriseValue = marketCap + netDebt + minorityInterest;
+
+    let quartersEbitHtml = '';
+    if (ev.quarters && ev.quarters.length > 0) {
+        ev.quarters.forEach(q => {
+            const year = q.date ? q.date.substring(0, 4) : '';
+            const periodLabel = year ? `${q.period} ${year}` : q.period;
+            quartersEbitHtml += `
+                <div class="ttm-quarter">
+                    <span class="ttm-quarter-period">${periodLabel}</span>
+                    <span class="ttm-quarter-value">${formatBillions(q.operating_income)}</span>
+                </div>
+            `;
+        });
+        quartersEbitHtml += `
+            <div class="ttm-quarter ttm-quarter-sum">
+                <span class="ttm-quarter-period">Summe</span>
+                <span class="ttm-quarter-value">${formatBillions(ev.ttm_ebit)}</span>
+            </div>
+        `;
+    }
+
+    // EV/EBIT Übersicht mit Abweichungen
+    const evEbit = data.ev_ebit_overview || {};
+
+    // Hilfsfunktion für Abweichungs-Formatierung
+    const formatDiff = (val) => {
+        if (val === null || val === undefined) return '-';
+        const sign = val >= 0 ? '+' : '';
+        return sign + val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 }) + '%';
+    };
+
+    const getDiffClass = (val) => {
+        if (val === null || val === undefined) return '';
+        return val < 0 ? 'diff-positive' : 'diff-negative';
+    };
+
+    // Tabelle mit Werten und Abweichungen
+    let evEbitOverviewHtml = `
+        <table class="pe-comparison-table">
+            <thead>
+                <tr>
+                    <th></th>
+                    <th>Wert</th>
+                    <th>vs Ø</th>
+                </tr>
+            </thead>
+            <tbody>
+                <tr>
+                    <td class="pe-label">TTM EV/EBIT</td>
+                    <td class="pe-value">${formatNumber(evEbit.ttm_ev_ebit)}</td>
+                    <td class="pe-diff"></td>
+                </tr>
+                <tr>
+                    <td class="pe-label">FY EV/EBIT</td>
+                    <td class="pe-value">${formatNumber(evEbit.fy_ev_ebit)}</td>
+                    <td class="pe-diff"></td>
+                </tr>
+                <tr class="pe-separator">
+                    <td colspan="3"></td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 5J</td>
+                    <td class="pe-value">${formatEVEBITAverage(evEbit.ev_ebit_avg_5y, 5, evEbit.ev_ebit_avg_5y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(evEbit.ev_ebit_vs_avg_5y)}">${formatDiff(evEbit.ev_ebit_vs_avg_5y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 10J</td>
+                    <td class="pe-value">${formatEVEBITAverage(evEbit.ev_ebit_avg_10y, 10, evEbit.ev_ebit_avg_10y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(evEbit.ev_ebit_vs_avg_10y)}">${formatDiff(evEbit.ev_ebit_vs_avg_10y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 15J</td>
+                    <td class="pe-value">${formatEVEBITAverage(evEbit.ev_ebit_avg_15y, 15, evEbit.ev_ebit_avg_15y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(evEbit.ev_ebit_vs_avg_15y)}">${formatDiff(evEbit.ev_ebit_vs_avg_15y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 20J</td>
+                    <td class="pe-value">${formatEVEBITAverage(evEbit.ev_ebit_avg_20y, 20, evEbit.ev_ebit_avg_20y_count)}</td>
+                    <td class="pe-diff ${getDiffClass(evEbit.ev_ebit_vs_avg_20y)}">${formatDiff(evEbit.ev_ebit_vs_avg_20y)}</td>
+                </tr>
+                <tr>
+                    <td class="pe-label">Ø 10-19</td>
+                    <td class="pe-value">${formatNumber(evEbit.ev_ebit_avg_10y_2019)}</td>
+                    <td class="pe-diff ${getDiffClass(evEbit.ev_ebit_vs_avg_10y_2019)}">${formatDiff(evEbit.ev_ebit_vs_avg_10y_2019)}</td>
+                </tr>
+            </tbody>
+        </table>
+    `;
+
+    // Body HTML aufbauen
+    let html = `
+        <!-- EV/EBIT Berechnung + Übersicht -->
+        <div class="detail-section">
+            <div class="detail-section-title">EV/EBIT Übersicht</div>
+            <div class="pe-section-grid">
+                <div class="ev-calc-box">
+                    <div class="ev-formula">
+                        <div class="ev-components">
+                            <div class="ev-component">
+                                <span class="ev-label">Market Cap</span>
+                                <span class="ev-value">${formatBillions(marketCap)}</span>
+                            </div>
+                            <div class="ev-component">
+                                <span class="ev-label">+ Net Debt</span>
+                                <span class="ev-value">${formatBillions(netDebt)}</span>
+                            </div>
+                            <div class="ev-component">
+                                <span class="ev-label">+ Minority Int.</span>
+                                <span class="ev-value">${formatBillions(minorityInterest)}</span>
+                            </div>
+                            <div class="ev-component ev-total">
+                                <span class="ev-label">= EV</span>
+                                <span class="ev-value">${formatBillions(enterpriseValue)}</span>
+                            </div>
+                        </div>
+                        <div class="ev-divider">÷</div>
+                        <div class="ev-ebit-section">
+                            <div class="ev-component">
+                                <span class="ev-label">TTM EBIT</span>
+                                <span class="ev-value">${formatBillions(ev.ttm_ebit)}</span>
+                            </div>
+                        </div>
+                        <div class="ev-divider">=</div>
+                        <div class="ev-result">${formatNumber(data.current_ttm_ev_ebit)}</div>
+                    </div>
+                    <div class="ttm-quarters">
+                        ${quartersEbitHtml}
+                    </div>
+                </div>
+                <div class="pe-overview-box">
+                    ${evEbitOverviewHtml}
+                </div>
+            </div>
+        </div>
+
+        <!-- Charts -->
+        <div class="detail-charts">
+            <div class="chart-container">
+                <div class="chart-title">EV/EBIT Verlauf (20 Jahre)</div>
+                <div class="chart-wrapper">
+                    <canvas id="ev-ebit-chart"></canvas>
+                </div>
+            </div>
+            <div class="chart-container">
+                <div class="chart-title">EBIT Verlauf</div>
+                <div class="chart-wrapper">
+                    <canvas id="ebit-chart"></canvas>
+                </div>
+            </div>
+        </div>
+
+        <!-- Income Statement Tabelle -->
+        <div class="detail-section">
+            <div class="detail-section-title">Income Statement (${data.company.currency || 'EUR'})</div>
+            <div class="income-table-container">
+                <table class="income-table">
+                    <thead>
+                        <tr>
+                            <th></th>
+                            ${data.income_statement.map(y => `<th>'${String(y.year).slice(-2)}</th>`).join('')}
+                            <th class="ttm-col">TTM</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr class="row-revenue">
+                            <td>Revenue</td>
+                            ${data.income_statement.map(y => `<td>${formatBillions(y.revenue)}</td>`).join('')}
+                            <td class="ttm-col">${formatBillions(data.ttm_income_statement?.revenue)}</td>
+                        </tr>
+                        <tr class="row-net-income">
+                            <td>EBIT</td>
+                            ${data.income_statement.map(y => `<td>${formatBillions(y.operating_income)}</td>`).join('')}
+                            <td class="ttm-col">${formatBillions(data.ttm_income_statement?.operating_income)}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    `;
+
+    detailBody.innerHTML = html;
+
+    // Charts rendern
+    if (typeof Chart !== 'undefined') {
+        renderEvEbitChart(data.ev_ebit_history, data.current_ttm_ev_ebit);
+        renderEbitChart(data.income_statement, data.ttm_income_statement);
+
+        // Click-Handler für Chart-Zoom hinzufügen
+        setupChartZoomHandlers();
+    }
+}
+
+function renderEvEbitChart(evEbitHistory, currentTtmEvEbit) {
+    const ctx = document.getElementById('ev-ebit-chart');
+    if (!ctx) return;
+
+    if (evEbitChart) {
+        evEbitChart.destroy();
+    }
+
+    const labels = evEbitHistory.map(p => p.year);
+    const evEbitData = evEbitHistory.map(p => p.ev_ebit);
+
+    if (currentTtmEvEbit) {
+        labels.push('TTM');
+        evEbitData.push(currentTtmEvEbit);
+    }
+
+    // Daten für Vollbild-Ansicht speichern
+    chartData.evEbit = { labels, evEbitData, currentTtmEvEbit };
+
+    // Robuste Y-Achsen-Begrenzung mit Hybridansatz berechnen
+    const yMax = calculateRobustYMax(evEbitData);
+
+    // Ausreißer identifizieren und unterschiedlich darstellen
+    const pointStyles = evEbitData.map(val => (yMax && val > yMax) ? 'triangle' : 'circle');
+    const pointRadii = evEbitData.map(val => (yMax && val > yMax) ? 5 : 3);
+
+    // Werte für Anzeige begrenzen, aber echte Werte für Tooltip behalten
+    const displayData = evEbitData.map(val => (yMax && val > yMax) ? yMax : val);
+
+    evEbitChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'EV/EBIT',
+                data: displayData,
+                borderColor: '#2d5aa3',
+                backgroundColor: 'rgba(45, 90, 163, 0.1)',
+                borderWidth: 2,
+                pointRadius: pointRadii,
+                pointStyle: pointStyles,
+                pointBackgroundColor: '#2d5aa3',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const actualValue = evEbitData[context.dataIndex];
+                            const isOutlier = yMax && actualValue > yMax;
+                            const valueStr = actualValue != null ? actualValue.toFixed(2) : '-';
+                            return `EV/EBIT: ${valueStr}${isOutlier ? ' (Ausreißer)' : ''}`;
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    beginAtZero: true,
+                    max: yMax,
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+function renderEbitChart(incomeStatement, ttmIncomeStatement) {
+    const ctx = document.getElementById('ebit-chart');
+    if (!ctx) return;
+
+    if (ebitChart) {
+        ebitChart.destroy();
+    }
+
+    const labels = incomeStatement.map(y => y.year);
+    const ebitData = incomeStatement.map(y => y.operating_income ? y.operating_income / 1e9 : 0);
+
+    if (ttmIncomeStatement?.operating_income) {
+        labels.push('TTM');
+        ebitData.push(ttmIncomeStatement.operating_income / 1e9);
+    }
+
+    const colors = ebitData.map((val, idx) => {
+        if (labels[idx] === 'TTM') {
+            return val >= 0 ? '#1a1a2e' : '#dc3545';
+        }
+        return val >= 0 ? '#2d5aa3' : '#dc3545';
+    });
+
+    ebitChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'EBIT (Mrd)',
+                data: ebitData,
+                backgroundColor: colors,
+                borderRadius: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+// =========================================================================
+// Vollbild-Chart-Funktionalität
+// =========================================================================
+const chartFullscreenModal = document.getElementById('chart-fullscreen-modal');
+const chartFullscreenTitle = document.getElementById('chart-fullscreen-title');
+const chartFullscreenCanvas = document.getElementById('chart-fullscreen-canvas');
+
+function setupChartZoomHandlers() {
+    // Click-Handler für P/E Chart
+    const peChartWrapper = document.querySelector('#pe-chart')?.closest('.chart-wrapper');
+    if (peChartWrapper) {
+        peChartWrapper.style.cursor = 'zoom-in';
+        peChartWrapper.onclick = () => openChartFullscreen('pe', 'KGV Verlauf (20 Jahre)');
+    }
+
+    // Click-Handler für EV/EBIT Chart
+    const evEbitChartWrapper = document.querySelector('#ev-ebit-chart')?.closest('.chart-wrapper');
+    if (evEbitChartWrapper) {
+        evEbitChartWrapper.style.cursor = 'zoom-in';
+        evEbitChartWrapper.onclick = () => openChartFullscreen('evEbit', 'EV/EBIT Verlauf (20 Jahre)');
+    }
+}
+
+function openChartFullscreen(chartType, title) {
+    const data = chartData[chartType];
+    if (!data) return;
+
+    chartFullscreenTitle.textContent = title;
+    chartFullscreenModal.classList.remove('hidden');
+
+    // Bestehenden Chart zerstören
+    if (fullscreenChart) {
+        fullscreenChart.destroy();
+    }
+
+    // Chart im Vollbild rendern
+    if (chartType === 'pe') {
+        renderFullscreenPEChart(data);
+    } else if (chartType === 'evEbit') {
+        renderFullscreenEvEbitChart(data);
+    }
+}
+
+function renderFullscreenPEChart(data) {
+    const { labels, peData } = data;
+
+    // Robuste Y-Achsen-Begrenzung mit Hybridansatz berechnen
+    const yMax = calculateRobustYMax(peData);
+
+    // Ausreißer identifizieren
+    const pointStyles = peData.map(val => (yMax && val > yMax) ? 'triangle' : 'circle');
+    const pointRadii = peData.map(val => (yMax && val > yMax) ? 6 : 4);
+    const displayData = peData.map(val => (yMax && val > yMax) ? yMax : val);
+
+    fullscreenChart = new Chart(chartFullscreenCanvas, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'KGV',
+                data: displayData,
+                borderColor: '#1a1a2e',
+                backgroundColor: 'rgba(26, 26, 46, 0.1)',
+                borderWidth: 3,
+                pointRadius: pointRadii,
+                pointStyle: pointStyles,
+                pointBackgroundColor: '#1a1a2e',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const actualValue = peData[context.dataIndex];
+                            const isOutlier = yMax && actualValue > yMax;
+                            const valueStr = actualValue != null ? actualValue.toFixed(2) : '-';
+                            return `KGV: ${valueStr}${isOutlier ? ' (Ausreißer)' : ''}`;
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 14 } },
+                    grid: { display: false }
+                },
+                y: {
+                    beginAtZero: true,
+                    max: yMax,
+                    ticks: { font: { size: 14 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+function renderFullscreenEvEbitChart(data) {
+    const { labels, evEbitData } = data;
+
+    // Robuste Y-Achsen-Begrenzung mit Hybridansatz berechnen
+    const yMax = calculateRobustYMax(evEbitData);
+
+    // Ausreißer identifizieren
+    const pointStyles = evEbitData.map(val => (yMax && val > yMax) ? 'triangle' : 'circle');
+    const pointRadii = evEbitData.map(val => (yMax && val > yMax) ? 6 : 4);
+    const displayData = evEbitData.map(val => (yMax && val > yMax) ? yMax : val);
+
+    fullscreenChart = new Chart(chartFullscreenCanvas, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'EV/EBIT',
+                data: displayData,
+                borderColor: '#2d5aa3',
+                backgroundColor: 'rgba(45, 90, 163, 0.1)',
+                borderWidth: 3,
+                pointRadius: pointRadii,
+                pointStyle: pointStyles,
+                pointBackgroundColor: '#2d5aa3',
+                fill: true,
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const actualValue = evEbitData[context.dataIndex];
+                            const isOutlier = yMax && actualValue > yMax;
+                            const valueStr = actualValue != null ? actualValue.toFixed(2) : '-';
+                            return `EV/EBIT: ${valueStr}${isOutlier ? ' (Ausreißer)' : ''}`;
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 14 } },
+                    grid: { display: false }
+                },
+                y: {
+                    beginAtZero: true,
+                    max: yMax,
+                    ticks: { font: { size: 14 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+// Modal-Close-Handler für Vollbild-Chart
+if (chartFullscreenModal) {
+    chartFullscreenModal.querySelectorAll('.modal-close').forEach(btn => {
+        btn.addEventListener('click', function() {
+            chartFullscreenModal.classList.add('hidden');
+            if (fullscreenChart) {
+                fullscreenChart.destroy();
+                fullscreenChart = null;
+            }
+        });
+    });
+
+    // Schließen beim Klick auf Hintergrund
+    chartFullscreenModal.addEventListener('click', function(e) {
+        if (e.target === chartFullscreenModal) {
+            chartFullscreenModal.classList.add('hidden');
+            if (fullscreenChart) {
+                fullscreenChart.destroy();
+                fullscreenChart = null;
+            }
+        }
+    });
+}
+
+// =========================================================================
+// Wachstum Detail Modal
+// =========================================================================
+let revenueChart = null;
+let netIncomeChart = null;
+
+function renderGrowthDetail(data) {
+    // Header
+    detailCompanyName.textContent = data.company.name || '-';
+    const fiscalYear = data.company.fiscal_year_end ? ` | FJ: ${data.company.fiscal_year_end}` : '';
+    detailMeta.textContent = `${data.company.ticker} | ${data.company.sector || '-'} | ${data.company.country || '-'}${fiscalYear}`;
+
+    // Formatierungsfunktionen
+    const formatBillions = (val) => {
+        if (val === null || val === undefined) return '-';
+        return (val / 1e9).toLocaleString('de-DE', { minimumFractionDigits: 2, maximumFractionDigits: 2 }) + ' Mrd';
+    };
+
+    const formatPercent = (val) => {
+        if (val === null || val === undefined) return '-';
+        const sign = val >= 0 ? '+' : '';
+        return sign + val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 }) + '%';
+    };
+
+    const formatPercentClass = (val) => {
+        if (val === null || val === undefined) return '';
+        return val >= 0 ? 'positive' : 'negative';
+    };
+
+    // CAGR Übersicht
+    const growth = data.growth_overview || {};
+
+    // YoY-Wachstum berechnen für die Tabelle
+    const incomeData = data.income_statement || [];
+    const growthRows = [];
+
+    for (let i = 0; i < incomeData.length; i++) {
+        const curr = incomeData[i];
+        const prev = i > 0 ? incomeData[i - 1] : null;
+
+        let revenueGrowth = null;
+        let netIncomeGrowth = null;
+        let profitMargin = null;
+
+        if (prev && prev.revenue && curr.revenue) {
+            revenueGrowth = ((curr.revenue - prev.revenue) / Math.abs(prev.revenue)) * 100;
+        }
+        if (prev && prev.net_income && curr.net_income && prev.net_income !== 0) {
+            netIncomeGrowth = ((curr.net_income - prev.net_income) / Math.abs(prev.net_income)) * 100;
+        }
+        if (curr.revenue && curr.net_income) {
+            profitMargin = (curr.net_income / curr.revenue) * 100;
+        }
+
+        growthRows.push({
+            year: curr.year,
+            revenue: curr.revenue,
+            revenueGrowth: revenueGrowth,
+            netIncome: curr.net_income,
+            netIncomeGrowth: netIncomeGrowth,
+            profitMargin: profitMargin
+        });
+    }
+
+    // TTM hinzufügen falls vorhanden
+    const ttm = data.ttm_income_statement;
+    if (ttm && ttm.revenue) {
+        const lastFY = incomeData.length > 0 ? incomeData[incomeData.length - 1] : null;
+        let ttmRevenueGrowth = null;
+        let ttmNetIncomeGrowth = null;
+        let ttmProfitMargin = null;
+
+        if (lastFY && lastFY.revenue) {
+            ttmRevenueGrowth = ((ttm.revenue - lastFY.revenue) / Math.abs(lastFY.revenue)) * 100;
+        }
+        if (lastFY && lastFY.net_income && ttm.net_income && lastFY.net_income !== 0) {
+            ttmNetIncomeGrowth = ((ttm.net_income - lastFY.net_income) / Math.abs(lastFY.net_income)) * 100;
+        }
+        if (ttm.revenue && ttm.net_income) {
+            ttmProfitMargin = (ttm.net_income / ttm.revenue) * 100;
+        }
+
+        growthRows.push({
+            year: 'TTM',
+            revenue: ttm.revenue,
+            revenueGrowth: ttmRevenueGrowth,
+            netIncome: ttm.net_income,
+            netIncomeGrowth: ttmNetIncomeGrowth,
+            profitMargin: ttmProfitMargin
+        });
+    }
+
+    // Body HTML aufbauen
+    let html = `
+        <!-- CAGR Übersicht -->
+        <div class="detail-section">
+            <div class="detail-section-title">CAGR Übersicht</div>
+            <div class="cagr-overview-box">
+                <table class="cagr-table">
+                    <thead>
+                        <tr>
+                            <th></th>
+                            <th>3 Jahre</th>
+                            <th>5 Jahre</th>
+                            <th>10 Jahre</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr>
+                            <td class="cagr-label">Umsatz</td>
+                            <td class="${formatPercentClass(growth.revenue_cagr_3y)}">${formatPercent(growth.revenue_cagr_3y)}</td>
+                            <td class="${formatPercentClass(growth.revenue_cagr_5y)}">${formatPercent(growth.revenue_cagr_5y)}</td>
+                            <td class="${formatPercentClass(growth.revenue_cagr_10y)}">${formatPercent(growth.revenue_cagr_10y)}</td>
+                        </tr>
+                        <tr>
+                            <td class="cagr-label">EBIT</td>
+                            <td class="${formatPercentClass(growth.ebit_cagr_3y)}">${formatPercent(growth.ebit_cagr_3y)}</td>
+                            <td class="${formatPercentClass(growth.ebit_cagr_5y)}">${formatPercent(growth.ebit_cagr_5y)}</td>
+                            <td class="${formatPercentClass(growth.ebit_cagr_10y)}">${formatPercent(growth.ebit_cagr_10y)}</td>
+                        </tr>
+                        <tr>
+                            <td class="cagr-label">Gewinn</td>
+                            <td class="${formatPercentClass(growth.net_income_cagr_3y)}">${formatPercent(growth.net_income_cagr_3y)}</td>
+                            <td class="${formatPercentClass(growth.net_income_cagr_5y)}">${formatPercent(growth.net_income_cagr_5y)}</td>
+                            <td class="${formatPercentClass(growth.net_income_cagr_10y)}">${formatPercent(growth.net_income_cagr_10y)}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+
+        <!-- Charts -->
+        <div class="detail-charts">
+            <div class="chart-container">
+                <div class="chart-title">Umsatz-Entwicklung</div>
+                <div class="chart-wrapper">
+                    <canvas id="revenue-chart"></canvas>
+                </div>
+            </div>
+            <div class="chart-container">
+                <div class="chart-title">Gewinn-Entwicklung</div>
+                <div class="chart-wrapper">
+                    <canvas id="net-income-chart"></canvas>
+                </div>
+            </div>
+        </div>
+
+        <!-- Wachstum pro Jahr Tabelle -->
+        <div class="detail-section">
+            <div class="detail-section-title">Wachstum pro Jahr (${data.company.currency || 'EUR'})</div>
+            <div class="income-table-container">
+                <table class="income-table growth-table">
+                    <thead>
+                        <tr>
+                            <th>Jahr</th>
+                            <th class="num">Umsatz</th>
+                            <th class="num">YoY</th>
+                            <th class="num">Gewinn</th>
+                            <th class="num">YoY</th>
+                            <th class="num">Marge</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        ${growthRows.map(row => `
+                            <tr class="${row.year === 'TTM' ? 'ttm-row' : ''}">
+                                <td>${row.year === 'TTM' ? 'TTM' : "'" + String(row.year).slice(-2)}</td>
+                                <td class="num">${formatBillions(row.revenue)}</td>
+                                <td class="num ${formatPercentClass(row.revenueGrowth)}">${row.revenueGrowth !== null ? formatPercent(row.revenueGrowth) : '-'}</td>
+                                <td class="num">${formatBillions(row.netIncome)}</td>
+                                <td class="num ${formatPercentClass(row.netIncomeGrowth)}">${row.netIncomeGrowth !== null ? formatPercent(row.netIncomeGrowth) : '-'}</td>
+                                <td class="num">${row.profitMargin !== null ? row.profitMargin.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 }) + '%' : '-'}</td>
+                            </tr>
+                        `).join('')}
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    `;
+
+    detailBody.innerHTML = html;
+
+    // Charts rendern
+    if (typeof Chart !== 'undefined') {
+        renderRevenueChart(data.income_statement, data.ttm_income_statement);
+        renderNetIncomeGrowthChart(data.income_statement, data.ttm_income_statement);
+    }
+}
+
+function renderRevenueChart(incomeStatement, ttmIncomeStatement) {
+    const ctx = document.getElementById('revenue-chart');
+    if (!ctx) return;
+
+    if (revenueChart) {
+        revenueChart.destroy();
+    }
+
+    const labels = incomeStatement.map(y => y.year);
+    const revenueData = incomeStatement.map(y => y.revenue ? y.revenue / 1e9 : 0);
+
+    if (ttmIncomeStatement?.revenue) {
+        labels.push('TTM');
+        revenueData.push(ttmIncomeStatement.revenue / 1e9);
+    }
+
+    const colors = revenueData.map((val, idx) => {
+        if (labels[idx] === 'TTM') {
+            return '#1a1a2e';
+        }
+        return '#4a9d5b';
+    });
+
+    revenueChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Umsatz (Mrd)',
+                data: revenueData,
+                backgroundColor: colors,
+                borderRadius: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    beginAtZero: true,
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+function renderNetIncomeGrowthChart(incomeStatement, ttmIncomeStatement) {
+    const ctx = document.getElementById('net-income-chart');
+    if (!ctx) return;
+
+    if (netIncomeChart) {
+        netIncomeChart.destroy();
+    }
+
+    const labels = incomeStatement.map(y => y.year);
+    const netIncomeData = incomeStatement.map(y => y.net_income ? y.net_income / 1e9 : 0);
+
+    if (ttmIncomeStatement?.net_income) {
+        labels.push('TTM');
+        netIncomeData.push(ttmIncomeStatement.net_income / 1e9);
+    }
+
+    const colors = netIncomeData.map((val, idx) => {
+        if (labels[idx] === 'TTM') {
+            return val >= 0 ? '#1a1a2e' : '#dc3545';
+        }
+        return val >= 0 ? '#2d5aa3' : '#dc3545';
+    });
+
+    netIncomeChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Gewinn (Mrd)',
+                data: netIncomeData,
+                backgroundColor: colors,
+                borderRadius: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+// =========================================================================
+// Margen Detail Modal
+// =========================================================================
+let marginsLineChart = null;
+let marginsBarChart = null;
+
+function renderMarginsDetail(data) {
+    // Header
+    detailCompanyName.textContent = data.company.name || '-';
+    const fiscalYear = data.company.fiscal_year_end ? ` | FJ: ${data.company.fiscal_year_end}` : '';
+    detailMeta.textContent = `${data.company.ticker} | ${data.company.sector || '-'} | ${data.company.country || '-'}${fiscalYear}`;
+
+    // Formatierungsfunktionen
+    const formatBillions = (val) => {
+        if (val === null || val === undefined) return '-';
+        return (val / 1e9).toLocaleString('de-DE', { minimumFractionDigits: 2, maximumFractionDigits: 2 }) + ' Mrd';
+    };
+
+    const formatPercent = (val) => {
+        if (val === null || val === undefined) return '-';
+        return val.toLocaleString('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 }) + '%';
+    };
+
+    // Margen Übersicht
+    const margins = data.margins_overview || {};
+
+    // Margen pro Jahr berechnen aus income_statement
+    const incomeData = data.income_statement || [];
+    const marginRows = [];
+
+    for (let i = 0; i < incomeData.length; i++) {
+        const curr = incomeData[i];
+
+        let grossMargin = null;
+        let operatingMargin = null;
+        let profitMargin = null;
+
+        if (curr.revenue && curr.gross_profit) {
+            grossMargin = (curr.gross_profit / curr.revenue) * 100;
+        }
+        if (curr.revenue && curr.operating_income) {
+            operatingMargin = (curr.operating_income / curr.revenue) * 100;
+        }
+        if (curr.revenue && curr.net_income) {
+            profitMargin = (curr.net_income / curr.revenue) * 100;
+        }
+
+        marginRows.push({
+            year: curr.year,
+            revenue: curr.revenue,
+            grossProfit: curr.gross_profit,
+            grossMargin: grossMargin,
+            operatingIncome: curr.operating_income,
+            operatingMargin: operatingMargin,
+            netIncome: curr.net_income,
+            profitMargin: profitMargin
+        });
+    }
+
+    // TTM hinzufügen falls vorhanden
+    const ttm = data.ttm_income_statement;
+    if (ttm && ttm.revenue) {
+        let ttmGrossMargin = null;
+        let ttmOperatingMargin = null;
+        let ttmProfitMargin = null;
+
+        if (ttm.gross_profit) {
+            ttmGrossMargin = (ttm.gross_profit / ttm.revenue) * 100;
+        }
+        if (ttm.operating_income) {
+            ttmOperatingMargin = (ttm.operating_income / ttm.revenue) * 100;
+        }
+        if (ttm.net_income) {
+            ttmProfitMargin = (ttm.net_income / ttm.revenue) * 100;
+        }
+
+        marginRows.push({
+            year: 'TTM',
+            revenue: ttm.revenue,
+            grossProfit: ttm.gross_profit,
+            grossMargin: ttmGrossMargin,
+            operatingIncome: ttm.operating_income,
+            operatingMargin: ttmOperatingMargin,
+            netIncome: ttm.net_income,
+            profitMargin: ttmProfitMargin
+        });
+    }
+
+    // Aktuelle Bruttomarge aus letztem FY berechnen
+    const lastFY = incomeData.length > 0 ? incomeData[incomeData.length - 1] : null;
+    let currentGrossMargin = null;
+    if (lastFY && lastFY.revenue && lastFY.gross_profit) {
+        currentGrossMargin = (lastFY.gross_profit / lastFY.revenue) * 100;
+    }
+
+    // Body HTML aufbauen
+    let html = `
+        <!-- Margen Übersicht -->
+        <div class="detail-section">
+            <div class="detail-section-title">Margen Übersicht</div>
+            <div class="cagr-overview-box">
+                <table class="cagr-table margins-table">
+                    <thead>
+                        <tr>
+                            <th></th>
+                            <th>Aktuell</th>
+                            <th>Ø 3J</th>
+                            <th>Ø 5J</th>
+                            <th>Ø 10J</th>
+                            <th>Ø 15-19</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr>
+                            <td class="cagr-label">Bruttomarge</td>
+                            <td>${formatPercent(currentGrossMargin)}</td>
+                            <td>-</td>
+                            <td>-</td>
+                            <td>-</td>
+                            <td>-</td>
+                        </tr>
+                        <tr>
+                            <td class="cagr-label">Op. Marge</td>
+                            <td>${formatPercent(margins.operating_margin)}</td>
+                            <td>${formatPercent(margins.operating_margin_avg_3y)}</td>
+                            <td>${formatPercent(margins.operating_margin_avg_5y)}</td>
+                            <td>${formatPercent(margins.operating_margin_avg_10y)}</td>
+                            <td>${formatPercent(margins.operating_margin_avg_5y_2019)}</td>
+                        </tr>
+                        <tr>
+                            <td class="cagr-label">Gewinnmarge</td>
+                            <td>${formatPercent(margins.profit_margin)}</td>
+                            <td>${formatPercent(margins.profit_margin_avg_3y)}</td>
+                            <td>${formatPercent(margins.profit_margin_avg_5y)}</td>
+                            <td>${formatPercent(margins.profit_margin_avg_10y)}</td>
+                            <td>${formatPercent(margins.profit_margin_avg_5y_2019)}</td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+
+        <!-- Charts -->
+        <div class="detail-charts">
+            <div class="chart-container">
+                <div class="chart-title">Margen-Entwicklung</div>
+                <div class="chart-wrapper">
+                    <canvas id="margins-line-chart"></canvas>
+                </div>
+            </div>
+            <div class="chart-container">
+                <div class="chart-title">Umsatz & Gewinn</div>
+                <div class="chart-wrapper">
+                    <canvas id="margins-bar-chart"></canvas>
+                </div>
+            </div>
+        </div>
+
+        <!-- Margen pro Jahr Tabelle -->
+        <div class="detail-section">
+            <div class="detail-section-title">Margen pro Jahr (${data.company.currency || 'EUR'})</div>
+            <div class="income-table-container">
+                <table class="income-table growth-table">
+                    <thead>
+                        <tr>
+                            <th>Jahr</th>
+                            <th class="num">Umsatz</th>
+                            <th class="num">Brutto</th>
+                            <th class="num">Brutto%</th>
+                            <th class="num">Op.Inc</th>
+                            <th class="num">Op.%</th>
+                            <th class="num">Gewinn%</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        ${marginRows.map(row => `
+                            <tr class="${row.year === 'TTM' ? 'ttm-row' : ''}">
+                                <td>${row.year === 'TTM' ? 'TTM' : "'" + String(row.year).slice(-2)}</td>
+                                <td class="num">${formatBillions(row.revenue)}</td>
+                                <td class="num">${formatBillions(row.grossProfit)}</td>
+                                <td class="num">${formatPercent(row.grossMargin)}</td>
+                                <td class="num">${formatBillions(row.operatingIncome)}</td>
+                                <td class="num">${formatPercent(row.operatingMargin)}</td>
+                                <td class="num">${formatPercent(row.profitMargin)}</td>
+                            </tr>
+                        `).join('')}
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    `;
+
+    detailBody.innerHTML = html;
+
+    // Charts rendern
+    if (typeof Chart !== 'undefined') {
+        renderMarginsLineChart(marginRows);
+        renderMarginsBarChart(data.income_statement, data.ttm_income_statement);
+    }
+}
+
+function renderMarginsLineChart(marginRows) {
+    const ctx = document.getElementById('margins-line-chart');
+    if (!ctx) return;
+
+    if (marginsLineChart) {
+        marginsLineChart.destroy();
+    }
+
+    const labels = marginRows.map(r => r.year === 'TTM' ? 'TTM' : r.year);
+    const grossData = marginRows.map(r => r.grossMargin);
+    const operatingData = marginRows.map(r => r.operatingMargin);
+    const profitData = marginRows.map(r => r.profitMargin);
+
+    marginsLineChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: labels,
+            datasets: [
+                {
+                    label: 'Bruttomarge',
+                    data: grossData,
+                    borderColor: '#4a9d5b',
+                    backgroundColor: 'transparent',
+                    borderWidth: 2,
+                    pointRadius: 2,
+                    tension: 0.1
+                },
+                {
+                    label: 'Op. Marge',
+                    data: operatingData,
+                    borderColor: '#2d5aa3',
+                    backgroundColor: 'transparent',
+                    borderWidth: 2,
+                    pointRadius: 2,
+                    tension: 0.1
+                },
+                {
+                    label: 'Gewinnmarge',
+                    data: profitData,
+                    borderColor: '#1a1a2e',
+                    backgroundColor: 'transparent',
+                    borderWidth: 2,
+                    pointRadius: 2,
+                    tension: 0.1
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: true,
+                    position: 'top',
+                    labels: {
+                        boxWidth: 12,
+                        font: { size: 9 },
+                        padding: 8
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    ticks: {
+                        font: { size: 9 },
+                        callback: function(value) {
+                            return value + '%';
+                        }
+                    },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+function renderMarginsBarChart(incomeStatement, ttmIncomeStatement) {
+    const ctx = document.getElementById('margins-bar-chart');
+    if (!ctx) return;
+
+    if (marginsBarChart) {
+        marginsBarChart.destroy();
+    }
+
+    const labels = incomeStatement.map(y => y.year);
+    const revenueData = incomeStatement.map(y => y.revenue ? y.revenue / 1e9 : 0);
+    const netIncomeData = incomeStatement.map(y => y.net_income ? y.net_income / 1e9 : 0);
+
+    if (ttmIncomeStatement?.revenue) {
+        labels.push('TTM');
+        revenueData.push(ttmIncomeStatement.revenue / 1e9);
+        netIncomeData.push(ttmIncomeStatement.net_income ? ttmIncomeStatement.net_income / 1e9 : 0);
+    }
+
+    marginsBarChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [
+                {
+                    label: 'Umsatz',
+                    data: revenueData,
+                    backgroundColor: '#4a9d5b',
+                    borderRadius: 2
+                },
+                {
+                    label: 'Gewinn',
+                    data: netIncomeData,
+                    backgroundColor: '#1a1a2e',
+                    borderRadius: 2
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: true,
+                    position: 'top',
+                    labels: {
+                        boxWidth: 12,
+                        font: { size: 9 },
+                        padding: 8
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    ticks: { font: { size: 9 } },
+                    grid: { display: false }
+                },
+                y: {
+                    ticks: { font: { size: 9 } },
+                    grid: { color: '#eee' }
+                }
+            }
+        }
+    });
+}
+
+// =========================================================================
+// Company Info Modal (Unternehmensbeschreibung)
+// =========================================================================
+const companyInfoModal = document.getElementById('company-info-modal');
+const infoCompanyName = document.getElementById('info-company-name');
+const infoMeta = document.getElementById('info-meta');
+const companyInfoBody = document.getElementById('info-body');
+
+export async function openCompanyInfo(isin) {
+    if (!companyInfoModal) return;
+
+    // Modal öffnen mit Ladeindikator
+    companyInfoModal.classList.remove('hidden');
+    infoCompanyName.textContent = 'Lade...';
+    infoMeta.textContent = '';
+    companyInfoBody.innerHTML = '<div class="detail-loading">Lade Daten...</div>';
+
+    try {
+        const data = await getStockData(isin, 'info');
+
+        // Header
+        infoCompanyName.textContent = data.company_name || '-';
+        const fiscalYear = data.fiscal_year_end ? ` | FJ: ${data.fiscal_year_end}` : '';
+        infoMeta.textContent = `${data.ticker} | ${data.sector || '-'} | ${data.country || '-'}${fiscalYear}`;
+
+        // Body: Beschreibung
+        let html = '<div class="company-description">';
+
+        if (data.description) {
+            html += `<p>${data.description}</p>`;
+        } else {
+            html += '<p class="empty-state">Keine Beschreibung verfügbar.</p>';
+        }
+
+        // Weitere Infos
+        html += '<div class="company-meta-info">';
+        if (data.industry) {
+            html += `<p><strong>Branche:</strong> ${data.industry}</p>`;
+        }
+        if (data.stock_index) {
+            html += `<p><strong>Index:</strong> ${data.stock_index}</p>`;
+        }
+        if (data.currency) {
+            html += `<p><strong>Währung:</strong> ${data.currency}</p>`;
+        }
+        if (data.market_cap) {
+            const marketCapFormatted = (data.market_cap / 1e9).toLocaleString('de-DE', {
+                minimumFractionDigits: 2,
+                maximumFractionDigits: 2
+            }) + ' Mrd.';
+            html += `<p><strong>Marktkapitalisierung:</strong> ${marketCapFormatted}</p>`;
+        }
+        html += '</div>';
+
+        html += '</div>';
+        companyInfoBody.innerHTML = html;
+
+    } catch (error) {
+        console.error('Fehler:', error);
+        companyInfoBody.innerHTML = '<div class="detail-loading">Fehler beim Laden der Daten.</div>';
+    }
+}
+
+// DCF-Tab: Code erst beim ersten Öffnen laden
+async function showDcfTab(isin) {
+    try {
+        const dcf = await import('./dcf.js');
+        dcf.loadDcfData(isin);
+    } catch (error) {
+        console.error('Fehler:', error);
+        detailBody.innerHTML = '<div class="detail-loading">Fehler beim Laden der Daten.</div>';
+    }
+}
@@ -0,0 +1,121 @@
+// =============================================================================
+// Aktien-Tool JavaScript (Einstieg)
+// =============================================================================
+// Sofort geladen: Tabelle (table.js), Favoriten/Notizen (notes.js),
+// Spalten-/Favoriten-Konfiguration (settings.js) und Screener (screener.js).
+// Detail-Modals mit Charts (detail.js) und DCF (dcf.js) werden erst beim
+// ersten Öffnen nachgeladen, ihre Daten für sichtbare Watchlist-Zeilen vorab
+// (stocks.js). Als Modul läuft die Datei nach dem Parsen der Seite.
+import { tableState, VirtualTable, rowsFromPage, bindTableEvents } from './table.js';
+import { prefetchStocks } from './stocks.js';
+import { saveFavorite, openNoteModal } from './notes.js';
+import { applyFilters } from './screener.js';
+import './settings.js';
+
+// =============================================================================
+// Detail-Modals (lazy)
+// =============================================================================
+let detailModule = null;
+
+function loadDetailModule() {
+    if (!detailModule) {
+        detailModule = import('./detail.js').catch(error => {
+            // Nächster Klick versucht es erneut
+            detailModule = null;
+            throw error;
+        });
+    }
+    return detailModule;
+}
+
+async function openStockDetail(isin, tab) {
+    try {
+        (await loadDetailModule()).openStockDetail(isin, tab);
+    } catch (error) {
+        console.error('Fehler:', error);
+        alert('Fehler beim Laden der Detailansicht');
+    }
+}
+
+async function openCompanyInfo(isin) {
+    try {
+        (await loadDetailModule()).openCompanyInfo(isin);
+    } catch (error) {
+        console.error('Fehler:', error);
+        alert('Fehler beim Laden der Detailansicht');
+    }
+}
+
+// =============================================================================
+// Prefetch: Detaildaten der sichtbaren Watchlist-Zeilen, wenn der Browser idle ist
+// =============================================================================
+const PREFETCH_DELAY_MS = 400;
+const whenIdle = window.requestIdleCallback || (callback => setTimeout(callback, 0));
+let prefetchTimer = null;
+
+function schedulePrefetch(table) {
+    // Datensparmodus respektieren
+    if (navigator.connection && navigator.connection.saveData) return;
+
+    // Erst wenn das Scrollen kurz ruht, nicht für jede überflogene Zeile
+    clearTimeout(prefetchTimer);
+    prefetchTimer = setTimeout(() => {
+        whenIdle(() => {
+            const [first, last] = table.visibleRange();
+            prefetchStocks(table.rows.slice(first, last).map(row => row.isin), 'details');
+        }, { timeout: 2000 });
+    }, PREFETCH_DELAY_MS);
+}
+
+// =============================================================================
+// Tabellen: Event Delegation, Watchlist-Daten
+// =============================================================================
+const tableHandlers = {
+    sort: () => applyFilters(),     // nur Screener (serverseitige Sortierung)
+    favorite: saveFavorite,
+    note: openNoteModal,
+    detail: openStockDetail,
+    companyInfo: openCompanyInfo
+};
+
+const watchlistContainer = document.getElementById('watchlist-container');
+const watchlistData = document.getElementById('watchlist-data');
+if (watchlistContainer && watchlistData) {
+    const data = JSON.parse(watchlistData.textContent);
+    tableState.table = new VirtualTable(watchlistContainer, data.columns, { onView: schedulePrefetch });
+    tableState.table.setRows(rowsFromPage(data));
+    bindTableEvents(watchlistContainer, tableHandlers);
+}
+
+// Screener-Tabelle rendert screener.js, der Container bleibt über Filterwechsel gleich
+const screenerContainer = document.getElementById('table-container');
+if (screenerContainer) {
+    bindTableEvents(screenerContainer, tableHandlers);
+}
+
+// =============================================================================
+// Modal schließen
+// =============================================================================
+document.querySelectorAll('.modal-close').forEach(btn => {
+    btn.addEventListener('click', function() {
+        this.closest('.modal').classList.add('hidden');
+    });
+});
+
+// Klick außerhalb Modal
+document.querySelectorAll('.modal').forEach(modal => {
+    modal.addEventListener('click', function(e) {
+        if (e.target === this) {
+            this.classList.add('hidden');
+        }
+    });
+});
+
+// Escape-Taste
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        document.querySelectorAll('.modal').forEach(modal => {
+            modal.classList.add('hidden');
+        });
+    }
+});
@@ -0,0 +1,81 @@
+import { tableState } from './table.js';
+import { invalidateScreenerCache } from './screener.js';
+
+// =============================================================================
+// Favoriten und Notizen einer Tabellenzeile
+// =============================================================================
+// Aufruf per Event Delegation aus bindTableEvents()
+export async function saveFavorite(select) {
+    const isin = select.dataset.isin;
+    const favorite = parseInt(select.value);
+
+    try {
+        const response = await fetch('/api/favorite', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ isin, favorite })
+        });
+
+        if (response.ok) {
+            invalidateScreenerCache();
+            // Zeilendaten mitziehen (Zeile wird beim Scrollen neu gerendert)
+            tableState.table?.updateRow(isin, { favorite });
+            // Visuelles Feedback
+            select.style.background = '#d4edda';
+            setTimeout(() => {
+                select.style.background = '';
+            }, 500);
+        }
+    } catch (error) {
+        console.error('Fehler:', error);
+        alert('Fehler beim Speichern');
+    }
+}
+
+// -----------------------------------------------------------------------------
+// Notizen Modal
+// -----------------------------------------------------------------------------
+const noteModal = document.getElementById('note-modal');
+const noteText = document.getElementById('note-text');
+let currentNoteIsin = null;
+
+// Notiz-Button klicken (Event Delegation aus bindTableEvents())
+export function openNoteModal(isin) {
+    currentNoteIsin = isin;
+    noteText.value = tableState.table?.getRow(isin)?.notes || '';
+    noteModal.classList.remove('hidden');
+    noteText.focus();
+}
+
+// Notiz speichern
+const noteSaveBtn = document.getElementById('note-save');
+if (noteSaveBtn) {
+    noteSaveBtn.addEventListener('click', async function() {
+        if (!currentNoteIsin) return;
+
+        try {
+            const response = await fetch('/api/note', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    isin: currentNoteIsin,
+                    notes: noteText.value
+                })
+            });
+
+            if (response.ok) {
+                invalidateScreenerCache();
+                // Zeilendaten und (falls gerendert) Button aktualisieren
+                tableState.table?.updateRow(currentNoteIsin, { notes: noteText.value });
+                const btn = document.querySelector(`.note-btn[data-isin="${currentNoteIsin}"]`);
+                if (btn) {
+                    btn.textContent = noteText.value ? '📝' : '+';
+                }
+                noteModal.classList.add('hidden');
+            }
+        } catch (error) {
+            console.error('Fehler:', error);
+            alert('Fehler beim Speichern');
+        }
+    });
+}
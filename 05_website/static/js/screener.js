@@ -0,0 +1,554 @@
+import { getCurrentView } from './util.js';
+import { tableState, VirtualTable, rowsFromPage } from './table.js';
+
+// =========================================================================
+// Screener-Zustand (Seiten per Keyset-Cursor, siehe loadMoreScreenerRows)
+// =========================================================================
+const SCREENER_PAGE_SIZE = 100;
+const screenerContainer = getCurrentView() === 'screener' ? document.getElementById('table-container') : null;
+const screenerDataEl = document.getElementById('screener-data');
+const screenerMore = document.getElementById('screener-more');
+
+let screenerCursor = null;
+let screenerTotal = null;
+let screenerLoaded = 0;
+let screenerLoading = false;
+let screenerReplacing = false;    // neue Filter/Sortierung unterwegs → kein Nachladen
+let screenerGeneration = 0;
+
+// Requests: Debounce beim Tippen, Abbruch überholter Requests, LRU-Cache
+const SCREENER_DEBOUNCE_MS = 300;
+const SCREENER_CACHE_SIZE = 20;
+const SCREENER_CACHE_TTL_MS = 60000;
+const screenerTabId = Math.random().toString(36).slice(2, 10);
+const screenerCache = new Map();   // Request-JSON → { time, data }, älteste zuerst
+let screenerRequestSeq = 0;
+let screenerController = null;
+
+function debounce(fn, delay) {
+    let timer = null;
+    const debounced = (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), delay);
+    };
+    debounced.cancel = () => clearTimeout(timer);
+    return debounced;
+}
+
+export function invalidateScreenerCache() {
+    screenerCache.clear();
+}
+
+/**
+ * Lädt eine Screener-Seite über den LRU-Cache.
+ * replace=true bricht den vorherigen ersetzenden Request ab (neue Filter/Sortierung)
+ * und schickt eine request_id mit, damit der Server überholte erste Seiten
+ * verwirft. Nachlade-Requests laufen ohne request_id.
+ * Returns die Antwort oder null, wenn sie überholt ist.
+ */
+async function fetchScreenerPage(payload, { replace = false } = {}) {
+    if (replace && screenerController) {
+        screenerController.abort();
+        screenerController = null;
+    }
+
+    const key = JSON.stringify(payload);
+    const cached = screenerCache.get(key);
+    if (cached && Date.now() - cached.time < SCREENER_CACHE_TTL_MS) {
+        // LRU: zuletzt benutzten Eintrag ans Ende
+        screenerCache.delete(key);
+        screenerCache.set(key, cached);
+        return cached.data;
+    }
+
+    const controller = new AbortController();
+    if (replace) {
+        screenerController = controller;
+    }
+    const requestId = replace ? `${screenerTabId}:${++screenerRequestSeq}` : null;
+
+    const response = await fetch('/api/screener/filter', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(requestId ? { ...payload, request_id: requestId } : payload),
+        signal: controller.signal
+    });
+    if (screenerController === controller) {
+        screenerController = null;
+    }
+
+    // 409: Server hat bereits einen neueren Request dieses Tabs gesehen
+    if (response.status === 409) return null;
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+    const data = await response.json();
+    if (requestId && data.request_id !== requestId) return null;
+
+    screenerCache.set(key, { time: Date.now(), data });
+    while (screenerCache.size > SCREENER_CACHE_SIZE) {
+        screenerCache.delete(screenerCache.keys().next().value);
+    }
+    return data;
+}
+
+// Erste Seite kommt als JSON aus dem Template (Events bindet main.js)
+if (screenerContainer && screenerDataEl) {
+    updateScreenerTable(JSON.parse(screenerDataEl.textContent));
+}
+
+// =========================================================================
+// Suchfeld (nur auf Screener-Seite)
+// =========================================================================
+const searchInput = document.getElementById('search-input');
+const searchBtn = document.getElementById('search-btn');
+
+// Beim Tippen erst nach einer Pause suchen
+const debouncedSearch = debounce(performSearch, SCREENER_DEBOUNCE_MS);
+
+if (searchInput && searchBtn) {
+    // Suchen-Button klicken
+    searchBtn.addEventListener('click', performSearch);
+
+    // Enter-Taste im Suchfeld
+    searchInput.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            performSearch();
+        }
+    });
+
+    // Live-Suche während der Eingabe
+    searchInput.addEventListener('input', debouncedSearch);
+}
+
+async function performSearch() {
+    debouncedSearch.cancel();
+    const searchTerm = searchInput.value.trim();
+    await applyFilters({ search: searchTerm });
+}
+
+// =========================================================================
+// Filter Modal (nur auf Screener-Seite)
+// =========================================================================
+const filterBtn = document.getElementById('filter-btn');
+const filterModal = document.getElementById('filter-modal');
+const filterBody = document.getElementById('filter-body');
+const filterApplyBtn = document.getElementById('filter-apply');
+const filterResetBtn = document.getElementById('filter-reset');
+
+let filterOptions = null;
+let numericFilterCount = 0;
+let currentFilters = {}; // Aktuelle Filter speichern
+
+// Filter aus localStorage beim Seitenladen wiederherstellen
+if (filterBtn) {
+    try {
+        const savedFilters = localStorage.getItem('screenerFilters');
+        if (savedFilters) {
+            currentFilters = JSON.parse(savedFilters);
+
+            // Suchfeld wiederherstellen falls vorhanden
+            if (currentFilters.search && searchInput) {
+                searchInput.value = currentFilters.search;
+            }
+
+            // Filter automatisch anwenden
+            applyFilters();
+        }
+    } catch (e) {
+        console.error('Fehler beim Laden der gespeicherten Filter:', e);
+    }
+}
+
+if (filterBtn && filterModal) {
+    filterBtn.addEventListener('click', async function() {
+        filterModal.classList.remove('hidden');
+        await loadFilterOptions();
+    });
+}
+
+async function loadFilterOptions() {
+    if (filterOptions) {
+        renderFilterForm();
+        return;
+    }
+
+    filterBody.innerHTML = '<p class="loading">Lade Filter...</p>';
+
+    try {
+        const response = await fetch('/api/filter-options');
+        filterOptions = await response.json();
+        renderFilterForm();
+    } catch (error) {
+        console.error('Fehler:', error);
+        filterBody.innerHTML = '<p class="error">Fehler beim Laden</p>';
+    }
+}
+
+function renderFilterForm() {
+    let html = '<div class="filter-form">';
+
+    // Kategorische Filter
+    html += '<div class="filter-section">';
+    html += '<h4>Kategorien</h4>';
+    html += '<div class="filter-grid">';
+
+    const categoryLabels = {
+        'stock_index': 'Index',
+        'sector': 'Sektor',
+        'industry': 'Branche',
+        'country': 'Land'
+    };
+
+    for (const [field, values] of Object.entries(filterOptions.categorical)) {
+        html += `
+            <div class="filter-field">
+                <label>${categoryLabels[field] || field}</label>
+                <select id="filter-${field}" class="filter-select">
+                    <option value="">Alle</option>
+                    ${values.map(v => `<option value="${v}">${v}</option>`).join('')}
+                </select>
+            </div>
+        `;
+    }
+
+    html += '</div></div>';
+
+    // Numerische Filter
+    html += '<div class="filter-section">';
+    html += '<h4>Kennzahlen</h4>';
+    html += '<div id="numeric-filters"></div>';
+    html += '<button type="button" id="add-numeric-filter" class="btn btn-small">+ Filter hinzufügen</button>';
+    html += '</div>';
+
+    html += '</div>';
+    filterBody.innerHTML = html;
+
+    // Event Listener für "Filter hinzufügen"
+    numericFilterCount = 0;
+    document.getElementById('add-numeric-filter').addEventListener('click', addNumericFilter);
+
+    // Gespeicherte Filter wiederherstellen
+    restoreSavedFilters();
+}
+
+function addNumericFilter() {
+    const container = document.getElementById('numeric-filters');
+    const id = numericFilterCount++;
+
+    // Numerische Spalten nach Gruppen sortieren
+    const groupedColumns = {};
+    for (const col of filterOptions.numeric) {
+        const group = col.column_group || 'Sonstige';
+        if (!groupedColumns[group]) {
+            groupedColumns[group] = [];
+        }
+        groupedColumns[group].push(col);
+    }
+
+    let optionsHtml = '<option value="">Kennzahl wählen...</option>';
+    const groupOrder = ['Kursdaten', 'Bewertung', 'Durchschnitte', 'KGV Abweichung', 'EV/EBIT Abweichung', 'Wachstum', 'Bilanz', 'Margen'];
+
+    for (const group of groupOrder) {
+        if (groupedColumns[group]) {
+            optionsHtml += `<optgroup label="${group}">`;
+            for (const col of groupedColumns[group]) {
+                optionsHtml += `<option value="${col.column_key}">${col.display_name}</option>`;
+            }
+            optionsHtml += '</optgroup>';
+        }
+    }
+
+    const filterHtml = `
+        <div class="numeric-filter-row" data-id="${id}">
+            <select class="filter-column">
+                ${optionsHtml}
+            </select>
+            <select class="filter-operator">
+                <option value="<">&lt;</option>
+                <option value="<=">&le;</option>
+                <option value="=">=</option>
+                <option value=">=">&ge;</option>
+                <option value=">">&gt;</option>
+            </select>
+            <input type="number" class="filter-value" step="any" placeholder="Wert">
+            <button type="button" class="btn-remove-filter" title="Entfernen">&times;</button>
+        </div>
+    `;
+
+    container.insertAdjacentHTML('beforeend', filterHtml);
+
+    // Event Listener für Entfernen-Button
+    container.querySelector(`[data-id="${id}"] .btn-remove-filter`).addEventListener('click', function() {
+        this.closest('.numeric-filter-row').remove();
+    });
+}
+
+function restoreSavedFilters() {
+    // Kategorische Filter wiederherstellen
+    for (const field of ['stock_index', 'sector', 'industry', 'country']) {
+        const select = document.getElementById(`filter-${field}`);
+        if (select && currentFilters[field]) {
+            select.value = currentFilters[field];
+        }
+    }
+
+    // Numerische Filter wiederherstellen
+    const container = document.getElementById('numeric-filters');
+    if (container && currentFilters.numeric && currentFilters.numeric.length > 0) {
+        // Vorhandene Filter entfernen (der eine leere Filter wurde bereits hinzugefügt)
+        container.innerHTML = '';
+        numericFilterCount = 0;
+
+        // Gespeicherte Filter wiederherstellen
+        currentFilters.numeric.forEach(filter => {
+            addNumericFilter();
+            const lastRow = container.lastElementChild;
+            if (lastRow) {
+                lastRow.querySelector('.filter-column').value = filter.column;
+                lastRow.querySelector('.filter-operator').value = filter.operator;
+                lastRow.querySelector('.filter-value').value = filter.value;
+            }
+        });
+    } else {
+        // Wenn keine gespeicherten numerischen Filter vorhanden sind, einen leeren hinzufügen
+        addNumericFilter();
+    }
+}
+
+// Gemeinsame Filter-Funktion
+export async function applyFilters(additionalFilters = {}) {
+    const filters = { ...currentFilters, ...additionalFilters };
+
+    // Suchfeld-Wert immer aktuell halten
+    if (searchInput) {
+        filters.search = searchInput.value.trim();
+    }
+
+    // Kategorische Filter aus Modal sammeln (falls vorhanden)
+    for (const field of ['stock_index', 'sector', 'industry', 'country']) {
+        const select = document.getElementById(`filter-${field}`);
+        if (select && select.value) {
+            filters[field] = select.value;
+        } else if (select) {
+            delete filters[field];
+        }
+    }
+
+    // Numerische Filter sammeln (falls vorhanden)
+    const numericRows = document.querySelectorAll('.numeric-filter-row');
+    if (numericRows.length > 0) {
+        filters.numeric = [];
+        numericRows.forEach(row => {
+            const column = row.querySelector('.filter-column').value;
+            const operator = row.querySelector('.filter-operator').value;
+            const value = row.querySelector('.filter-value').value;
+
+            if (column && value !== '') {
+                filters.numeric.push({ column, operator, value: parseFloat(value) });
+            }
+        });
+    }
+
+    // Aktuelle Filter speichern
+    currentFilters = filters;
+
+    // Filter in localStorage speichern für Persistenz
+    try {
+        localStorage.setItem('screenerFilters', JSON.stringify(filters));
+    } catch (e) {
+        console.error('Fehler beim Speichern der Filter:', e);
+    }
+
+    // UI-Feedback
+    if (searchBtn) {
+        searchBtn.textContent = 'Lade...';
+        searchBtn.disabled = true;
+    }
+    if (filterApplyBtn) {
+        filterApplyBtn.textContent = 'Lade...';
+        filterApplyBtn.disabled = true;
+    }
+
+    // Laufendes Nachladen der alten Ergebnisliste verwerfen; bis die neue erste
+    // Seite da ist, darf nicht mit dem alten Cursor nachgeladen werden
+    const generation = ++screenerGeneration;
+    const previousCursor = screenerCursor;
+    screenerCursor = null;
+    screenerReplacing = true;
+    updateScreenerInfo();
+
+    try {
+        const data = await fetchScreenerPage(screenerRequest(filters), { replace: true });
+
+        // Überholt (neuere Eingabe) → nichts anzeigen
+        if (!data || generation !== screenerGeneration) return;
+
+        updateScreenerTable(data);
+
+        if (filterModal) {
+            filterModal.classList.add('hidden');
+        }
+
+    } catch (error) {
+        if (error.name === 'AbortError') return;
+        console.error('Fehler:', error);
+        // Alte Ergebnisliste bleibt stehen und kann weiter nachgeladen werden
+        if (generation === screenerGeneration) {
+            screenerCursor = previousCursor;
+            updateScreenerInfo();
+        }
+        alert('Fehler beim Filtern');
+    } finally {
+        // Nur der jüngste Request setzt Nachladesperre und Buttons zurück
+        if (generation !== screenerGeneration) return;
+        screenerReplacing = false;
+        if (searchBtn) {
+            searchBtn.textContent = 'Suchen';
+            searchBtn.disabled = false;
+        }
+        if (filterApplyBtn) {
+            filterApplyBtn.textContent = 'Anwenden';
+            filterApplyBtn.disabled = false;
+        }
+    }
+}
+
+// Filter anwenden (Button im Modal)
+if (filterApplyBtn) {
+    filterApplyBtn.addEventListener('click', function() {
+        applyFilters();
+    });
+}
+
+// Filter zurücksetzen
+if (filterResetBtn) {
+    filterResetBtn.addEventListener('click', function() {
+        // Suchfeld leeren
+        if (searchInput) {
+            searchInput.value = '';
+        }
+
+        // Kategorische Filter zurücksetzen
+        for (const field of ['stock_index', 'sector', 'industry', 'country']) {
+            const select = document.getElementById(`filter-${field}`);
+            if (select) select.value = '';
+        }
+
+        // Numerische Filter entfernen
+        const container = document.getElementById('numeric-filters');
+        if (container) {
+            container.innerHTML = '';
+            numericFilterCount = 0;
+            addNumericFilter();
+        }
+
+        // Gespeicherte Filter leeren
+        currentFilters = {};
+
+        // Auch aus localStorage entfernen
+        try {
+            localStorage.removeItem('screenerFilters');
+        } catch (e) {
+            console.error('Fehler beim Löschen der Filter:', e);
+        }
+
+        // Ungefilterte Daten laden
+        applyFilters();
+    });
+}
+
+// =========================================================================
+// Screener: serverseitige Seiten (Keyset-Cursor) und Nachladen beim Scrollen
+// =========================================================================
+function screenerRequest(filters, cursor = null) {
+    return {
+        filters,
+        sort: tableState.sortColumn,
+        direction: tableState.sortDirection,
+        page_size: SCREENER_PAGE_SIZE,
+        cursor,
+        format: 'columnar'
+    };
+}
+
+function updateScreenerInfo() {
+    const resultInfo = document.getElementById('result-info');
+    if (!resultInfo || screenerTotal === null) return;
+    resultInfo.textContent = screenerLoaded < screenerTotal
+        ? `${screenerTotal} Aktien gefunden, ${screenerLoaded} geladen.`
+        : `${screenerTotal} Aktien gefunden.`;
+    if (screenerMore) {
+        screenerMore.classList.toggle('hidden', !screenerCursor);
+    }
+}
+
+// Tabelle mit gefilterten Daten neu aufbauen (erste Seite)
+function updateScreenerTable(data) {
+    if (!screenerContainer) return;
+
+    screenerCursor = data.next_cursor;
+    screenerTotal = data.total;
+    screenerLoaded = data.count;
+    tableState.sortColumn = data.sort;
+    tableState.sortDirection = data.direction;
+    updateScreenerInfo();
+
+    if (tableState.table) {
+        tableState.table.destroy();
+        tableState.table = null;
+    }
+
+    if (data.count === 0) {
+        screenerContainer.innerHTML = '<p class="empty-state">Keine Aktien gefunden.</p>';
+        return;
+    }
+
+    tableState.table = new VirtualTable(screenerContainer, data.columns, {
+        id: 'screener-table',
+        sort: data.sort,
+        direction: data.direction,
+        serverSide: true
+    });
+    tableState.table.setRows(rowsFromPage(data));
+}
+
+// Nächste Seite anhängen (Keyset-Cursor der letzten Antwort)
+async function loadMoreScreenerRows() {
+    if (!screenerCursor || screenerLoading || screenerReplacing) return;
+
+    screenerLoading = true;
+    const generation = screenerGeneration;
+
+    try {
+        const data = await fetchScreenerPage(screenerRequest(currentFilters, screenerCursor));
+
+        // Filter/Sortierung haben sich inzwischen geändert → Antwort verwerfen
+        if (!data || generation !== screenerGeneration) return;
+
+        if (tableState.table) {
+            tableState.table.appendRows(rowsFromPage(data));
+        }
+
+        screenerCursor = data.next_cursor;
+        screenerLoaded += data.count;
+        updateScreenerInfo();
+    } catch (error) {
+        console.error('Fehler beim Nachladen:', error);
+    } finally {
+        screenerLoading = false;
+    }
+}
+
+if (screenerMore) {
+    updateScreenerInfo();
+
+    if ('IntersectionObserver' in window) {
+        const observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadMoreScreenerRows();
+            }
+        }, { rootMargin: '600px' });
+        observer.observe(screenerMore);
+    }
+    screenerMore.addEventListener('click', loadMoreScreenerRows);
+}
@@ -0,0 +1,385 @@
+import { getCurrentView } from './util.js';
+
+// =========================================================================
+// Favoriten-Konfiguration Modal
+// =========================================================================
+const favoritesBtn = document.getElementById('favorites-btn');
+const favoritesModal = document.getElementById('favorites-modal');
+const labelList = document.getElementById('label-list');
+const filterList = document.getElementById('filter-list');
+const favoritesSaveBtn = document.getElementById('favorites-save');
+
+let favoritesData = { labels: {}, filters: {} };
+
+if (favoritesBtn) {
+    favoritesBtn.addEventListener('click', async function() {
+        favoritesModal.classList.remove('hidden');
+        await loadFavoriteSettings();
+    });
+}
+
+async function loadFavoriteSettings() {
+    try {
+        const response = await fetch('/api/favorite-settings');
+        favoritesData = await response.json();
+        renderFavoriteSettings();
+    } catch (error) {
+        console.error('Fehler:', error);
+    }
+}
+
+function renderFavoriteSettings() {
+    // Badge-Farben für die Nummern
+    const badgeColors = {
+        1: { bg: '#d4edda', color: '#155724' },
+        2: { bg: '#fff3cd', color: '#856404' },
+        3: { bg: '#cce5ff', color: '#004085' },
+        4: { bg: '#f8d7da', color: '#721c24' },
+        5: { bg: '#e2d5f1', color: '#4a235a' },
+        6: { bg: '#d1ecf1', color: '#0c5460' },
+        7: { bg: '#ffeeba', color: '#856404' },
+        8: { bg: '#c3e6cb', color: '#155724' },
+        9: { bg: '#d6d8db', color: '#383d41' }
+    };
+
+    // Labels rendern
+    if (labelList) {
+        let html = '';
+        for (let i = 1; i <= 9; i++) {
+            const label = favoritesData.labels[i] || `Favorit ${i}`;
+            const colors = badgeColors[i];
+            html += `
+                <div class="label-item">
+                    <span class="label-number" style="background: ${colors.bg}; color: ${colors.color}">${i}</span>
+                    <input type="text" data-id="${i}" value="${label}" placeholder="Name eingeben...">
+                </div>
+            `;
+        }
+        labelList.innerHTML = html;
+    }
+
+    // Filter rendern
+    if (filterList) {
+        let html = '';
+        for (let i = 1; i <= 9; i++) {
+            const label = favoritesData.labels[i] || `Favorit ${i}`;
+            const isVisible = favoritesData.filters[i] !== false;
+            html += `
+                <label class="filter-item">
+                    <input type="checkbox" data-id="${i}" ${isVisible ? 'checked' : ''}>
+                    <span class="filter-number">${i}</span>
+                    <span class="filter-label">${label}</span>
+                </label>
+            `;
+        }
+        filterList.innerHTML = html;
+    }
+
+    // Label-Änderungen auf Filter-Liste übertragen
+    if (labelList) {
+        labelList.querySelectorAll('input[type="text"]').forEach(input => {
+            input.addEventListener('input', function() {
+                const id = this.dataset.id;
+                const value = this.value;
+                // Filter-Label aktualisieren
+                const filterLabel = filterList.querySelector(`[data-id="${id}"]`);
+                if (filterLabel) {
+                    filterLabel.closest('.filter-item').querySelector('.filter-label').textContent = value || `Favorit ${id}`;
+                }
+            });
+        });
+    }
+}
+
+// Favoriten speichern
+if (favoritesSaveBtn) {
+    favoritesSaveBtn.addEventListener('click', async function() {
+        const labels = {};
+        const filters = {};
+
+        // Labels sammeln
+        if (labelList) {
+            labelList.querySelectorAll('input[type="text"]').forEach(input => {
+                labels[input.dataset.id] = input.value;
+            });
+        }
+
+        // Filter sammeln
+        if (filterList) {
+            filterList.querySelectorAll('input[type="checkbox"]').forEach(checkbox => {
+                filters[checkbox.dataset.id] = checkbox.checked;
+            });
+        }
+
+        try {
+            const response = await fetch('/api/favorite-settings', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ labels, filters })
+            });
+
+            if (response.ok) {
+                window.location.reload();
+            } else {
+                alert('Fehler beim Speichern');
+            }
+        } catch (error) {
+            console.error('Fehler:', error);
+            alert('Fehler beim Speichern');
+        }
+    });
+}
+
+// =========================================================================
+// Spalten-Konfiguration Modal
+// =========================================================================
+const settingsBtn = document.getElementById('settings-btn');
+const columnsModal = document.getElementById('columns-modal');
+const columnsBody = document.getElementById('columns-body');
+const columnsSaveBtn = document.getElementById('columns-save');
+
+let columnsData = [];
+
+if (settingsBtn) {
+    settingsBtn.addEventListener('click', async function() {
+        columnsModal.classList.remove('hidden');
+        await loadColumns();
+    });
+}
+
+async function loadColumns() {
+    const viewName = getCurrentView();
+    columnsBody.innerHTML = '<p class="loading">Lade Spalten...</p>';
+
+    try {
+        const response = await fetch(`/api/columns/${viewName}`);
+        const data = await response.json();
+
+        columnsData = data.columns;
+        renderColumnsList(data.groups);
+
+    } catch (error) {
+        console.error('Fehler:', error);
+        columnsBody.innerHTML = '<p class="error">Fehler beim Laden</p>';
+    }
+}
+
+// Spalten-Daten global speichern für Zugriff in Event-Handlern
+let allColumns = [];
+
+function renderColumnsList(groups) {
+    // Alle Spalten in flaches Array sammeln
+    allColumns = [];
+    const groupOrder = ['Stammdaten', 'Kursdaten', 'Bewertung', 'Durchschnitte', 'KGV Abweichung', 'EV/EBIT Abweichung', 'Wachstum', 'Bilanz', 'Margen'];
+    for (const groupName of groupOrder) {
+        if (groups[groupName]) {
+            allColumns.push(...groups[groupName]);
+        }
+    }
+
+    // Sichtbare Spalten nach sort_order sortieren
+    const visibleColumns = allColumns
+        .filter(col => col.is_visible)
+        .sort((a, b) => a.sort_order - b.sort_order);
+
+    let html = '<div class="columns-config-split">';
+
+    // Linke Seite: Auswahl
+    html += '<div class="columns-selection">';
+    html += '<h4>Spalten auswählen</h4>';
+    html += '<p class="hint">Checkboxen zum Ein-/Ausblenden</p>';
+
+    for (const groupName of groupOrder) {
+        if (!groups[groupName]) continue;
+
+        html += `<div class="column-group">`;
+        html += `<h5>${groupName}</h5>`;
+        html += `<ul class="column-list" data-group="${groupName}">`;
+
+        const sortedCols = groups[groupName].sort((a, b) => a.sort_order - b.sort_order);
+
+        for (const col of sortedCols) {
+            html += `
+                <li class="column-item" data-key="${col.column_key}" data-name="${col.display_name}">
+                    <label>
+                        <input type="checkbox" ${col.is_visible ? 'checked' : ''}>
+                        ${col.display_name}
+                    </label>
+                </li>
+            `;
+        }
+
+        html += `</ul></div>`;
+    }
+    html += '</div>';
+
+    // Rechte Seite: Reihenfolge
+    html += '<div class="columns-order">';
+    html += '<h4>Reihenfolge festlegen</h4>';
+    html += '<p class="hint">Drag & Drop zum Sortieren</p>';
+    html += '<ul class="order-list">';
+
+    for (const col of visibleColumns) {
+        html += `
+            <li class="order-item" draggable="true" data-key="${col.column_key}">
+                <span class="drag-handle">☰</span>
+                <span class="order-name">${col.display_name}</span>
+            </li>
+        `;
+    }
+
+    html += '</ul></div>';
+    html += '</div>';
+
+    columnsBody.innerHTML = html;
+
+    // Event-Listener für Checkboxen
+    initCheckboxListeners();
+    // Drag & Drop für Sortier-Liste
+    initOrderDragAndDrop();
+}
+
+function initCheckboxListeners() {
+    document.querySelectorAll('.column-item input[type="checkbox"]').forEach(checkbox => {
+        checkbox.addEventListener('change', function() {
+            const item = this.closest('.column-item');
+            const key = item.dataset.key;
+            const name = item.dataset.name;
+            const orderList = document.querySelector('.order-list');
+
+            if (this.checked) {
+                // Zur Sortier-Liste hinzufügen
+                const li = document.createElement('li');
+                li.className = 'order-item';
+                li.draggable = true;
+                li.dataset.key = key;
+                li.innerHTML = `
+                    <span class="drag-handle">☰</span>
+                    <span class="order-name">${name}</span>
+                `;
+                orderList.appendChild(li);
+                initOrderDragAndDrop();
+            } else {
+                // Aus Sortier-Liste entfernen
+                const orderItem = orderList.querySelector(`[data-key="${key}"]`);
+                if (orderItem) {
+                    orderItem.remove();
+                }
+            }
+        });
+    });
+}
+
+function initOrderDragAndDrop() {
+    const orderList = document.querySelector('.order-list');
+    if (!orderList) return;
+
+    const items = orderList.querySelectorAll('.order-item');
+
+    items.forEach(item => {
+        item.addEventListener('dragstart', handleOrderDragStart);
+        item.addEventListener('dragend', handleOrderDragEnd);
+        item.addEventListener('dragover', handleOrderDragOver);
+        item.addEventListener('drop', handleOrderDrop);
+    });
+}
+
+let draggedOrderItem = null;
+
+function handleOrderDragStart(e) {
+    draggedOrderItem = this;
+    this.classList.add('dragging');
+    e.dataTransfer.effectAllowed = 'move';
+}
+
+function handleOrderDragEnd(e) {
+    this.classList.remove('dragging');
+    document.querySelectorAll('.order-item').forEach(item => {
+        item.classList.remove('drag-over');
+    });
+}
+
+function handleOrderDragOver(e) {
+    e.preventDefault();
+    e.dataTransfer.dropEffect = 'move';
+
+    const targetItem = this;
+    if (targetItem !== draggedOrderItem) {
+        targetItem.classList.add('drag-over');
+    }
+}
+
+function handleOrderDrop(e) {
+    e.preventDefault();
+    const targetItem = this;
+
+    if (targetItem !== draggedOrderItem) {
+        const list = targetItem.parentNode;
+        const items = Array.from(list.children);
+        const draggedIndex = items.indexOf(draggedOrderItem);
+        const targetIndex = items.indexOf(targetItem);
+
+        if (draggedIndex < targetIndex) {
+            targetItem.after(draggedOrderItem);
+        } else {
+            targetItem.before(draggedOrderItem);
+        }
+    }
+
+    targetItem.classList.remove('drag-over');
+}
+
+// Spalten speichern
+if (columnsSaveBtn) {
+    columnsSaveBtn.addEventListener('click', async function() {
+        const viewName = getCurrentView();
+        const updates = [];
+        let sortOrder = 1;
+
+        // 1. Sichtbare Spalten aus der Sortier-Liste (Reihenfolge zählt!)
+        const orderList = document.querySelector('.order-list');
+        const visibleKeys = new Set();
+
+        if (orderList) {
+            orderList.querySelectorAll('.order-item').forEach(item => {
+                const columnKey = item.dataset.key;
+                visibleKeys.add(columnKey);
+                updates.push({
+                    column_key: columnKey,
+                    is_visible: true,
+                    sort_order: sortOrder++
+                });
+            });
+        }
+
+        // 2. Nicht-sichtbare Spalten hinzufügen (Reihenfolge egal)
+        document.querySelectorAll('.column-item').forEach(item => {
+            const columnKey = item.dataset.key;
+            if (!visibleKeys.has(columnKey)) {
+                updates.push({
+                    column_key: columnKey,
+                    is_visible: false,
+                    sort_order: sortOrder++
+                });
+            }
+        });
+
+        try {
+            const response = await fetch(`/api/columns/${viewName}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ columns: updates })
+            });
+
+            if (response.ok) {
+                // Seite neu laden um Änderungen anzuzeigen
+                window.location.reload();
+            } else {
+                alert('Fehler beim Speichern');
+            }
+        } catch (error) {
+            console.error('Fehler:', error);
+            alert('Fehler beim Speichern');
+        }
+    });
+}
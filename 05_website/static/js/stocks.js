@@ -0,0 +1,77 @@
+// =============================================================================
+// Modal-Daten (Details, Unternehmensinfo): Cache und gebündelter Prefetch
+// =============================================================================
+// Die Daten ändern sich nur mit dem nächtlichen Pipeline-Lauf, Einträge bleiben
+// daher STOCK_CACHE_TTL_MS gültig. DCF-Daten enthalten die Szenarien des Users
+// und laufen nicht über den Cache (siehe dcf.js).
+const STOCK_CACHE_SIZE = 200;
+const STOCK_CACHE_TTL_MS = 10 * 60 * 1000;
+const STOCK_BATCH_SIZE = 50;        // = STOCK_BATCH_MAX_ISINS im Backend
+const STOCK_ROUTES = {
+    details: isin => `/api/stock/${isin}/details`,
+    info: isin => `/api/stock/${isin}/info`
+};
+
+// `${section}:${isin}` → { time, promise }, älteste zuerst. Es wird das Promise
+// gecacht, damit ein Klick während des Prefetch nicht doppelt lädt.
+const stockCache = new Map();
+
+function cacheGet(key) {
+    const cached = stockCache.get(key);
+    if (!cached) return null;
+    if (Date.now() - cached.time >= STOCK_CACHE_TTL_MS) {
+        stockCache.delete(key);
+        return null;
+    }
+    // LRU: zuletzt benutzten Eintrag ans Ende
+    stockCache.delete(key);
+    stockCache.set(key, cached);
+    return cached.promise;
+}
+
+function cacheSet(key, promise) {
+    const entry = { time: Date.now(), promise };
+    stockCache.set(key, entry);
+    // Fehlgeschlagene Requests nicht cachen, der nächste Aufruf lädt neu
+    promise.catch(() => {
+        if (stockCache.get(key) === entry) stockCache.delete(key);
+    });
+    while (stockCache.size > STOCK_CACHE_SIZE) {
+        stockCache.delete(stockCache.keys().next().value);
+    }
+    return promise;
+}
+
+async function fetchJson(url) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return response.json();
+}
+
+/**
+ * Lädt eine Section für alle noch nicht gecachten ISINs gebündelt über
+ * /api/stocks (ein Request je STOCK_BATCH_SIZE ISINs).
+ */
+export function prefetchStocks(isins, section = 'details') {
+    const missing = [...new Set(isins)].filter(isin => isin && !cacheGet(`${section}:${isin}`));
+
+    for (let i = 0; i < missing.length; i += STOCK_BATCH_SIZE) {
+        const chunk = missing.slice(i, i + STOCK_BATCH_SIZE);
+        const params = new URLSearchParams({ isins: chunk.join(','), sections: section });
+        const batch = fetchJson(`/api/stocks?${params}`);
+
+        for (const isin of chunk) {
+            cacheSet(`${section}:${isin}`, batch.then(data => {
+                const stock = data.stocks[isin];
+                if (!stock) throw new Error('Aktie nicht gefunden');
+                return stock[section];
+            }));
+        }
+    }
+}
+
+// Daten einer Aktie aus dem Cache, sonst über die Einzel-Route
+export function getStockData(isin, section = 'details') {
+    const key = `${section}:${isin}`;
+    return cacheGet(key) || cacheSet(key, fetchJson(STOCK_ROUTES[section](isin)));
+}
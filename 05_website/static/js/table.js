@@ -0,0 +1,363 @@
+// =============================================================================
+// Aktien-Tabelle (Watchlist + Screener): virtualisiert + Event Delegation
+// =============================================================================
+// Nur die sichtbaren Zeilen (plus Überhang) stehen im DOM, der Rest wird
+// durch zwei Platzhalter-Zeilen ersetzt. Alle Klicks/Änderungen laufen über
+// je einen Listener am Tabellen-Container (bindTableEvents).
+const VIRTUAL_ROW_HEIGHT = 38;    // Startwert in px, wird nach dem Rendern gemessen
+const VIRTUAL_OVERSCAN = 20;      // zusätzlich gerenderte Zeilen ober-/unterhalb
+
+// KGV-relevante Spalten, die das PE-Modal öffnen
+const PE_COLUMNS = [
+    'ttm_pe', 'fy_pe',
+    'pe_avg_5y', 'pe_avg_10y', 'pe_avg_15y', 'pe_avg_20y', 'pe_avg_10y_2019',
+    'pe_avg_5y_count', 'pe_avg_10y_count', 'pe_avg_15y_count', 'pe_avg_20y_count',
+    'yf_ttm_pe', 'yf_forward_pe',
+    'yf_ttm_pe_vs_avg_5y', 'yf_ttm_pe_vs_avg_10y', 'yf_ttm_pe_vs_avg_15y', 'yf_ttm_pe_vs_avg_20y', 'yf_ttm_pe_vs_avg_10y_2019',
+    'yf_fwd_pe_vs_avg_5y', 'yf_fwd_pe_vs_avg_10y', 'yf_fwd_pe_vs_avg_15y', 'yf_fwd_pe_vs_avg_20y', 'yf_fwd_pe_vs_avg_10y_2019'
+];
+
+// EV/EBIT-relevante Spalten
+const EV_EBIT_COLUMNS = [
+    'ttm_ev_ebit', 'fy_ev_ebit',
+    'ev_ebit_avg_5y', 'ev_ebit_avg_10y', 'ev_ebit_avg_15y', 'ev_ebit_avg_20y', 'ev_ebit_avg_10y_2019',
+    'ev_ebit_avg_5y_count', 'ev_ebit_avg_10y_count', 'ev_ebit_avg_15y_count', 'ev_ebit_avg_20y_count',
+    'ev_ebit_vs_avg_5y', 'ev_ebit_vs_avg_10y', 'ev_ebit_vs_avg_15y', 'ev_ebit_vs_avg_20y', 'ev_ebit_vs_avg_10y_2019'
+];
+
+// Wachstums-relevante Spalten
+const GROWTH_COLUMNS = [
+    'revenue_cagr_3y', 'revenue_cagr_5y', 'revenue_cagr_10y',
+    'ebit_cagr_3y', 'ebit_cagr_5y', 'ebit_cagr_10y',
+    'net_income_cagr_3y', 'net_income_cagr_5y', 'net_income_cagr_10y'
+];
+
+// Margen-relevante Spalten
+const MARGIN_COLUMNS = [
+    'profit_margin', 'operating_margin',
+    'profit_margin_avg_3y', 'profit_margin_avg_5y', 'profit_margin_avg_10y', 'profit_margin_avg_5y_2019',
+    'operating_margin_avg_3y', 'operating_margin_avg_5y', 'operating_margin_avg_10y', 'operating_margin_avg_5y_2019'
+];
+
+// Spalte → Tab des Detail-Modals
+const DETAIL_TAB_BY_COLUMN = {};
+PE_COLUMNS.forEach(column => { DETAIL_TAB_BY_COLUMN[column] = 'pe'; });
+EV_EBIT_COLUMNS.forEach(column => { DETAIL_TAB_BY_COLUMN[column] = 'ev_ebit'; });
+GROWTH_COLUMNS.forEach(column => { DETAIL_TAB_BY_COLUMN[column] = 'growth'; });
+MARGIN_COLUMNS.forEach(column => { DETAIL_TAB_BY_COLUMN[column] = 'margins'; });
+
+// Formatierer einmal anlegen (toLocaleString pro Zelle ist deutlich langsamer)
+const DE_NUMBER = {
+    1: new Intl.NumberFormat('de-DE', { minimumFractionDigits: 1, maximumFractionDigits: 1 }),
+    2: new Intl.NumberFormat('de-DE', { minimumFractionDigits: 2, maximumFractionDigits: 2 })
+};
+const DE_COLLATOR = new Intl.Collator('de');
+
+// Tabelle der aktuellen Seite, geteilt mit Screener/Favoriten/Notizen
+export const tableState = {
+    table: null,            // aktive VirtualTable
+    sortColumn: null,
+    sortDirection: 'asc'
+};
+
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+// Zellwert nach format_type (user_column_settings) – wie die Jinja-Filter de/de_percent/...
+function formatCellValue(value, formatType) {
+    if (value === null || value === undefined) return '-';
+
+    if (formatType === 'date') {
+        // ISO-Datum (YYYY-MM-DD) → TT.MM.JJJJ
+        const match = /^(\d{4})-(\d{2})-(\d{2})/.exec(value);
+        return match ? `${match[3]}.${match[2]}.${match[1]}` : String(value);
+    }
+    if (formatType === 'text' || !formatType) return String(value);
+
+    const number = parseFloat(value);
+    if (isNaN(number)) return '-';
+    if (formatType === 'percent') return DE_NUMBER[1].format(number) + '%';
+    if (formatType === 'billions') return DE_NUMBER[1].format(number / 1000000000);
+    if (formatType === 'currency') return DE_NUMBER[2].format(number);
+    return DE_NUMBER[1].format(number);
+}
+
+function columnSortType(col) {
+    if (col.format_type === 'date') return 'date';
+    return col.format_type === 'text' ? 'text' : 'number';
+}
+
+// API-/Template-Daten (format "columnar" oder Zeilen-Objekte) → Zeilen-Objekte
+export function rowsFromPage(data) {
+    if (data.format !== 'columnar') return data.stocks;
+    const rows = Array.from({ length: data.count }, () => ({}));
+    data.fields.forEach((field, j) => {
+        const values = data.data[j];
+        for (let i = 0; i < rows.length; i++) {
+            rows[i][field] = values[i];
+        }
+    });
+    return rows;
+}
+
+function renderStockRow(row, columns) {
+    const isin = escapeHtml(row.isin);
+    const favorite = row.favorite || 0;
+
+    let favOptions = '';
+    for (let i = 0; i <= 9; i++) {
+        favOptions += `<option value="${i}"${favorite == i ? ' selected' : ''}>${i || '-'}</option>`;
+    }
+
+    let html = `<tr data-isin="${isin}"><td data-column="favorite" data-label="Favorit">` +
+        `<select class="favorite-select" data-isin="${isin}">${favOptions}</select></td>`;
+
+    for (const col of columns) {
+        const key = col.column_key;
+        const classes = [];
+        if (col.format_type !== 'text') classes.push('num');
+        if (key === 'company_name') {
+            // Firmenname öffnet die Unternehmensbeschreibung
+            classes.push('name', 'clickable-cell');
+        } else if (DETAIL_TAB_BY_COLUMN[key]) {
+            classes.push('clickable-cell');
+        }
+        html += `<td class="${classes.join(' ')}" data-column="${key}" data-label="${escapeHtml(col.display_name)}">` +
+            `${escapeHtml(formatCellValue(row[key], col.format_type))}</td>`;
+    }
+
+    html += `<td class="notes-cell" data-label="Notizen"><button class="note-btn" data-isin="${isin}">` +
+        `${row.notes ? '📝' : '+'}</button></td></tr>`;
+    return html;
+}
+
+export class VirtualTable {
+    /**
+     * Baut <table> in container auf und rendert nur die sichtbaren Zeilen.
+     * Scrollen über den Container (Desktop) oder das Fenster (Mobile-Karten).
+     * serverSide: Sortierung übernimmt der Server (Screener), sonst sortRows().
+     * onView: wird nach jedem Rendern und Scrollen mit der Tabelle aufgerufen.
+     */
+    constructor(container, columns, { id = '', sort = null, direction = 'asc', serverSide = false,
+                                      onView = null } = {}) {
+        this.container = container;
+        this.columns = columns;
+        this.serverSide = serverSide;
+        this.onView = onView;
+        this.rows = [];
+        this.rowHeight = VIRTUAL_ROW_HEIGHT;
+        this.start = 0;
+        this.end = 0;
+        this.frame = null;
+
+        container.innerHTML = `<table class="stock-table"${id ? ` id="${id}"` : ''}>` +
+            `<thead>${this.headerHtml(sort, direction)}</thead><tbody></tbody></table>`;
+        container.scrollTop = 0;
+        this.table = container.querySelector('table');
+        this.tbody = this.table.tBodies[0];
+
+        this.onScroll = () => this.schedule();
+        container.addEventListener('scroll', this.onScroll, { passive: true });
+        window.addEventListener('scroll', this.onScroll, { passive: true });
+        window.addEventListener('resize', this.onScroll);
+    }
+
+    headerHtml(sort, direction) {
+        const th = (key, label, type, numClass = '') => {
+            const sortClass = key === sort ? ` sort-${direction}` : '';
+            return `<th class="sortable${numClass}${sortClass}" data-column="${key}" data-type="${type}">${label}</th>`;
+        };
+        let html = '<tr>' + th('favorite', 'Fav', 'number');
+        for (const col of this.columns) {
+            const label = escapeHtml(col.display_name).replace(/\//g, '/<wbr>');
+            html += th(col.column_key, label, columnSortType(col), col.format_type !== 'text' ? ' num' : '');
+        }
+        return html + '<th>Notizen</th></tr>';
+    }
+
+    setSortIndicator(column, direction) {
+        this.table.querySelectorAll('th.sortable').forEach(th => {
+            th.classList.remove('sort-asc', 'sort-desc');
+            if (th.dataset.column === column) {
+                th.classList.add(`sort-${direction}`);
+            }
+        });
+    }
+
+    setRows(rows) {
+        this.rows = rows.slice();
+        this.render(true);
+    }
+
+    appendRows(rows) {
+        for (const row of rows) {
+            this.rows.push(row);
+        }
+        this.render(true);
+    }
+
+    getRow(isin) {
+        return this.rows.find(row => row.isin === isin) || null;
+    }
+
+    updateRow(isin, changes) {
+        const row = this.getRow(isin);
+        if (row) Object.assign(row, changes);
+    }
+
+    // Clientseitige Sortierung (Watchlist); leere Werte stehen immer am Ende
+    sortRows(column, type, direction) {
+        const sign = direction === 'asc' ? 1 : -1;
+        const value = column === 'favorite' ? row => row.favorite || 0 : row => row[column];
+        this.rows.sort((a, b) => {
+            const valA = value(a);
+            const valB = value(b);
+            const emptyA = valA === null || valA === undefined || valA === '';
+            const emptyB = valB === null || valB === undefined || valB === '';
+            if (emptyA || emptyB) return emptyA === emptyB ? 0 : (emptyA ? 1 : -1);
+
+            let comparison;
+            if (type === 'number') {
+                comparison = valA - valB;
+            } else if (type === 'date') {
+                // ISO-Format sortiert auch alphabetisch korrekt
+                comparison = valA < valB ? -1 : (valA > valB ? 1 : 0);
+            } else {
+                comparison = DE_COLLATOR.compare(String(valA), String(valB));
+            }
+            return sign * comparison;
+        });
+        this.render(true);
+    }
+
+    schedule() {
+        if (this.frame === null) {
+            this.frame = requestAnimationFrame(() => {
+                this.frame = null;
+                this.render();
+            });
+        }
+    }
+
+    // Sichtbare Zeilen [first, last) ohne Überhang
+    visibleRange() {
+        const body = this.tbody.getBoundingClientRect();
+        const view = this.container.getBoundingClientRect();
+        const top = Math.max(view.top, 0) - body.top;
+        const bottom = Math.min(view.bottom, window.innerHeight) - body.top;
+        const first = Math.min(this.rows.length, Math.max(0, Math.floor(top / this.rowHeight)));
+        const last = Math.min(this.rows.length, Math.max(first, Math.ceil(bottom / this.rowHeight)));
+        return [first, last];
+    }
+
+    render(force = false) {
+        const [first, last] = this.visibleRange();
+        // Nur neu rendern, wenn der sichtbare Bereich den gerenderten verlässt
+        if (!force && first >= this.start && last <= this.end) {
+            if (this.onView) this.onView(this);
+            return;
+        }
+
+        const start = Math.max(0, first - VIRTUAL_OVERSCAN);
+        const end = Math.min(this.rows.length, last + VIRTUAL_OVERSCAN);
+        const colspan = this.columns.length + 2;
+        const spacer = height => height > 0
+            ? `<tr class="vt-spacer" aria-hidden="true"><td colspan="${colspan}" style="height:${height}px"></td></tr>`
+            : '';
+
+        let html = spacer(start * this.rowHeight);
+        for (let i = start; i < end; i++) {
+            html += renderStockRow(this.rows[i], this.columns);
+        }
+        html += spacer((this.rows.length - end) * this.rowHeight);
+        this.tbody.innerHTML = html;
+        this.start = start;
+        this.end = end;
+
+        // Zeilenabstand messen; bei Abweichung Platzhalter einmal korrigieren
+        if (this.measure() && force !== 'measured') {
+            this.render('measured');
+            return;
+        }
+        if (this.onView) this.onView(this);
+    }
+
+    measure() {
+        const rendered = this.tbody.querySelectorAll('tr[data-isin]');
+        if (rendered.length < 2) return false;
+        const pitch = (rendered[rendered.length - 1].getBoundingClientRect().top -
+                       rendered[0].getBoundingClientRect().top) / (rendered.length - 1);
+        if (pitch <= 0 || Math.abs(pitch - this.rowHeight) < 0.5) return false;
+        this.rowHeight = pitch;
+        return true;
+    }
+
+    destroy() {
+        if (this.frame !== null) cancelAnimationFrame(this.frame);
+        this.container.removeEventListener('scroll', this.onScroll);
+        window.removeEventListener('scroll', this.onScroll);
+        window.removeEventListener('resize', this.onScroll);
+    }
+}
+
+// Ein Listener je Ereignistyp am Container statt Listener pro Zelle.
+// handlers: { sort, favorite(select), note(isin), detail(isin, tab), companyInfo(isin) }
+export function bindTableEvents(container, handlers) {
+    container.addEventListener('click', function(e) {
+        const header = e.target.closest('th.sortable');
+        if (header) {
+            sortByHeader(header, handlers.sort);
+            return;
+        }
+
+        const noteBtn = e.target.closest('.note-btn');
+        if (noteBtn) {
+            handlers.note(noteBtn.dataset.isin);
+            return;
+        }
+
+        const cell = e.target.closest('td.clickable-cell');
+        const isin = cell?.closest('tr')?.dataset.isin;
+        if (!isin) return;
+
+        if (cell.classList.contains('name')) {
+            handlers.companyInfo(isin);
+        } else {
+            handlers.detail(isin, DETAIL_TAB_BY_COLUMN[cell.dataset.column]);
+        }
+    });
+
+    container.addEventListener('change', function(e) {
+        if (e.target.classList.contains('favorite-select')) {
+            handlers.favorite(e.target);
+        }
+    });
+}
+
+function sortByHeader(header, serverSort) {
+    const table = tableState.table;
+    if (!table) return;
+    const column = header.dataset.column;
+
+    // Sortierrichtung bestimmen
+    if (tableState.sortColumn === column) {
+        tableState.sortDirection = tableState.sortDirection === 'asc' ? 'desc' : 'asc';
+    } else {
+        tableState.sortColumn = column;
+        tableState.sortDirection = 'asc';
+    }
+    table.setSortIndicator(column, tableState.sortDirection);
+
+    if (table.serverSide) {
+        // Screener: Sortierung serverseitig über das ganze Universum,
+        // nicht nur über die bereits geladenen Zeilen
+        serverSort();
+    } else {
+        table.sortRows(column, header.dataset.type || 'text', tableState.sortDirection);
+    }
+}
@@ -0,0 +1,39 @@
+// =============================================================================
+// Aktien-Tool JavaScript: gemeinsame Hilfsfunktionen
+// =============================================================================
+
+const CHART_JS_URL = 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js';
+
+// View-Name aus URL ermitteln
+export function getCurrentView() {
+    const path = window.location.pathname;
+    if (path.includes('watchlist')) return 'watchlist';
+    if (path.includes('screener')) return 'screener';
+    return 'watchlist';
+}
+
+// Externes Skript einmalig nachladen; bei Fehler wird der nächste Aufruf neu versucht
+const scriptPromises = {};
+
+export function loadScript(src) {
+    if (!scriptPromises[src]) {
+        scriptPromises[src] = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = src;
+            script.async = true;
+            script.onload = resolve;
+            script.onerror = () => {
+                delete scriptPromises[src];
+                script.remove();
+                reject(new Error(`Skript konnte nicht geladen werden: ${src}`));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return scriptPromises[src];
+}
+
+// Chart.js wird erst für das erste Detail-Modal gebraucht
+export function loadChartJs() {
+    return window.Chart ? Promise.resolve() : loadScript(CHART_JS_URL);
+}
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WSGI-Einstieg für den Produktivbetrieb.
+
+Starten mit: gunicorn -c gunicorn.conf.py   (aus 05_website/, siehe restart_website.sh)
+
+Beim Import werden die prozesslokalen Caches gewärmt (app.warm_up). Mit
+preload_app = True geschieht das einmal im Master vor dem fork() der Worker.
+
+Neue Pipeline-Daten brauchen keinen Neustart: die Routen lesen bei jedem
+Request aus der DB, die ETags hängen an der Daten-Generation
+(data_generation.py) und ändern sich mit dem nächsten Pipeline-Lauf.
+Neu starten muss man nur nach Code-Änderungen.
+"""
+
+from app import app, warm_up
+
+warm_up()
+
+application = app
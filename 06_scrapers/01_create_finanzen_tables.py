@@ -2,6 +2,8 @@
 Erstellt die Tabellen für finanzen.net Daten:
 - earnings_calendar: Veröffentlichungstermine für Quartalszahlen
 - analyst_estimates: Analystenschätzungen (EPS, Umsatz, EBIT, etc.)
+- finanzen_page_state: Abrufstand je Seite (ETag, Last-Modified, Inhalts-Hash)
+- finanzen_slug_cache: Ergebnis der Slug-Suche je ISIN (inkl. Fehlversuche)
 """
 
 import sys
@@ -86,6 +88,45 @@ CREATE TABLE IF NOT EXISTS `analyst_estimates` (
 """
 
 
+# Tabelle 3: Abrufstand je (ISIN, Seite) für Conditional GET / Änderungserkennung
+CREATE_PAGE_STATE = """
+CREATE TABLE IF NOT EXISTS `finanzen_page_state` (
+    isin VARCHAR(32) NOT NULL,
+    page_type VARCHAR(32) NOT NULL,    -- 'termine', 'schaetzungen'
+    slug VARCHAR(255) NOT NULL,        -- Slug, zu dem der Stand gehört
+
+    -- Conditional GET
+    etag VARCHAR(255),
+    last_modified VARCHAR(64),         -- Last-Modified Header (unverändert)
+
+    -- Änderungserkennung
+    content_hash CHAR(64),             -- SHA-256 über alle <table>-Blöcke
+    records INT,                       -- Datensätze beim letzten Parsen
+
+    fetched_at DATETIME,               -- Letzter Abruf
+    changed_at DATETIME,               -- Letzte inhaltliche Änderung
+
+    PRIMARY KEY (isin, page_type)
+);
+"""
+
+
+# Tabelle 4: Slug-Suche je ISIN (Negativ-Cache für ISINs ohne finanzen.net-Seite)
+CREATE_SLUG_CACHE = """
+CREATE TABLE IF NOT EXISTS `finanzen_slug_cache` (
+    isin VARCHAR(32) NOT NULL PRIMARY KEY,
+    slug VARCHAR(255),                 -- NULL bei Fehlversuch
+    status VARCHAR(16) NOT NULL,       -- 'found', 'missing'
+
+    attempts INT DEFAULT 0,            -- Fehlversuche in Folge
+    checked_at DATETIME,               -- Letzte Suche
+    retry_after DATE,                  -- Frühestens dann erneut suchen
+
+    INDEX idx_status_retry (status, retry_after)
+);
+"""
+
+
 def main():
     try:
         con = get_connection(db_name="analytics")
@@ -99,6 +140,14 @@ def main():
         cur.execute(CREATE_ANALYST_ESTIMATES)
         print("Tabelle 'analyst_estimates' erstellt.")
 
+        # Seitenstand (Conditional GET)
+        cur.execute(CREATE_PAGE_STATE)
+        print("Tabelle 'finanzen_page_state' erstellt.")
+
+        # Slug-Cache
+        cur.execute(CREATE_SLUG_CACHE)
+        print("Tabelle 'finanzen_slug_cache' erstellt.")
+
         con.commit()
         cur.close()
         con.close()
@@ -1,66 +1,80 @@
 """
-finanzen.net Scraper - FAST VERSION (requests + BeautifulSoup)
+finanzen.net Scraper - FAST VERSION (requests + lxml)
 
 ~10x schneller als Selenium-Version durch:
 - requests statt Selenium
-- BeautifulSoup für HTML-Parsing
-- Minimale Delays
+- lxml für HTML-Parsing (finanzen_parser.py, Fallback BeautifulSoup + SoupStrainer)
+- Mehrere ISINs parallel (Thread-Pool), Höflichkeit über Token Bucket pro Host
 - Fortschrittsanzeige
+
+Crawl-Engine:
+- MAX_WORKERS ISINs gleichzeitig in Arbeit (nur HTTP + Parsing)
+- Token Bucket pro Host: im Mittel höchstens 1 Request / REQUEST_DELAY,
+  Abstände zufällig gejittert → Laufzeit wird vom Höflichkeitsbudget
+  bestimmt, nicht von der Latenz einzelner Requests
+- 429/5xx und Verbindungsfehler: Retry mit exponentiellem Backoff
+  (Retry-After wird beachtet, bei 429 pausiert der ganze Host)
+- HTTP über den gemeinsamen http_client.py (Keep-Alive-Pool, optional --http2)
+- DB-Schreibzugriffe laufen ausschließlich im Haupt-Thread
+
+Änderungserkennung (Tabelle finanzen_page_state):
+- Pro (ISIN, Seite) werden ETag, Last-Modified und ein Hash der Tabellen
+  gespeichert; Folgeabrufe sind Conditional GETs
+- 304 oder gleicher Hash → kein Parsing, keine DB-Schreibzugriffe
+- Geänderte Datensätze werden gesammelt und per executemany geschrieben
+- --force lädt und parst alle Seiten unabhängig vom gespeicherten Stand
+
+Slug-Suche (Tabelle finanzen_slug_cache):
+- Eigener paralleler Vorlauf für alle ISINs ohne finanzen_name
+- Fehlversuche werden mit retry_after gespeichert und bis dahin nicht
+  erneut gesucht (7 Tage, verdoppelt je Fehlversuch, max. 90)
+- Gefundene Slugs gehen gebündelt nach tickerlist
 """
 
 import sys
 import time
 import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
-from decimal import Decimal, InvalidOperation
+from datetime import date, datetime, timedelta
 from urllib.parse import unquote
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
-from bs4 import BeautifulSoup
+from mysql.connector import Error
 from db import get_connection
+from data_generation import bump_generation
+from http_client import HttpClient
+from finanzen_parser import parse_termine, parse_schaetzungen
 
 # =============================================================================
 # KONFIGURATION
 # =============================================================================
 
-REQUEST_DELAY = 0.3  # Sekunden zwischen Requests (höflich aber schnell)
+REQUEST_DELAY = 0.3  # Sekunden zwischen Requests pro Host im Mittel (höflich aber schnell)
 REQUEST_TIMEOUT = 15
 
+MAX_WORKERS = 6        # ISINs gleichzeitig in Arbeit
+BUCKET_BURST = 1       # Max. Requests am Stück nach Leerlauf
+REQUEST_JITTER = 0.5   # Zufällige Streuung der Abstände (Anteil von REQUEST_DELAY)
+
+MAX_RETRIES = 4
+RETRY_BACKOFF = 2.0    # Sekunden, verdoppelt sich pro Versuch
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+SLUG_RETRY_DAYS = 7       # Wartezeit nach erfolgloser Slug-Suche (verdoppelt sich)
+SLUG_RETRY_MAX_DAYS = 90
+
+BATCH_SIZE = 500       # Zeilen pro executemany
+FLUSH_ROWS = 2000      # Gesammelte Datensätze, ab denen geschrieben wird
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
 }
 
-# Metriken-Mapping
-METRIC_MAPPING = {
-    "umsatzerlöse": ("revenue", "millions"),
-    "umsatz": ("revenue", "millions"),
-    "dividende": ("dividend", "per_share"),
-    "dividendenrendite": ("dividend_yield", "percent"),
-    "gewinn/aktie": ("eps", "per_share"),
-    "gewinn pro aktie": ("eps", "per_share"),
-    "kgv": ("pe_ratio", "ratio"),
-    "ebit": ("ebit", "millions"),
-    "ebitda": ("ebitda", "millions"),
-    "gewinn in mio": ("net_income", "millions"),
-    "gewinn (vor steuern)": ("ebt", "millions"),
-    "gewinn/aktie (reported)": ("eps_reported", "per_share"),
-    "cashflow (operations)": ("cashflow_operations", "millions"),
-    "cashflow (investing)": ("cashflow_investing", "millions"),
-    "cashflow (financing)": ("cashflow_financing", "millions"),
-    "cashflow/aktie": ("cashflow_per_share", "per_share"),
-    "free cashflow": ("free_cashflow", "millions"),
-    "buchwert/aktie": ("book_value_per_share", "per_share"),
-    "buchwert": ("book_value_per_share", "per_share"),
-    "nettofinanzverbindlichkeiten": ("net_debt", "millions"),
-    "eigenkapital": ("equity", "millions"),
-    "bilanzsumme": ("total_assets", "millions"),
-}
-
 # =============================================================================
 # FORTSCHRITTSANZEIGE
 # =============================================================================
@@ -101,343 +115,304 @@ class ProgressBar:
 
 
 # =============================================================================
-# HELPER FUNCTIONS
+# HTTP CLIENT (http_client.py: Token Bucket pro Host, Retry mit Backoff)
 # =============================================================================
 
-def parse_german_number(text: str) -> Decimal | None:
-    if not text or text.strip() in ['-', '—', '']:
-        return None
-    try:
-        cleaned = re.sub(r'[A-Za-z%\s]', '', text)
-        cleaned = cleaned.replace('.', '').replace(',', '.')
-        return Decimal(cleaned)
-    except (InvalidOperation, ValueError):
-        return None
+def create_client(request_delay: float = REQUEST_DELAY, workers: int = MAX_WORKERS,
+                  http2: bool = False) -> HttpClient:
+    """Ein Client für alle Threads, Keep-Alive-Pool mit einer Verbindung je Worker."""
+    return HttpClient(
+        pool_size=workers,
+        max_retries=MAX_RETRIES,
+        backoff=RETRY_BACKOFF,
+        retry_status=RETRY_STATUS,
+        timeout=REQUEST_TIMEOUT,
+        headers=HEADERS,
+        rate=1 / request_delay,
+        burst=BUCKET_BURST,
+        jitter=REQUEST_JITTER,
+        http2=http2,
+    )
 
 
-def parse_german_date(text: str) -> str | None:
-    if not text:
-        return None
-    text = re.sub(r'\s*\(e\)\*?\s*', '', text).strip()
-    try:
-        dt = datetime.strptime(text, "%d.%m.%Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        return None
+# =============================================================================
+# SLUG FINDER (Vorlauf mit Negativ-Cache)
+# =============================================================================
 
+def resolve_slug(client: HttpClient, isin: str) -> tuple[str, str | None]:
+    """
+    Findet den finanzen.net Slug für eine ISIN via Redirect.
 
-def extract_currency(text: str) -> str | None:
-    match = re.search(r'(EUR|USD|JPY|GBP|CHF|DKK|SEK|NOK)', text)
-    return match.group(1) if match else None
+    Returns (status, slug) mit status "found", "missing" (Suche ohne Treffer)
+    oder "error" (Request fehlgeschlagen → nicht als Fehlversuch werten).
+    """
+    search_url = f"https://www.finanzen.net/suchergebnis.asp?_search={isin}"
 
+    try:
+        r = client.get(search_url, allow_redirects=True)
+    except Exception:
+        return "error", None
 
-def extract_period_info(info_text: str) -> tuple[str, str]:
-    info_text = info_text.strip()
-    q_match = re.search(r'Q([1-4])\s*(\d{4})', info_text)
-    if q_match:
-        return f"Q{q_match.group(1)} {q_match.group(2)}", "quarter"
-    fy_match = re.search(r'(?:FY|GJ)\s*(\d{4})', info_text)
-    if fy_match:
-        return f"FY {fy_match.group(1)}", "fiscal_year"
-    year_match = re.search(r'(\d{4})', info_text)
-    if year_match:
-        return f"FY {year_match.group(1)}", "fiscal_year"
-    return info_text, "unknown"
+    if r.status_code in RETRY_STATUS:
+        return "error", None
 
+    final_url = str(r.url)
 
-def identify_metric(label: str) -> tuple[str, str] | None:
-    label_lower = label.lower().strip()
-    for key, (metric, unit) in METRIC_MAPPING.items():
-        if key in label_lower:
-            return metric, unit
-    return None
+    # Sonderfall: Redirect zu finanzen.ch
+    if 'finanzen.ch' in final_url and 'countryredirect' in final_url:
+        redirect_match = re.search(r'countryredirect=([^&]+)', final_url)
+        if redirect_match:
+            redirect_url = unquote(redirect_match.group(1))
+            match = re.search(r'/aktien/([^/]+)-aktie', redirect_url)
+            if match:
+                return "found", match.group(1)
 
+    match = re.search(r'/aktien/([^/]+)-aktie', final_url)
+    if match:
+        slug = match.group(1)
+        if '?' not in slug:
+            return "found", slug
 
-# =============================================================================
-# SLUG FINDER (requests version)
-# =============================================================================
+    return "missing", None
 
-def get_finanzen_slug(session: requests.Session, isin: str) -> str | None:
-    """Findet den finanzen.net Slug für eine ISIN via Redirect."""
-    search_url = f"https://www.finanzen.net/suchergebnis.asp?_search={isin}"
 
+def load_slug_cache(con) -> dict | None:
+    """Letzte Slug-Suche je ISIN; None, wenn die Tabelle fehlt."""
+    cur = con.cursor(dictionary=True)
     try:
-        r = session.get(search_url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-        final_url = r.url
-
-        # Sonderfall: Redirect zu finanzen.ch
-        if 'finanzen.ch' in final_url and 'countryredirect' in final_url:
-            redirect_match = re.search(r'countryredirect=([^&]+)', final_url)
-            if redirect_match:
-                redirect_url = unquote(redirect_match.group(1))
-                match = re.search(r'/aktien/([^/]+)-aktie', redirect_url)
-                if match:
-                    return match.group(1)
-
-        match = re.search(r'/aktien/([^/]+)-aktie', final_url)
-        if match:
-            slug = match.group(1)
-            if '?' not in slug:
-                return slug
-
-    except Exception as e:
-        pass
+        cur.execute("SELECT isin, slug, status, attempts, retry_after FROM finanzen_slug_cache")
+    except Error as e:
+        print(f"⚠️  finanzen_slug_cache nicht lesbar ({e}) – 01_create_finanzen_tables.py ausführen.")
+        cur.close()
+        return None
+    cache = {row["isin"]: row for row in cur.fetchall()}
+    cur.close()
+    return cache
 
-    return None
 
+def save_slug_cache(con, cache: dict, resolved: list[tuple[str, str, str | None]]):
+    """
+    Speichert Treffer und Fehlversuche. Nach einem Fehlversuch wird die ISIN
+    erst nach SLUG_RETRY_DAYS wieder gesucht, verdoppelt je weiterem Fehlversuch.
+    """
+    today = date.today()
+    rows = []
+    for isin, status, slug in resolved:
+        if status == "error":
+            continue
+        if status == "found":
+            attempts, retry_after = 0, None
+        else:
+            attempts = (cache.get(isin) or {}).get("attempts", 0) + 1
+            days = min(SLUG_RETRY_DAYS * 2 ** (attempts - 1), SLUG_RETRY_MAX_DAYS)
+            retry_after = today + timedelta(days=days)
+        rows.append({"isin": isin, "slug": slug, "status": status,
+                     "attempts": attempts, "retry_after": retry_after})
 
-# =============================================================================
-# TERMINE SCRAPER (requests + BeautifulSoup)
-# =============================================================================
+    sql = """
+        INSERT INTO finanzen_slug_cache (isin, slug, status, attempts, checked_at, retry_after)
+        VALUES (%(isin)s, %(slug)s, %(status)s, %(attempts)s, NOW(), %(retry_after)s)
+        ON DUPLICATE KEY UPDATE
+            slug = VALUES(slug),
+            status = VALUES(status),
+            attempts = VALUES(attempts),
+            checked_at = VALUES(checked_at),
+            retry_after = VALUES(retry_after)
+    """
+    _, failed = _upsert_many(con, sql, rows)
+    _print_failed("Slug-Cache-Einträge", failed)
+    con.commit()
 
-def scrape_termine(session: requests.Session, slug: str, isin: str) -> list[dict]:
-    """Scraped die Termine-Seite."""
-    url = f"https://www.finanzen.net/termine/{slug}"
 
-    try:
-        r = session.get(url, timeout=REQUEST_TIMEOUT)
-        soup = BeautifulSoup(r.text, 'html.parser')
-    except Exception:
-        return []
-
-    termine = []
-
-    for table in soup.find_all('table'):
-        rows = table.find_all('tr')
-        for row in rows:
-            cells = row.find_all('td')
-            if len(cells) >= 4:
-                terminart = cells[0].get_text(strip=True)
-                eps_text = cells[1].get_text(strip=True)
-                info = cells[2].get_text(strip=True)
-                datum_text = cells[3].get_text(strip=True)
-
-                if not terminart or not datum_text:
-                    continue
-
-                event_type = "earnings"
-                if "hauptversammlung" in terminart.lower():
-                    event_type = "hauptversammlung"
-                elif "dividende" in terminart.lower():
-                    event_type = "dividende"
-
-                period, _ = extract_period_info(info)
-                is_estimated = "(e)*" in datum_text or "(e)" in datum_text
-                release_date = parse_german_date(datum_text)
-                eps_value = parse_german_number(eps_text)
-                eps_currency = extract_currency(eps_text)
-
-                termine.append({
-                    "isin": isin,
-                    "period": period,
-                    "release_date": release_date,
-                    "event_type": event_type,
-                    "eps_estimate": eps_value,
-                    "eps_currency": eps_currency,
-                    "is_estimated": is_estimated,
-                })
-
-    return termine
+def update_finanzen_slugs(con_ticker, slugs: dict[str, str]) -> int:
+    """Schreibt gefundene Slugs gebündelt nach tickerlist (ein UPDATE pro Batch)."""
+    if not slugs:
+        return 0
+    cur = con_ticker.cursor()
+    items = list(slugs.items())
+    for i in range(0, len(items), BATCH_SIZE):
+        batch = items[i:i + BATCH_SIZE]
+        cases = " ".join(["WHEN %s THEN %s"] * len(batch))
+        placeholders = ",".join(["%s"] * len(batch))
+        params = [value for pair in batch for value in pair] + [isin for isin, _ in batch]
+        cur.execute(f"""
+            UPDATE tickerlist
+            SET finanzen_name = CASE isin {cases} END
+            WHERE isin IN ({placeholders})
+        """, params)
+    con_ticker.commit()
+    cur.close()
+    return len(items)
 
 
-# =============================================================================
-# SCHÄTZUNGEN SCRAPER (requests + BeautifulSoup)
-# =============================================================================
+def resolve_slugs(client: HttpClient, con_analytics, con_ticker, isins: list[str],
+                  workers: int, retry_missing: bool = False) -> tuple[dict, dict]:
+    """
+    Vorlauf: sucht Slugs für alle ISINs ohne finanzen_name parallel.
 
-def scrape_schaetzungen(session: requests.Session, slug: str, isin: str) -> list[dict]:
-    """Scraped die Schätzungen-Seite komplett."""
-    url = f"https://www.finanzen.net/schaetzungen/{slug}"
+    ISINs mit kürzlichem Fehlversuch werden bis retry_after übersprungen
+    (außer mit retry_missing). Returns (gefundene Slugs, pausierte ISINs → retry_after).
+    """
+    cache = load_slug_cache(con_analytics)
+    today = date.today()
 
-    try:
-        r = session.get(url, timeout=REQUEST_TIMEOUT)
-        soup = BeautifulSoup(r.text, 'html.parser')
-    except Exception:
-        return []
+    paused = {}
+    if cache is not None and not retry_missing:
+        paused = {
+            isin: cache[isin]["retry_after"] for isin in isins
+            if isin in cache and cache[isin]["status"] == "missing"
+            and cache[isin]["retry_after"] and cache[isin]["retry_after"] > today
+        }
+    todo = [isin for isin in isins if isin not in paused]
 
-    estimates = []
+    print(f"Slug-Suche: {len(todo)} ISINs ohne Slug, {len(paused)} pausiert (Negativ-Cache)")
+    if not todo:
+        return {}, paused
 
-    for table in soup.find_all('table'):
-        rows = table.find_all('tr')
-        if len(rows) < 2:
-            continue
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        resolved = [
+            (isin, *status_slug)
+            for isin, status_slug in zip(todo, executor.map(lambda i: resolve_slug(client, i), todo))
+        ]
 
-        # Headers aus erster Zeile
-        header_row = rows[0]
-        headers = [th.get_text(strip=True) for th in header_row.find_all(['th', 'td'])]
+    slugs = {isin: slug for isin, status, slug in resolved if status == "found"}
+    errors = sum(1 for _, status, _ in resolved if status == "error")
+    print(f"  -> {len(slugs)} gefunden, {len(todo) - len(slugs) - errors} ohne Treffer, "
+          f"{errors} Fehler (nächster Lauf)")
 
-        if not headers or not any(re.search(r'\d{4}', h) for h in headers):
-            continue
+    update_finanzen_slugs(con_ticker, slugs)
+    if cache is not None:
+        save_slug_cache(con_analytics, cache, resolved)
 
-        # Perioden aus Headers
-        periods = []
-        for h in headers[1:]:
-            period, period_type, period_end = parse_period_from_header(h)
-            periods.append((period, period_type, period_end))
-
-        # Tabellentyp erkennen
-        row_texts = [row.get_text(strip=True).lower() for row in rows[1:4]]
-        is_quarterly = any("anzahl" in t and "analyst" in t for t in row_texts)
-        is_annual = any(identify_metric(t) for t in row_texts)
-
-        if is_quarterly:
-            estimates.extend(_parse_quarterly_table_bs(rows, periods, isin))
-        elif is_annual:
-            estimates.extend(_parse_annual_table_bs(rows, periods, isin))
-
-    return estimates
-
-
-def parse_period_from_header(header_text: str) -> tuple[str, str, str | None]:
-    header_text = header_text.replace("\n", " ")
-
-    # Format: 2026e, 2027e
-    year_match = re.search(r'(\d{4})e?$', header_text.strip())
-    if year_match and "quartal" not in header_text.lower():
-        year = year_match.group(1)
-        return f"FY {year}", "fiscal_year", None
-
-    # Format: Datum
-    date_match = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{4})', header_text)
-    if date_match:
-        day, month, year = date_match.groups()
-        period_end = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-        month_int = int(month)
-        quarter_map = {3: 1, 6: 2, 9: 3, 12: 4, 1: 1, 2: 1, 4: 2, 5: 2, 7: 3, 8: 3, 10: 4, 11: 4}
-        quarter = quarter_map.get(month_int, 4)
-
-        if "geschäftsjahr" in header_text.lower():
-            return f"FY {year}", "fiscal_year", period_end
-        else:
-            return f"Q{quarter} {year}", "quarter", period_end
+    return slugs, paused
 
-    return "", "unknown", None
 
+# =============================================================================
+# TERMINE / SCHÄTZUNGEN (Conditional GET, Parsing in finanzen_parser.py)
+# =============================================================================
 
-def _parse_quarterly_table_bs(rows, periods, isin: str) -> list[dict]:
-    """Parst Quartalsschätzungen mit BeautifulSoup."""
-    estimates = []
-    num_analysts = {}
-    estimate_values = {}
-    prior_year_values = {}
-    actual_values = {}
-    currency = None
-    metric = "eps"
+PAGE_URLS = {
+    "termine": "https://www.finanzen.net/termine/{slug}",
+    "schaetzungen": "https://www.finanzen.net/schaetzungen/{slug}",
+}
 
-    for row in rows[1:]:
-        cells = row.find_all('td')
-        if len(cells) < 2:
-            continue
+PAGE_PARSERS = {
+    "termine": parse_termine,
+    "schaetzungen": parse_schaetzungen,
+}
 
-        label = cells[0].get_text(strip=True).lower()
 
-        if "umsatz" in label:
-            metric = "revenue"
+def content_hash(html: str) -> str:
+    """
+    SHA-256 über alle <table>-Blöcke der Seite.
 
-        values = [c.get_text(strip=True) for c in cells[1:]]
+    Werbung, Tokens und Zeitstempel außerhalb der Tabellen ändern sich bei
+    jedem Abruf und sollen keine Neuverarbeitung auslösen.
+    """
+    tables = re.findall(r'<table\b.*?</table>', html, re.S | re.I)
+    return hashlib.sha256("\n".join(tables).encode("utf-8")).hexdigest()
 
-        if "anzahl" in label and "analyst" in label:
-            for i, val in enumerate(values):
-                if i < len(periods):
-                    num_analysts[i] = parse_german_number(val)
 
-        elif "mittlere schätzung" in label:
-            for i, val in enumerate(values):
-                if i < len(periods):
-                    estimate_values[i] = parse_german_number(val)
-                    if not currency:
-                        currency = extract_currency(val)
+def scrape_page(client: HttpClient, page_type: str, slug: str, isin: str,
+                state: dict | None = None) -> tuple[str, list[dict], dict | None]:
+    """
+    Lädt eine Termine-/Schätzungen-Seite und parst sie nur bei Änderung.
+
+    state: letzter Stand aus finanzen_page_state (ETag, Last-Modified, Hash).
+    Returns (status, records, new_state) mit status
+        "changed"      → neu geparst
+        "not_modified" → HTTP 304, nicht geladen
+        "unchanged"    → geladen, Tabellen-Hash unverändert, nicht geparst
+        "error"        → Request fehlgeschlagen
+    """
+    url = PAGE_URLS[page_type].format(slug=slug)
 
-        elif "vorjahr" in label:
-            for i, val in enumerate(values):
-                if i < len(periods):
-                    prior_year_values[i] = parse_german_number(val)
+    # Alter Stand gilt nur für denselben Slug (sonst andere URL)
+    if state and state["slug"] != slug:
+        state = None
 
-        elif "tatsächlicher wert" in label:
-            for i, val in enumerate(values):
-                if i < len(periods):
-                    actual_values[i] = parse_german_number(val)
+    headers = {}
+    if state:
+        if state["etag"]:
+            headers["If-None-Match"] = state["etag"]
+        if state["last_modified"]:
+            headers["If-Modified-Since"] = state["last_modified"]
 
-    for i, (period, period_type, period_end) in enumerate(periods):
-        if not period:
-            continue
-        if i in estimate_values and estimate_values[i] is not None:
-            estimates.append({
-                "isin": isin,
-                "period": period,
-                "period_type": period_type,
-                "period_end_date": period_end,
-                "metric": metric,
-                "estimate_value": estimate_values.get(i),
-                "prior_year_value": prior_year_values.get(i),
-                "actual_value": actual_values.get(i),
-                "currency": currency,
-                "unit": "per_share" if metric == "eps" else "millions",
-                "num_analysts": int(num_analysts[i]) if num_analysts.get(i) else None,
-                "release_date": None,
-            })
-
-    return estimates
-
-
-def _parse_annual_table_bs(rows, periods, isin: str) -> list[dict]:
-    """Parst Geschäftsjahresschätzungen mit BeautifulSoup."""
-    estimates = []
-
-    for row in rows[1:]:
-        cells = row.find_all('td')
-        if len(cells) < 2:
-            continue
-
-        label = cells[0].get_text(strip=True)
-        metric_info = identify_metric(label)
-        if not metric_info:
-            continue
-
-        metric, unit = metric_info
-        currency = None
-        values = [c.get_text(strip=True) for c in cells[1:]]
+    try:
+        r = client.get(url, headers=headers)
+    except Exception:
+        return "error", [], None
 
-        for i, val in enumerate(values):
-            if i >= len(periods):
-                break
+    fetched_at = datetime.now()
 
-            period, period_type, period_end = periods[i]
-            if not period:
-                continue
+    if r.status_code == 304 and state:
+        return "not_modified", [], {**state, "fetched_at": fetched_at, "changed": False}
 
-            value = parse_german_number(val)
-            if value is None:
-                continue
+    if r.status_code != 200:
+        return "error", [], None
 
-            if not currency:
-                currency = extract_currency(val) or "EUR"
+    new_state = {
+        "isin": isin,
+        "page_type": page_type,
+        "slug": slug,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "content_hash": content_hash(r.text),
+        "records": state["records"] if state else 0,
+        "fetched_at": fetched_at,
+        "changed": False,
+    }
 
-            estimates.append({
-                "isin": isin,
-                "period": period,
-                "period_type": period_type,
-                "period_end_date": period_end,
-                "metric": metric,
-                "estimate_value": value,
-                "prior_year_value": None,
-                "actual_value": None,
-                "currency": currency,
-                "unit": unit,
-                "num_analysts": None,
-                "release_date": None,
-            })
+    if state and state["content_hash"] == new_state["content_hash"]:
+        return "unchanged", [], new_state
 
-    return estimates
+    records = PAGE_PARSERS[page_type](r.text, isin)
+    new_state["records"] = len(records)
+    new_state["changed"] = True
+    return "changed", records, new_state
 
 
 # =============================================================================
 # DATABASE FUNCTIONS
 # =============================================================================
 
-def save_termine(con, termine: list[dict]) -> int:
-    if not termine:
-        return 0
+def _upsert_many(con, sql: str, rows: list[dict]) -> tuple[int, list[tuple[dict, str]]]:
+    """
+    executemany in Batches; schlägt ein Batch fehl, wird er zeilenweise
+    wiederholt. Returns (geschriebene Zeilen, [(Zeile, Fehler)] der übrigen).
+    """
+    if not rows:
+        return 0, []
     cur = con.cursor()
+    count = 0
+    failed = []
+    for i in range(0, len(rows), BATCH_SIZE):
+        batch = rows[i:i + BATCH_SIZE]
+        try:
+            cur.executemany(sql, batch)
+            count += len(batch)
+        except Error:
+            for row in batch:
+                try:
+                    cur.execute(sql, row)
+                    count += 1
+                except Error as e:
+                    failed.append((row, str(e)))
+    cur.close()
+    return count, failed
+
+
+def _print_failed(label: str, failed: list[tuple[dict, str]]):
+    if not failed:
+        return
+    print(f"\n⚠️  {len(failed)} {label} nicht gespeichert:")
+    for row, error in failed[:5]:
+        print(f"  {row.get('isin')}: {error}")
+    if len(failed) > 5:
+        print(f"  ... und {len(failed) - 5} weitere")
+
+
+def save_termine(con, termine: list[dict]) -> tuple[int, list]:
     sql = """
         INSERT INTO earnings_calendar
         (isin, period, release_date, event_type, eps_estimate, eps_currency, is_estimated)
@@ -449,22 +424,10 @@ def save_termine(con, termine: list[dict]) -> int:
             is_estimated = VALUES(is_estimated),
             updated_at = CURRENT_TIMESTAMP
     """
-    count = 0
-    for t in termine:
-        try:
-            cur.execute(sql, t)
-            count += 1
-        except:
-            pass
-    con.commit()
-    cur.close()
-    return count
+    return _upsert_many(con, sql, termine)
 
 
-def save_estimates(con, estimates: list[dict]) -> int:
-    if not estimates:
-        return 0
-    cur = con.cursor()
+def save_estimates(con, estimates: list[dict]) -> tuple[int, list]:
     sql = """
         INSERT INTO analyst_estimates
         (isin, period, period_type, period_end_date, metric, estimate_value, prior_year_value, actual_value, currency, unit, num_analysts, release_date)
@@ -479,57 +442,102 @@ def save_estimates(con, estimates: list[dict]) -> int:
             num_analysts = COALESCE(VALUES(num_analysts), num_analysts),
             updated_at = CURRENT_TIMESTAMP
     """
-    count = 0
-    for est in estimates:
-        try:
-            cur.execute(sql, est)
-            count += 1
-        except:
-            pass
-    con.commit()
-    cur.close()
-    return count
+    return _upsert_many(con, sql, estimates)
 
 
-def update_finanzen_slug(con_ticker, isin: str, slug: str):
-    cur = con_ticker.cursor()
-    cur.execute("UPDATE tickerlist SET finanzen_name = %s WHERE isin = %s", (slug, isin))
-    con_ticker.commit()
+def load_page_states(con) -> dict | None:
+    """Letzter Abrufstand je (ISIN, Seite); None, wenn die Tabelle fehlt."""
+    cur = con.cursor(dictionary=True)
+    try:
+        cur.execute("""
+            SELECT isin, page_type, slug, etag, last_modified, content_hash, records
+            FROM finanzen_page_state
+        """)
+    except Error as e:
+        print(f"⚠️  finanzen_page_state nicht lesbar ({e}) – 01_create_finanzen_tables.py ausführen.")
+        print("   Alle Seiten werden vollständig geladen.")
+        cur.close()
+        return None
+    states = {(row["isin"], row["page_type"]): row for row in cur.fetchall()}
     cur.close()
+    return states
 
 
-# =============================================================================
-# MAIN
-# =============================================================================
+def save_page_states(con, states: list[dict]) -> tuple[int, list]:
+    # changed_at zuerst zuweisen, solange content_hash noch den alten Wert hat
+    sql = """
+        INSERT INTO finanzen_page_state
+        (isin, page_type, slug, etag, last_modified, content_hash, records, fetched_at, changed_at)
+        VALUES (%(isin)s, %(page_type)s, %(slug)s, %(etag)s, %(last_modified)s, %(content_hash)s,
+                %(records)s, %(fetched_at)s, %(fetched_at)s)
+        ON DUPLICATE KEY UPDATE
+            changed_at = IF(content_hash <=> VALUES(content_hash), changed_at, VALUES(changed_at)),
+            slug = VALUES(slug),
+            etag = VALUES(etag),
+            last_modified = VALUES(last_modified),
+            content_hash = VALUES(content_hash),
+            records = VALUES(records),
+            fetched_at = VALUES(fetched_at)
+    """
+    return _upsert_many(con, sql, states)
 
-def process_isin(session, con_analytics, con_ticker, isin: str, name: str, existing_slug: str | None) -> dict:
-    """Verarbeitet eine einzelne ISIN."""
-    result = {"isin": isin, "name": name, "slug": None, "termine": 0, "estimates": 0, "error": None}
 
+def save_batch(con, termine: list[dict], estimates: list[dict], states: list[dict]) -> tuple[int, int]:
+    """
+    Schreibt gesammelte Datensätze und Seitenstände in einer Transaktion
+    (Verbindung mit autocommit=False). Der neue Hash wird nur zusammen mit den
+    Daten gespeichert: Seiten mit nicht gespeicherten Zeilen behalten ihren
+    alten Stand und werden beim nächsten Lauf erneut geparst.
+    """
     try:
-        # Slug finden
-        if existing_slug:
-            slug = existing_slug
-        else:
-            slug = get_finanzen_slug(session, isin)
-            if slug:
-                update_finanzen_slug(con_ticker, isin, slug)
+        saved_termine, failed_termine = save_termine(con, termine)
+        saved_estimates, failed_estimates = save_estimates(con, estimates)
+
+        failed_pages = ({(row["isin"], "termine") for row, _ in failed_termine}
+                        | {(row["isin"], "schaetzungen") for row, _ in failed_estimates})
+        _print_failed("Termine", failed_termine)
+        _print_failed("Schätzungen", failed_estimates)
 
-        if not slug:
-            result["error"] = "Slug nicht gefunden"
-            return result
+        states = [s for s in states if (s["isin"], s["page_type"]) not in failed_pages]
+        _, failed_states = save_page_states(con, states)
+        _print_failed("Seitenstände", failed_states)
 
-        result["slug"] = slug
-        time.sleep(REQUEST_DELAY)
+        con.commit()
+    except Error as e:
+        # z. B. Deadlock: ganze Transaktion verworfen, Seiten beim nächsten Lauf neu
+        con.rollback()
+        print(f"\n⚠️  Batch nicht gespeichert, zurückgerollt: {e}")
+        return 0, 0
 
-        # Termine scrapen
-        termine = scrape_termine(session, slug, isin)
-        result["termine"] = save_termine(con_analytics, termine)
-        time.sleep(REQUEST_DELAY)
+    return saved_termine, saved_estimates
 
-        # Schätzungen scrapen
-        estimates = scrape_schaetzungen(session, slug, isin)
-        result["estimates"] = save_estimates(con_analytics, estimates)
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def fetch_isin(client: HttpClient, isin: str, name: str, slug: str,
+               states: dict | None = None) -> dict:
+    """
+    Lädt und parst alle Seiten einer ISIN (läuft im Worker-Thread, ohne DB).
+
+    Returns Ergebnis-Dict inkl. geparster termine/estimates (nur geänderte
+    Seiten) und neuer Seitenstände.
+    """
+    result = {"isin": isin, "name": name, "slug": slug,
+              "termine": [], "estimates": [], "states": [], "pages": {}, "error": None}
+    states = states or {}
+
+    try:
+        # Termine und Schätzungen (Abstände regelt der Token Bucket)
+        for page_type, key in (("termine", "termine"), ("schaetzungen", "estimates")):
+            status, records, state = scrape_page(
+                client, page_type, slug, isin, states.get((isin, page_type))
+            )
+            result["pages"][page_type] = status
+            result[key] = records
+            if state:
+                result["states"].append(state)
 
     except Exception as e:
         result["error"] = str(e)
@@ -537,7 +545,9 @@ def process_isin(session, con_analytics, con_ticker, isin: str, name: str, exist
     return result
 
 
-def main(limit: int = None, index_filter: str = None):
+def main(limit: int = None, index_filter: str = None, workers: int = MAX_WORKERS,
+         request_delay: float = REQUEST_DELAY, force: bool = False, retry_missing: bool = False,
+         http2: bool = False):
     """Hauptfunktion mit Fortschrittsanzeige."""
     print("=" * 60)
     print("finanzen.net Scraper - FAST VERSION")
@@ -548,11 +558,11 @@ def main(limit: int = None, index_filter: str = None):
 
     try:
         con_ticker = get_connection(db_name="ticker")
-        con_analytics = get_connection(db_name="analytics")
+        # Daten und Seitenstände gemeinsam committen (siehe save_batch)
+        con_analytics = get_connection(db_name="analytics", autocommit=False)
 
-        # Session für Connection-Pooling
-        session = requests.Session()
-        session.headers.update(HEADERS)
+        # Ein Verbindungspool für alle Threads, ein Token Bucket pro Host
+        client = create_client(request_delay, workers, http2=http2)
 
         # ISINs laden
         cur = con_ticker.cursor()
@@ -568,36 +578,98 @@ def main(limit: int = None, index_filter: str = None):
         rows = cur.fetchall()
         cur.close()
 
+        # Letzter Abrufstand (ETag/Last-Modified/Hash) je Seite
+        states = load_page_states(con_analytics)
+        if force and states is not None:
+            print("--force: Seitenstände werden ignoriert (aber neu gespeichert)")
+            states_for_fetch = {}
+        else:
+            states_for_fetch = states
+
         total = len(rows)
         print(f"\n{total} Aktien zu verarbeiten", end="")
         if index_filter:
             print(f" (Filter: {index_filter})", end="")
-        print("\n")
+        print()
 
-        # Fortschrittsanzeige
-        progress = ProgressBar(total, prefix="Scraping: ")
+        print(f"{workers} Worker, max. {1 / request_delay:.1f} Requests/s pro Host\n")
 
-        results = []
-        total_termine = 0
-        total_estimates = 0
+        # Vorlauf: fehlende Slugs suchen (parallel, mit Negativ-Cache)
+        missing = [isin for isin, _, slug in rows if not slug]
+        paused = {}
+        if missing:
+            new_slugs, paused = resolve_slugs(client, con_analytics, con_ticker, missing,
+                                              workers, retry_missing)
+            rows = [(isin, name, slug or new_slugs.get(isin)) for isin, name, slug in rows]
 
-        for i, (isin, name, existing_slug) in enumerate(rows):
-            result = process_isin(session, con_analytics, con_ticker, isin, name, existing_slug)
-            results.append(result)
-
-            total_termine += result["termine"]
-            total_estimates += result["estimates"]
-
-            # Fortschritt aktualisieren
-            status = f"{name[:20]:<20} | T:{result['termine']:>2} E:{result['estimates']:>3}"
-            if result["error"]:
-                status += f" | ✗"
-            progress.update(i + 1, status)
+        # ISINs ohne Slug direkt als fehlgeschlagen verbuchen (keine Requests)
+        results = []
+        for isin, name, slug in rows:
+            if not slug:
+                error = (f"Slug-Suche pausiert bis {paused[isin]}" if isin in paused
+                         else "Slug nicht gefunden")
+                results.append({"isin": isin, "name": name, "slug": None, "error": error})
+        rows = [row for row in rows if row[2]]
+
+        # Höflichkeitsbudget: 2 Seiten pro ISIN
+        planned = 2 * len(rows)
+        print(f"\n{len(rows)} ISINs mit Slug → mind. {planned * request_delay / 60:.1f} Min "
+              f"für {planned} Requests\n")
 
-            time.sleep(REQUEST_DELAY)
+        # Fortschrittsanzeige
+        progress = ProgressBar(len(rows), prefix="Scraping: ")
 
+        total_termine = 0
+        total_estimates = 0
+        page_stats = {"changed": 0, "not_modified": 0, "unchanged": 0, "error": 0}
+
+        # Geänderte Datensätze sammeln und gebündelt schreiben
+        pending = {"termine": [], "estimates": [], "states": []}
+
+        def flush():
+            nonlocal total_termine, total_estimates
+            saved_termine, saved_estimates = save_batch(
+                con_analytics, pending["termine"], pending["estimates"],
+                pending["states"] if states is not None else []
+            )
+            total_termine += saved_termine
+            total_estimates += saved_estimates
+            for key in pending:
+                pending[key] = []
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(fetch_isin, client, isin, name, slug, states_for_fetch)
+                for isin, name, slug in rows
+            ]
+
+            for i, future in enumerate(as_completed(futures)):
+                result = future.result()
+                results.append(result)
+
+                for key in pending:
+                    pending[key].extend(result[key])
+                if len(pending["termine"]) + len(pending["estimates"]) >= FLUSH_ROWS:
+                    flush()
+
+                for page_status in result["pages"].values():
+                    page_stats[page_status] += 1
+
+                # Fortschritt aktualisieren ("=" → Seite unverändert, nicht geparst)
+                pages = result["pages"]
+                termine = len(result["termine"]) if pages.get("termine") == "changed" else "="
+                estimates = len(result["estimates"]) if pages.get("schaetzungen") == "changed" else "="
+                status = f"{(result['name'] or '')[:20]:<20} | T:{termine:>2} E:{estimates:>3}"
+                if result["error"]:
+                    status += f" | ✗"
+                progress.update(i + 1, status)
+
+        flush()
         progress.finish()
 
+        # Analystenschätzungen erscheinen im DCF-Modal
+        print(f"🔄 Daten-Generation {bump_generation()}")
+
         # Zusammenfassung
         print("\n" + "=" * 60)
         print("ZUSAMMENFASSUNG")
@@ -607,8 +679,12 @@ def main(limit: int = None, index_filter: str = None):
         failed = [r for r in results if not r["slug"]]
 
         print(f"Erfolgreich: {len(successful)}/{len(results)}")
+        print(f"Seiten geändert: {page_stats['changed']}, unverändert: "
+              f"{page_stats['not_modified']} (304) + {page_stats['unchanged']} (Hash), "
+              f"Fehler: {page_stats['error']}")
         print(f"Termine gespeichert: {total_termine}")
         print(f"Schätzungen gespeichert: {total_estimates}")
+        client.print_stats()
 
         if failed:
             print(f"\nFehlgeschlagen ({len(failed)}):")
@@ -635,6 +711,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="finanzen.net Scraper (Fast Version)")
     parser.add_argument("--limit", type=int, help="Maximale Anzahl ISINs")
     parser.add_argument("--index", type=str, help="Nur bestimmten Index (z.B. DAX)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"ISINs gleichzeitig (Default: {MAX_WORKERS})")
+    parser.add_argument("--delay", type=float, default=REQUEST_DELAY,
+                        help=f"Mittlerer Abstand zwischen Requests pro Host in s (Default: {REQUEST_DELAY})")
+
+    parser.add_argument("--force", action="store_true",
+                        help="Alle Seiten vollständig laden und parsen (ETag/Hash ignorieren)")
+    parser.add_argument("--retry-missing", action="store_true",
+                        help="Auch ISINs mit kürzlich erfolgloser Slug-Suche erneut suchen")
+    parser.add_argument("--http2", action="store_true",
+                        help="HTTP/2 verwenden (benötigt httpx[http2])")
 
     args = parser.parse_args()
-    main(limit=args.limit, index_filter=args.index)
+    main(limit=args.limit, index_filter=args.index, workers=args.workers,
+         request_delay=args.delay, force=args.force, retry_missing=args.retry_missing,
+         http2=args.http2)
@@ -0,0 +1,170 @@
+"""
+Benchmark + Fixture-Check für finanzen_parser.py
+
+Parst gespeicherte finanzen.net-Seiten mit allen verfügbaren Backends und
+prüft, dass jedes Backend exakt dieselben Datensätze liefert wie die
+Referenz (BeautifulSoup, voller Baum = bisheriges Verhalten).
+Anschließend wird der Durchsatz (Seiten/s) je Backend gemessen.
+
+Fixtures: fixtures/finanzen_net/<slug>.termine.html
+          fixtures/finanzen_net/<slug>.schaetzungen.html
+          beispiel.*.html ist synthetisch und eingecheckt, damit der Check
+          ohne --fetch läuft; per --fetch geladene Seiten bleiben ungetrackt.
+
+Aufruf:
+    python 03_benchmark_finanzen_parser.py --fetch siemens sap basf   # Seiten speichern
+    python 03_benchmark_finanzen_parser.py                            # prüfen + messen
+    python 03_benchmark_finanzen_parser.py --repeat 20
+
+Exit-Code 1, wenn ein Backend abweichende Datensätze liefert.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import finanzen_parser
+from finanzen_parser import parse_termine, parse_schaetzungen
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "finanzen_net"
+
+PAGES = {
+    "termine": ("https://www.finanzen.net/termine/{slug}", parse_termine),
+    "schaetzungen": ("https://www.finanzen.net/schaetzungen/{slug}", parse_schaetzungen),
+}
+
+REFERENCE_BACKEND = "bs"
+FIXTURE_ISIN = "XX0000000000"
+FETCH_DELAY = 1.0
+
+
+def fetch_fixtures(slugs: list[str]):
+    """Lädt Termine- und Schätzungen-Seite je Slug nach FIXTURE_DIR."""
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from http_client import HttpClient
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    client = HttpClient(pool_size=1, timeout=15, rate=1 / FETCH_DELAY, headers={
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
+    })
+
+    for slug in slugs:
+        for page, (url, _) in PAGES.items():
+            r = client.get(url.format(slug=slug))
+            path = FIXTURE_DIR / f"{slug}.{page}.html"
+            path.write_text(r.text, encoding="utf-8")
+            print(f"  {path.name}: HTTP {r.status_code}, {len(r.text) / 1024:.0f} KB")
+
+
+def load_fixtures() -> list[tuple[str, str, str]]:
+    """Returns Liste (name, page_type, html)."""
+    fixtures = []
+    for path in sorted(FIXTURE_DIR.glob("*.html")):
+        page = path.stem.rsplit(".", 1)[-1]
+        if page in PAGES:
+            fixtures.append((path.stem, page, path.read_text(encoding="utf-8")))
+    return fixtures
+
+
+def available_backends() -> list[str]:
+    backends = [REFERENCE_BACKEND, "strainer"]
+    if finanzen_parser.LXML_AVAILABLE:
+        backends.append("lxml")
+    return backends
+
+
+def check_fixtures(fixtures, backends) -> int:
+    """Vergleicht alle Backends mit der Referenz. Returns Anzahl Abweichungen."""
+    mismatches = 0
+
+    for name, page, html in fixtures:
+        parse = PAGES[page][1]
+        expected = parse(html, FIXTURE_ISIN, backend=REFERENCE_BACKEND)
+        ok = True
+
+        for backend in backends:
+            if backend == REFERENCE_BACKEND:
+                continue
+            actual = parse(html, FIXTURE_ISIN, backend=backend)
+            if actual == expected:
+                continue
+
+            ok = False
+            mismatches += 1
+            print(f"  ✗ {name} [{backend}]: {len(actual)} statt {len(expected)} Datensätze")
+            for i, (a, e) in enumerate(zip(actual, expected)):
+                if a != e:
+                    print(f"      erste Abweichung bei #{i}:\n      erwartet {e}\n      erhalten {a}")
+                    break
+
+        if ok:
+            print(f"  ✓ {name}: {len(expected)} Datensätze")
+
+    return mismatches
+
+
+def benchmark(fixtures, backends, repeat: int) -> dict:
+    """Seiten/s je Backend über alle Fixtures."""
+    results = {}
+    pages = len(fixtures) * repeat
+
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, page, html in fixtures:
+                PAGES[page][1](html, FIXTURE_ISIN, backend=backend)
+        elapsed = time.perf_counter() - start
+        results[backend] = pages / elapsed if elapsed > 0 else 0.0
+
+    return results
+
+
+def main(repeat: int = 10, fetch: list[str] = None):
+    print("=" * 60)
+    print("finanzen.net Parser - Benchmark & Fixture-Check")
+    print("=" * 60)
+
+    if fetch:
+        print(f"\nLade Fixtures nach {FIXTURE_DIR}...")
+        fetch_fixtures(fetch)
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        print(f"\nKeine Fixtures in {FIXTURE_DIR} – zuerst mit --fetch <slug> speichern.")
+        return 0
+
+    backends = available_backends()
+    size_kb = sum(len(html) for _, _, html in fixtures) / 1024
+    print(f"\n{len(fixtures)} Seiten ({size_kb:.0f} KB), Backends: {', '.join(backends)}")
+
+    print("\nPrüfe Datensätze gegen Referenz (BeautifulSoup, voller Baum)...")
+    mismatches = check_fixtures(fixtures, backends)
+
+    print(f"\nMesse Durchsatz ({repeat} Durchläufe)...")
+    results = benchmark(fixtures, backends, repeat)
+    reference = results[REFERENCE_BACKEND]
+    for backend, pages_per_sec in results.items():
+        speedup = pages_per_sec / reference if reference else 0
+        print(f"  {backend:<10} {pages_per_sec:>8.1f} Seiten/s   x{speedup:.1f}")
+
+    print(f"\nStandard-Backend im Scraper: {finanzen_parser.DEFAULT_BACKEND}")
+
+    if mismatches:
+        print(f"\n✗ {mismatches} Abweichungen")
+        return 1
+
+    print("\n✓ Alle Backends liefern identische Datensätze")
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark & Fixture-Check für finanzen_parser.py")
+    parser.add_argument("--repeat", type=int, default=10, help="Durchläufe für die Messung")
+    parser.add_argument("--fetch", nargs="+", metavar="SLUG",
+                        help="Termine- und Schätzungen-Seite dieser Slugs als Fixture speichern")
+    args = parser.parse_args()
+
+    sys.exit(main(repeat=args.repeat, fetch=args.fetch))
@@ -0,0 +1,407 @@
+"""
+finanzen.net HTML-Parser (Termine- und Schätzungen-Seite)
+
+Gemeinsam genutzt von 02_scrape_finanzen_net_fast.py und dem Benchmark
+03_benchmark_finanzen_parser.py.
+
+Backends (gleiche Datensätze, unterschiedliche Geschwindigkeit):
+- "lxml":     C-Parser, Text per XPath nur aus den Tabellen (Default, falls installiert)
+- "strainer": BeautifulSoup mit SoupStrainer → nur <table>-Elemente werden aufgebaut
+- "bs":       BeautifulSoup mit vollem Baum (bisheriges Verhalten, Referenz)
+
+Die Auswertung der Tabellen (Spalten, Perioden, Metriken) ist für alle
+Backends identisch; die Backends liefern nur Tabellen, Zeilen, Zellen und
+Text im Sinne von BeautifulSoup get_text(strip=True).
+"""
+
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+DEFAULT_BACKEND = "lxml" if LXML_AVAILABLE else "strainer"
+
+# Metriken-Mapping
+METRIC_MAPPING = {
+    "umsatzerlöse": ("revenue", "millions"),
+    "umsatz": ("revenue", "millions"),
+    "dividende": ("dividend", "per_share"),
+    "dividendenrendite": ("dividend_yield", "percent"),
+    "gewinn/aktie": ("eps", "per_share"),
+    "gewinn pro aktie": ("eps", "per_share"),
+    "kgv": ("pe_ratio", "ratio"),
+    "ebit": ("ebit", "millions"),
+    "ebitda": ("ebitda", "millions"),
+    "gewinn in mio": ("net_income", "millions"),
+    "gewinn (vor steuern)": ("ebt", "millions"),
+    "gewinn/aktie (reported)": ("eps_reported", "per_share"),
+    "cashflow (operations)": ("cashflow_operations", "millions"),
+    "cashflow (investing)": ("cashflow_investing", "millions"),
+    "cashflow (financing)": ("cashflow_financing", "millions"),
+    "cashflow/aktie": ("cashflow_per_share", "per_share"),
+    "free cashflow": ("free_cashflow", "millions"),
+    "buchwert/aktie": ("book_value_per_share", "per_share"),
+    "buchwert": ("book_value_per_share", "per_share"),
+    "nettofinanzverbindlichkeiten": ("net_debt", "millions"),
+    "eigenkapital": ("equity", "millions"),
+    "bilanzsumme": ("total_assets", "millions"),
+}
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def parse_german_number(text: str) -> Decimal | None:
+    if not text or text.strip() in ['-', '—', '']:
+        return None
+    try:
+        cleaned = re.sub(r'[A-Za-z%\s]', '', text)
+        cleaned = cleaned.replace('.', '').replace(',', '.')
+        return Decimal(cleaned)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def parse_german_date(text: str) -> str | None:
+    if not text:
+        return None
+    text = re.sub(r'\s*\(e\)\*?\s*', '', text).strip()
+    try:
+        dt = datetime.strptime(text, "%d.%m.%Y")
+        return dt.strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def extract_currency(text: str) -> str | None:
+    match = re.search(r'(EUR|USD|JPY|GBP|CHF|DKK|SEK|NOK)', text)
+    return match.group(1) if match else None
+
+
+def extract_period_info(info_text: str) -> tuple[str, str]:
+    info_text = info_text.strip()
+    q_match = re.search(r'Q([1-4])\s*(\d{4})', info_text)
+    if q_match:
+        return f"Q{q_match.group(1)} {q_match.group(2)}", "quarter"
+    fy_match = re.search(r'(?:FY|GJ)\s*(\d{4})', info_text)
+    if fy_match:
+        return f"FY {fy_match.group(1)}", "fiscal_year"
+    year_match = re.search(r'(\d{4})', info_text)
+    if year_match:
+        return f"FY {year_match.group(1)}", "fiscal_year"
+    return info_text, "unknown"
+
+
+def identify_metric(label: str) -> tuple[str, str] | None:
+    label_lower = label.lower().strip()
+    for key, (metric, unit) in METRIC_MAPPING.items():
+        if key in label_lower:
+            return metric, unit
+    return None
+
+
+def parse_period_from_header(header_text: str) -> tuple[str, str, str | None]:
+    header_text = header_text.replace("\n", " ")
+
+    # Format: 2026e, 2027e
+    year_match = re.search(r'(\d{4})e?$', header_text.strip())
+    if year_match and "quartal" not in header_text.lower():
+        year = year_match.group(1)
+        return f"FY {year}", "fiscal_year", None
+
+    # Format: Datum
+    date_match = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{4})', header_text)
+    if date_match:
+        day, month, year = date_match.groups()
+        period_end = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+        month_int = int(month)
+        quarter_map = {3: 1, 6: 2, 9: 3, 12: 4, 1: 1, 2: 1, 4: 2, 5: 2, 7: 3, 8: 3, 10: 4, 11: 4}
+        quarter = quarter_map.get(month_int, 4)
+
+        if "geschäftsjahr" in header_text.lower():
+            return f"FY {year}", "fiscal_year", period_end
+        else:
+            return f"Q{quarter} {year}", "quarter", period_end
+
+    return "", "unknown", None
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class _SoupDocument:
+    """BeautifulSoup-Backend (voller Baum oder per SoupStrainer auf Tabellen beschränkt)."""
+
+    def __init__(self, html: str, strainer: bool):
+        if strainer:
+            self.soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('table'))
+        else:
+            self.soup = BeautifulSoup(html, 'html.parser')
+
+    def tables(self):
+        return self.soup.find_all('table')
+
+    @staticmethod
+    def rows(table):
+        return table.find_all('tr')
+
+    @staticmethod
+    def cells(row, tags=('td',)):
+        return row.find_all(list(tags))
+
+    @staticmethod
+    def text(element) -> str:
+        return element.get_text(strip=True)
+
+
+class _LxmlDocument:
+    """lxml-Backend: Text wie get_text(strip=True), ohne Kommentare und Script/Style."""
+
+    if LXML_AVAILABLE:
+        _TEXT = etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+    def __init__(self, html: str):
+        self.root = None
+        if html and html.strip():
+            try:
+                self.root = lxml.html.fromstring(html)
+            except ValueError:
+                # Unicode-String mit XML-Encoding-Deklaration
+                self.root = lxml.html.fromstring(html.encode('utf-8'))
+            except etree.ParserError:
+                self.root = None
+
+    def tables(self):
+        return [] if self.root is None else list(self.root.iter('table'))
+
+    @staticmethod
+    def rows(table):
+        return list(table.iter('tr'))
+
+    @staticmethod
+    def cells(row, tags=('td',)):
+        return list(row.iter(*tags))
+
+    @classmethod
+    def text(cls, element) -> str:
+        return ''.join(s.strip() for s in cls._TEXT(element))
+
+
+def _document(html: str, backend: str | None):
+    backend = backend or DEFAULT_BACKEND
+    if backend == "lxml":
+        if not LXML_AVAILABLE:
+            raise ValueError("lxml ist nicht installiert")
+        return _LxmlDocument(html)
+    if backend in ("strainer", "bs"):
+        return _SoupDocument(html, strainer=(backend == "strainer"))
+    raise ValueError(f"Unbekanntes Parser-Backend: {backend}")
+
+
+# =============================================================================
+# TERMINE
+# =============================================================================
+
+def parse_termine(html: str, isin: str, backend: str = None) -> list[dict]:
+    """Termine-Seite → Liste von earnings_calendar-Datensätzen."""
+    doc = _document(html, backend)
+    termine = []
+
+    for table in doc.tables():
+        for row in doc.rows(table):
+            cells = doc.cells(row)
+            if len(cells) >= 4:
+                terminart = doc.text(cells[0])
+                eps_text = doc.text(cells[1])
+                info = doc.text(cells[2])
+                datum_text = doc.text(cells[3])
+
+                if not terminart or not datum_text:
+                    continue
+
+                event_type = "earnings"
+                if "hauptversammlung" in terminart.lower():
+                    event_type = "hauptversammlung"
+                elif "dividende" in terminart.lower():
+                    event_type = "dividende"
+
+                period, _ = extract_period_info(info)
+                is_estimated = "(e)*" in datum_text or "(e)" in datum_text
+                release_date = parse_german_date(datum_text)
+                eps_value = parse_german_number(eps_text)
+                eps_currency = extract_currency(eps_text)
+
+                termine.append({
+                    "isin": isin,
+                    "period": period,
+                    "release_date": release_date,
+                    "event_type": event_type,
+                    "eps_estimate": eps_value,
+                    "eps_currency": eps_currency,
+                    "is_estimated": is_estimated,
+                })
+
+    return termine
+
+
+# =============================================================================
+# SCHÄTZUNGEN
+# =============================================================================
+
+def parse_schaetzungen(html: str, isin: str, backend: str = None) -> list[dict]:
+    """Schätzungen-Seite → Liste von analyst_estimates-Datensätzen."""
+    doc = _document(html, backend)
+    estimates = []
+
+    for table in doc.tables():
+        rows = doc.rows(table)
+        if len(rows) < 2:
+            continue
+
+        # Headers aus erster Zeile
+        headers = [doc.text(cell) for cell in doc.cells(rows[0], ('th', 'td'))]
+
+        if not headers or not any(re.search(r'\d{4}', h) for h in headers):
+            continue
+
+        # Perioden aus Headers
+        periods = [parse_period_from_header(h) for h in headers[1:]]
+
+        # Tabellentyp erkennen
+        row_texts = [doc.text(row).lower() for row in rows[1:4]]
+        is_quarterly = any("anzahl" in t and "analyst" in t for t in row_texts)
+        is_annual = any(identify_metric(t) for t in row_texts)
+
+        if is_quarterly:
+            estimates.extend(_parse_quarterly_table(doc, rows, periods, isin))
+        elif is_annual:
+            estimates.extend(_parse_annual_table(doc, rows, periods, isin))
+
+    return estimates
+
+
+def _parse_quarterly_table(doc, rows, periods, isin: str) -> list[dict]:
+    """Parst Quartalsschätzungen."""
+    estimates = []
+    num_analysts = {}
+    estimate_values = {}
+    prior_year_values = {}
+    actual_values = {}
+    currency = None
+    metric = "eps"
+
+    for row in rows[1:]:
+        cells = doc.cells(row)
+        if len(cells) < 2:
+            continue
+
+        label = doc.text(cells[0]).lower()
+
+        if "umsatz" in label:
+            metric = "revenue"
+
+        values = [doc.text(c) for c in cells[1:]]
+
+        if "anzahl" in label and "analyst" in label:
+            for i, val in enumerate(values):
+                if i < len(periods):
+                    num_analysts[i] = parse_german_number(val)
+
+        elif "mittlere schätzung" in label:
+            for i, val in enumerate(values):
+                if i < len(periods):
+                    estimate_values[i] = parse_german_number(val)
+                    if not currency:
+                        currency = extract_currency(val)
+
+        elif "vorjahr" in label:
+            for i, val in enumerate(values):
+                if i < len(periods):
+                    prior_year_values[i] = parse_german_number(val)
+
+        elif "tatsächlicher wert" in label:
+            for i, val in enumerate(values):
+                if i < len(periods):
+                    actual_values[i] = parse_german_number(val)
+
+    for i, (period, period_type, period_end) in enumerate(periods):
+        if not period:
+            continue
+        if i in estimate_values and estimate_values[i] is not None:
+            estimates.append({
+                "isin": isin,
+                "period": period,
+                "period_type": period_type,
+                "period_end_date": period_end,
+                "metric": metric,
+                "estimate_value": estimate_values.get(i),
+                "prior_year_value": prior_year_values.get(i),
+                "actual_value": actual_values.get(i),
+                "currency": currency,
+                "unit": "per_share" if metric == "eps" else "millions",
+                "num_analysts": int(num_analysts[i]) if num_analysts.get(i) else None,
+                "release_date": None,
+            })
+
+    return estimates
+
+
+def _parse_annual_table(doc, rows, periods, isin: str) -> list[dict]:
+    """Parst Geschäftsjahresschätzungen."""
+    estimates = []
+
+    for row in rows[1:]:
+        cells = doc.cells(row)
+        if len(cells) < 2:
+            continue
+
+        label = doc.text(cells[0])
+        metric_info = identify_metric(label)
+        if not metric_info:
+            continue
+
+        metric, unit = metric_info
+        currency = None
+        values = [doc.text(c) for c in cells[1:]]
+
+        for i, val in enumerate(values):
+            if i >= len(periods):
+                break
+
+            period, period_type, period_end = periods[i]
+            if not period:
+                continue
+
+            value = parse_german_number(val)
+            if value is None:
+                continue
+
+            if not currency:
+                currency = extract_currency(val) or "EUR"
+
+            estimates.append({
+                "isin": isin,
+                "period": period,
+                "period_type": period_type,
+                "period_end_date": period_end,
+                "metric": metric,
+                "estimate_value": value,
+                "prior_year_value": None,
+                "actual_value": None,
+                "currency": currency,
+                "unit": unit,
+                "num_analysts": None,
+                "release_date": None,
+            })
+
+    return estimates
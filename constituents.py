@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Neu aufgenommene ISINs aus dem Constituent-Sync für die Nachlader.
+
+00_tickerlist/05_sync_constituents.py schreibt nach jedem Abgleich die ISINs,
+die bisher in keinem Index standen, nach NEW_ISINS_FILE (eine ISIN pro Zeile).
+Die Loader für Kurse, FMP-Fundamentaldaten und company_info lesen sie per
+--isins-file und laden dann nur diese ISINs statt der ganzen tickerlist
+(run_pipeline.sh 0 bzw. new).
+
+Verzeichnis per Umgebungsvariable CONSTITUENT_DELTA_DIR, Default: <projekt>/data/constituents
+"""
+
+import os
+from pathlib import Path
+
+CONSTITUENT_DELTA_DIR = Path(os.getenv(
+    "CONSTITUENT_DELTA_DIR", Path(__file__).parent / "data" / "constituents"
+))
+NEW_ISINS_FILE = CONSTITUENT_DELTA_DIR / "new_isins.txt"
+
+
+def read_isins_file(path=None) -> set[str]:
+    """ISINs aus einer Datei (eine pro Zeile, Leerzeilen und #-Kommentare werden ignoriert)."""
+    path = Path(path or NEW_ISINS_FILE)
+    isins = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            isins.add(line)
+    return isins
+
+
+def add_isins_argument(parser):
+    """--isins-file [DATEI] für die Loader-CLIs (ohne Wert: NEW_ISINS_FILE)."""
+    parser.add_argument("--isins-file", type=Path, nargs="?", const=NEW_ISINS_FILE,
+                        help=f"Nur ISINs aus dieser Datei laden (Standard: {NEW_ISINS_FILE})")
+
+
+def isins_from_args(args):
+    """Returns Menge der ISINs aus --isins-file oder None (= ganze tickerlist)."""
+    if args.isins_file is None:
+        return None
+    isins = read_isins_file(args.isins_file)
+    print(f"📋 {len(isins)} ISINs aus {args.isins_file}")
+    return isins
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generationszähler für veröffentlichte Daten (HTTP-Caching der Website).
+
+Jede Generation ist eine kleine Datei unter DATA_GENERATION_DIR mit einem
+Zähler. Die Pipeline erhöht die globale Generation ("data"), sobald sie
+live_metrics, calcu_numbers & Co. geschrieben hat; die Website erhöht
+"user-<id>", wenn ein User eigene Daten (DCF-Szenarien, Spalten) ändert.
+
+Die Website bildet daraus ETags und beantwortet If-None-Match ohne
+Datenbankzugriff: read_generation() kostet ein stat(), gelesen wird die
+Datei nur, wenn sie sich geändert hat. Da alle Prozesse dieselben Dateien
+sehen, gilt das auch für mehrere Worker.
+
+Verzeichnis per Umgebungsvariable DATA_GENERATION_DIR, Default: <projekt>/data/generation
+
+Aufruf:
+    python data_generation.py                    # aktuelle Generation anzeigen
+    python data_generation.py bump               # globale Generation erhöhen
+"""
+
+import os
+import fcntl
+import threading
+from pathlib import Path
+
+DATA_GENERATION_DIR = Path(os.getenv(
+    "DATA_GENERATION_DIR", Path(__file__).parent / "data" / "generation"
+))
+
+DATA = "data"       # globale Generation der Pipeline-Daten
+
+_cache = {}         # Pfad → ((inode, mtime_ns, size), Generation)
+_cache_lock = threading.Lock()
+
+
+def user_key(user_id) -> str:
+    """Name der Generation für die eigenen Daten eines Users."""
+    return f"user-{int(user_id)}"
+
+
+def _path(name: str, base_dir=None) -> Path:
+    return Path(base_dir or DATA_GENERATION_DIR) / name
+
+
+def _read(path: Path) -> int:
+    try:
+        return int(path.read_text(encoding="utf-8").strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def read_generation(name: str = DATA, base_dir=None) -> int:
+    """Aktuelle Generation (0, solange noch nie erhöht)."""
+    path = _path(name, base_dir)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return 0
+
+    # os.replace legt jedes Mal eine neue Datei (neue Inode) an
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+
+    generation = _read(path)
+    with _cache_lock:
+        _cache[path] = (key, generation)
+    return generation
+
+
+def bump_generation(name: str = DATA, base_dir=None) -> int:
+    """
+    Erhöht die Generation um 1 und gibt den neuen Wert zurück.
+    Prozessübergreifend gesperrt (flock), geschrieben wird atomar per os.replace.
+    """
+    path = _path(name, base_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path.with_name(f"{name}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        generation = _read(path) + 1
+        tmp = path.with_name(f"{name}.tmp")
+        tmp.write_text(f"{generation}\n", encoding="utf-8")
+        os.replace(tmp, path)
+    return generation
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Daten-Generation anzeigen oder erhöhen")
+    parser.add_argument("action", nargs="?", choices=["show", "bump"], default="show")
+    parser.add_argument("--name", default=DATA, help="Name der Generation (Default: data)")
+    args = parser.parse_args()
+
+    if args.action == "bump":
+        print(f"✅ Generation '{args.name}' → {bump_generation(args.name)}")
+    else:
+        print(f"Generation '{args.name}': {read_generation(args.name)} ({_path(args.name)})")
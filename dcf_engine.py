@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DCF-Engine: vektorisierte Discounted-Cash-Flow-Bewertung mit NumPy.
+
+Wird von der Website (dcf-calculate, Szenario-Bewertung) und vom
+Pipeline-Schritt für das universumweite DCF-Screening genutzt.
+
+Konventionen:
+- Annahmen kommen wie in API/DB in Prozent (z. B. wacc=9.0) und werden
+  intern in Dezimalwerte umgerechnet.
+- Alle Funktionen arbeiten auf N Szenarien gleichzeitig (Achse 0 = Szenario).
+  Basisdaten (Revenue, Net Debt, Shares) können Skalare oder Arrays der
+  Länge N sein – so lassen sich sowohl viele Szenarien einer Aktie als auch
+  ein Szenario über viele Aktien in einem Durchlauf rechnen.
+- Ungültige Werte (WACC <= Terminal Growth, keine Aktienanzahl) werden als NaN
+  geliefert, nicht als Exception.
+"""
+
+import numpy as np
+
+FORECAST_YEARS = 10
+YEARS = np.arange(1, FORECAST_YEARS + 1)
+
+GROWTH_KEYS = [f"revenue_growth_y{i}" for i in range(1, FORECAST_YEARS + 1)]
+
+# Fallback-Annahmen, falls ein Wert im Request/Szenario fehlt
+DEFAULT_ASSUMPTIONS = {
+    "revenue_growth_y1": 8.0,
+    "revenue_growth_y2": 7.0,
+    "revenue_growth_y3": 6.0,
+    "revenue_growth_y4": 5.0,
+    "revenue_growth_y5": 4.0,
+    "revenue_growth_y6": 3.5,
+    "revenue_growth_y7": 3.0,
+    "revenue_growth_y8": 2.5,
+    "revenue_growth_y9": 2.0,
+    "revenue_growth_y10": 2.0,
+    "ebit_margin": 15.0,
+    "tax_rate": 25.0,
+    "capex_percent": 3.0,
+    "wc_change_percent": 0.0,
+    "depreciation_percent": 3.0,
+    "terminal_growth": 2.0,
+    "wacc": 9.0,
+}
+
+ASSUMPTION_KEYS = list(DEFAULT_ASSUMPTIONS.keys())
+
+# Abklingende Wachstumsrate für Default-Annahmen (Faktor auf historischen CAGR)
+GROWTH_DECAY = np.array([1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.35, 0.3, 0.25])
+
+# Fallback-Wachstum, wenn kein historischer CAGR vorliegt
+DEFAULT_GROWTH = 5.0
+
+PROJECTION_FIELDS = [
+    "revenue", "ebit", "depreciation", "nopat", "capex",
+    "wc_change", "fcf", "discount_factor", "pv_fcf",
+]
+
+
+# =============================================================================
+# Annahmen
+# =============================================================================
+
+def default_assumptions_batch(revenue_cagr_5y, revenue_cagr_3y, ebit_margin):
+    """
+    Default-Annahmen für N Aktien aus historischen Werten (Prozent).
+
+    Wachstum: CAGR 5J, sonst CAGR 3J, sonst 5 % – abklingend über 10 Jahre.
+    Fehlende Werte als None/NaN; 0 zählt wie bisher als "nicht vorhanden".
+    Gibt ein Dict {key: Array (N,)} in Prozent zurück.
+    """
+    cagr_5y = _as_float_array(revenue_cagr_5y)
+    cagr_3y = _as_float_array(revenue_cagr_3y)
+    margin = _as_float_array(ebit_margin)
+
+    growth = np.where(_is_missing(cagr_5y), cagr_3y, cagr_5y)
+    growth = np.where(_is_missing(growth), DEFAULT_GROWTH, growth)
+    margin = np.where(np.isnan(margin), DEFAULT_ASSUMPTIONS["ebit_margin"], margin)
+
+    n = max(len(growth), len(margin))
+    growth = np.broadcast_to(growth, (n,))
+    margin = np.broadcast_to(margin, (n,))
+
+    result = {}
+    for key, decay in zip(GROWTH_KEYS, GROWTH_DECAY):
+        result[key] = np.round(growth * decay, 1)
+    result["ebit_margin"] = np.round(margin, 1)
+    for key in ASSUMPTION_KEYS:
+        if key not in result:
+            result[key] = np.full(n, DEFAULT_ASSUMPTIONS[key])
+    return result
+
+
+def default_assumptions(revenue_cagr_5y=None, revenue_cagr_3y=None, ebit_margin=None):
+    """Default-Annahmen für eine einzelne Aktie als Dict (Prozent, gerundet)."""
+    batch = default_assumptions_batch([revenue_cagr_5y], [revenue_cagr_3y], [ebit_margin])
+    return {key: float(batch[key][0]) for key in ASSUMPTION_KEYS}
+
+
+def assumptions_to_arrays(scenarios):
+    """
+    Liste von Annahmen-Dicts (Prozent, z. B. Request-JSON oder DB-Zeilen)
+    in Dezimal-Arrays umwandeln.
+
+    Fehlende oder NULL-Werte werden mit DEFAULT_ASSUMPTIONS aufgefüllt.
+    Ergebnis: {'growth': (N, 10), 'ebit_margin': (N,), ..., 'wacc': (N,)}
+    """
+    columns = {}
+    for key in ASSUMPTION_KEYS:
+        default = DEFAULT_ASSUMPTIONS[key]
+        values = [s.get(key) for s in scenarios]
+        columns[key] = np.array(
+            [default if v is None else float(v) for v in values], dtype=float
+        ) / 100
+
+    arrays = {"growth": np.stack([columns.pop(k) for k in GROWTH_KEYS], axis=1)}
+    arrays.update(columns)
+    return arrays
+
+
+def batch_to_arrays(batch):
+    """Spalten-Dict aus default_assumptions_batch() in Dezimal-Arrays umwandeln."""
+    arrays = {"growth": np.stack([np.asarray(batch[k], dtype=float) for k in GROWTH_KEYS], axis=1) / 100}
+    for key in ASSUMPTION_KEYS:
+        if key not in GROWTH_KEYS:
+            arrays[key] = np.asarray(batch[key], dtype=float) / 100
+    return arrays
+
+
+# =============================================================================
+# Bewertung
+# =============================================================================
+
+def evaluate(base_revenue, net_debt, shares_outstanding, assumptions):
+    """
+    10-Jahres-Prognose, Terminal Value und Fair Value für N Szenarien.
+
+    Args:
+        base_revenue: Umsatz des letzten FY (Skalar oder (N,))
+        net_debt: Nettoverschuldung (Skalar oder (N,)), NaN zählt als 0
+        shares_outstanding: Aktienanzahl (Skalar oder (N,))
+        assumptions: Ergebnis von assumptions_to_arrays()/batch_to_arrays()
+
+    Returns:
+        Dict mit (N, 10)-Arrays für die Prognosefelder (PROJECTION_FIELDS)
+        und (N,)-Arrays für terminal_value, terminal_pv, sum_pv_fcf,
+        enterprise_value, equity_value, fair_value.
+    """
+    growth = assumptions["growth"]
+    n = growth.shape[0]
+
+    base = np.broadcast_to(_as_float_array(base_revenue), (n,))
+    debt = np.nan_to_num(np.broadcast_to(_as_float_array(net_debt), (n,)))
+    shares = np.broadcast_to(_as_float_array(shares_outstanding), (n,))
+
+    ebit_margin = assumptions["ebit_margin"][:, None]
+    tax_rate = assumptions["tax_rate"][:, None]
+    capex_percent = assumptions["capex_percent"][:, None]
+    wc_change_percent = assumptions["wc_change_percent"][:, None]
+    depreciation_percent = assumptions["depreciation_percent"][:, None]
+    terminal_growth = assumptions["terminal_growth"]
+    wacc = assumptions["wacc"]
+
+    # Prognose: Umsatzpfad als kumuliertes Produkt der Wachstumsraten
+    revenue = base[:, None] * np.cumprod(1 + growth, axis=1)
+    previous_revenue = np.concatenate([base[:, None], revenue[:, :-1]], axis=1)
+
+    ebit = revenue * ebit_margin
+    depreciation = revenue * depreciation_percent
+    nopat = ebit * (1 - tax_rate)
+    capex = revenue * capex_percent
+    wc_change = (revenue - previous_revenue) * wc_change_percent
+    fcf = nopat + depreciation - capex - wc_change
+    discount_factor = (1 + wacc)[:, None] ** -YEARS[None, :]
+    pv_fcf = fcf * discount_factor
+
+    # Terminal Value (nach Jahr 10), nur gültig wenn WACC > Terminal Growth
+    spread = wacc - terminal_growth
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(
+            spread > 0, fcf[:, -1] * (1 + terminal_growth) / spread, np.nan
+        )
+        terminal_pv = terminal_value * discount_factor[:, -1]
+
+        sum_pv_fcf = pv_fcf.sum(axis=1)
+        enterprise_value = sum_pv_fcf + terminal_pv
+        equity_value = enterprise_value - debt
+        fair_value = np.where(shares > 0, equity_value / shares, np.nan)
+
+    return {
+        "revenue": revenue,
+        "ebit": ebit,
+        "depreciation": depreciation,
+        "nopat": nopat,
+        "capex": capex,
+        "wc_change": wc_change,
+        "fcf": fcf,
+        "discount_factor": discount_factor,
+        "pv_fcf": pv_fcf,
+        "terminal_value": terminal_value,
+        "terminal_pv": terminal_pv,
+        "sum_pv_fcf": sum_pv_fcf,
+        "enterprise_value": enterprise_value,
+        "net_debt": debt,
+        "equity_value": equity_value,
+        "shares_outstanding": shares,
+        "fair_value": fair_value,
+    }
+
+
+def upside(fair_value, price):
+    """Upside/Downside in Prozent; NaN wenn kein positiver Kurs vorliegt."""
+    fair_value = _as_float_array(fair_value)
+    price = _as_float_array(price)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(price > 0, (fair_value / price - 1) * 100, np.nan)
+
+
+def sensitivity_axis(center, step, count):
+    """
+    Symmetrische Achse um center (Dezimal): count Werte im Abstand step.
+
+    center als Skalar → (count,), als (N,) → (N, count).
+    """
+    offsets = (np.arange(count) - (count - 1) / 2) * step
+    center = np.asarray(center, dtype=float)
+    return center[..., None] + offsets
+
+
+def sensitivity_grid(fcf, net_debt, shares_outstanding, wacc_values, tgr_values):
+    """
+    Fair Value je Aktie über das Raster WACC x Terminal Growth.
+
+    Die FCF-Prognose bleibt fix, nur Diskontierung und Terminal Value werden
+    für jede Rasterzelle neu bewertet – komplett als Array-Operation.
+
+    Args:
+        fcf: (10,) oder (N, 10) Free Cash Flows aus evaluate()
+        net_debt, shares_outstanding: Skalar oder (N,)
+        wacc_values: (W,) oder (N, W), Dezimal
+        tgr_values: (T,) oder (N, T), Dezimal
+
+    Returns:
+        (W, T) bei eindimensionalem fcf, sonst (N, W, T).
+        NaN wo WACC <= Terminal Growth.
+    """
+    single = np.ndim(fcf) == 1
+    fcf = np.atleast_2d(np.asarray(fcf, dtype=float))
+    n = fcf.shape[0]
+
+    wacc_values = np.asarray(wacc_values, dtype=float)
+    tgr_values = np.asarray(tgr_values, dtype=float)
+    w = np.broadcast_to(np.atleast_2d(wacc_values), (n, wacc_values.shape[-1]))
+    tg = np.broadcast_to(np.atleast_2d(tgr_values), (n, tgr_values.shape[-1]))
+    debt = np.nan_to_num(np.broadcast_to(_as_float_array(net_debt), (n,)))
+    shares = np.broadcast_to(_as_float_array(shares_outstanding), (n,))
+
+    discount = (1 + w)[:, :, None] ** -YEARS[None, None, :]      # (N, W, 10)
+    pv_sum = np.einsum("nk,nwk->nw", fcf, discount)               # (N, W)
+    spread = w[:, :, None] - tg[:, None, :]                       # (N, W, T)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tv = fcf[:, -1, None, None] * (1 + tg)[:, None, :] / spread
+        tv_pv = tv * discount[:, :, -1, None]
+        equity = pv_sum[:, :, None] + tv_pv - debt[:, None, None]
+        grid = equity / shares[:, None, None]
+
+    grid = np.where((spread > 0) & (shares[:, None, None] > 0), grid, np.nan)
+    return grid[0] if single else grid
+
+
+# =============================================================================
+# Hilfsfunktionen
+# =============================================================================
+
+def projection_rows(result, index=0):
+    """Prognose eines Szenarios als Liste von Dicts (Format der API)."""
+    rows = []
+    for i, year in enumerate(YEARS):
+        row = {"year": int(year)}
+        for field in PROJECTION_FIELDS:
+            row[field] = float(result[field][index, i])
+        rows.append(row)
+    return rows
+
+
+def to_python(value, decimals=None):
+    """NumPy-Wert/Array → float/None bzw. Liste (NaN/inf → None) für JSON und DB."""
+    array = np.asarray(value, dtype=float)
+    if array.ndim > 0:
+        return [to_python(v, decimals) for v in array]
+    if not np.isfinite(array):
+        return None
+    number = float(array)
+    return round(number, decimals) if decimals is not None else number
+
+
+def _as_float_array(value):
+    """Skalar/Liste (mit None) → 1D-Float-Array, None → NaN."""
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return np.atleast_1d(value.astype(float))
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if np.isscalar(value) or value is None:
+        value = [value]
+    return np.array([np.nan if v is None else v for v in value], dtype=float)
+
+
+def _is_missing(values):
+    """NaN oder 0 gilt als fehlend (entspricht `x or fallback`)."""
+    return np.isnan(values) | (values == 0)
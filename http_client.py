@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemeinsamer HTTP-Client für alle Loader und Scraper.
+
+- Eine Session für alle Threads, Keep-Alive-Pool pro Domain, Poolgröße =
+  Anzahl Worker (pool_block → keine "Connection pool is full"-Verwerfungen)
+- Einheitliche Retry-Policy: Verbindungsfehler und RETRY_STATUS werden mit
+  exponentiellem Backoff + Jitter wiederholt, Retry-After wird beachtet,
+  429 bremst die ganze Domain (nicht nur den Thread)
+- Optionales Rate-Limit pro Domain (Token Bucket, mit Burst und Jitter)
+- Optional HTTP/2 über httpx (pip install "httpx[http2]"), sonst requests
+- gzip/deflate immer, brotli wenn das Paket brotli installiert ist
+- Statistik pro Domain: Requests, Fehler, Retries, 429, Latenz (Ø/p50/p95)
+
+Verwendung:
+    from http_client import HttpClient, REQUEST_ERRORS
+
+    HTTP = HttpClient(pool_size=MAX_WORKERS, rate=10)
+    r = HTTP.get(url, params={...})
+    data = HTTP.get_json(url, params={...})      # None nach Fehlern
+    HTTP.print_stats()
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx braucht h2 für http2=True)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401  (urllib3/httpx dekodieren "br" automatisch)
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# KONFIGURATION
+# =============================================================================
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0          # Sekunden, verdoppelt je Versuch
+RETRY_STATUS = {429, 500, 502, 503, 504}
+LATENCY_WINDOW = 2000          # letzte n Latenzen je Domain für p50/p95
+
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+# Fehler, die ein Aufrufer abfangen sollte (requests bzw. httpx)
+REQUEST_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+
+# =============================================================================
+# Rate-Limit
+# =============================================================================
+
+class TokenBucket:
+    """
+    Thread-sicherer Token Bucket: im Mittel `rate` Requests/Sekunde,
+    höchstens `burst` am Stück. pause() sperrt den Bucket (z. B. nach 429).
+    """
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.paused_until:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        # Jitter verschiebt nur den Zeitpunkt, nicht das Budget
+                        wait = random.uniform(0, self.jitter / self.rate) if self.jitter else 0
+                        break
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.paused_until - now
+            time.sleep(wait)
+        if wait:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.updated = max(self.updated, self.paused_until)
+
+
+class _NoLimit:
+    def acquire(self):
+        pass
+
+    def pause(self, seconds: float):
+        pass
+
+
+# =============================================================================
+# Statistik
+# =============================================================================
+
+class DomainStats:
+    """Zähler + Latenzfenster einer Domain."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.total_time = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+
+        def pct(p):
+            return lat[min(len(lat) - 1, int(p * len(lat)))] * 1000 if lat else 0.0
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "avg_ms": self.total_time / self.requests * 1000 if self.requests else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+class HttpClient:
+    """
+    Thread-sicherer HTTP-Client mit Pool, Retry, Rate-Limit und Statistik pro Domain.
+
+    rate/burst/jitter gelten je Domain (None = kein Limit); set_rate()
+    überschreibt sie für einzelne Domains.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, retry_status=RETRY_STATUS,
+                 timeout: float = DEFAULT_TIMEOUT, headers: dict = None,
+                 rate: float = None, burst: int = 1, jitter: float = 0.0, http2: bool = False):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.retry_status = set(retry_status)
+        self.timeout = timeout
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 angefordert, aber httpx[http2] fehlt – nutze HTTP/1.1 (requests)")
+
+        default_headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        default_headers.update(headers or {})
+
+        if self.http2:
+            # HTTP/2 multiplext Requests, wenige Verbindungen je Domain reichen
+            self._client = httpx.Client(
+                http2=True,
+                headers=default_headers,
+                timeout=timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            )
+        else:
+            session = requests.Session()
+            session.headers.update(default_headers)
+            # Ein Pool je Domain (pool_connections = Anzahl gemerkter Domains),
+            # jeweils pool_size Verbindungen; pool_block wartet statt zu verwerfen
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size, pool_block=True)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._client = session
+
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+
+    def set_rate(self, host: str, rate: float = None, burst: int = 1, jitter: float = 0.0):
+        """Eigenes Limit für eine Domain (rate None = unbegrenzt)."""
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, burst, jitter) if rate else _NoLimit()
+
+    def _domain(self, host: str):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = (
+                    TokenBucket(self.rate, self.burst, self.jitter) if self.rate else _NoLimit()
+                )
+            if host not in self._stats:
+                self._stats[host] = DomainStats()
+            return self._buckets[host], self._stats[host]
+
+    def _record(self, stats: DomainStats, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                setattr(stats, key, getattr(stats, key) + value)
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Request mit Rate-Limit und Retry.
+
+        Nach max_retries wird die letzte Response zurückgegeben bzw. der
+        letzte Verbindungsfehler geworfen (siehe REQUEST_ERRORS).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if self.http2 and "allow_redirects" in kwargs:
+            kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+
+        host = urlparse(url).hostname or ""
+        bucket, stats = self._domain(host)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            start = time.perf_counter()
+            try:
+                r = self._client.request(method, url, **kwargs)
+                error = None
+            except REQUEST_ERRORS as e:
+                r, error = None, e
+
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats.requests += 1
+                stats.total_time += elapsed
+                stats.latencies.append(elapsed)
+                if error is not None or r.status_code >= 400:
+                    stats.errors += 1
+
+            if r is not None and (r.status_code not in self.retry_status or attempt == self.max_retries):
+                return r
+            if error is not None and attempt == self.max_retries:
+                raise error
+
+            delay = self.backoff * 2 ** attempt
+            if r is not None:
+                retry_after = r.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                if r.status_code == 429:
+                    # Ganze Domain bremsen, nicht nur diesen Thread
+                    self._record(stats, throttled=1)
+                    bucket.pause(delay)
+
+            logger.debug(f"{host}: Versuch {attempt + 1} fehlgeschlagen "
+                         f"({error or r.status_code}), warte {delay:.1f}s")
+            self._record(stats, retries=1)
+            time.sleep(delay + random.uniform(0, self.backoff))
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def get_json(self, url: str, **kwargs):
+        """GET + raise_for_status + JSON. Returns None bei Fehler (wird geloggt)."""
+        try:
+            r = self.get(url, **kwargs)
+            r.raise_for_status()
+            return r.json()
+        except REQUEST_ERRORS + (ValueError,) as e:
+            logger.error(f"HTTP Fehler {urlparse(url).hostname}: {e}")
+            return None
+
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Returns {domain: {requests, errors, retries, throttled, avg_ms, p50_ms, p95_ms}}."""
+        with self._lock:
+            return {host: s.summary() for host, s in self._stats.items()}
+
+    def totals(self) -> dict:
+        """Summen über alle Domains (requests, errors, retries, throttled)."""
+        totals = {"requests": 0, "errors": 0, "retries": 0, "throttled": 0}
+        for s in self.stats().values():
+            for key in totals:
+                totals[key] += s[key]
+        return totals
+
+    def print_stats(self):
+        stats = self.stats()
+        if not stats:
+            return
+        print(f"\nHTTP ({'HTTP/2' if self.http2 else 'HTTP/1.1'}, {ACCEPT_ENCODING}):")
+        print(f"  {'Domain':<38}{'Req':>7}{'Fehler':>8}{'Retry':>7}{'429':>5}"
+              f"{'Ø ms':>8}{'p50':>7}{'p95':>7}")
+        for host, s in sorted(stats.items(), key=lambda x: -x[1]["requests"]):
+            print(f"  {host[:37]:<38}{s['requests']:>7}{s['errors']:>8}{s['retries']:>7}"
+                  f"{s['throttled']:>5}{s['avg_ms']:>8.0f}{s['p50_ms']:>7.0f}{s['p95_ms']:>7.0f}")
+
+    def close(self):
+        self._client.close()
@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index-Advisor für die heißen Queries von Website und Pipeline.
+
+Ablauf:
+1. Queries sammeln
+   - Katalog HOT_QUERIES (aus app.py – _load_stock_rows, _load_dcf_base,
+     get_column_config – und 02_load_live_metrics.py; WHERE/ORDER/Fenster wie
+     im Code, lange Spaltenlisten gekürzt)
+   - Screener-Filter je numerischer Spalte (aus user_column_settings)
+   - Optional (--digest): tatsächlich ausgeführte Statements aus
+     performance_schema.events_statements_summary_by_digest
+2. Jede Query mit EXPLAIN ANALYZE messen (Median über --repeat Läufe)
+   und Full Scans / Filesorts melden
+3. Optional (--evaluate): Kandidaten-Indizes einzeln anlegen, erneut messen,
+   wieder entfernen. Übernommen wird nur, was messbar schneller ist.
+4. Optional (--write-migration): idempotente Migration mit den
+   übernommenen Indizes schreiben
+
+ACHTUNG: --evaluate legt Indizes an und entfernt sie wieder → nur gegen eine
+lokale Kopie der Datenbank laufen lassen (Verbindung wie immer über .env,
+z. B. DB_HOST=127.0.0.1 DB_PORT=3307 python index_advisor.py --evaluate).
+
+Aufruf:
+    python index_advisor.py                        # nur Report
+    python index_advisor.py --digest               # + performance_schema
+    python index_advisor.py --evaluate --write-migration 03_analytics/06_add_query_indexes.py
+"""
+
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mysql.connector import Error
+from db import get_connection
+
+# Mindest-Speedup, ab dem ein Kandidat übernommen wird
+MIN_SPEEDUP = 1.2
+
+# Statements aus performance_schema (Top n nach Gesamtlaufzeit)
+DIGEST_LIMIT = 25
+DIGEST_SCHEMAS = ("analytics", "raw_data")
+
+# Screener: Schwelle je Spalte = dieses Quantil (selektiver Filter)
+SCREENER_QUANTILE = 0.9
+
+
+# =============================================================================
+# Query-Katalog
+# =============================================================================
+# Parameter (siehe sample_params): {isins} = Liste von SAMPLE_ISINS ISINs mit
+# den meisten FY-Zeilen (wie ein Batch aus /api/stocks bzw. der Watchlist),
+# %(fy_years)s / %(history_years)s wie DETAIL_INCOME_YEARS / DETAIL_HISTORY_YEARS.
+
+SAMPLE_ISINS = 20
+
+HOT_QUERIES = [
+    {
+        "name": "stock_rows.company",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT isin, ticker, company_name, sector, industry, country,
+                   currency, fiscal_year_end, stock_index, description
+            FROM analytics.company_info
+            WHERE isin IN ({isins})
+        """,
+    },
+    {
+        "name": "stock_rows.live",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT *
+            FROM analytics.live_metrics
+            WHERE isin IN ({isins})
+        """,
+    },
+    {
+        "name": "stock_rows.fy",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT isin, year, revenue, gross_profit, operating_income, net_income,
+                   free_cash_flow, net_debt, minority_interest, shares_outstanding
+            FROM (
+                SELECT isin, date, YEAR(date) as year, revenue, gross_profit,
+                       operating_income, net_income, free_cash_flow, net_debt,
+                       minority_interest, weighted_average_shs_out_dil as shares_outstanding,
+                       ROW_NUMBER() OVER (PARTITION BY isin ORDER BY date DESC) AS rn
+                FROM analytics.fmp_filtered_numbers
+                WHERE isin IN ({isins}) AND period = 'FY'
+            ) fy
+            WHERE rn <= %(fy_years)s
+            ORDER BY isin, date DESC
+        """,
+    },
+    {
+        "name": "stock_rows.periods",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT isin, period, date, net_income, revenue, gross_profit, operating_income
+            FROM analytics.fmp_filtered_numbers
+            WHERE isin IN ({isins}) AND period != 'FY'
+              AND date >= DATE_SUB(CURDATE(), INTERVAL 18 MONTH)
+            ORDER BY isin, date DESC
+        """,
+    },
+    {
+        "name": "stock_rows.history",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT isin, year, fy_pe, fy_ev_ebit
+            FROM (
+                SELECT isin, date, YEAR(date) as year, fy_pe, fy_ev_ebit,
+                       ROW_NUMBER() OVER (PARTITION BY isin, fy_pe IS NULL ORDER BY date DESC) AS pe_rn,
+                       ROW_NUMBER() OVER (PARTITION BY isin, fy_ev_ebit IS NULL ORDER BY date DESC) AS ev_rn
+                FROM analytics.calcu_numbers
+                WHERE isin IN ({isins}) AND period = 'FY'
+                  AND (fy_pe IS NOT NULL OR fy_ev_ebit IS NOT NULL)
+            ) h
+            WHERE (fy_pe IS NOT NULL AND pe_rn <= %(history_years)s)
+               OR (fy_ev_ebit IS NOT NULL AND ev_rn <= %(history_years)s)
+            ORDER BY isin, date DESC
+        """,
+    },
+    {
+        "name": "stock_rows.estimates",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT isin, period, metric, estimate_value, currency, unit
+            FROM analytics.analyst_estimates
+            WHERE isin IN ({isins})
+              AND metric IN ('revenue', 'ebit', 'free_cashflow')
+              AND period_type = 'fiscal_year'
+            ORDER BY isin, period ASC
+        """,
+    },
+    {
+        "name": "stock_rows.scenarios",
+        "source": "app.py _load_stock_rows",
+        "sql": """
+            SELECT isin, id, scenario_name, ebit_margin, wacc, terminal_growth,
+                   fair_value_per_share, created_at, updated_at
+            FROM analytics.user_dcf_scenarios
+            WHERE user_id = %(user_id)s AND isin IN ({isins})
+            ORDER BY isin, updated_at DESC
+        """,
+    },
+    {
+        "name": "dcf_scenarios.base",
+        "source": "app.py _load_dcf_base",
+        "sql": """
+            SELECT f.isin, f.revenue, f.net_debt,
+                   f.weighted_average_shs_out_dil as shares_outstanding
+            FROM analytics.fmp_filtered_numbers f
+            INNER JOIN (
+                SELECT isin, MAX(date) as max_date
+                FROM analytics.fmp_filtered_numbers
+                WHERE period = 'FY' AND isin IN ({isins})
+                GROUP BY isin
+            ) latest ON f.isin = latest.isin AND f.date = latest.max_date
+            WHERE f.period = 'FY'
+        """,
+    },
+    {
+        "name": "column_config",
+        "source": "app.py get_column_config",
+        "sql": """
+            SELECT column_key, source_table, display_name,
+                   sort_order, is_visible, column_group, format_type
+            FROM analytics.user_column_settings
+            WHERE view_name = 'screener' AND user_id = %(user_id)s
+            ORDER BY sort_order
+        """,
+    },
+    {
+        "name": "live_metrics.latest_calcu",
+        "source": "02_load_live_metrics.py",
+        "sql": """
+            SELECT c.isin, c.fy_pe, c.fy_ev_ebit
+            FROM analytics.calcu_numbers c
+            INNER JOIN (
+                SELECT isin, MAX(date) as max_date
+                FROM analytics.calcu_numbers
+                WHERE period = 'FY'
+                GROUP BY isin
+            ) latest ON c.isin = latest.isin AND c.date = latest.max_date
+            WHERE c.period = 'FY'
+        """,
+    },
+    {
+        "name": "live_metrics.latest_shares",
+        "source": "02_load_live_metrics.py",
+        "sql": """
+            SELECT f.isin, f.weighted_average_shs_out as shares_outstanding,
+                   f.net_debt, f.minority_interest
+            FROM analytics.fmp_filtered_numbers f
+            INNER JOIN (
+                SELECT isin, MAX(date) as max_date
+                FROM analytics.fmp_filtered_numbers
+                WHERE period = 'FY'
+                GROUP BY isin
+            ) latest ON f.isin = latest.isin AND f.date = latest.max_date
+            WHERE f.period = 'FY'
+        """,
+    },
+    {
+        "name": "live_metrics.ttm_periods",
+        "source": "02_load_live_metrics.py",
+        "sql": """
+            SELECT isin, date, period, net_income, operating_income
+            FROM analytics.fmp_filtered_numbers
+            WHERE period != 'FY'
+              AND date >= DATE_SUB(CURDATE(), INTERVAL 15 MONTH)
+            ORDER BY isin, date DESC
+        """,
+    },
+]
+
+SCREENER_SQL = """
+    SELECT ci.isin, ci.ticker, ci.company_name, lm.{column}
+    FROM analytics.company_info ci
+    LEFT JOIN analytics.user_watchlist uw ON (ci.isin = uw.isin AND uw.user_id = %(user_id)s)
+    LEFT JOIN analytics.live_metrics lm ON ci.isin = lm.isin
+    WHERE lm.{column} > %(threshold)s
+    ORDER BY (lm.{column} IS NULL), lm.{column} DESC, ci.isin DESC
+    LIMIT 101
+"""
+
+# (schema, tabelle, index_name, spalten)
+CANDIDATE_INDEXES = [
+    ("analytics", "fmp_filtered_numbers", "idx_isin_period_date", ("isin", "period", "date")),
+    ("analytics", "calcu_numbers", "idx_isin_period_date", ("isin", "period", "date")),
+    ("analytics", "fmp_filtered_numbers", "idx_period_isin_date", ("period", "isin", "date")),
+    ("analytics", "calcu_numbers", "idx_period_isin_date", ("period", "isin", "date")),
+]
+
+
+# =============================================================================
+# Queries sammeln
+# =============================================================================
+
+def sample_params(cur):
+    """
+    Realistische Parameter: die SAMPLE_ISINS ISINs mit den meisten FY-Zeilen
+    (isin_0 … isin_n, dazu "isin" = isin_0), kleinste User-ID.
+    """
+    cur.execute(f"""
+        SELECT isin
+        FROM analytics.fmp_filtered_numbers
+        WHERE period = 'FY'
+        GROUP BY isin
+        ORDER BY COUNT(*) DESC
+        LIMIT {SAMPLE_ISINS}
+    """)
+    isins = [row['isin'] for row in cur.fetchall()] or ['']
+
+    cur.execute("SELECT MIN(user_id) as user_id FROM analytics.user_column_settings")
+    row = cur.fetchone()
+    user_id = row['user_id'] if row and row['user_id'] is not None else 1
+
+    params = {f"isin_{i}": isin for i, isin in enumerate(isins)}
+    params.update(isin=isins[0], user_id=user_id, fy_years=10, history_years=20)
+    return params
+
+
+def catalog_queries(params):
+    """HOT_QUERIES mit eingesetzter ISIN-Liste ({isins} → %(isin_0)s, …)."""
+    isins = ", ".join(f"%(isin_{i})s" for i in range(sum(k.startswith("isin_") for k in params)))
+    return [{**q, "sql": q["sql"].replace("{isins}", isins), "params": params} for q in HOT_QUERIES]
+
+
+def screener_queries(cur, params):
+    """Ein Screener-Filter je numerischer live_metrics-Spalte, sortiert nach ihr (wie query_screener_page)."""
+    cur.execute("""
+        SELECT column_key
+        FROM analytics.user_column_settings
+        WHERE view_name = 'screener'
+          AND user_id = %s
+          AND source_table = 'live_metrics'
+          AND format_type IN ('number', 'percent', 'currency', 'billions')
+          AND column_key NOT IN ('isin', 'ticker', 'price_date')
+        ORDER BY sort_order
+    """, (params['user_id'],))
+    columns = [row['column_key'] for row in cur.fetchall()]
+
+    queries = []
+    for column in columns:
+        cur.execute(f"""
+            SELECT {column} as value
+            FROM analytics.live_metrics
+            WHERE {column} IS NOT NULL
+            ORDER BY {column}
+        """)
+        values = [row['value'] for row in cur.fetchall()]
+        if not values:
+            continue
+
+        queries.append({
+            "name": f"screener.{column}",
+            "source": "app.py query_screener_page",
+            "sql": SCREENER_SQL.format(column=column),
+            "params": {**params, "threshold": float(values[int(len(values) * SCREENER_QUANTILE)])},
+        })
+    return queries
+
+
+def digest_queries(cur):
+    """Top-Statements aus performance_schema (tatsächlich von App/Pipeline ausgeführt)."""
+    placeholders = ','.join(['%s'] * len(DIGEST_SCHEMAS))
+    cur.execute(f"""
+        SELECT SCHEMA_NAME as schema_name, DIGEST as digest, COUNT_STAR as calls,
+               SUM_TIMER_WAIT / 1e9 as total_ms, SUM_NO_INDEX_USED as no_index,
+               QUERY_SAMPLE_TEXT as sample
+        FROM performance_schema.events_statements_summary_by_digest
+        WHERE SCHEMA_NAME IN ({placeholders})
+          AND QUERY_SAMPLE_TEXT LIKE 'SELECT%%'
+        ORDER BY SUM_TIMER_WAIT DESC
+        LIMIT {DIGEST_LIMIT}
+    """, DIGEST_SCHEMAS)
+
+    queries = []
+    for row in cur.fetchall():
+        sample = row['sample'] or ''
+        # Abgeschnittene Samples (performance_schema_max_sql_text_length) sind nicht ausführbar
+        if sample.endswith('...'):
+            continue
+        queries.append({
+            "name": f"digest.{row['digest'][:12]}",
+            "source": f"performance_schema ({row['calls']} Aufrufe, "
+                      f"{float(row['total_ms']):.0f} ms, ohne Index: {row['no_index']})",
+            "sql": sample,
+            "schema": row['schema_name'],
+            "params": None,
+        })
+    return queries
+
+
+def referenced_tables(sql):
+    """Tabellennamen (ohne Schema) aus FROM/JOIN."""
+    return {m.group(1) for m in re.finditer(r"(?:FROM|JOIN)\s+(?:\w+\.)?(\w+)", sql, re.IGNORECASE)}
+
+
+# =============================================================================
+# Messen
+# =============================================================================
+
+def explain(cur, query):
+    """
+    EXPLAIN ANALYZE einer Query.
+
+    Returns Dict: time_ms (oberster Knoten), full_scans, filesorts, plan (Text)
+    """
+    if query.get("schema"):
+        cur.execute(f"USE {query['schema']}")
+
+    sql = "EXPLAIN ANALYZE " + query["sql"]
+    if query.get("params") is None:
+        cur.execute(sql)
+    else:
+        cur.execute(sql, query["params"])
+    plan = list(cur.fetchone().values())[0]
+
+    times = re.findall(r"actual time=[\d.]+\.\.([\d.]+)", plan)
+    return {
+        "time_ms": float(times[0]) if times else 0.0,
+        "full_scans": re.findall(r"-> (?:Table scan on (\w+)|Index scan on (\w+))", plan),
+        "filesorts": len(re.findall(r"-> Sort(?: row IDs)?:", plan)),
+        "plan": plan,
+    }
+
+
+def measure(cur, query, repeat):
+    """Misst eine Query repeat-mal (Median); None, wenn EXPLAIN fehlschlägt."""
+    results = []
+    for _ in range(repeat):
+        try:
+            results.append(explain(cur, query))
+        except Error as e:
+            print(f"   ⚠️  {query['name']}: {e}")
+            return None
+
+    result = results[-1]
+    result["time_ms"] = median(r["time_ms"] for r in results)
+    # Materialisierte Derived Tables (z. B. 'latest', 'fy') sind kein Full Scan einer Basistabelle
+    derived = set(re.findall(r"\)\s+(?:AS\s+)?(\w+)\s+(?:ON|WHERE)\b", query["sql"], re.IGNORECASE))
+    result["full_scans"] = sorted({
+        name for pair in result["full_scans"] for name in pair
+        if name and name not in derived
+    })
+    return result
+
+
+def report(queries, measurements):
+    """Übersicht: Laufzeit, Full Scans, Filesorts je Query."""
+    print(f"\n{'Query':<42} {'ms':>9}  {'Filesort':>8}  Full Scans")
+    print("-" * 90)
+    for query in sorted(queries, key=lambda q: -(measurements.get(q["name"]) or {}).get("time_ms", 0)):
+        m = measurements.get(query["name"])
+        if m is None:
+            continue
+        flag = "⚠️ " if m["full_scans"] or m["filesorts"] else "   "
+        print(f"{flag}{query['name']:<39} {m['time_ms']:>9.2f}  {m['filesorts']:>8}  "
+              f"{', '.join(m['full_scans']) or '-'}")
+
+
+# =============================================================================
+# Kandidaten bewerten
+# =============================================================================
+
+def index_exists(cur, schema, table, name):
+    cur.execute("""
+        SELECT COUNT(*) as cnt
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (schema, table, name))
+    return cur.fetchone()['cnt'] > 0
+
+
+def screener_candidates(queries):
+    """Einspaltige live_metrics-Indizes für jede gemessene Screener-Spalte."""
+    return [
+        ("analytics", "live_metrics", f"idx_{q['name'].split('.', 1)[1]}", (q['name'].split('.', 1)[1],))
+        for q in queries if q["name"].startswith("screener.")
+    ]
+
+
+def evaluate_candidates(cur, candidates, queries, measurements, repeat):
+    """
+    Legt jeden Kandidaten einzeln an, misst die betroffenen Queries erneut und
+    entfernt ihn wieder. Returns Liste der übernommenen Kandidaten als
+    (schema, tabelle, index_name, spalten, Messung).
+    """
+    accepted = []
+
+    for schema, table, name, columns in candidates:
+        label = f"{table}.{name} ({', '.join(columns)})"
+
+        if index_exists(cur, schema, table, name):
+            print(f"\n   ℹ {label} existiert bereits")
+            continue
+
+        affected = [
+            q for q in queries
+            if table in referenced_tables(q["sql"]) and measurements.get(q["name"])
+        ]
+        if not affected:
+            continue
+
+        print(f"\n   🔍 {label} – {len(affected)} Queries")
+        start = time.time()
+        cur.execute(f"ALTER TABLE {schema}.{table} ADD INDEX {name} ({', '.join(columns)})")
+        build_s = time.time() - start
+
+        try:
+            before = sum(measurements[q["name"]]["time_ms"] for q in affected)
+            after = 0.0
+            improved = []
+            for q in affected:
+                m = measure(cur, q, repeat)
+                if m is None:
+                    after += measurements[q["name"]]["time_ms"]
+                    continue
+                after += m["time_ms"]
+                old = measurements[q["name"]]
+                if m["time_ms"] * MIN_SPEEDUP <= old["time_ms"]:
+                    improved.append(f"{q['name']} {old['time_ms']:.2f} → {m['time_ms']:.2f} ms")
+        finally:
+            cur.execute(f"ALTER TABLE {schema}.{table} DROP INDEX {name}")
+
+        speedup = before / after if after else 0
+        for line in improved:
+            print(f"      {line}")
+        print(f"      Summe {before:.2f} → {after:.2f} ms (x{speedup:.2f}), Aufbau {build_s:.1f}s")
+
+        if improved and speedup >= MIN_SPEEDUP:
+            print("      ✅ übernommen")
+            accepted.append((schema, table, name, columns,
+                             f"Summe {before:.2f} → {after:.2f} ms (x{speedup:.2f}); " + "; ".join(improved)))
+        else:
+            print("      ❌ kein messbarer Gewinn")
+
+    return accepted
+
+
+# =============================================================================
+# Migration schreiben
+# =============================================================================
+
+MIGRATION_TEMPLATE = '''#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migration: Composite-Indizes für die heißen Website- und Pipeline-Queries.
+
+Erzeugt am {generated} von index_advisor.py (--evaluate --write-migration)
+gegen {database}. Übernommen wurden nur Kandidaten, die die betroffenen
+Queries messbar beschleunigt haben (Median EXPLAIN ANALYZE, vorher → nachher):
+{evidence}
+
+Idempotent: vorhandene Indizes werden übersprungen.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mysql.connector import Error
+from db import get_connection
+
+# (schema, tabelle, index_name, spalten)
+INDEXES = [
+{indexes}
+]
+
+
+def main():
+    conn = None
+    cur = None
+
+    try:
+        print("Verbinde mit Datenbank...")
+        conn = get_connection(autocommit=False)
+        cur = conn.cursor()
+
+        print("Lege Indizes an...")
+
+        for schema, table, name, columns in INDEXES:
+            try:
+                cur.execute(f"ALTER TABLE {{schema}}.{{table}} ADD INDEX {{name}} ({{', '.join(columns)}})")
+                print(f"  + {{table}}.{{name}} ({{', '.join(columns)}}) angelegt")
+            except Error as e:
+                if e.errno == 1061:  # Duplicate key name
+                    print(f"  - {{table}}.{{name}} existiert bereits")
+                else:
+                    raise
+
+        conn.commit()
+        print("Migration erfolgreich!")
+
+    except Error as e:
+        print(f"Datenbankfehler: {{e}}")
+        if conn:
+            conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def write_migration(path, indexes, database):
+    """indexes: übernommene Kandidaten aus evaluate_candidates (inkl. Messwerten)."""
+    lines = "\n".join(
+        f"    ({schema!r}, {table!r}, {name!r}, {tuple(columns)!r}),"
+        for schema, table, name, columns, _ in indexes
+    )
+    evidence = "\n".join(
+        f"- {table}.{name}: {summary}" for _, table, name, _, summary in indexes
+    ) or "- (keine)"
+    text = MIGRATION_TEMPLATE.format(
+        indexes=lines, evidence=evidence, database=database,
+        generated=datetime.now().strftime("%Y-%m-%d %H:%M"),
+    )
+    Path(path).write_text(text, encoding="utf-8")
+    print(f"\n📝 Migration geschrieben: {path} ({len(indexes)} Indizes)")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main(use_digest=False, evaluate=False, migration_path=None, repeat=3, show_plans=False):
+    print("=" * 60)
+    print("INDEX-ADVISOR")
+    print("=" * 60)
+
+    try:
+        conn = get_connection(db_name="analytics")
+        cur = conn.cursor(dictionary=True)
+    except Error as e:
+        print("❌ DB-Verbindung fehlgeschlagen:", e)
+        return
+
+    try:
+        params = sample_params(cur)
+        print(f"\nBeispiel-Parameter: {params['isin']} (+{SAMPLE_ISINS - 1} ISINs), "
+              f"user_id {params['user_id']}")
+
+        queries = catalog_queries(params)
+        queries += screener_queries(cur, params)
+        if use_digest:
+            queries += digest_queries(cur)
+        print(f"{len(queries)} Queries gesammelt, messe ({repeat} Läufe je Query)...")
+
+        measurements = {q["name"]: measure(cur, q, repeat) for q in queries}
+        report(queries, measurements)
+
+        if show_plans:
+            for q in queries:
+                if measurements.get(q["name"]):
+                    print(f"\n--- {q['name']} ({q['source']})\n{measurements[q['name']]['plan']}")
+
+        if evaluate:
+            print("\n" + "=" * 60)
+            print("KANDIDATEN BEWERTEN")
+            print("=" * 60)
+            candidates = CANDIDATE_INDEXES + screener_candidates(queries)
+            accepted = evaluate_candidates(cur, candidates, queries, measurements, repeat)
+
+            print(f"\n✅ {len(accepted)} von {len(candidates)} Kandidaten übernommen")
+            if migration_path:
+                cur.execute("SELECT @@hostname AS host, @@port AS port, VERSION() AS version")
+                server = cur.fetchone()
+                write_migration(migration_path, accepted,
+                                f"MySQL {server['version']} auf {server['host']}:{server['port']}")
+        elif migration_path:
+            print("\n⚠️  --write-migration benötigt --evaluate (Indizes nur nach Messung)")
+
+    except Error as e:
+        print(f"\nDatenbankfehler: {e}")
+    finally:
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="EXPLAIN-ANALYZE-Report und Index-Empfehlungen")
+    parser.add_argument("--digest", action="store_true",
+                        help="Zusätzlich Top-Statements aus performance_schema messen")
+    parser.add_argument("--evaluate", action="store_true",
+                        help="Kandidaten-Indizes anlegen, messen, wieder entfernen (nur lokale DB!)")
+    parser.add_argument("--write-migration", metavar="PFAD",
+                        help="Migration mit den übernommenen Indizes schreiben")
+    parser.add_argument("--repeat", type=int, default=3, help="Messläufe je Query (Median)")
+    parser.add_argument("--plans", action="store_true", help="Vollständige Pläne ausgeben")
+    args = parser.parse_args()
+
+    main(args.digest, args.evaluate, args.write_migration, args.repeat, args.plans)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spaltenbasiertes Kursarchiv (NumPy, memory-mapped) neben raw_data.yf_prices.
+
+Layout (ein Verzeichnis pro ISIN, eine .npy-Datei pro Spalte):
+
+    <PRICE_STORE_DIR>/<isin>/date.npy        datetime64[D] (int64), aufsteigend
+                             open.npy        float32
+                             high.npy        float32
+                             low.npy         float32
+                             close.npy       float32
+                             adj_close.npy   float32
+                             volume.npy      int64 (fehlend = 0)
+
+- Lesen erfolgt per np.load(mmap_mode='r') → keine Kopie, nur benötigte
+  Seiten werden vom Betriebssystem geladen.
+- Eine Spaltendatei wird atomar ersetzt, der Satz aller Spalten nicht:
+  load_series prüft gleiche Längen und liest bei einem Schreibvorgang neu.
+- Schreiben: 01_yf_history_all.py und 02_load_historical_prices_from_old_tickers.py
+  halten das Archiv synchron (merge_frame), 03_build_price_store.py baut es
+  komplett aus yf_prices auf.
+- Universumweite Auswertungen (Jahresaggregate, letzte Kurse) laufen ohne
+  Datenbank in Sekunden.
+
+Verzeichnis per Umgebungsvariable PRICE_STORE_DIR, Default: <projekt>/data/price_store
+"""
+
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+PRICE_STORE_DIR = Path(os.getenv(
+    "PRICE_STORE_DIR", Path(__file__).parent / "data" / "price_store"
+))
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "adj_close"]
+COLUMNS = ["date"] + PRICE_COLUMNS + ["volume"]
+
+DTYPES = {
+    "date": "datetime64[D]",
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "adj_close": np.float32,
+    "volume": np.int64,
+}
+
+# Leser: erneute Versuche, wenn die Spaltenlängen während eines Schreibvorgangs abweichen
+READ_RETRIES = 5
+READ_RETRY_DELAY_S = 0.05
+
+
+# =============================================================================
+# Lesen
+# =============================================================================
+
+def list_isins(store_dir=None):
+    """Alle ISINs im Archiv (sortiert)."""
+    store_dir = Path(store_dir or PRICE_STORE_DIR)
+    if not store_dir.exists():
+        return []
+    return sorted(p.name for p in store_dir.iterdir() if (p / "date.npy").exists())
+
+
+def load_series(isin, columns=None, store_dir=None, mmap=True):
+    """
+    Kursreihe einer ISIN als Dict {spalte: Array}.
+
+    Mit mmap=True sind die Arrays read-only Memory-Maps (zero-copy).
+    Returns None, wenn die ISIN nicht im Archiv ist. Haben die Spalten
+    unterschiedliche Längen (write_series läuft gerade), wird neu gelesen;
+    ValueError, wenn das nach READ_RETRIES Versuchen noch so ist.
+    """
+    path = Path(store_dir or PRICE_STORE_DIR) / isin
+    if not (path / "date.npy").exists():
+        return None
+
+    columns = columns or COLUMNS
+    if "date" not in columns:
+        columns = ["date"] + list(columns)
+
+    mode = "r" if mmap else None
+    for attempt in range(READ_RETRIES):
+        series = {col: np.load(path / f"{col}.npy", mmap_mode=mode) for col in columns}
+        lengths = {len(values) for values in series.values()}
+        if len(lengths) == 1:
+            return series
+        time.sleep(READ_RETRY_DELAY_S * (attempt + 1))
+
+    raise ValueError(f"Kursreihe {isin}: Spaltenlängen {sorted(lengths)} weichen voneinander ab")
+
+
+def load_many(isins, columns=None, store_dir=None, mmap=True):
+    """Kursreihen mehrerer ISINs: {isin: {spalte: Array}} (fehlende ISINs entfallen)."""
+    result = {}
+    for isin in isins:
+        series = load_series(isin, columns, store_dir, mmap)
+        if series is not None:
+            result[isin] = series
+    return result
+
+
+# =============================================================================
+# Schreiben
+# =============================================================================
+
+def write_series(isin, data, store_dir=None):
+    """
+    Ersetzt die komplette Kursreihe einer ISIN.
+
+    data: Dict {spalte: Array-like}, 'date' Pflicht. Fehlende Spalten → NaN/0.
+    Zeilen werden nach Datum sortiert, doppelte Daten entfernt (letzte gewinnt).
+    """
+    path = Path(store_dir or PRICE_STORE_DIR) / isin
+    path.mkdir(parents=True, exist_ok=True)
+
+    columns = _normalize(data)
+
+    # Erst alle Temp-Dateien schreiben, dann je Spalte per os.replace tauschen.
+    # Atomar ist nur jede einzelne Datei, nicht der Satz: zwischen zwei Replaces
+    # kann ein Leser alte und neue Spalten mischen. Ändert sich die Zeilenzahl,
+    # erkennt load_series das an den Längen und liest neu; bei gleicher Länge
+    # (nur Kurse einzelner Tage korrigiert) kann ein Leser kurz alte und neue
+    # Werte derselben Tage sehen. date zuletzt, damit eine neue ISIN erst
+    # sichtbar wird (list_isins), wenn alle Spalten vorhanden sind.
+    for col in COLUMNS:
+        with open(path / f"{col}.npy.tmp", "wb") as f:
+            np.save(f, columns[col])
+    for col in PRICE_COLUMNS + ["volume", "date"]:
+        os.replace(path / f"{col}.npy.tmp", path / f"{col}.npy")
+
+    return len(columns["date"])
+
+
+def merge_series(isin, data, store_dir=None, keep_existing=False):
+    """
+    Fügt neue/aktualisierte Zeilen in die bestehende Kursreihe ein (Upsert per Datum).
+
+    Neue Werte überschreiben bestehende Tage; mit keep_existing=True werden nur
+    fehlende Tage ergänzt (z.B. Historie alter Ticker). Returns Anzahl Zeilen danach.
+    """
+    new = _normalize(data)
+    existing = load_series(isin, store_dir=store_dir, mmap=False)
+
+    if existing is None or len(existing["date"]) == 0:
+        return write_series(isin, new, store_dir)
+
+    if keep_existing:
+        missing = ~np.isin(new["date"], existing["date"])
+        if not missing.any():
+            return len(existing["date"])
+        new = {col: values[missing] for col, values in new.items()}
+
+    # Bestehende Tage, die im Update enthalten sind, verwerfen
+    keep = ~np.isin(existing["date"], new["date"])
+    merged = {
+        col: np.concatenate([existing[col][keep], new[col]])
+        for col in COLUMNS
+    }
+    return write_series(isin, merged, store_dir)
+
+
+def merge_frame(df, store_dir=None, keep_existing=False):
+    """
+    Schreibt einen DataFrame mit Spalten isin, date und Kursspalten je ISIN
+    per merge_series ins Archiv (nur die enthaltenen ISINs).
+    """
+    columns = [c for c in PRICE_COLUMNS + ["volume"] if c in df.columns]
+    for isin, group in df.groupby("isin"):
+        merge_series(isin, {
+            "date": group["date"].values,
+            **{col: group[col].values for col in columns}
+        }, store_dir, keep_existing=keep_existing)
+
+
+def _normalize(data):
+    """Dict → sortierte, deduplizierte Arrays mit Archiv-Datentypen."""
+    dates = np.asarray(data["date"]).astype("datetime64[D]")
+    n = len(dates)
+
+    columns = {"date": dates}
+    for col in PRICE_COLUMNS:
+        values = data.get(col)
+        if values is None:
+            columns[col] = np.full(n, np.nan, dtype=np.float32)
+        else:
+            columns[col] = np.asarray(values, dtype=np.float64).astype(np.float32)
+
+    volume = data.get("volume")
+    if volume is None:
+        columns["volume"] = np.zeros(n, dtype=np.int64)
+    else:
+        volume = np.asarray(volume, dtype=np.float64)
+        columns["volume"] = np.nan_to_num(volume, nan=0).astype(np.int64)
+
+    # Sortieren; bei doppelten Tagen gewinnt die letzte Zeile
+    order = np.argsort(dates, kind="stable")[::-1]
+    _, first = np.unique(dates[order], return_index=True)
+    index = order[first]
+    return {col: values[index] for col, values in columns.items()}
+
+
+# =============================================================================
+# Universumweite Auswertungen
+# =============================================================================
+
+def yearly_aggregates(series):
+    """
+    Jahresaggregate einer Kursreihe (nur Tage mit Schlusskurs).
+
+    Returns Dict mit Arrays: year, avg_close, last_close, last_date, trading_days
+    """
+    dates = series["date"]
+    close = series["close"]
+    valid = ~np.isnan(close)
+    dates, close = dates[valid], close[valid].astype(np.float64)
+
+    if len(dates) == 0:
+        empty = np.array([], dtype=np.int64)
+        return {"year": empty, "avg_close": empty.astype(float), "last_close": empty.astype(float),
+                "last_date": empty.astype("datetime64[D]"), "trading_days": empty}
+
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    starts = np.flatnonzero(np.r_[True, np.diff(years) != 0])
+    ends = np.r_[starts[1:], len(years)] - 1
+    counts = ends - starts + 1
+
+    return {
+        "year": years[starts],
+        "avg_close": np.add.reduceat(close, starts) / counts,
+        "last_close": close[ends],
+        "last_date": dates[ends],
+        "trading_days": counts,
+    }
+
+
+def iter_yearly_aggregates(isins=None, store_dir=None):
+    """
+    Jahresaggregate für alle (oder ausgewählte) ISINs.
+
+    Yields Tupel (isin, year, avg_close, last_close, last_date, trading_days) –
+    direkt als Parameter für executemany verwendbar.
+    """
+    for isin in isins or list_isins(store_dir):
+        series = load_series(isin, ["close"], store_dir)
+        if series is None:
+            continue
+        agg = yearly_aggregates(series)
+        for i in range(len(agg["year"])):
+            yield (
+                isin,
+                int(agg["year"][i]),
+                float(agg["avg_close"][i]),
+                float(agg["last_close"][i]),
+                agg["last_date"][i].item(),
+                int(agg["trading_days"][i]),
+            )
+
+
+def latest_prices(isins=None, store_dir=None):
+    """Letzter Schlusskurs je ISIN: {isin: (date, close)}."""
+    result = {}
+    for isin in isins or list_isins(store_dir):
+        series = load_series(isin, ["close"], store_dir)
+        if series is None:
+            continue
+        valid = np.flatnonzero(~np.isnan(series["close"]))
+        if len(valid):
+            last = valid[-1]
+            result[isin] = (series["date"][last].item(), float(series["close"][last]))
+    return result
@@ -2,12 +2,18 @@
 # =============================================================================
 # Website Restart Script
 # =============================================================================
-# Stoppt die laufende Website und startet sie neu
+# Stoppt die laufende Website und startet sie neu (gunicorn, mehrere Worker,
+# Konfiguration in 05_website/gunicorn.conf.py). Ohne gunicorn im venv läuft
+# als Fallback der Flask-Dev-Server.
+#
+# Nur nach Code-Änderungen nötig: neue Pipeline-Daten sind ohne Neustart
+# sichtbar (Daten-Generation, siehe data_generation.py).
 # =============================================================================
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 WEBSITE_DIR="$SCRIPT_DIR/05_website"
 LOG_FILE="$SCRIPT_DIR/logs/website.log"
+PID_FILE="${WEB_PIDFILE:-$SCRIPT_DIR/logs/website.pid}"
 
 # Farben
 GREEN='\033[0;32m'
@@ -17,9 +23,18 @@ NC='\033[0m'
 
 echo -e "${YELLOW}>>> Website wird neu gestartet...${NC}"
 
-# Stoppe laufende Website-Prozesse
-pkill -f "python.*app.py" 2>/dev/null
-if [ $? -eq 0 ]; then
+mkdir -p "$SCRIPT_DIR/logs"
+
+# Stoppe laufende Website: gunicorn-Master (beendet seine Worker sauber) …
+if [ -f "$PID_FILE" ] && kill -0 "$(cat "$PID_FILE")" 2>/dev/null; then
+    kill -TERM "$(cat "$PID_FILE")"
+    echo "  → gunicorn gestoppt (PID: $(cat "$PID_FILE"))"
+    for _ in $(seq 1 30); do
+        [ -f "$PID_FILE" ] || break
+        sleep 1
+    done
+# … bzw. Dev-Server
+elif pkill -f "python.*app.py" 2>/dev/null; then
     echo "  → Website-Prozess gestoppt"
     sleep 2
 else
@@ -35,7 +50,12 @@ if [ -f "../venv/bin/activate" ]; then
 fi
 
 # Starte Website im Hintergrund
-nohup python app.py > "$LOG_FILE" 2>&1 &
+if command -v gunicorn > /dev/null; then
+    nohup gunicorn -c gunicorn.conf.py > "$LOG_FILE" 2>&1 &
+else
+    echo -e "${YELLOW}  → gunicorn nicht installiert, starte Flask-Dev-Server (pip install -r requirements.txt)${NC}"
+    nohup python app.py > "$LOG_FILE" 2>&1 &
+fi
 WEBSITE_PID=$!
 
 echo -e "${GREEN}  → Website gestartet (PID: $WEBSITE_PID)${NC}"
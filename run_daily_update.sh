@@ -80,6 +80,9 @@ cd "$SCRIPT_DIR/04_frontend"
 # Nur live_metrics aktualisieren, NICHT company_info (Stammdaten ändern sich selten)
 python 02_load_live_metrics.py 2>&1 | tee -a "$LOG_FILE"
 
+# DCF-Screening (Default-Annahmen) auf Basis der neuen Kurse
+python 12_dcf_screening.py 2>&1 | tee -a "$LOG_FILE"
+
 cd "$SCRIPT_DIR"
 
 # =============================================================================
@@ -8,7 +8,8 @@
 #
 # Optionen:
 #   ./run_pipeline.sh        # Alles ausfuehren
-#   ./run_pipeline.sh 0      # Nur Schritt 0 (Ticker)
+#   ./run_pipeline.sh 0      # Nur Schritt 0 (Ticker) + Nachladen neuer ISINs
+#   ./run_pipeline.sh new    # Nur neue ISINs aus dem letzten Sync nachladen
 #   ./run_pipeline.sh 1      # Nur Schritt 1 (Fundamentals)
 #   ./run_pipeline.sh 2      # Nur Schritt 2 (History)
 #   ./run_pipeline.sh 3      # Nur Schritt 3 (Analytics)
@@ -46,10 +47,11 @@ run_step() {
 
     cd "$SCRIPT_DIR/$dir"
 
+    # Eintrag = Skript plus optionale Argumente, z.B. "01_yf_history_all.py --isins-file"
     for script in "${scripts[@]}"; do
-        if [ -f "$script" ]; then
+        if [ -f "${script%% *}" ]; then
             echo -e "${GREEN}>>> $script${NC}"
-            python "$script"
+            python $script
             echo ""
         else
             echo -e "${RED}WARNUNG: $script nicht gefunden${NC}"
@@ -71,12 +73,30 @@ echo "Startzeit: $(date)"
 if [ "$STEP" = "all" ] || [ "$STEP" = "0" ]; then
     run_step "0" "00_tickerlist" \
         "00_create_table_tickerlist.py" \
-        "01_ishares_scrap_ubuntu.py" \
-        "02_add_to_tickerlist_from_csv.py" \
+        "05_sync_constituents.py" \
         "03_update_yf_ticker.py" \
         "04_fill_eodhd_ticker.py"
 fi
 
+# SCHRITT 0b: Neu aufgenommene ISINs nachladen (Kurse, FMP, company_info).
+# Nur bei "0"/"new" – ein Komplettlauf lädt ohnehin die ganze tickerlist.
+if [ "$STEP" = "0" ] || [ "$STEP" = "new" ]; then
+    NEW_ISINS_FILE="${CONSTITUENT_DELTA_DIR:-$SCRIPT_DIR/data/constituents}/new_isins.txt"
+    if [ -s "$NEW_ISINS_FILE" ]; then
+        echo "Neue ISINs: $(wc -l < "$NEW_ISINS_FILE") ($NEW_ISINS_FILE)"
+        run_step "0b" "02_history" \
+            "01_yf_history_all.py --isins-file"
+        run_step "0b" "01_load_fundamentals" \
+            "00_fmp_financial_loader.py --isins-file" \
+            "01_fmp_market_cap_loader.py --isins-file" \
+            "02_fmp_revenue_segments_loader.py --isins-file"
+        run_step "0b" "04_frontend" \
+            "01_load_company_info.py --isins-file"
+    else
+        echo "Keine neuen ISINs – nichts nachzuladen."
+    fi
+fi
+
 # SCHRITT 1: Fundamentaldaten (FMP API)
 if [ "$STEP" = "all" ] || [ "$STEP" = "1" ]; then
     run_step "1" "01_load_fundamentals" \
@@ -114,11 +134,14 @@ if [ "$STEP" = "all" ] || [ "$STEP" = "4" ]; then
         "00_create_frontend_tables.py" \
         "00a_alter_live_metrics_add_margins.py" \
         "00b_alter_live_metrics_add_pe_diffs.py" \
+        "13_add_translation_cache.py" \
         "01_load_company_info.py" \
         "02_load_live_metrics.py" \
         "03_init_watchlist.py" \
         "04_create_column_settings.py" \
-        "04a_add_pe_diff_columns.py"
+        "04a_add_pe_diff_columns.py" \
+        "11_add_dcf_columns.py" \
+        "12_dcf_screening.py"
 fi
 
 echo ""
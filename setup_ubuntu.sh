@@ -215,9 +215,9 @@ echo "   python 03_init_watchlist.py"
 echo "   python 04_create_column_settings.py"
 echo "   cd .."
 echo ""
-echo "   # Schritt 5: Webserver starten"
-echo "   cd 05_website"
-echo "   python app.py"
+echo "   # Schritt 5: Webserver starten (gunicorn, Logs in logs/website.log)"
+echo "   ./restart_website.sh"
+echo "   # Entwicklung: cd 05_website && python app.py"
 echo ""
 echo "4. Webserver erreichbar unter:"
 echo "   http://SERVER_IP:5001"